@@ -3,11 +3,12 @@
 import Image from "next/image";
 import { useState } from "react";
 
+// thumb: pre-generated WebP width (book-ingest src/thumbnails.py), >= 2x display width
 const SIZES = {
-  xs: { width: 40, height: 55, className: "w-10 h-[55px]" },
-  sm: { width: 64, height: 88, className: "w-16 h-[88px]" },
-  md: { width: 120, height: 166, className: "w-[120px] h-[166px]" },
-  lg: { width: 180, height: 250, className: "w-[180px] h-[250px]" },
+  xs: { width: 40, height: 55, thumb: 150, className: "w-10 h-[55px]" },
+  sm: { width: 64, height: 88, thumb: 150, className: "w-16 h-[88px]" },
+  md: { width: 120, height: 166, thumb: 300, className: "w-[120px] h-[166px]" },
+  lg: { width: 180, height: 250, thumb: 300, className: "w-[180px] h-[250px]" },
 };
 
 interface BookCoverProps {
@@ -17,9 +18,14 @@ interface BookCoverProps {
 }
 
 export function BookCover({ bookId, name, size = "md" }: BookCoverProps) {
-  const [error, setError] = useState(false);
-  const { width, height, className } = SIZES[size];
-  const src = error ? "/covers/placeholder.jpg" : `/covers/${bookId}.jpg`;
+  // 0 = thumbnail, 1 = full cover (no thumbnail yet), 2 = placeholder
+  const [fallback, setFallback] = useState(0);
+  const { width, height, thumb, className } = SIZES[size];
+  const src = [
+    `/covers/${bookId}-${thumb}.webp`,
+    `/covers/${bookId}.jpg`,
+    "/covers/placeholder.jpg",
+  ][fallback];
 
   return (
     <div className={`${className} relative rounded overflow-hidden bg-gray-100 shrink-0 transition-transform duration-200 group-hover:scale-105`}>
@@ -29,7 +35,7 @@ export function BookCover({ bookId, name, size = "md" }: BookCoverProps) {
         width={width}
         height={height}
         className="object-cover w-full h-full"
-        onError={() => setError(true)}
+        onError={() => setFallback((f) => Math.min(f + 1, 2))}
         unoptimized
       />
     </div>
@@ -0,0 +1,56 @@
+"""BLIB bundle encode / decode, index and full reads, atomic writes."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.bundle import (
+    ChapterMeta,
+    _decode_meta,
+    _encode_meta,
+    read_bundle_indices,
+    read_bundle_meta,
+    read_bundle_raw,
+    write_bundle,
+)
+
+pytestmark = pytest.mark.benchmark(group="bundle")
+
+META = ChapterMeta(
+    chapter_id=123_456_789,
+    word_count=2_731,
+    title="Chương 1024: Thiên địa dị biến, vạn tông triều bái",
+    slug="chuong-1024-thien-dia-di-bien",
+)
+
+
+def bench_encode_meta(benchmark):
+    block = benchmark(_encode_meta, META)
+    assert len(block) == 256
+
+
+def bench_decode_meta(benchmark):
+    block = _encode_meta(META)
+    assert benchmark(_decode_meta, block) == META
+
+
+def bench_read_bundle_indices(benchmark, bundle_path, chapters):
+    indices = benchmark(read_bundle_indices, str(bundle_path))
+    assert len(indices) == len(chapters)
+
+
+def bench_read_bundle_raw(benchmark, bundle_path, chapters):
+    raw = benchmark(read_bundle_raw, str(bundle_path))
+    assert len(raw) == len(chapters)
+
+
+def bench_read_bundle_meta(benchmark, bundle_path, chapters):
+    meta = benchmark(read_bundle_meta, str(bundle_path))
+    assert len(meta) == len(chapters)
+
+
+def bench_write_bundle(benchmark, tmp_path, bundle_chapters):
+    data, meta = bundle_chapters
+    path = str(tmp_path / "out.bundle")
+    benchmark(write_bundle, path, data, meta)
+    assert read_bundle_indices(path) == set(data)
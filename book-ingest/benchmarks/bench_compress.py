@@ -0,0 +1,14 @@
+"""Chapter compression with the trained zstd dictionary."""
+
+from __future__ import annotations
+
+import pytest
+import pyzstd
+
+pytestmark = pytest.mark.benchmark(group="compress")
+
+
+def bench_compress_chapter(benchmark, compressor, chapter):
+    compressed, raw_len = benchmark(compressor.compress, chapter.body)
+    assert raw_len == len(chapter.body.encode("utf-8"))
+    assert pyzstd.decompress(compressed, compressor._dict) == chapter.body.encode("utf-8")
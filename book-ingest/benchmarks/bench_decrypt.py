@@ -0,0 +1,20 @@
+"""MTC chapter decryption: raw envelope and the full ``decrypt_chapter``."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.api import decrypt_chapter
+from src.decrypt import decrypt_content
+
+pytestmark = pytest.mark.benchmark(group="decrypt")
+
+
+def bench_decrypt_content(benchmark, api_chapter, chapter):
+    assert benchmark(decrypt_content, api_chapter["content"]) == chapter.body
+
+
+def bench_decrypt_chapter(benchmark, api_chapter, chapter):
+    title, slug, body, word_count = benchmark(decrypt_chapter, api_chapter)
+    assert title == chapter.title
+    assert body and not body.startswith(chapter.title)
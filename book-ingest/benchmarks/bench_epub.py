@@ -0,0 +1,25 @@
+"""EPUB converter hot paths: bundle read-back and body → XHTML."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("ebooklib")
+
+from epub_builder import BundleReader, _body_to_html  # noqa: E402
+
+pytestmark = pytest.mark.benchmark(group="epub")
+
+
+def bench_read_all_bodies(benchmark, bundle_path, dict_path, chapters):
+    bodies = benchmark.pedantic(
+        lambda reader: reader.read_all_bodies(),
+        setup=lambda: ((BundleReader(bundle_path, dict_path),), {}),
+        rounds=20,
+    )
+    assert len(bodies) == len(chapters)
+
+
+def bench_body_to_html(benchmark, chapter):
+    html = benchmark(_body_to_html, chapter.body)
+    assert html.startswith("<p>")
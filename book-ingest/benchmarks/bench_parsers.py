@@ -0,0 +1,27 @@
+"""TTV / TF chapter page parsing (lxml fast path and BeautifulSoup reference)."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.sources import tf, ttv
+
+pytestmark = pytest.mark.benchmark(group="parse")
+
+
+def bench_ttv_parse_chapter(benchmark, ttv_page, chapter):
+    parsed = benchmark(ttv.parse_chapter, ttv_page)
+    assert parsed["title"] == chapter.title
+
+
+def bench_ttv_parse_chapter_bs4(benchmark, ttv_page):
+    assert benchmark(ttv._extract_chapter_bs4, ttv_page) is not None
+
+
+def bench_tf_parse_chapter(benchmark, tf_page, chapter):
+    parsed = benchmark(tf.parse_chapter, tf_page)
+    assert parsed["title"] == chapter.title
+
+
+def bench_tf_parse_chapter_bs4(benchmark, tf_page):
+    assert benchmark(tf._extract_chapter_bs4, tf_page) is not None
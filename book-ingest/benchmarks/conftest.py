@@ -0,0 +1,167 @@
+"""Synthetic fixtures for the micro-benchmark suite.
+
+Everything is generated locally and deterministically: chapter text comes
+from the ``bench`` source generator, the zstd dictionary is trained on
+that text, MTC ciphertext is produced with the same envelope layout the
+API uses, and TTV / TF pages wrap the text in the sites' markup.  No
+network, database or binslib checkout is needed.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+import pyzstd
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad
+
+BENCH_DIR = Path(__file__).resolve().parent
+INGEST_DIR = BENCH_DIR.parent
+EPUB_DIR = INGEST_DIR.parent / "epub-converter"
+
+# Ensure the packages are importable
+sys.path.insert(0, str(INGEST_DIR))
+sys.path.insert(1, str(EPUB_DIR))
+
+from src.bundle import ChapterMeta, write_bundle  # noqa: E402
+from src.compress import ChapterCompressor  # noqa: E402
+from src.decrypt import KEY_START  # noqa: E402
+from src.sources.bench import generate_chapter  # noqa: E402
+
+BOOK_ID = 4242
+CHAPTERS = 300  # a typical mid-sized book
+MEAN_WORDS = 2500
+
+# 16 key characters outside the base64 alphabet, so the key can never
+# collide with the envelope text it is spliced into.
+_AES_KEY = "!#$%&()*,-.:;<>?"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Skip the regression check on the first run, when nothing is saved yet."""
+    storage = getattr(config.option, "benchmark_storage", "") or ""
+    if not getattr(config.option, "benchmark_compare_fail", None):
+        return
+    if storage.startswith("file://") and not any(Path(storage[7:]).rglob("*.json")):
+        config.option.benchmark_compare = None
+        config.option.benchmark_compare_fail = None
+
+
+@pytest.fixture(scope="session")
+def chapters():
+    return [generate_chapter(BOOK_ID, i, MEAN_WORDS) for i in range(1, CHAPTERS + 1)]
+
+
+@pytest.fixture(scope="session")
+def chapter(chapters):
+    return chapters[0]
+
+
+@pytest.fixture(scope="session")
+def dict_path(tmp_path_factory, chapters):
+    samples = [c.body.encode("utf-8") for c in chapters]
+    zdict = pyzstd.train_dict(samples, 64 * 1024)
+    path = tmp_path_factory.mktemp("dict") / "global.dict"
+    path.write_bytes(zdict.dict_content)
+    return path
+
+
+@pytest.fixture(scope="session")
+def compressor(dict_path):
+    return ChapterCompressor(str(dict_path))
+
+
+@pytest.fixture(scope="session")
+def bundle_chapters(compressor, chapters):
+    """``write_bundle`` input: ``(data, meta)`` for the whole book."""
+    data = {c.index: compressor.compress(c.body) for c in chapters}
+    meta = {
+        c.index: ChapterMeta(
+            chapter_id=BOOK_ID * 10_000 + c.index,
+            word_count=c.word_count,
+            title=c.title,
+            slug=c.slug,
+        )
+        for c in chapters
+    }
+    return data, meta
+
+
+@pytest.fixture(scope="session")
+def bundle_path(tmp_path_factory, bundle_chapters):
+    data, meta = bundle_chapters
+    path = tmp_path_factory.mktemp("compressed") / f"{BOOK_ID}.bundle"
+    write_bundle(str(path), data, meta)
+    return path
+
+
+def encrypt_content(plaintext: str, key: str = _AES_KEY) -> str:
+    """Inverse of :func:`src.decrypt.decrypt_content` (MAC is not checked)."""
+    key_bytes = bytes(ord(c) for c in key)
+    iv = os.urandom(16)
+    ciphertext = AES.new(key_bytes, AES.MODE_CBC, iv).encrypt(
+        pad(plaintext.encode("utf-8"), AES.block_size)
+    )
+    envelope = {
+        "iv": base64.b64encode(iv).decode(),
+        "value": base64.b64encode(ciphertext).decode(),
+        "mac": "0" * 64,
+    }
+    clean = base64.b64encode(json.dumps(envelope).encode()).decode().rstrip("=")
+    return clean[:KEY_START] + key + clean[KEY_START:]
+
+
+@pytest.fixture(scope="session")
+def api_chapter(chapter):
+    """An MTC API chapter object with encrypted ``content``."""
+    return {
+        "id": BOOK_ID * 10_000 + chapter.index,
+        "index": chapter.index,
+        "name": chapter.title,
+        "slug": chapter.slug,
+        "content": encrypt_content(chapter.body),
+    }
+
+
+def _paragraphs(body: str) -> list[str]:
+    return body.split("\n")[1:]  # first line is the title
+
+
+@pytest.fixture(scope="session")
+def ttv_page(chapter):
+    lines = "\n\n".join(_paragraphs(chapter.body))
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{chapter.title}</title></head><body>"
+        '<div class="container"><div class="chapter">'
+        f"<h2>{chapter.title}</h2>"
+        f'<div class="box-chap box-chap-{BOOK_ID}">'
+        f"<h5>{chapter.title}</h5>\n{chapter.title}\n\n{lines}\n</div>"
+        "</div></div></body></html>"
+    )
+
+
+@pytest.fixture(scope="session")
+def tf_page(chapter):
+    paras = _paragraphs(chapter.body)
+    half = len(paras) // 2
+    body = (
+        "<br><br>".join(paras[:half])
+        + '<div class="ads-responsive incontent-ad"><ins class="adsbygoogle"></ins>'
+        "<script>(adsbygoogle = []).push({});</script></div>"
+        + "<br><br>".join(paras[half:])
+    )
+    return (
+        "<!DOCTYPE html><html lang=\"vi\"><head><meta charset=\"utf-8\">"
+        f"<title>{chapter.title}</title></head><body>"
+        '<div id="wrap"><div class="container chapter">'
+        f'<h2><a class="chapter-title" href="/x/chuong-1/">{chapter.title}</a></h2>'
+        f'<div id="chapter-c" class="chapter-c">{body}</div>'
+        "</div></div></body></html>"
+    )
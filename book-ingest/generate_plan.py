@@ -12,24 +12,33 @@ Modes:
   --refresh             Read the existing plan file, fetch full per-book
                         metadata from the API (author, genres, tags, synopsis,
                         poster, stats), and write an enriched plan.  Detects
-                        removed books (404) and new chapters.
+                        removed books (404) and new chapters.  Only books
+                        due under the tiered refresh policy are fetched
+                        (hot serials every run, idle and completed books
+                        every few days/weeks); --refresh-all fetches all.
 
   --scan                (requires --refresh) Also probe every ID in the MTC
                         range to discover books invisible to the catalog
-                        listing endpoint.
+                        listing endpoint.  A scan ledger
+                        (data/scan_ledger.sqlite) remembers each probe, so
+                        repeat scans only re-probe stale IDs and new ones.
 
   --cover-only          Only download missing cover images; skip plan
-                        generation entirely.
+                        generation entirely.  Poster URLs are read from the
+                        plan; the API is queried only for books without one.
 
 Usage:
     python3 generate_plan.py                                # catalog → plan + covers
     python3 generate_plan.py --refresh                      # enrich existing plan
     python3 generate_plan.py --refresh --scan               # enrich + discover missing
     python3 generate_plan.py --refresh --scan               # + synthetic authors (default)
+    python3 generate_plan.py --refresh --scan --full-scan   # ignore the scan ledger
     python3 generate_plan.py --refresh --no-fix-author      # disable synthetic authors
+    python3 generate_plan.py --refresh --refresh-all        # re-fetch every book
     python3 generate_plan.py --cover-only                   # covers only
     python3 generate_plan.py --cover-only --ids 132599 131197
     python3 generate_plan.py --cover-only --force           # re-download all
+    python3 generate_plan.py --cover-only --cover-workers 16  # more parallel downloads
     python3 generate_plan.py --dry-run                      # preview, no writes
 """
 
@@ -38,10 +47,13 @@ from __future__ import annotations
 import argparse
 import asyncio
 import json
+import multiprocessing
 import os
 import struct
 import sys
 import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -72,6 +84,7 @@ HEADERS = {
     "content-type": "application/json",
 }
 REQUEST_DELAY = 0.3
+CATALOG_WORKERS = 8  # concurrent /api/books page requests
 
 # ── Paths ───────────────────────────────────────────────────────────────────
 
@@ -84,6 +97,9 @@ PLAN_FILE = PLAN_DIR / "books_plan_mtc.json"
 TTV_PLAN_FILE = PLAN_DIR / "books_plan_ttv.json"
 TF_PLAN_FILE = PLAN_DIR / "books_plan_tf.json"
 AUDIT_FILE = PLAN_DIR / "catalog_audit.json"
+SCAN_LEDGER_FILE = PLAN_DIR / "scan_ledger.sqlite"
+PLAN_STORE_FILE = PLAN_DIR / "plans.sqlite"
+PLAN_FILES = {"mtc": PLAN_FILE, "ttv": TTV_PLAN_FILE, "tf": TF_PLAN_FILE}
 
 # ── Scan config ─────────────────────────────────────────────────────────────
 
@@ -99,21 +115,68 @@ ID_RANGE_END = 153500  # generous upper bound; --scan auto-detects the real max
 console = Console()
 
 
-def _flush_plan_file(path: Path, entries: list[dict], label: str = "") -> None:
-    """Write plan entries to a JSON file (periodic checkpoint during discovery).
+def open_plan_store():
+    """The plan store (``data/plans.sqlite``), synced with the plan JSON files."""
+    from src.planstore import PlanStore
 
-    Called every ``flush_every`` new books during scraping so progress is
-    saved and not lost if the process is interrupted.
+    return PlanStore(PLAN_STORE_FILE, PLAN_FILES)
+
+
+def read_plan(source: str) -> list[dict] | None:
+    """All plan entries for *source* in plan order (``None`` if no plan)."""
+    with open_plan_store() as store:
+        if not store.has_plan(source):
+            return None
+        return store.query(source)
+
+
+def write_plan(
+    source: str, entries: list[dict], refreshed: list[int] | None = None
+) -> None:
+    """Replace the plan for *source* and export its JSON file.
+
+    Unchanged books are left untouched in the store; the JSON export is
+    the only full rewrite, once per run.  *refreshed* are the IDs whose
+    metadata was fetched this run (``--refresh``).
+    """
+    PLAN_DIR.mkdir(parents=True, exist_ok=True)
+    with open_plan_store() as store:
+        store.replace(source, entries)
+        if refreshed:
+            store.mark_refreshed(source, refreshed)
+        store.export_json(source)
+
+
+def _flush_plan(source: str, entries: list[dict], label: str = "") -> None:
+    """Upsert newly discovered plan entries (periodic checkpoint during discovery).
+
+    Called every ``flush_every`` new books during scraping with the books
+    found since the last checkpoint, so progress survives an interruption
+    without rewriting the whole plan.
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=2, ensure_ascii=False)
+    with open_plan_store() as store:
+        store.upsert(source, entries)
     if label:
         console.print(
             f"  [dim]Checkpoint: flushed {len(entries)} entries ({label})[/dim]"
         )
 
 
+def _report_registry(label: str, registry) -> None:
+    """Print the registry size and any JSON snapshot entries it refused."""
+    console.print(f"  {label} registry: {len(registry)} existing IDs")
+    conflicts = registry.import_conflicts
+    if conflicts:
+        console.print(
+            f"  [yellow]{len(conflicts)} registry snapshot entries conflict with "
+            f"{registry.path.name} and were not imported:[/yellow]"
+        )
+        for conflict in conflicts[:10]:
+            console.print(f"    {conflict}")
+        if len(conflicts) > 10:
+            console.print(f"    [dim]... and {len(conflicts) - 10:,} more[/dim]")
+
+
 # ── Bundle helpers (minimal BLIB reader) ────────────────────────────────────
 
 BUNDLE_MAGIC = b"BLIB"
@@ -336,7 +399,7 @@ def parse_book_lite(item: dict) -> dict:
     }
 
 
-# ── API: sync fetchers (catalog pagination, single-book) ───────────────────
+# ── API: sync fetchers (single-book) ────────────────────────────────────────
 
 
 def fetch_book_metadata_sync(client: httpx.Client, book_id: int) -> dict | None:
@@ -355,48 +418,130 @@ def fetch_book_metadata_sync(client: httpx.Client, book_id: int) -> dict | None:
     return None
 
 
-def fetch_catalog(
-    client: httpx.Client, limit: int = 50, log=console.print
-) -> list[dict]:
-    """Paginate through /api/books to get every book on the platform."""
-    all_books: list[dict] = []
-    page = 1
-    total = None
-    last_page = "?"
+# ── API: async fetchers (catalog, --refresh and --scan) ─────────────────────
 
-    while True:
-        r = client.get(f"{BASE_URL}/api/books", params={"limit": limit, "page": page})
-        data = r.json()
-        if not data.get("success"):
-            log(f"  Page {page}: API error — {data.get('message', '?')}")
-            break
 
-        items = data.get("data", [])
-        if not items:
-            break
+async def _fetch_catalog_page(
+    client: httpx.AsyncClient,
+    hosts,
+    page: int,
+    limit: int,
+    retries: int = 4,
+) -> dict | None:
+    """GET one /api/books page; retries transport errors, 429 and 5xx.
 
-        pag = data.get("pagination", {})
-        if total is None:
-            total = pag.get("total", "?")
-            last_page = pag.get("last", "?")
-            log(f"  Total books: {total}, pages: {last_page}")
+    Returns the decoded response, or ``None`` once retries are exhausted
+    or the API reports an error.
+    """
+    url = f"{BASE_URL}/api/books"
+    for attempt in range(retries):
+        try:
+            async with hosts.slot(url):
+                r = await client.get(url, params={"limit": limit, "page": page})
+        except httpx.TransportError:
+            if attempt < retries - 1:
+                await asyncio.sleep(2 ** (attempt + 1))
+                continue
+            return None
 
-        for item in items:
-            all_books.append(parse_book_lite(item))
+        if r.status_code == 429 or r.status_code >= 500:
+            if attempt < retries - 1:
+                wait = r.headers.get("Retry-After")
+                await asyncio.sleep(
+                    int(wait) if wait and wait.isdigit() else 2 ** (attempt + 1)
+                )
+                continue
+            return None
+        if r.status_code != 200:
+            return None
 
-        if page % 50 == 0 or page == 1:
-            log(f"  Page {page}/{last_page}: {len(all_books)} books collected")
+        data = r.json()
+        return data if data.get("success") else None
+    return None
 
-        if not pag.get("next"):
-            break
-        page += 1
-        time.sleep(0.08)
 
-    log(f"  Done: {len(all_books)} books fetched")
-    return all_books
+async def fetch_catalog_async(
+    limit: int = 50,
+    workers: int = CATALOG_WORKERS,
+    delay: float = 0.08,
+    log=console.print,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> list[dict]:
+    """Fetch every book on the platform via /api/books.
+
+    Page 1 gives ``pagination.last``; the remaining pages are then fetched
+    by *workers* concurrent requests through one shared limiter (request
+    starts at least *delay* seconds apart), each with retries.  Results
+    are reassembled in page order and de-duplicated by ID (books can
+    shift between pages while the crawl runs).  If the last page still
+    reports a ``next``, the catalog grew and the extra pages are followed
+    one by one.  *transport* replaces the network (tests).
+    """
+    from src.ratelimit import HostLimiter
 
+    hosts = HostLimiter(workers, delay)
+    pages: dict[int, list[dict]] = {}
+    failed: list[int] = []
 
-# ── API: async fetchers (for --refresh and --scan) ──────────────────────────
+    async with httpx.AsyncClient(
+        headers=HEADERS, timeout=30, transport=transport
+    ) as client:
+        first = await _fetch_catalog_page(client, hosts, 1, limit)
+        if first is None:
+            log("  Page 1: API error — catalog not fetched")
+            return []
+        pag = first.get("pagination") or {}
+        pages[1] = first.get("data") or []
+        last_page = int(pag.get("last") or 1)
+        log(f"  Total books: {pag.get('total', '?')}, pages: {last_page}")
+
+        todo = iter(range(2, last_page + 1))
+        tail_next = bool(pag.get("next")) and last_page == 1
+        start = time.time()
+
+        async def worker() -> None:
+            nonlocal tail_next
+            for page in todo:
+                data = await _fetch_catalog_page(client, hosts, page, limit)
+                if data is None:
+                    failed.append(page)
+                    continue
+                pages[page] = data.get("data") or []
+                if page == last_page:
+                    tail_next = bool((data.get("pagination") or {}).get("next"))
+                done = len(pages) + len(failed)
+                if done % 50 == 0:
+                    rate = done / (time.time() - start)
+                    log(f"  Page {done}/{last_page} ({rate:.0f} pages/s)")
+
+        await asyncio.gather(*(worker() for _ in range(max(workers, 1))))
+
+        # Catalog grew past the last page seen on page 1
+        page = last_page
+        while tail_next and pages.get(page):
+            page += 1
+            data = await _fetch_catalog_page(client, hosts, page, limit)
+            if data is None:
+                failed.append(page)
+                break
+            pages[page] = data.get("data") or []
+            tail_next = bool((data.get("pagination") or {}).get("next"))
+
+    all_books: list[dict] = []
+    seen: set[int] = set()
+    for page in sorted(pages):
+        for item in pages[page]:
+            if item["id"] not in seen:
+                seen.add(item["id"])
+                all_books.append(parse_book_lite(item))
+
+    if failed:
+        log(
+            f"  [yellow]{len(failed)} pages failed after retries:[/yellow] "
+            f"{', '.join(str(p) for p in sorted(failed)[:20])}"
+        )
+    log(f"  Done: {len(all_books)} books fetched from {len(pages)} pages")
+    return all_books
 
 
 async def fetch_book_async(
@@ -406,8 +551,13 @@ async def fetch_book_async(
     delay: float,
     fix_author: bool = False,
     retries: int = 3,
+    missing: set[int] | None = None,
 ) -> dict | None:
-    """Fetch and parse metadata for a single book (async)."""
+    """Fetch and parse metadata for a single book (async).
+
+    Books the API says do not exist (404 / unsuccessful response) are
+    added to *missing*; ``None`` without that means the request failed.
+    """
     for attempt in range(retries):
         async with sem:
             await asyncio.sleep(delay)
@@ -423,6 +573,8 @@ async def fetch_book_async(
                 return None
 
         if r.status_code == 404:
+            if missing is not None:
+                missing.add(book_id)
             return None
         if r.status_code == 429:
             wait = int(r.headers.get("Retry-After", 2 ** (attempt + 2)))
@@ -438,6 +590,8 @@ async def fetch_book_async(
 
         data = r.json()
         if not data.get("success"):
+            if missing is not None:
+                missing.add(book_id)
             return None
         return parse_book_full(data.get("data", {}), fix_author=fix_author)
 
@@ -450,8 +604,14 @@ async def _fetch_batch(
     delay: float,
     label: str,
     fix_author: bool = False,
+    missing: set[int] | None = None,
+    quiet: bool = False,
 ) -> dict[int, dict | None]:
-    """Fetch metadata for a batch of book IDs. Returns {id: entry_or_None}."""
+    """Fetch metadata for a batch of book IDs. Returns {id: entry_or_None}.
+
+    IDs confirmed not to exist are added to *missing* (see
+    :func:`fetch_book_async`).
+    """
     results: dict[int, dict | None] = {}
     results_lock = asyncio.Lock()
     sem = asyncio.Semaphore(workers)
@@ -463,14 +623,14 @@ async def _fetch_batch(
 
         async def _do(bid: int) -> None:
             entry = await fetch_book_async(
-                client, sem, bid, delay, fix_author=fix_author
+                client, sem, bid, delay, fix_author=fix_author, missing=missing
             )
             async with results_lock:
                 results[bid] = entry
                 progress["done"] += 1
 
             done = progress["done"]
-            if done % 500 == 0 or done == total:
+            if not quiet and (done % 500 == 0 or done == total):
                 elapsed = time.time() - start
                 rate = done / elapsed if elapsed > 0 else 0
                 eta = (total - done) / rate if rate > 0 else 0
@@ -484,15 +644,20 @@ async def _fetch_batch(
     return results
 
 
-async def find_upper_bound(workers: int, delay: float) -> int:
-    """Probe above ID_RANGE_END to find the true upper boundary."""
-    probe_ids = list(range(ID_RANGE_END - 500, ID_RANGE_END + 1000, 50))
-    results = await _fetch_batch(probe_ids, workers, delay, "probe")
-    last_valid = ID_RANGE_END
-    for bid in sorted(results):
-        if results[bid] is not None:
-            last_valid = max(last_valid, bid)
-    return last_valid + 100
+async def find_upper_bound(workers: int, delay: float, start: int) -> int:
+    """Search upward from the live ID *start* for the end of the ID range
+    (exponential + binary search, see :func:`src.scanledger.find_upper_bound`)."""
+    from src.scanledger import UPPER_MARGIN
+    from src.scanledger import find_upper_bound as _search
+
+    async def probe(ids: list[int]) -> set[int]:
+        results = await _fetch_batch(ids, workers, delay, "probe", quiet=True)
+        return {bid for bid, entry in results.items() if entry is not None}
+
+    # Never below the configured range end, whatever the probes found
+    return await _search(
+        probe, max(start, ID_RANGE_START), floor=ID_RANGE_END + UPPER_MARGIN
+    )
 
 
 async def scan_missing_ids(
@@ -501,20 +666,45 @@ async def scan_missing_ids(
     delay: float,
     upper_bound: int,
     fix_author: bool = False,
+    ledger=None,
+    dead_ttl: float = 0,
+    found_ttl: float = 0,
 ) -> list[dict]:
-    """Scan the full ID range and return entries for books not in known_ids."""
-    to_probe = [
-        bid for bid in range(ID_RANGE_START, upper_bound + 1) if bid not in known_ids
-    ]
+    """Scan the ID range and return entries for books not in known_ids.
+
+    With a :class:`~src.scanledger.ScanLedger`, IDs whose last probe is
+    still fresh (*dead_ttl* for 404s, *found_ttl* for books too small for
+    the plan) are skipped, every result is recorded, and the high-water
+    mark moves up to *upper_bound*.
+    """
+    if ledger is not None:
+        ledger.forget(known_ids)
+        to_probe = ledger.due(
+            ID_RANGE_START, upper_bound, known_ids, dead_ttl=dead_ttl, found_ttl=found_ttl
+        )
+        total = upper_bound - ID_RANGE_START + 1 - len(known_ids)
+        console.print(
+            f"  Ledger: high-water {ledger.high_water or '—'}, "
+            f"skipping {max(total - len(to_probe), 0):,} recently probed IDs"
+        )
+    else:
+        to_probe = [
+            bid
+            for bid in range(ID_RANGE_START, upper_bound + 1)
+            if bid not in known_ids
+        ]
     if not to_probe:
-        console.print("  No IDs to scan — plan already covers the full range.")
+        console.print("  No IDs to scan — plan and ledger cover the full range.")
+        if ledger is not None:
+            ledger.set_high_water(max(upper_bound, ledger.high_water))
         return []
 
     console.print(
         f"  Scanning {len(to_probe):,} unknown IDs ({ID_RANGE_START}–{upper_bound})..."
     )
+    missing: set[int] = set()
     results = await _fetch_batch(
-        to_probe, workers, delay, "scan", fix_author=fix_author
+        to_probe, workers, delay, "scan", fix_author=fix_author, missing=missing
     )
 
     discovered: list[dict] = []
@@ -526,6 +716,18 @@ async def scan_missing_ids(
         ):
             discovered.append(entry)
 
+    if ledger is not None:
+        found = {
+            bid: entry.get("chapter_count", 0)
+            for bid, entry in results.items()
+            if entry is not None
+        }
+        ledger.record(found, missing)
+        ledger.set_high_water(max(upper_bound, ledger.high_water))
+        errors = len(to_probe) - len(found) - len(missing)
+        if errors:
+            console.print(f"  [yellow]{errors:,} probes failed; retried next scan[/yellow]")
+
     return discovered
 
 
@@ -541,79 +743,184 @@ class RefreshStats:
     errors: int = 0
     new_chapters: int = 0
     discovered: int = 0
+    held: int = 0  # not due under the tiered refresh policy
+
+
+def select_refresh(
+    source: str, entries: list[dict], policy=None
+) -> tuple[list[dict], list[dict]]:
+    """Split plan *entries* into (refresh now, held back) under *policy*.
+
+    *policy* is a :class:`~src.refreshpolicy.RefreshPolicy`; ``None``
+    (``--refresh-all``) refreshes every book.
+    """
+    if policy is None:
+        console.print("  Refresh policy: [dim]all books[/dim]")
+        return entries, []
+    with open_plan_store() as store:
+        state = store.refresh_state(source)
+    due, held, tiers = policy.select(entries, state)
+    summary = ", ".join(f"{tier} {d:,}/{n:,}" for tier, (n, d) in tiers.items() if n)
+    console.print(
+        f"  Refresh policy: [dim]tiered — {len(due):,} due, "
+        f"{len(held):,} held ({summary})[/dim]"
+    )
+    return due, held
+
+
+def merge_held(
+    updated: list[dict], held: list[dict], min_chapters: int
+) -> list[dict]:
+    """Refreshed entries plus the held-back ones, by chapter count descending."""
+    merged = updated + [e for e in held if e.get("chapter_count", 0) >= min_chapters]
+    merged.sort(key=lambda b: -b.get("chapter_count", 0))
+    return merged
 
 
 # ── Cover downloading ──────────────────────────────────────────────────────
 
 
-def download_cover_image(
-    client: httpx.Client, poster: dict | str | None, dest_path: str
-) -> bool:
-    """Download the best available cover image.
+async def fetch_poster_async(
+    client: httpx.AsyncClient, book_id: int, hosts=None
+) -> dict | None:
+    """Fetch a book's poster URLs from the API (fallback for plan entries
+    without ``poster``)."""
+    url = f"{BASE_URL}/api/books/{book_id}"
+    try:
+        if hosts is not None:
+            async with hosts.slot(url):
+                r = await client.get(url)
+        else:
+            r = await client.get(url)
+    except httpx.HTTPError:
+        return None
+    if r.status_code != 200:
+        return None
+    data = r.json()
+    if not data.get("success") or not data.get("data"):
+        return None
+    book = _unwrap_book(data["data"])
+    return _parse_poster(book.get("poster")) if book else None
 
-    poster may be a dict with size keys ('default', '600', '300', '150')
-    or a plain URL string.
-    """
-    if not poster:
-        return False
 
-    if isinstance(poster, dict):
-        for key in ("default", "600", "300", "150"):
-            url = poster.get(key)
-            if not url:
-                continue
-            try:
-                r = client.get(url, follow_redirects=True, timeout=30)
-                if r.status_code == 200 and len(r.content) > 100:
-                    with open(dest_path, "wb") as f:
-                        f.write(r.content)
-                    return True
-            except Exception:
-                continue
-        return False
+def load_plan_posters(
+    plan_path: Path | None = None, ids: list[int] | None = None
+) -> dict[int, dict]:
+    """Map book ID → poster dict from a plan file (empty if none).
 
-    if isinstance(poster, str):
-        try:
-            r = client.get(poster, follow_redirects=True, timeout=30)
-            if r.status_code == 200 and len(r.content) > 100:
-                with open(dest_path, "wb") as f:
-                    f.write(r.content)
-                return True
-        except Exception:
-            pass
+    Without *plan_path*, reads only the *ids* rows of the MTC plan store.
+    """
+    if plan_path is None:
+        with open_plan_store() as store:
+            entries = store.query("mtc", ids=ids)
+    elif plan_path.exists():
+        from src.planstore import read_plan_json
 
-    return False
+        entries = read_plan_json(plan_path)
+    else:
+        return {}
+    return {e["id"]: e["poster"] for e in entries if e.get("poster")}
 
 
-def pull_cover_for_book(client: httpx.Client, book_id: int, log=console.print) -> bool:
-    """Download a cover image directly to binslib/public/covers/{book_id}.jpg.
+def _pull_covers(
+    jobs: list[tuple[int, dict | str | None]],
+    headers: dict,
+    delay: float,
+    workers: int,
+    per_host: int,
+    force: bool = False,
+    resolve_api: bool = False,
+    label: str = "covers",
+    color: str = "blue",
+) -> None:
+    """Download *jobs* concurrently with a progress bar.
 
-    Fetches the poster URL from the API (one request per book).
+    Every host gets at most *per_host* requests in flight, started at
+    least *delay* seconds apart.  With *resolve_api*, jobs without a
+    poster look it up via ``/api/books/{id}`` first.  Saved covers get
+    WebP thumbnails when Pillow is installed.
     """
-    dest_path = str(COVERS_DIR / f"{book_id}.jpg")
+    from src.cover import pull_covers
+    from src.ratelimit import HostLimiter
+    from src.thumbnails import THUMB_FORMATS, ThumbnailPool, unsupported_formats
 
-    raw = fetch_book_metadata_sync(client, book_id)
-    if not raw:
-        log(f"  [red]FAILED[/red] {book_id}: no API data")
-        return False
+    progress = Progress(
+        TextColumn(f"[bold {color}]{{task.description}}"),
+        BarColumn(bar_width=30),
+        MofNCompleteColumn(),
+        TextColumn("•"),
+        TimeElapsedColumn(),
+        TextColumn("•"),
+        TimeRemainingColumn(),
+    )
+    hosts = HostLimiter(per_host, delay)
+
+    async def run(task) -> tuple[int, int]:
+        async with httpx.AsyncClient(
+            headers=headers, timeout=30, follow_redirects=True
+        ) as client:
+
+            async def resolve(book_id: int) -> dict | None:
+                poster = await fetch_poster_async(client, book_id, hosts)
+                if not poster:
+                    progress.console.print(
+                        f"  [yellow]WARNING[/yellow] {book_id}: no poster info"
+                    )
+                return poster
+
+            return await pull_covers(
+                client,
+                jobs,
+                str(COVERS_DIR),
+                workers=workers,
+                hosts=hosts,
+                resolve=resolve if resolve_api else None,
+                overwrite=force,
+                on_done=lambda _bid, _ok: progress.advance(task),
+                thumbs=thumbs,
+            )
 
-    book = _unwrap_book(raw) if isinstance(raw, dict) else raw
-    if not book:
-        log(f"  [red]FAILED[/red] {book_id}: bad response shape")
-        return False
+    thumbs = (
+        None
+        if unsupported_formats(THUMB_FORMATS)
+        else ThumbnailPool(str(COVERS_DIR))
+    )
+    try:
+        with progress:
+            task = progress.add_task(f"Pulling {label}", total=len(jobs))
+            succeeded, failed = asyncio.run(run(task))
+    finally:
+        if thumbs is not None:
+            thumbs.close()
+
+    console.print(
+        f"\nDone: [green]{succeeded}[/green] succeeded, "
+        f"[red]{failed}[/red] failed out of {len(jobs)}"
+    )
 
-    poster = _parse_poster(book.get("poster") if isinstance(book, dict) else None)
-    if not poster:
-        log(f"  [yellow]WARNING[/yellow] {book_id}: no poster info")
-        return False
 
-    return download_cover_image(client, poster, dest_path)
+def _show_dry_run(pending: list[dict]) -> None:
+    console.print("[yellow]Dry run — would download covers for:[/yellow]")
+    for e in pending[:30]:
+        name = e.get("name")
+        console.print(f"  {e['id']}  {name[:40]}" if name else f"  {e['id']}")
+    if len(pending) > 30:
+        console.print(f"  [dim]... and {len(pending) - 30} more[/dim]")
 
 
 def run_cover_pull(
-    target_ids: list[int], force: bool, dry_run: bool, delay: float
+    target_ids: list[int],
+    force: bool,
+    dry_run: bool,
+    delay: float,
+    workers: int = 8,
+    per_host: int = 4,
 ) -> None:
-    """Download missing covers for the given book IDs."""
+    """Download missing covers for the given book IDs.
+
+    Poster URLs come from the MTC plan file (``--refresh`` plans carry
+    them); only books without one fall back to an API lookup.
+    """
     COVERS_DIR.mkdir(parents=True, exist_ok=True)
 
     if force:
@@ -622,9 +929,12 @@ def run_cover_pull(
         pending = [
             bid for bid in target_ids if not (COVERS_DIR / f"{bid}.jpg").exists()
         ]
+    posters = load_plan_posters(ids=pending) if pending else {}
+    lookups = sum(1 for bid in pending if bid not in posters)
 
     console.print(f"  Targeted:       [bold]{len(target_ids)}[/bold]")
     console.print(f"  Missing covers: [bold]{len(pending)}[/bold]")
+    console.print(f"  API lookups:    [bold]{lookups}[/bold] [dim](no poster in plan)[/dim]")
     console.print(f"  Destination:    [dim]{COVERS_DIR}[/dim]")
     console.print()
 
@@ -633,52 +943,26 @@ def run_cover_pull(
         return
 
     if dry_run:
-        console.print("[yellow]Dry run — would download covers for:[/yellow]")
-        for bid in pending[:30]:
-            console.print(f"  {bid}")
-        if len(pending) > 30:
-            console.print(f"  [dim]... and {len(pending) - 30} more[/dim]")
+        _show_dry_run([{"id": bid} for bid in pending])
         return
 
-    succeeded = 0
-    failed = 0
-
-    progress = Progress(
-        TextColumn("[bold blue]{task.description}"),
-        BarColumn(bar_width=30),
-        MofNCompleteColumn(),
-        TextColumn("•"),
-        TimeElapsedColumn(),
-        TextColumn("•"),
-        TimeRemainingColumn(),
-    )
-
-    with progress, httpx.Client(headers=HEADERS, timeout=30) as client:
-        task = progress.add_task("Pulling covers", total=len(pending))
-
-        for i, bid in enumerate(pending, 1):
-            progress.update(task, description=f"Cover {bid}")
-
-            if pull_cover_for_book(client, bid, log=progress.console.print):
-                succeeded += 1
-            else:
-                failed += 1
-
-            progress.advance(task)
-
-            if i < len(pending):
-                time.sleep(delay)
-
-    console.print(
-        f"\nDone: [green]{succeeded}[/green] succeeded, "
-        f"[red]{failed}[/red] failed out of {len(pending)}"
+    _pull_covers(
+        [(bid, posters.get(bid)) for bid in pending],
+        HEADERS,
+        delay,
+        workers,
+        per_host,
+        force=force,
+        resolve_api=True,
     )
 
 
 # ── Mode: generate (catalog pagination → plan) ─────────────────────────────
 
 
-def run_generate(dry_run: bool = False) -> list[dict]:
+def run_generate(
+    dry_run: bool = False, workers: int = CATALOG_WORKERS, delay: float = 0.08
+) -> list[dict]:
     """Paginate the API catalog, cross-ref with local bundles, write plan.
 
     This is the fast path: uses the /api/books listing endpoint which returns
@@ -686,8 +970,7 @@ def run_generate(dry_run: bool = False) -> list[dict]:
     enrich with full per-book metadata afterward.
     """
     console.print("\n[bold blue]Fetching API catalog...[/bold blue]")
-    with httpx.Client(headers=HEADERS, timeout=30) as client:
-        catalog = fetch_catalog(client)
+    catalog = asyncio.run(fetch_catalog_async(workers=workers, delay=delay))
 
     # Build local chapter counts from bundles
     console.print("[bold blue]Scanning local bundles...[/bold blue]")
@@ -764,9 +1047,7 @@ def run_generate(dry_run: bool = False) -> list[dict]:
         entry = {k: v for k, v in b.items() if k not in ("local", "gap")}
         plan_entries.append(entry)
 
-    PLAN_DIR.mkdir(parents=True, exist_ok=True)
-    with open(PLAN_FILE, "w", encoding="utf-8") as f:
-        json.dump(plan_entries, f, indent=2, ensure_ascii=False)
+    write_plan("mtc", plan_entries)
     console.print(
         f"\n[green]Plan written:[/green] {PLAN_FILE}\n"
         f"  {len(plan_entries)} entries "
@@ -814,8 +1095,18 @@ async def _run_refresh(
     scan: bool,
     min_chapters: int,
     fix_author: bool,
+    ledger=None,
+    dead_ttl: float = 0,
+    found_ttl: float = 0,
+    known: set[int] | None = None,
 ) -> tuple[list[dict], RefreshStats]:
-    """Async core: refresh existing entries + optional scan."""
+    """Async core: refresh existing entries + optional scan.
+
+    *ledger* (a :class:`~src.scanledger.ScanLedger`) lets the scan skip
+    recently probed IDs; without it every unknown ID is probed.  *known*
+    is every ID already in the plan (default: the IDs of *entries*), so
+    books held back by the refresh policy are not probed as missing.
+    """
     stats = RefreshStats(total=len(entries))
     old_by_id = {e["id"]: e for e in entries}
 
@@ -849,11 +1140,21 @@ async def _run_refresh(
     # Phase 2 (optional): scan for missing books
     if scan:
         console.print("\n[bold blue]Phase 2:[/bold blue] Scanning for missing books...")
-        upper = await find_upper_bound(workers, delay)
+        known = set(old_by_id) if known is None else known | set(old_by_id)
+        start = max(known, default=0)
+        if ledger is not None:
+            start = max(start, ledger.max_found())
+        upper = await find_upper_bound(workers, delay, start)
         console.print(f"  Detected upper bound: {upper}")
-        known = set(old_by_id.keys())
         discovered = await scan_missing_ids(
-            known, workers, delay, upper, fix_author=fix_author
+            known,
+            workers,
+            delay,
+            upper,
+            fix_author=fix_author,
+            ledger=ledger,
+            dead_ttl=dead_ttl,
+            found_ttl=found_ttl,
         )
         discovered = [
             b for b in discovered if b.get("chapter_count", 0) >= min_chapters
@@ -877,37 +1178,73 @@ def run_refresh(
     min_chapters: int,
     fix_author: bool,
     dry_run: bool,
+    scan_ttl: float = 30,
+    found_ttl: float = 7,
+    full_scan: bool = False,
+    policy=None,
 ) -> list[dict]:
-    """Read existing plan, enrich with full per-book metadata, write back."""
+    """Read existing plan, enrich with full per-book metadata, write back.
+
+    Only books due under *policy* (see :func:`select_refresh`) are
+    fetched; the rest are written back unchanged.
 
-    if not PLAN_FILE.exists():
+    With *scan*, the scan ledger (``data/scan_ledger.sqlite``) skips IDs
+    probed within *scan_ttl* days (404s) or *found_ttl* days (books below
+    the plan threshold); *full_scan* probes everything and refreshes the
+    ledger.  TTLs are in days.
+    """
+    from src.scanledger import DAY, ScanLedger
+
+    entries = read_plan("mtc")
+    if entries is None:
         console.print(
             f"[red]Error:[/red] Plan file not found: {PLAN_FILE}\n"
             "  Run without --refresh first to generate an initial plan."
         )
         sys.exit(1)
 
-    with open(PLAN_FILE, encoding="utf-8") as f:
-        entries = json.load(f)
-
-    if not isinstance(entries, list):
-        console.print("[red]Error:[/red] Plan file must be a JSON array.")
-        sys.exit(1)
-
     console.print(f"  Plan file:      [dim]{PLAN_FILE}[/dim]")
     console.print(f"  Input books:    [bold]{len(entries):,}[/bold]")
     console.print(f"  Workers:        [dim]{workers}[/dim]")
     console.print(f"  Min chapters:   [dim]{min_chapters}[/dim]")
-    console.print(
-        f"  Scan:           [dim]{'YES — full ID range' if scan else 'no'}[/dim]"
-    )
+    if not scan:
+        scan_mode = "no"
+    elif full_scan:
+        scan_mode = "YES — full ID range"
+    else:
+        scan_mode = (
+            f"YES — ledger (re-probe 404s after {scan_ttl:g}d, "
+            f"small books after {found_ttl:g}d)"
+        )
+    console.print(f"  Scan:           [dim]{scan_mode}[/dim]")
     console.print(f"  Fix author:     [dim]{'YES' if fix_author else 'no'}[/dim]")
+    due, held = select_refresh("mtc", entries, policy)
 
+    ledger = ScanLedger(SCAN_LEDGER_FILE, readonly=dry_run) if scan else None
+    ttl_scale = 0 if full_scan else DAY
     start = time.time()
-    updated, stats = asyncio.run(
-        _run_refresh(entries, workers, delay, scan, min_chapters, fix_author)
-    )
+    try:
+        updated, stats = asyncio.run(
+            _run_refresh(
+                due,
+                workers,
+                delay,
+                scan,
+                min_chapters,
+                fix_author,
+                ledger=ledger,
+                dead_ttl=scan_ttl * ttl_scale,
+                found_ttl=found_ttl * ttl_scale,
+                known={e["id"] for e in held},
+            )
+        )
+    finally:
+        if ledger is not None:
+            ledger.close()
     elapsed = time.time() - start
+    refreshed = [b["id"] for b in updated]
+    updated = merge_held(updated, held, min_chapters)
+    stats.held = len(held)
 
     # Count author stats
     authors_generated = sum(1 for b in updated if b.get("author_generated"))
@@ -922,6 +1259,8 @@ def run_refresh(
     table.add_row("Output books", f"[bold]{len(updated):,}[/bold]")
     table.add_row("Updated", f"[green]{stats.updated:,}[/green]")
     table.add_row("Unchanged", f"{stats.unchanged:,}")
+    if stats.held:
+        table.add_row("Held (not due)", f"[dim]{stats.held:,}[/dim]")
     table.add_row("Removed (404)", f"[red]{stats.removed:,}[/red]")
     table.add_row("Errors", f"{stats.errors:,}")
     if stats.discovered:
@@ -929,7 +1268,7 @@ def run_refresh(
     table.add_row("New chapters", f"[bold]{stats.new_chapters:,}[/bold]")
     table.add_row("Duration", f"{elapsed:.1f}s")
     if elapsed > 0:
-        table.add_row("Rate", f"{len(entries) / elapsed:.0f} books/s")
+        table.add_row("Rate", f"{len(due) / elapsed:.0f} books/s")
     console.print(table)
 
     if authors_generated or no_author:
@@ -941,9 +1280,7 @@ def run_refresh(
         return updated
 
     # Write output
-    PLAN_DIR.mkdir(parents=True, exist_ok=True)
-    with open(PLAN_FILE, "w", encoding="utf-8") as f:
-        json.dump(updated, f, indent=2, ensure_ascii=False)
+    write_plan("mtc", updated, refreshed)
     console.print(f"\n[green]Wrote {len(updated):,} books to {PLAN_FILE}[/green]")
 
     # Show top books with most new chapters
@@ -977,6 +1314,202 @@ def run_refresh(
     return updated
 
 
+# ── Listing pages (TTV / TF discovery) ─────────────────────────────────────
+
+LISTING_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+# Pages per worker that may be fetched past the next page owed to on_page
+LISTING_LOOKAHEAD = 4
+
+
+def _parse_pool(parse_workers: int) -> ProcessPoolExecutor | None:
+    """Process pool for HTML parsing; ``None`` (parse inline) if *parse_workers* is 0."""
+    if parse_workers <= 0:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+async def _fetch_listing_html(
+    client: httpx.AsyncClient, hosts, url: str, retries: int = 3
+) -> str | None:
+    """GET one listing page; retries transport errors, 429 and 5xx."""
+    for attempt in range(retries):
+        try:
+            async with hosts.slot(url):
+                r = await client.get(url)
+        except httpx.TransportError:
+            r = None
+        if r is not None and r.status_code == 200:
+            return r.text
+        if r is not None and r.status_code < 500 and r.status_code != 429:
+            return None
+        if attempt < retries - 1:
+            await asyncio.sleep(2 ** (attempt + 1))
+    return None
+
+
+async def scrape_listing(
+    page_url: Callable[[int], str],
+    parse_page: Callable[[str], list[dict]],
+    parse_last_page: Callable[[str], int],
+    on_page: Callable[[int, int, list[dict]], None],
+    headers: dict,
+    max_pages: int = 0,
+    workers: int = CATALOG_WORKERS,
+    delay: float = REQUEST_DELAY,
+    parse_workers: int = LISTING_PARSE_WORKERS,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> int:
+    """Fetch and parse numbered listing pages concurrently.
+
+    Page 1 gives the page count (*parse_last_page*, capped by *max_pages*
+    if positive).  Pages 2..N are then fetched by *workers* requests
+    through one :class:`~src.ratelimit.HostLimiter` (request starts
+    *delay* seconds apart) and parsed by *parse_page* in a process pool.
+    *on_page* ``(page, page_limit, books)`` is called strictly in page
+    order, so rank counters and first-seen dedup in the caller behave
+    exactly as in a sequential crawl.  Workers start no page more than
+    ``LISTING_LOOKAHEAD * workers`` pages past the next one owed to
+    *on_page*, so a slow page cannot let parsed pages pile up behind
+    it.  An empty page ends the listing there; a page that fails after
+    retries is logged and skipped.
+
+    Returns the number of pages handed to *on_page*.
+    """
+    from src.ratelimit import HostLimiter
+
+    hosts = HostLimiter(workers, delay)
+    loop = asyncio.get_running_loop()
+    pool = _parse_pool(parse_workers)
+
+    async def parse(html: str) -> list[dict]:
+        if pool is None:
+            return parse_page(html)
+        return await loop.run_in_executor(pool, parse_page, html)
+
+    try:
+        async with httpx.AsyncClient(
+            headers=headers, timeout=30, follow_redirects=True, transport=transport
+        ) as client:
+            html = await _fetch_listing_html(client, hosts, page_url(1))
+            if html is None:
+                console.print("  Page 1: FAILED")
+                return 0
+            books = await parse(html)
+            if not books:
+                console.print("  Page 1: no books found, stopping")
+                return 0
+            total_pages = parse_last_page(html)
+            page_limit = min(max_pages, total_pages) if max_pages > 0 else total_pages
+            console.print(
+                f"  Total pages available: {total_pages}, will scrape: {page_limit}"
+            )
+            on_page(1, page_limit, books)
+            emitted = 1
+
+            todo = iter(range(2, page_limit + 1))
+            ready: dict[int, list[dict] | None] = {}
+            next_page = 2
+            lookahead = LISTING_LOOKAHEAD * max(workers, 1)
+            advanced = asyncio.Condition()
+
+            def emit_ready() -> None:
+                nonlocal next_page, emitted
+                while next_page <= page_limit and next_page in ready:
+                    page_books = ready.pop(next_page)
+                    if page_books is not None:
+                        on_page(next_page, page_limit, page_books)
+                        emitted += 1
+                    next_page += 1
+
+            async def worker() -> None:
+                nonlocal page_limit
+                for page in todo:
+                    async with advanced:
+                        await advanced.wait_for(
+                            lambda: page < next_page + lookahead or page > page_limit
+                        )
+                    if page > page_limit:
+                        return
+                    html = await _fetch_listing_html(client, hosts, page_url(page))
+                    if html is None:
+                        console.print(f"  Page {page}: FAILED after retries, skipped")
+                        ready[page] = None
+                    else:
+                        page_books = await parse(html)
+                        if not page_books and page <= page_limit:
+                            console.print(f"  Page {page}: no books found, stopping")
+                            page_limit = page - 1
+                        ready[page] = page_books
+                    emit_ready()
+                    async with advanced:
+                        advanced.notify_all()
+
+            await asyncio.gather(*(worker() for _ in range(max(workers, 1))))
+            emit_ready()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return emitted
+
+
+async def fingerprint_duplicates(
+    books: list[dict],
+    chapter_url: Callable[[dict], str],
+    parse_chapter: Callable[[str], dict | None],
+    index,
+    headers: dict,
+    workers: int = CATALOG_WORKERS,
+    delay: float = REQUEST_DELAY,
+    parse_workers: int = LISTING_PARSE_WORKERS,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> dict[int, dict]:
+    """Fetch chapter 1 of each book and match it against *index* (a
+    :class:`~src.dedup.DedupIndex`) by content fingerprint.
+
+    Chapters are parsed and fingerprinted in a process pool of
+    *parse_workers* like listing pages (*parse_chapter* must be
+    picklable then).  Returns ``{book id: existing book}`` for the
+    matches; books whose chapter 1 cannot be fetched or is too short to
+    fingerprint are kept.
+    """
+    from src.dedup import chapter_fingerprint
+    from src.ratelimit import HostLimiter
+
+    hosts = HostLimiter(workers, delay)
+    loop = asyncio.get_running_loop()
+    pool = _parse_pool(parse_workers)
+    matches: dict[int, dict] = {}
+    todo = iter(books)
+
+    async def fingerprint(html: str) -> str | None:
+        if pool is None:
+            return chapter_fingerprint(parse_chapter, html)
+        return await loop.run_in_executor(pool, chapter_fingerprint, parse_chapter, html)
+
+    try:
+        async with httpx.AsyncClient(
+            headers=headers, timeout=30, follow_redirects=True, transport=transport
+        ) as client:
+
+            async def worker() -> None:
+                for book in todo:
+                    html = await _fetch_listing_html(client, hosts, chapter_url(book))
+                    fp = await fingerprint(html) if html else None
+                    if fp is None:
+                        continue
+                    match = index.by_fingerprint(fp)
+                    if match is not None and match["id"] != book["id"]:
+                        matches[book["id"]] = match
+
+            await asyncio.gather(*(worker() for _ in range(max(workers, 1))))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return matches
+
+
 # ── TTV plan generation ─────────────────────────────────────────────────────
 
 
@@ -985,119 +1518,145 @@ def run_generate_ttv(
     min_chapters: int = MIN_CHAPTER_COUNT,
     flush_every: int = 100,
     dry_run: bool = False,
+    workers: int = CATALOG_WORKERS,
+    delay: float = REQUEST_DELAY,
+    fingerprint_dedup: bool = False,
 ) -> list[dict]:
     """Scrape TTV listing pages, cross-ref with bundles, write plan.
 
     This is the TTV equivalent of :func:`run_generate`.  It scrapes the
     ``/tong-hop`` filter pages on truyen.tangthuvien.vn, assigns 10M+
     offset IDs, and writes a plan file at ``data/books_plan_ttv.json``.
+    With *fingerprint_dedup*, chapter 1 of each new book is fetched and
+    books whose text matches a completed book from another source are
+    skipped as well.
     """
     from src.sources.ttv import (
         TTV_BASE_URL,
         TTV_HEADERS,
         build_mtc_index,
-        get_or_create_book_id,
         is_mtc_duplicate,
         load_registry,
+        parse_chapter,
         parse_listing_page,
         parse_listing_total_pages,
-        save_registry,
     )
 
     console.print("\n[bold blue]Scraping TTV catalog...[/bold blue]")
 
-    registry = load_registry()
     mtc_index = build_mtc_index()
     console.print(f"  MTC index: {len(mtc_index)} books for dedup")
-    console.print(f"  TTV registry: {len(registry)} existing IDs")
 
     all_books: list[dict] = []
     seen_slugs: set[str] = set()
     skipped_mtc = 0
     books_since_flush = 0
 
-    with httpx.Client(headers=TTV_HEADERS, timeout=30, follow_redirects=True) as client:
-        page = 0
-        # 0 = scrape all available pages; positive = cap at that number
-        page_limit = max_pages if max_pages > 0 else 10_000
-
-        while page < page_limit:
-            page += 1
-            try:
-                r = client.get(
-                    f"{TTV_BASE_URL}/tong-hop",
-                    params={"tp": "cv", "ctg": "0", "page": str(page)},
-                )
-                html = r.text
-            except Exception as e:
-                console.print(f"  Page {page}: FAILED ({e})")
-                break
-
-            books = parse_listing_page(html)
-            if not books:
-                console.print(f"  Page {page}: no books found, stopping")
-                break
-
-            if page == 1:
-                total_pages = parse_listing_total_pages(html)
-                page_limit = min(page_limit, total_pages)
-                console.print(
-                    f"  Total pages available: {total_pages}, will scrape: {page_limit}"
-                )
-
-            new_on_page = 0
-            for book in books:
-                ttv_slug = book.get("ttv_slug", book["slug"])
-                if not ttv_slug or ttv_slug in seen_slugs:
-                    continue
-                seen_slugs.add(ttv_slug)
+    def on_page(page: int, page_limit: int, books: list[dict]) -> None:
+        nonlocal skipped_mtc, books_since_flush
+        new_books: list[dict] = []
+        for book in books:
+            ttv_slug = book.get("ttv_slug", book["slug"])
+            if not ttv_slug or ttv_slug in seen_slugs:
+                continue
+            seen_slugs.add(ttv_slug)
 
-                # Dedup against MTC using the ASCII-clean slug
-                if is_mtc_duplicate(book["slug"], mtc_index):
-                    skipped_mtc += 1
-                    continue
+            # Dedup against MTC using the ASCII-clean slug
+            if is_mtc_duplicate(book["slug"], mtc_index):
+                skipped_mtc += 1
+                continue
 
-                # Assign ID early so periodic flushes produce usable plan files
-                book["id"] = get_or_create_book_id(
-                    book.get("ttv_slug", book["slug"]), registry
-                )
-                book["source"] = "ttv"
-                all_books.append(book)
-                new_on_page += 1
+            book["source"] = "ttv"
+            new_books.append(book)
+
+        # Assign IDs early (one registry transaction per page) so periodic
+        # flushes produce usable plan files
+        ids = registry.allocate(b.get("ttv_slug", b["slug"]) for b in new_books)
+        for book in new_books:
+            book["id"] = ids[book.get("ttv_slug", book["slug"])]
+        all_books.extend(new_books)
+        new_on_page = len(new_books)
+
+        # Periodic flush — save progress so it survives interruption
+        books_since_flush += new_on_page
+        if books_since_flush >= flush_every and not dry_run and all_books:
+            _flush_plan(
+                "ttv", all_books[-books_since_flush:], f"page {page}/{page_limit}"
+            )
+            books_since_flush = 0
 
-            # Periodic flush — save progress so it survives interruption
-            books_since_flush += new_on_page
-            if books_since_flush >= flush_every and not dry_run and all_books:
-                _flush_plan_file(TTV_PLAN_FILE, all_books, f"page {page}/{page_limit}")
-                books_since_flush = 0
+        if page % 50 == 0 or page == 1:
+            console.print(
+                f"  Page {page}/{page_limit}: {len(books)} found, "
+                f"{new_on_page} new, total: {len(all_books)}"
+            )
 
-            if page % 50 == 0 or page == 1:
-                console.print(
-                    f"  Page {page}/{page_limit}: {len(books)} found, "
-                    f"{new_on_page} new, total: {len(all_books)}"
-                )
+    with load_registry() as registry:
+        _report_registry("TTV", registry)
+        asyncio.run(
+            scrape_listing(
+                lambda page: f"{TTV_BASE_URL}/tong-hop?tp=cv&ctg=0&page={page}",
+                parse_listing_page,
+                parse_listing_total_pages,
+                on_page,
+                TTV_HEADERS,
+                max_pages=max_pages,
+                workers=workers,
+                delay=delay,
+            )
+        )
 
-            time.sleep(REQUEST_DELAY)
+        # Snapshot the registry to its git-tracked JSON once per run
+        if not dry_run:
+            registry.export_json()
 
     console.print(
         f"\n  Discovery complete: {len(all_books)} unique books, "
         f"{skipped_mtc} MTC duplicates skipped"
     )
+    known_bids = get_bundle_chapter_counts()
+
+    if fingerprint_dedup and not mtc_index.has_fingerprints:
+        console.print("  [dim]--fingerprint-dedup: no fingerprints recorded yet[/dim]")
+    elif fingerprint_dedup:
+        console.print("[bold blue]Fingerprinting first chapters...[/bold blue]")
+        new_books = [b for b in all_books if b["id"] not in known_bids]
+        matches = asyncio.run(
+            fingerprint_duplicates(
+                new_books,
+                lambda b: f"{TTV_BASE_URL}/doc-truyen/"
+                f"{b.get('ttv_slug', b['slug'])}/chuong-1",
+                parse_chapter,
+                mtc_index,
+                TTV_HEADERS,
+                workers=workers,
+                delay=delay,
+            )
+        )
+        dup_ids = {
+            bid
+            for bid, match in matches.items()
+            if match["source"] != "ttv" and match["status"] == 2
+        }
+        all_books = [b for b in all_books if b["id"] not in dup_ids]
+        skipped_mtc += len(dup_ids)
+        console.print(
+            f"  {len(new_books)} checked, {len(dup_ids)} duplicates by content skipped"
+        )
 
-    # Assign IDs and build plan entries
+    # Build plan entries
     console.print("[bold blue]Building plan entries...[/bold blue]")
-    known_bids = get_bundle_chapter_counts()
 
     have_complete: list[dict] = []
     have_partial: list[dict] = []
     need_download: list[dict] = []
 
     for book in all_books:
-        # Use ttv_slug (original TTV URL slug) as the registry key
-        # for backward compatibility with existing ID assignments.
+        # IDs were assigned during discovery, keyed by ttv_slug (the
+        # original TTV URL slug) for compatibility with existing IDs.
         ttv_slug = book.get("ttv_slug", book["slug"])
         slug = book["slug"]  # ASCII-clean for DB/website
-        book_id = get_or_create_book_id(ttv_slug, registry)
+        book_id = book["id"]
         ch_count = book.get("chapter_count", 0)
 
         if ch_count < min_chapters:
@@ -1146,9 +1705,6 @@ def run_generate_ttv(
         else:
             need_download.append(entry)
 
-    # Save registry (new IDs may have been created)
-    save_registry(registry)
-
     # Display audit summary
     total_gap = sum(b.get("gap", 0) for b in have_partial) + sum(
         b["chapter_count"] for b in need_download
@@ -1179,9 +1735,7 @@ def run_generate_ttv(
         entry = {k: v for k, v in b.items() if k not in ("local", "gap")}
         plan_entries.append(entry)
 
-    PLAN_DIR.mkdir(parents=True, exist_ok=True)
-    with open(TTV_PLAN_FILE, "w", encoding="utf-8") as f:
-        json.dump(plan_entries, f, indent=2, ensure_ascii=False)
+    write_plan("ttv", plan_entries)
     console.print(
         f"\n[green]Plan written:[/green] {TTV_PLAN_FILE}\n"
         f"  {len(plan_entries)} entries "
@@ -1326,33 +1880,33 @@ def run_refresh_ttv(
     delay: float,
     min_chapters: int,
     dry_run: bool,
+    policy=None,
 ) -> list[dict]:
-    """Read existing TTV plan, re-fetch metadata from HTML, write back."""
+    """Read existing TTV plan, re-fetch metadata from HTML, write back.
+
+    Only books due under *policy* are fetched (see :func:`select_refresh`).
+    """
 
-    if not TTV_PLAN_FILE.exists():
+    entries = read_plan("ttv")
+    if entries is None:
         console.print(
             f"[red]Error:[/red] TTV plan file not found: {TTV_PLAN_FILE}\n"
             "  Run with --source ttv (no --refresh) first to generate an initial plan."
         )
         sys.exit(1)
 
-    with open(TTV_PLAN_FILE, encoding="utf-8") as f:
-        entries = json.load(f)
-
-    if not isinstance(entries, list):
-        console.print("[red]Error:[/red] TTV plan file must be a JSON array.")
-        sys.exit(1)
-
     console.print(f"  Plan file:      [dim]{TTV_PLAN_FILE}[/dim]")
     console.print(f"  Input books:    [bold]{len(entries):,}[/bold]")
     console.print(f"  Workers:        [dim]{workers}[/dim]")
     console.print(f"  Min chapters:   [dim]{min_chapters}[/dim]")
+    due, held = select_refresh("ttv", entries, policy)
 
     start = time.time()
-    updated, stats = asyncio.run(
-        _run_refresh_ttv(entries, workers, delay, min_chapters)
-    )
+    updated, stats = asyncio.run(_run_refresh_ttv(due, workers, delay, min_chapters))
     elapsed = time.time() - start
+    refreshed = [b["id"] for b in updated]
+    updated = merge_held(updated, held, min_chapters)
+    stats.held = len(held)
 
     # Report
     console.print()
@@ -1363,20 +1917,20 @@ def run_refresh_ttv(
     table.add_row("Output books", f"[bold]{len(updated):,}[/bold]")
     table.add_row("Updated", f"[green]{stats.updated:,}[/green]")
     table.add_row("Unchanged", f"{stats.unchanged:,}")
+    if stats.held:
+        table.add_row("Held (not due)", f"[dim]{stats.held:,}[/dim]")
     table.add_row("Removed (404)", f"[red]{stats.removed:,}[/red]")
     table.add_row("New chapters", f"[bold]{stats.new_chapters:,}[/bold]")
     table.add_row("Duration", f"{elapsed:.1f}s")
     if elapsed > 0:
-        table.add_row("Rate", f"{len(entries) / elapsed:.0f} books/s")
+        table.add_row("Rate", f"{len(due) / elapsed:.0f} books/s")
     console.print(table)
 
     if dry_run:
         console.print("\n[yellow]Dry run — plan file not written.[/yellow]")
         return updated
 
-    PLAN_DIR.mkdir(parents=True, exist_ok=True)
-    with open(TTV_PLAN_FILE, "w", encoding="utf-8") as f:
-        json.dump(updated, f, indent=2, ensure_ascii=False)
+    write_plan("ttv", updated, refreshed)
     console.print(f"\n[green]Wrote {len(updated):,} books to {TTV_PLAN_FILE}[/green]")
 
     return updated
@@ -1387,22 +1941,23 @@ def run_cover_pull_ttv(
     force: bool,
     dry_run: bool,
     delay: float,
+    workers: int = 8,
+    per_host: int = 4,
 ) -> None:
     """Download missing covers for TTV books using cover_url from the plan."""
-    from src.sources.ttv import TTV_HEADERS
+    from urllib.parse import urljoin
+
+    from src.sources.ttv import TTV_BASE_URL, TTV_HEADERS
 
     COVERS_DIR.mkdir(parents=True, exist_ok=True)
 
-    if force:
-        pending = plan_entries
-    else:
-        pending = [
-            e
-            for e in plan_entries
-            if not (COVERS_DIR / f"{e['id']}.jpg").exists()
-            and e.get("cover_url")
-            and "default-book" not in e.get("cover_url", "")
-        ]
+    pending = [
+        e
+        for e in plan_entries
+        if e.get("cover_url")
+        and "default-book" not in e["cover_url"]
+        and (force or not (COVERS_DIR / f"{e['id']}.jpg").exists())
+    ]
 
     console.print(f"  Plan entries:   [bold]{len(plan_entries)}[/bold]")
     console.print(f"  Missing covers: [bold]{len(pending)}[/bold]")
@@ -1414,57 +1969,18 @@ def run_cover_pull_ttv(
         return
 
     if dry_run:
-        console.print("[yellow]Dry run — would download covers for:[/yellow]")
-        for e in pending[:30]:
-            console.print(f"  {e['id']}  {e.get('name', '?')[:40]}")
-        if len(pending) > 30:
-            console.print(f"  [dim]... and {len(pending) - 30} more[/dim]")
+        _show_dry_run(pending)
         return
 
-    succeeded = 0
-    failed = 0
-
-    progress = Progress(
-        TextColumn("[bold cyan]{task.description}"),
-        BarColumn(bar_width=30),
-        MofNCompleteColumn(),
-        TextColumn("•"),
-        TimeElapsedColumn(),
-        TextColumn("•"),
-        TimeRemainingColumn(),
-    )
-
-    with (
-        progress,
-        httpx.Client(headers=TTV_HEADERS, timeout=30, follow_redirects=True) as client,
-    ):
-        task = progress.add_task("Pulling TTV covers", total=len(pending))
-
-        for i, entry in enumerate(pending, 1):
-            bid = entry["id"]
-            cover_url = entry.get("cover_url", "")
-            dest = str(COVERS_DIR / f"{bid}.jpg")
-
-            progress.update(task, description=f"Cover {bid}")
-
-            try:
-                r = client.get(cover_url, follow_redirects=True, timeout=30)
-                if r.status_code == 200 and len(r.content) > 100:
-                    with open(dest, "wb") as f:
-                        f.write(r.content)
-                    succeeded += 1
-                else:
-                    failed += 1
-            except Exception:
-                failed += 1
-
-            progress.advance(task)
-            if i < len(pending):
-                time.sleep(delay)
-
-    console.print(
-        f"\nDone: [green]{succeeded}[/green] succeeded, "
-        f"[red]{failed}[/red] failed out of {len(pending)}"
+    _pull_covers(
+        [(e["id"], urljoin(f"{TTV_BASE_URL}/", e["cover_url"])) for e in pending],
+        TTV_HEADERS,
+        delay,
+        workers,
+        per_host,
+        force=force,
+        label="TTV covers",
+        color="cyan",
     )
 
 
@@ -1476,31 +1992,33 @@ def run_generate_tf(
     min_chapters: int = MIN_CHAPTER_COUNT,
     flush_every: int = 100,
     dry_run: bool = False,
+    workers: int = CATALOG_WORKERS,
+    delay: float = REQUEST_DELAY,
+    fingerprint_dedup: bool = False,
 ) -> list[dict]:
     """Scrape TF hot completed listing, cross-ref with bundles, write plan.
 
     Scrapes ``/danh-sach/truyen-hot/trang-{N}/`` for all completed hot books,
     deduplicates against existing books in the DB (all sources), filters by
     min chapter count, and writes ``data/books_plan_tf.json``.
+    With *fingerprint_dedup*, chapter 1 of each new book is also compared
+    with the first chapters of books already ingested.
     """
     from src.sources.tf import (
         TF_BASE_URL,
         TF_HEADERS,
         build_existing_index,
-        get_or_create_book_id,
         is_duplicate,
         load_registry,
+        parse_chapter,
         parse_listing_last_page,
         parse_listing_page,
-        save_registry,
     )
 
     console.print("\n[bold blue]Scraping TF hot completed listing...[/bold blue]")
 
-    registry = load_registry()
     existing_index = build_existing_index()
     console.print(f"  Existing books index: {len(existing_index)} books for dedup")
-    console.print(f"  TF registry: {len(registry)} existing IDs")
 
     all_books: list[dict] = []
     seen_slugs: set[str] = set()
@@ -1508,78 +2026,99 @@ def run_generate_tf(
     books_since_flush = 0
     global_rank = 0  # Track position across all pages for "top hot" ranking
 
-    with httpx.Client(headers=TF_HEADERS, timeout=30, follow_redirects=True) as client:
-        page = 0
-        page_limit = max_pages if max_pages > 0 else 100_000
-
-        while page < page_limit:
-            page += 1
-            url = f"{TF_BASE_URL}/danh-sach/truyen-hot/trang-{page}/"
-
-            try:
-                r = client.get(url)
-                html = r.text
-            except Exception as e:
-                console.print(f"  Page {page}: FAILED ({e})")
-                break
-
-            books = parse_listing_page(html)
-            if not books:
-                console.print(f"  Page {page}: no books found, stopping")
-                break
+    def on_page(page: int, page_limit: int, books: list[dict]) -> None:
+        nonlocal skipped_dup, books_since_flush, global_rank
+        new_books: list[dict] = []
+        for book in books:
+            global_rank += 1
+            tf_slug = book.get("tf_slug", book["slug"])
+            if not tf_slug or tf_slug in seen_slugs:
+                continue
+            seen_slugs.add(tf_slug)
 
-            if page == 1:
-                total_pages = parse_listing_last_page(html)
-                page_limit = min(page_limit, total_pages)
-                console.print(
-                    f"  Total pages available: {total_pages}, will scrape: {page_limit}"
-                )
+            # Dedup against existing books (all sources)
+            if is_duplicate(
+                book["slug"], book["name"], existing_index, book.get("author_name")
+            ):
+                skipped_dup += 1
+                continue
 
-            new_on_page = 0
-            for i, book in enumerate(books):
-                global_rank += 1
-                tf_slug = book.get("tf_slug", book["slug"])
-                if not tf_slug or tf_slug in seen_slugs:
-                    continue
-                seen_slugs.add(tf_slug)
+            book["source"] = "tf"
+            # Preserve the original listing position for "top hot" ranking
+            book["hot_rank"] = global_rank
+            new_books.append(book)
+
+        # Assign IDs early (one registry transaction per page) so periodic
+        # flushes produce usable plan files
+        ids = registry.allocate(b.get("tf_slug", b["slug"]) for b in new_books)
+        for book in new_books:
+            book["id"] = ids[book.get("tf_slug", book["slug"])]
+        all_books.extend(new_books)
+        new_on_page = len(new_books)
+
+        # Periodic flush — save progress so it survives interruption
+        books_since_flush += new_on_page
+        if books_since_flush >= flush_every and not dry_run and all_books:
+            _flush_plan(
+                "tf", all_books[-books_since_flush:], f"page {page}/{page_limit}"
+            )
+            books_since_flush = 0
 
-                # Dedup against existing books (all sources)
-                if is_duplicate(book["slug"], book["name"], existing_index):
-                    skipped_dup += 1
-                    continue
+        if page % 50 == 0 or page == 1:
+            console.print(
+                f"  Page {page}/{page_limit}: {len(books)} found, "
+                f"{new_on_page} new, total: {len(all_books)}"
+            )
 
-                # Assign ID early so periodic flushes produce usable plan files
-                book["id"] = get_or_create_book_id(
-                    book.get("tf_slug", book["slug"]), registry
-                )
-                book["source"] = "tf"
-                # Preserve the original listing position for "top hot" ranking
-                book["hot_rank"] = global_rank
-                all_books.append(book)
-                new_on_page += 1
-
-            # Periodic flush — save progress so it survives interruption
-            books_since_flush += new_on_page
-            if books_since_flush >= flush_every and not dry_run and all_books:
-                _flush_plan_file(TF_PLAN_FILE, all_books, f"page {page}/{page_limit}")
-                books_since_flush = 0
-
-            if page % 50 == 0 or page == 1:
-                console.print(
-                    f"  Page {page}/{page_limit}: {len(books)} found, "
-                    f"{new_on_page} new, total: {len(all_books)}"
-                )
+    with load_registry() as registry:
+        _report_registry("TF", registry)
+        asyncio.run(
+            scrape_listing(
+                lambda page: f"{TF_BASE_URL}/danh-sach/truyen-hot/trang-{page}/",
+                parse_listing_page,
+                parse_listing_last_page,
+                on_page,
+                TF_HEADERS,
+                max_pages=max_pages,
+                workers=workers,
+                delay=delay,
+            )
+        )
 
-            time.sleep(REQUEST_DELAY)
+        # Snapshot the registry to its git-tracked JSON once per run
+        if not dry_run:
+            registry.export_json()
 
     console.print(
         f"\n  Discovery complete: {len(all_books)} unique books, "
         f"{skipped_dup} duplicates skipped"
     )
+    known_bids = get_bundle_chapter_counts()
 
-    # Assign IDs and build plan entries
+    if fingerprint_dedup and not existing_index.has_fingerprints:
+        console.print("  [dim]--fingerprint-dedup: no fingerprints recorded yet[/dim]")
+    elif fingerprint_dedup:
+        console.print("[bold blue]Fingerprinting first chapters...[/bold blue]")
+        new_books = [b for b in all_books if b["id"] not in known_bids]
+        matches = asyncio.run(
+            fingerprint_duplicates(
+                new_books,
+                lambda b: f"{TF_BASE_URL}/{b.get('tf_slug', b['slug'])}/chuong-1/",
+                parse_chapter,
+                existing_index,
+                TF_HEADERS,
+                workers=workers,
+                delay=delay,
+            )
+        )
+        all_books = [b for b in all_books if b["id"] not in matches]
+        skipped_dup += len(matches)
+        console.print(
+            f"  {len(new_books)} checked, {len(matches)} duplicates by content skipped"
+        )
+
+    # Build plan entries
     console.print("[bold blue]Building plan entries...[/bold blue]")
-    known_bids = get_bundle_chapter_counts()
 
     have_complete: list[dict] = []
     have_partial: list[dict] = []
@@ -1588,7 +2127,7 @@ def run_generate_tf(
     for book in all_books:
         tf_slug = book.get("tf_slug", book["slug"])
         slug = book["slug"]
-        book_id = get_or_create_book_id(tf_slug, registry)
+        book_id = book["id"]
         ch_count = book.get("chapter_count", 0)
 
         if ch_count < min_chapters:
@@ -1648,9 +2187,6 @@ def run_generate_tf(
         else:
             need_download.append(entry)
 
-    # Save registry
-    save_registry(registry)
-
     # Display audit summary
     total_gap = sum(b.get("gap", 0) for b in have_partial) + sum(
         b["chapter_count"] for b in need_download
@@ -1681,9 +2217,7 @@ def run_generate_tf(
         entry = {k: v for k, v in b.items() if k not in ("local", "gap")}
         plan_entries.append(entry)
 
-    PLAN_DIR.mkdir(parents=True, exist_ok=True)
-    with open(TF_PLAN_FILE, "w", encoding="utf-8") as f:
-        json.dump(plan_entries, f, indent=2, ensure_ascii=False)
+    write_plan("tf", plan_entries)
     console.print(
         f"\n[green]Plan written:[/green] {TF_PLAN_FILE}\n"
         f"  {len(plan_entries)} entries "
@@ -1817,31 +2351,33 @@ def run_refresh_tf(
     delay: float,
     min_chapters: int,
     dry_run: bool,
+    policy=None,
 ) -> list[dict]:
-    """Read existing TF plan, re-fetch metadata from HTML, write back."""
+    """Read existing TF plan, re-fetch metadata from HTML, write back.
+
+    Only books due under *policy* are fetched (see :func:`select_refresh`).
+    """
 
-    if not TF_PLAN_FILE.exists():
+    entries = read_plan("tf")
+    if entries is None:
         console.print(
             f"[red]Error:[/red] TF plan file not found: {TF_PLAN_FILE}\n"
             "  Run with --source tf (no --refresh) first to generate an initial plan."
         )
         sys.exit(1)
 
-    with open(TF_PLAN_FILE, encoding="utf-8") as f:
-        entries = json.load(f)
-
-    if not isinstance(entries, list):
-        console.print("[red]Error:[/red] TF plan file must be a JSON array.")
-        sys.exit(1)
-
     console.print(f"  Plan file:      [dim]{TF_PLAN_FILE}[/dim]")
     console.print(f"  Input books:    [bold]{len(entries):,}[/bold]")
     console.print(f"  Workers:        [dim]{workers}[/dim]")
     console.print(f"  Min chapters:   [dim]{min_chapters}[/dim]")
+    due, held = select_refresh("tf", entries, policy)
 
     start = time.time()
-    updated, stats = asyncio.run(_run_refresh_tf(entries, workers, delay, min_chapters))
+    updated, stats = asyncio.run(_run_refresh_tf(due, workers, delay, min_chapters))
     elapsed = time.time() - start
+    refreshed = [b["id"] for b in updated]
+    updated = merge_held(updated, held, min_chapters)
+    stats.held = len(held)
 
     # Report
     console.print()
@@ -1852,20 +2388,20 @@ def run_refresh_tf(
     table.add_row("Output books", f"[bold]{len(updated):,}[/bold]")
     table.add_row("Updated", f"[green]{stats.updated:,}[/green]")
     table.add_row("Unchanged", f"{stats.unchanged:,}")
+    if stats.held:
+        table.add_row("Held (not due)", f"[dim]{stats.held:,}[/dim]")
     table.add_row("Removed (404)", f"[red]{stats.removed:,}[/red]")
     table.add_row("New chapters", f"[bold]{stats.new_chapters:,}[/bold]")
     table.add_row("Duration", f"{elapsed:.1f}s")
     if elapsed > 0:
-        table.add_row("Rate", f"{len(entries) / elapsed:.0f} books/s")
+        table.add_row("Rate", f"{len(due) / elapsed:.0f} books/s")
     console.print(table)
 
     if dry_run:
         console.print("\n[yellow]Dry run — plan file not written.[/yellow]")
         return updated
 
-    PLAN_DIR.mkdir(parents=True, exist_ok=True)
-    with open(TF_PLAN_FILE, "w", encoding="utf-8") as f:
-        json.dump(updated, f, indent=2, ensure_ascii=False)
+    write_plan("tf", updated, refreshed)
     console.print(f"\n[green]Wrote {len(updated):,} books to {TF_PLAN_FILE}[/green]")
 
     return updated
@@ -1876,20 +2412,22 @@ def run_cover_pull_tf(
     force: bool,
     dry_run: bool,
     delay: float,
+    workers: int = 8,
+    per_host: int = 4,
 ) -> None:
     """Download missing covers for TF books using cover_url from the plan."""
-    from src.sources.tf import TF_HEADERS as _TF_HEADERS
+    from urllib.parse import urljoin
+
+    from src.sources.tf import TF_BASE_URL, TF_HEADERS
 
     COVERS_DIR.mkdir(parents=True, exist_ok=True)
 
-    if force:
-        pending = plan_entries
-    else:
-        pending = [
-            e
-            for e in plan_entries
-            if not (COVERS_DIR / f"{e['id']}.jpg").exists() and e.get("cover_url")
-        ]
+    pending = [
+        e
+        for e in plan_entries
+        if e.get("cover_url")
+        and (force or not (COVERS_DIR / f"{e['id']}.jpg").exists())
+    ]
 
     console.print(f"  Plan entries:   [bold]{len(plan_entries)}[/bold]")
     console.print(f"  Missing covers: [bold]{len(pending)}[/bold]")
@@ -1901,57 +2439,18 @@ def run_cover_pull_tf(
         return
 
     if dry_run:
-        console.print("[yellow]Dry run — would download covers for:[/yellow]")
-        for e in pending[:30]:
-            console.print(f"  {e['id']}  {e.get('name', '?')[:40]}")
-        if len(pending) > 30:
-            console.print(f"  [dim]... and {len(pending) - 30} more[/dim]")
+        _show_dry_run(pending)
         return
 
-    succeeded = 0
-    failed = 0
-
-    progress = Progress(
-        TextColumn("[bold yellow]{task.description}"),
-        BarColumn(bar_width=30),
-        MofNCompleteColumn(),
-        TextColumn("•"),
-        TimeElapsedColumn(),
-        TextColumn("•"),
-        TimeRemainingColumn(),
-    )
-
-    with (
-        progress,
-        httpx.Client(headers=_TF_HEADERS, timeout=30, follow_redirects=True) as client,
-    ):
-        task = progress.add_task("Pulling TF covers", total=len(pending))
-
-        for i, entry in enumerate(pending, 1):
-            bid = entry["id"]
-            cover_url = entry.get("cover_url", "")
-            dest = str(COVERS_DIR / f"{bid}.jpg")
-
-            progress.update(task, description=f"Cover {bid}")
-
-            try:
-                r = client.get(cover_url, follow_redirects=True, timeout=30)
-                if r.status_code == 200 and len(r.content) > 100:
-                    with open(dest, "wb") as f:
-                        f.write(r.content)
-                    succeeded += 1
-                else:
-                    failed += 1
-            except Exception:
-                failed += 1
-
-            progress.advance(task)
-            if i < len(pending):
-                time.sleep(delay)
-
-    console.print(
-        f"\nDone: [green]{succeeded}[/green] succeeded, "
-        f"[red]{failed}[/red] failed out of {len(pending)}"
+    _pull_covers(
+        [(e["id"], urljoin(f"{TF_BASE_URL}/", e["cover_url"])) for e in pending],
+        TF_HEADERS,
+        delay,
+        workers,
+        per_host,
+        force=force,
+        label="TF covers",
+        color="yellow",
     )
 
 
@@ -1993,6 +2492,57 @@ def main() -> None:
         help="(With --refresh, MTC only) Scan the full MTC ID range to "
         "discover books missing from the plan",
     )
+    parser.add_argument(
+        "--scan-ttl",
+        type=float,
+        default=30,
+        metavar="DAYS",
+        help="(With --scan) Re-probe IDs that returned 404 only after DAYS "
+        "days (default: 30); see data/scan_ledger.sqlite",
+    )
+    parser.add_argument(
+        "--scan-found-ttl",
+        type=float,
+        default=7,
+        metavar="DAYS",
+        help="(With --scan) Re-probe books too small for the plan after DAYS "
+        "days (default: 7)",
+    )
+    parser.add_argument(
+        "--full-scan",
+        action="store_true",
+        help="(With --scan) Ignore the scan ledger and probe every unknown ID",
+    )
+    parser.add_argument(
+        "--refresh-all",
+        action="store_true",
+        help="(With --refresh) Re-fetch every plan book instead of only the "
+        "books due under the tiered refresh policy",
+    )
+    parser.add_argument(
+        "--refresh-warm-ttl",
+        type=float,
+        default=3,
+        metavar="DAYS",
+        help="(With --refresh) Re-fetch books idle for 2 weeks to 3 months "
+        "(or with no update date) every DAYS days (default: 3)",
+    )
+    parser.add_argument(
+        "--refresh-cold-ttl",
+        type=float,
+        default=14,
+        metavar="DAYS",
+        help="(With --refresh) Re-fetch books idle for over 3 months every "
+        "DAYS days (default: 14)",
+    )
+    parser.add_argument(
+        "--refresh-done-ttl",
+        type=float,
+        default=30,
+        metavar="DAYS",
+        help="(With --refresh) Re-fetch completed books every DAYS days "
+        "(default: 30)",
+    )
     parser.add_argument(
         "--cover-only",
         action="store_true",
@@ -2006,6 +2556,12 @@ def main() -> None:
         default=0,
         help="(TTV/TF only) Number of listing pages to scrape (default: 0 = all)",
     )
+    parser.add_argument(
+        "--fingerprint-dedup",
+        action="store_true",
+        help="(TTV/TF only) Also fetch chapter 1 of each new book and skip books "
+        "whose text matches a book already ingested from another source",
+    )
     parser.add_argument(
         "--flush-plan-every",
         type=int,
@@ -2050,6 +2606,19 @@ def main() -> None:
         action="store_true",
         help="Re-download covers even if they already exist",
     )
+    parser.add_argument(
+        "--cover-workers",
+        type=int,
+        default=8,
+        help="Concurrent cover downloads (default: 8)",
+    )
+    parser.add_argument(
+        "--cover-per-host",
+        type=int,
+        default=4,
+        help="Concurrent cover requests per image host (default: 4); "
+        "--delay spaces requests to the same host",
+    )
 
     # Refresh options
     parser.add_argument(
@@ -2058,6 +2627,13 @@ def main() -> None:
         default=150,
         help="Max concurrent requests for --refresh (default: 150)",
     )
+    parser.add_argument(
+        "--catalog-workers",
+        type=int,
+        default=CATALOG_WORKERS,
+        help="Concurrent catalog / listing page requests when generating a plan "
+        f"(default: {CATALOG_WORKERS})",
+    )
     parser.add_argument(
         "--delay",
         type=float,
@@ -2071,9 +2647,24 @@ def main() -> None:
         action="store_true",
         help="Preview what would be done without writing any files",
     )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Sample-profile the run: write collapsed stacks (flamegraph input) "
+        "to PATH (default: data/profile/generate-plan-<time>.collapsed) and a top-N summary to PATH.top.txt",
+    )
 
     args = parser.parse_args()
 
+    if args.profile is not None:
+        from src.profiling import default_output, start_profiling
+
+        start_profiling(
+            args.profile or default_output(PLAN_DIR / "profile", "generate-plan")
+        )
+
     is_ttv = args.source == "ttv"
     is_tf = args.source == "tf"
 
@@ -2097,6 +2688,21 @@ def main() -> None:
         )
         sys.exit(1)
 
+    if args.scan_ttl < 0 or args.scan_found_ttl < 0:
+        console.print("[red]Error:[/red] --scan-ttl and --scan-found-ttl must be >= 0.")
+        sys.exit(1)
+
+    if min(args.refresh_warm_ttl, args.refresh_cold_ttl, args.refresh_done_ttl) < 0:
+        console.print("[red]Error:[/red] --refresh-*-ttl values must be >= 0.")
+        sys.exit(1)
+
+    if args.cover_workers < 1 or args.cover_per_host < 1 or args.catalog_workers < 1:
+        console.print(
+            "[red]Error:[/red] --cover-workers, --cover-per-host and "
+            "--catalog-workers must be >= 1."
+        )
+        sys.exit(1)
+
     # Determine what to do
     do_plan = not args.cover_only
     do_covers = not args.refresh  # covers run unless --refresh (refresh is plan-only)
@@ -2127,6 +2733,16 @@ def main() -> None:
 
     # ── Plan phase ──────────────────────────────────────────────────────
 
+    refresh_policy = None
+    if args.refresh and not args.refresh_all:
+        from src.refreshpolicy import DAY, RefreshPolicy
+
+        refresh_policy = RefreshPolicy(
+            warm_interval=args.refresh_warm_ttl * DAY,
+            cold_interval=args.refresh_cold_ttl * DAY,
+            completed_interval=args.refresh_done_ttl * DAY,
+        )
+
     if do_plan:
         if is_tf:
             if args.refresh:
@@ -2135,6 +2751,7 @@ def main() -> None:
                     delay=args.delay,
                     min_chapters=args.min_chapters,
                     dry_run=args.dry_run,
+                    policy=refresh_policy,
                 )
             else:
                 run_generate_tf(
@@ -2142,6 +2759,9 @@ def main() -> None:
                     min_chapters=args.min_chapters,
                     flush_every=args.flush_plan_every,
                     dry_run=args.dry_run,
+                    workers=args.catalog_workers,
+                    delay=args.delay,
+                    fingerprint_dedup=args.fingerprint_dedup,
                 )
         elif is_ttv:
             if args.refresh:
@@ -2150,6 +2770,7 @@ def main() -> None:
                     delay=args.delay,
                     min_chapters=args.min_chapters,
                     dry_run=args.dry_run,
+                    policy=refresh_policy,
                 )
             else:
                 run_generate_ttv(
@@ -2157,6 +2778,9 @@ def main() -> None:
                     min_chapters=args.min_chapters,
                     flush_every=args.flush_plan_every,
                     dry_run=args.dry_run,
+                    workers=args.catalog_workers,
+                    delay=args.delay,
+                    fingerprint_dedup=args.fingerprint_dedup,
                 )
         else:
             if args.refresh:
@@ -2167,36 +2791,54 @@ def main() -> None:
                     min_chapters=args.min_chapters,
                     fix_author=args.fix_author,
                     dry_run=args.dry_run,
+                    scan_ttl=args.scan_ttl,
+                    found_ttl=args.scan_found_ttl,
+                    full_scan=args.full_scan,
+                    policy=refresh_policy,
                 )
             else:
-                run_generate(dry_run=args.dry_run)
+                run_generate(
+                    dry_run=args.dry_run,
+                    workers=args.catalog_workers,
+                    delay=args.delay,
+                )
 
     # ── Cover phase ─────────────────────────────────────────────────────
 
     if do_covers:
         if is_tf:
-            plan_path = TF_PLAN_FILE
-            if plan_path.exists():
-                with open(plan_path, encoding="utf-8") as f:
-                    tf_entries = json.load(f)
+            tf_entries = read_plan("tf")
+            if tf_entries is not None:
                 console.print(f"\n[bold yellow]TF Cover Pull[/bold yellow]")
-                run_cover_pull_tf(tf_entries, args.force, args.dry_run, args.delay)
+                run_cover_pull_tf(
+                    tf_entries,
+                    args.force,
+                    args.dry_run,
+                    args.delay,
+                    args.cover_workers,
+                    args.cover_per_host,
+                )
             else:
                 console.print(
-                    f"\n[yellow]TF plan file not found: {plan_path}[/yellow]\n"
+                    f"\n[yellow]TF plan file not found: {TF_PLAN_FILE}[/yellow]\n"
                     "  Run without --cover-only first to generate a plan."
                 )
         elif is_ttv:
             # TTV covers come from the plan file (cover_url field)
-            plan_path = TTV_PLAN_FILE
-            if plan_path.exists():
-                with open(plan_path, encoding="utf-8") as f:
-                    ttv_entries = json.load(f)
+            ttv_entries = read_plan("ttv")
+            if ttv_entries is not None:
                 console.print(f"\n[bold cyan]TTV Cover Pull[/bold cyan]")
-                run_cover_pull_ttv(ttv_entries, args.force, args.dry_run, args.delay)
+                run_cover_pull_ttv(
+                    ttv_entries,
+                    args.force,
+                    args.dry_run,
+                    args.delay,
+                    args.cover_workers,
+                    args.cover_per_host,
+                )
             else:
                 console.print(
-                    f"\n[yellow]TTV plan file not found: {plan_path}[/yellow]\n"
+                    f"\n[yellow]TTV plan file not found: {TTV_PLAN_FILE}[/yellow]\n"
                     "  Run without --cover-only first to generate a plan."
                 )
         else:
@@ -2215,7 +2857,14 @@ def main() -> None:
                     f"  Source:         [dim]bundles in {COMPRESSED_DIR}[/dim]"
                 )
                 console.print(f"  Books found:    [bold]{len(target_ids)}[/bold]")
-                run_cover_pull(target_ids, args.force, args.dry_run, args.delay)
+                run_cover_pull(
+                    target_ids,
+                    args.force,
+                    args.dry_run,
+                    args.delay,
+                    args.cover_workers,
+                    args.cover_per_host,
+                )
 
 
 if __name__ == "__main__":
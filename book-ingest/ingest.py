@@ -24,6 +24,10 @@ Modes:
                         explicit book IDs and prompts for confirmation.
     Audit (--audit-only)
                         Report missing chapters/metadata without downloading.
+    Daemon (--daemon)   Ingest continuously: every plan book is re-checked
+                        when its next-check time comes due (release cadence,
+                        status, last result), and the plan store is re-read
+                        every --reload-every seconds.
     Update metadata (--update-meta-only)
                         Bulk-update book metadata (author, stats, genres,
                         tags) from the plan file without downloading chapters.
@@ -34,12 +38,17 @@ Usage:
     # ── Ingest (MTC — default) ────────────────────────────────
     python3 ingest.py                           # ingest from default plan file
     python3 ingest.py 100358 100441             # specific book IDs
-    python3 ingest.py -w 5                      # 5 parallel workers
+    python3 ingest.py -w 5                      # at least 5 books in parallel
+    python3 ingest.py --max-books 200           # allow up to 200 books in parallel
+    python3 ingest.py --order weighted          # most valuable books first
     python3 ingest.py --plan custom.json        # custom plan file
     python3 ingest.py --offset 500 --limit 200  # skip first 500, process next 200
     python3 ingest.py --min-chapters 200        # skip books with < 200 chapters
     python3 ingest.py --flush-every 50          # checkpoint every 50 chapters
+    python3 ingest.py --checkpoint-interval 60  # checkpoint at least once a minute
+    python3 ingest.py --http2                   # HTTP/2 to the upstream (needs h2)
     python3 ingest.py --dry-run                 # simulate without writing
+    python3 ingest.py --daemon                  # run continuously, per-book checks
 
     # ── Ingest (TTV) ─────────────────────────────────────────
     python3 ingest.py --source ttv              # ingest from TTV plan file
@@ -81,11 +90,13 @@ import argparse
 import asyncio
 import json
 import os
+import signal
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
 
+import httpx
 from rich.console import Console
 from rich.progress import (
     BarColumn,
@@ -100,35 +111,108 @@ from rich.progress import (
 from src.api import AsyncBookClient
 from src.bundle import (
     ChapterMeta,
+    read_bundle_count,
     read_bundle_indices,
     read_bundle_meta,
     read_bundle_raw,
     write_bundle,
 )
 from src.compress import ChapterCompressor
+from src.cover import DEFAULT_COVER_PER_HOST, DEFAULT_COVER_WORKERS, CoverStage
+from src.daemon import CheckQueue
+from src.dedup import FINGERPRINTS_PATH, FingerprintStore
+from src.planstore import PLAN_STORE_PATH, PlanStore, read_plan_json
+from src.thumbnails import (
+    SUPPORTED_FORMATS,
+    THUMB_FORMATS,
+    ThumbnailPool,
+    unsupported_formats,
+)
 from src.db import (
     compute_meta_hash,
     get_book_meta_hash,
     get_chapter_indices,
     insert_chapters,
     open_db,
-    update_cover_url,
+    update_chapters_saved,
     upsert_book_metadata,
 )
-from src.sources import VALID_SOURCES, create_source
+from src.httpreplay import (
+    ERROR_KINDS,
+    Cassette,
+    RecordingTransport,
+    ReplayTransport,
+    live_transport,
+)
+from src.journal import (
+    ChapterJournal,
+    JournalDirLock,
+    JournalError,
+    journal_path,
+    list_journals,
+    merge_into_bundle,
+    read_journal,
+)
+from src.logsink import LOG_FORMATS, LogSink
+from src.metrics import (
+    BOOKS,
+    BOOKS_IN_FLIGHT,
+    BUNDLE_WRITE,
+    BYTES_WRITTEN,
+    CHAPTERS,
+    COVER_QUEUE_DEPTH,
+    DB_COMMIT,
+    QUEUE_DEPTH,
+    REQUESTS_IN_FLIGHT,
+    REQUESTS_WAITING,
+    start_metrics_server,
+)
+from src.priority import ORDER_POLICIES, PlanQueue
+from src.profiling import default_output, start_profiling
+from src.scheduler import BookScheduler
+from src.trace import (
+    format_report,
+    load_trace,
+    record as trace_record,
+    span,
+    start_trace,
+    stop_trace,
+    summarize,
+)
+from src.sources import (
+    VALID_SOURCES,
+    create_http_client,
+    create_source,
+    has_chapter_list,
+)
 
 # ─── Paths ────────────────────────────────────────────────────────────────────
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 BINSLIB_DIR = SCRIPT_DIR.parent / "binslib"
-COMPRESSED_DIR = BINSLIB_DIR / "data" / "compressed"
-DB_PATH = BINSLIB_DIR / "data" / "binslib.db"
+# COMPRESSED_DIR / DATABASE_PATH / COVERS_DIR override the binslib paths
+# (same variables as epub-converter), e.g. to benchmark on a scratch copy;
+# JOURNAL_DIR overrides the chapter journal directory.
+LIBRARY_COMPRESSED_DIR = BINSLIB_DIR / "data" / "compressed"
+LIBRARY_DB_PATH = BINSLIB_DIR / "data" / "binslib.db"
+COMPRESSED_DIR = Path(os.environ.get("COMPRESSED_DIR", str(LIBRARY_COMPRESSED_DIR)))
+DB_PATH = Path(os.environ.get("DATABASE_PATH", str(LIBRARY_DB_PATH)))
 DICT_PATH = BINSLIB_DIR / "data" / "global.dict"
-COVERS_DIR = BINSLIB_DIR / "public" / "covers"
+COVERS_DIR = Path(os.environ.get("COVERS_DIR", str(BINSLIB_DIR / "public" / "covers")))
+JOURNAL_DIR = Path(os.environ.get("JOURNAL_DIR", str(SCRIPT_DIR / "data" / "journal")))
+# Book ID range of each source, for journals written before the per-source
+# journal directories (see ID_OFFSET in src/sources/ttv.py, tf.py, bench.py)
+_SOURCE_ID_RANGES = {
+    "mtc": (0, 10_000_000),
+    "ttv": (10_000_000, 30_000_000),
+    "tf": (30_000_000, 90_000_000),
+    "bench": (90_000_000, float("inf")),
+}
 PLAN_PREFIX = "books_plan_"
 DEFAULT_PLAN = SCRIPT_DIR / "data" / "books_plan_mtc.json"
 TTV_DEFAULT_PLAN = SCRIPT_DIR / "data" / "books_plan_ttv.json"
 TF_DEFAULT_PLAN = SCRIPT_DIR / "data" / "books_plan_tf.json"
+PLAN_JSON_FILES = {"mtc": DEFAULT_PLAN, "ttv": TTV_DEFAULT_PLAN, "tf": TF_DEFAULT_PLAN}
 
 LOG_DIR = SCRIPT_DIR / "data"
 DETAIL_LOG = LOG_DIR / "ingest-detail.log"
@@ -143,6 +227,7 @@ _SOURCE_DEFAULTS = {
     "mtc": {"max_concurrent": 180, "request_delay": 0.015},
     "ttv": {"max_concurrent": 20, "request_delay": 0.3},
     "tf": {"max_concurrent": 20, "request_delay": 0.15},
+    "bench": {"max_concurrent": 64, "request_delay": 0.0},
 }
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
@@ -167,10 +252,20 @@ def format_num(n: int) -> str:
     return f"{n:,}"
 
 
+# Written by a background thread; see src/logsink.py.  --log-format json
+# swaps in a JSON-lines sink before anything is logged.
+_detail_log = LogSink(DETAIL_LOG)
+
+
+def set_detail_log_format(fmt: str) -> None:
+    global _detail_log
+    if fmt != _detail_log.fmt:
+        path = DETAIL_LOG if fmt == "text" else DETAIL_LOG.with_suffix(".jsonl")
+        _detail_log = LogSink(path, fmt=fmt)
+
+
 def log_detail(msg: str) -> None:
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-    with open(DETAIL_LOG, "a") as f:
-        f.write(f"[{timestamp()}] {msg}\n")
+    _detail_log.write(msg)
 
 
 def log_summary(msg: str) -> None:
@@ -183,20 +278,11 @@ def log_summary(msg: str) -> None:
 
 
 def load_plan(plan_path: str, offset: int = 0, limit: int = 0) -> list[dict]:
-    """Load book entries from a plan JSON file.
+    """Load book entries from a plan JSON file (``--plan``).
 
     Supports both flat arrays and structured plans with need_download/partial.
     """
-    with open(plan_path) as f:
-        data = json.load(f)
-
-    entries: list[dict] = []
-    if isinstance(data, list):
-        entries = data
-    elif isinstance(data, dict):
-        for key in ("need_download", "partial", "have_partial", "books"):
-            if key in data and isinstance(data[key], list):
-                entries.extend(data[key])
+    entries = read_plan_json(plan_path)
 
     if offset > 0:
         entries = entries[offset:]
@@ -206,6 +292,27 @@ def load_plan(plan_path: str, offset: int = 0, limit: int = 0) -> list[dict]:
     return entries
 
 
+def open_plan_store(source_name: str) -> PlanStore:
+    """The plan store, with *source_name*'s plan JSON merged in if it changed."""
+    json_paths = {}
+    if source_name in PLAN_JSON_FILES:
+        json_paths[source_name] = PLAN_JSON_FILES[source_name]
+    return PlanStore(PLAN_STORE_PATH, json_paths)
+
+
+def read_plan_changes(
+    source_name: str, since: float, min_chapters: int = 0
+) -> tuple[list[dict], set[int]]:
+    """Plan entries changed since *since* and the IDs of every plan book.
+
+    Used by ``--daemon`` to reload the plan incrementally; a plan JSON
+    rewritten by another tool is imported first (see :func:`open_plan_store`).
+    """
+    with open_plan_store(source_name) as store:
+        changed = store.query(source_name, min_chapters=min_chapters, changed_since=since)
+        return changed, store.ids(source_name)
+
+
 def entries_from_ids(book_ids: list[int], source_name: str = "mtc") -> list[dict]:
     """Create minimal plan entries from explicit book IDs.
 
@@ -218,9 +325,8 @@ def entries_from_ids(book_ids: list[int], source_name: str = "mtc") -> list[dict
     if source_name == "ttv":
         from src.sources.ttv import load_registry
 
-        registry = load_registry()
-        # Invert: id → slug
-        id_to_slug = {v: k for k, v in registry.items()}
+        with load_registry() as registry:
+            id_to_slug = registry.slugs_for(book_ids)
         for e in entries:
             slug = id_to_slug.get(e["id"])
             if slug:
@@ -229,9 +335,8 @@ def entries_from_ids(book_ids: list[int], source_name: str = "mtc") -> list[dict
     elif source_name == "tf":
         from src.sources.tf import load_registry as load_tf_registry
 
-        registry = load_tf_registry()
-        # Invert: id → tf_slug
-        id_to_slug = {v: k for k, v in registry.items()}
+        with load_tf_registry() as registry:
+            id_to_slug = registry.slugs_for(book_ids)
         for e in entries:
             tf_slug = id_to_slug.get(e["id"])
             if tf_slug:
@@ -369,6 +474,9 @@ async def ingest_book(
     chapter_task_id: int,
     lock: asyncio.Lock,
     fix_mode: bool = False,
+    checkpoint_interval: float = 0,
+    covers: CoverStage | None = None,
+    fingerprints: FingerprintStore | None = None,
 ) -> dict:
     """Ingest a single book: fetch → compress → bundle + DB.
 
@@ -378,21 +486,36 @@ async def ingest_book(
     When *fix_mode* is True, the "bundle complete" skip logic is bypassed
     so that missing chapters (gaps in the bundle) are re-downloaded.
 
-    Returns stats dict with keys: book_id, name, saved, skipped, errors.
+    Every fetched chapter is appended to the book's journal
+    (``data/journal/{source}/{id}.journal``) as it arrives.  Bundle + DB checkpoints
+    happen every *flush_every* chapters and/or *checkpoint_interval*
+    seconds (``0`` disables either trigger) and at the end of the book;
+    anything fetched since the last checkpoint is recovered from the
+    journal if the process dies.
+
+    Covers are handed to *covers* (a :class:`CoverStage`) once the book
+    row exists and downloaded in the background; ``None`` skips them.
+    A fetched chapter 1 is fingerprinted into *fingerprints* for
+    cross-source dedup (``generate_plan.py --fingerprint-dedup``).
+
+    Returns stats dict with keys: book_id, name, saved, skipped, errors,
+    chapter_count (as reported by the source; 0 if metadata failed).
     """
     book_id = entry["id"]
+    src = source.name
     stats = {
         "book_id": book_id,
         "name": entry.get("name", "?"),
         "saved": 0,
         "skipped": 0,
         "errors": 0,
-        "cover": False,
+        "chapter_count": 0,
     }
 
     # 1. Fetch metadata from source
     try:
-        meta = await source.fetch_book_metadata(entry)
+        with span("metadata", src, book_id):
+            meta = await source.fetch_book_metadata(entry)
         if meta is None:
             log_detail(f"SKIP {book_id}: not found on source")
             stats["errors"] = -1
@@ -408,19 +531,34 @@ async def ingest_book(
         return stats
 
     api_chapter_count = meta.get("chapter_count", 0)
+    stats["chapter_count"] = api_chapter_count or 0
     book_name = meta.get("name", "?")
 
     # 2. Determine what's needed — bundle-first skip logic
     bundle_path = str(COMPRESSED_DIR / f"{book_id}.bundle")
-    bundle_indices = await asyncio.to_thread(read_bundle_indices, bundle_path)
-
-    if (
-        not fix_mode
-        and len(bundle_indices) >= api_chapter_count
-        and api_chapter_count > 0
-    ):
+    jpath = journal_path(journal_dir(src), book_id)
+    if not dry_run and jpath.exists():
+        # Left over from a run that died after startup replay
+        async with lock:
+            await asyncio.to_thread(replay_journal, db_path, jpath)
+    with span("bundle_index", src, book_id):
+        bundle_indices = await asyncio.to_thread(read_bundle_indices, bundle_path)
+    bundle_complete = len(bundle_indices) >= api_chapter_count and api_chapter_count > 0
+
+    # Sources with a table of contents (TTV/TF) know exactly which chapters
+    # are free to read — a bundle holding all of them is complete even when
+    # chapter_count also counts VIP chapters.
+    toc = None
+    if fix_mode or not bundle_complete:
+        with span("toc", src, book_id):
+            toc = await source.fetch_chapter_list(meta)
+            if toc is not None:
+                bundle_complete = {ref.index for ref in toc} <= bundle_indices
+
+    if not fix_mode and bundle_complete:
         # Bundle is complete — check if DB needs update
         async with lock:
+            t0 = time.perf_counter()
             db = open_db(db_path)
             try:
                 existing_hash = get_book_meta_hash(db, book_id)
@@ -471,29 +609,23 @@ async def ingest_book(
                     )
             finally:
                 db.close()
+            trace_record("db_lookup", src, t0, book_id)
 
-        # Pull cover if missing
-        cover_url = await source.download_cover(book_id, meta, str(COVERS_DIR))
-        if cover_url:
-            async with lock:
-                db = open_db(db_path)
-                try:
-                    update_cover_url(db, book_id, cover_url)
-                    db.commit()
-                finally:
-                    db.close()
-            stats["cover"] = True
+        # Pull cover if missing (background stage)
+        if covers is not None:
+            covers.submit(book_id, meta)
 
         stats["skipped"] = len(bundle_indices)
         return stats
 
     # Bundle incomplete — query DB for chapter indices
     async with lock:
-        db = open_db(db_path)
-        try:
-            db_indices = get_chapter_indices(db, book_id)
-        finally:
-            db.close()
+        with span("db_lookup", src, book_id):
+            db = open_db(db_path)
+            try:
+                db_indices = get_chapter_indices(db, book_id)
+            finally:
+                db.close()
 
     existing = bundle_indices | db_indices
 
@@ -501,104 +633,149 @@ async def ingest_book(
         stats["skipped"] = len(existing)
         return stats
 
+    if toc is not None:
+        missing = len({ref.index for ref in toc} - existing)
+        approx = ""
+    else:
+        missing = max(api_chapter_count - len(existing), 0)
+        approx = "~"
+
     if fix_mode and existing:
-        gaps = api_chapter_count - len(existing) if api_chapter_count > 0 else 0
         log_detail(
             f'FIX {book_id} "{book_name}": {len(existing)} existing, '
-            f"{api_chapter_count} total, ~{gaps} gaps to fill"
+            f"{api_chapter_count} total, {approx}{missing} gaps to fill"
         )
 
+    if toc is not None and missing == 0:
+        stats["skipped"] = len(existing)
+        return stats
+
     if source.name == "mtc" and not meta.get("first_chapter"):
         log_detail(f'SKIP {book_id} "{book_name}": no first_chapter')
         stats["errors"] = -1
         return stats
 
     if dry_run:
-        remaining = api_chapter_count - len(existing)
-        log_detail(f'DRY-RUN {book_id} "{book_name}": would fetch {remaining} chapters')
-        stats["saved"] = remaining
+        log_detail(f'DRY-RUN {book_id} "{book_name}": would fetch {missing} chapters')
+        stats["saved"] = missing
         return stats
 
     # Ensure book row exists in DB before any chapter inserts (FK constraint)
     meta_hash = compute_meta_hash(meta)
     async with lock:
-        db = open_db(db_path)
-        try:
-            if not get_book_meta_hash(db, book_id):
-                upsert_book_metadata(
-                    db,
-                    meta,
-                    None,
-                    0,
-                    meta_hash,
-                    source=source.name,
-                )
-                db.commit()
-        finally:
-            db.close()
+        with span("db_lookup", src, book_id):
+            db = open_db(db_path)
+            try:
+                if not get_book_meta_hash(db, book_id):
+                    upsert_book_metadata(
+                        db,
+                        meta,
+                        None,
+                        0,
+                        meta_hash,
+                        source=source.name,
+                    )
+                    db.commit()
+            finally:
+                db.close()
 
     # 3. Walk chapters via source (source handles walk strategy internally)
     log_detail(
         f'START {book_id} "{book_name}": {api_chapter_count} total, '
-        f"{len(existing)} existing, ~{api_chapter_count - len(existing)} to fetch"
+        f"{len(existing)} existing, {approx}{missing} to fetch"
     )
 
     # pending: index -> (compressed, raw_len, title, slug, word_count, chapter_id)
     pending_chapters: dict[int, tuple[bytes, int, str, str, int, int]] = {}
     start_time = time.time()
-
-    async for ch in source.fetch_chapters(meta, existing, bundle_path):
-        compressed, raw_len = await asyncio.to_thread(compressor.compress, ch.body)
-        pending_chapters[ch.index] = (
-            compressed,
-            raw_len,
-            ch.title,
-            ch.slug,
-            ch.word_count,
-            ch.chapter_id,
+    last_checkpoint = start_time
+    journal = await asyncio.to_thread(ChapterJournal, jpath, book_id)
+
+    def _compress_and_journal(ch) -> tuple[bytes, int]:
+        t0 = time.perf_counter()
+        compressed, raw_len = compressor.compress(ch.body)
+        written = journal.append(
+            ch.index, compressed, raw_len, ch.title, ch.slug,
+            ch.word_count, ch.chapter_id,
         )
-        existing.add(ch.index)
-        stats["saved"] += 1
-        chapter_progress.update(chapter_task_id, advance=1)
+        trace_record("compress", src, t0, book_id, index=ch.index)
+        BYTES_WRITTEN.labels(source.name, "journal").inc(written)
+        if fingerprints is not None and ch.index == 1:
+            fingerprints.record(book_id, src, ch.body)
+        return compressed, raw_len
 
-        if len(pending_chapters) >= flush_every:
+    try:
+        t_fetch = time.perf_counter()
+        async for ch in source.fetch_chapters(meta, existing, bundle_path):
+            trace_record("fetch", src, t_fetch, book_id, index=ch.index)
+            CHAPTERS.labels(source.name, "fetched").inc()
+            compressed, raw_len = await asyncio.to_thread(_compress_and_journal, ch)
+            CHAPTERS.labels(source.name, "compressed").inc()
+            pending_chapters[ch.index] = (
+                compressed,
+                raw_len,
+                ch.title,
+                ch.slug,
+                ch.word_count,
+                ch.chapter_id,
+            )
+            existing.add(ch.index)
+            stats["saved"] += 1
+            chapter_progress.update(chapter_task_id, advance=1)
+
+            now = time.time()
+            if (flush_every > 0 and len(pending_chapters) >= flush_every) or (
+                checkpoint_interval > 0 and now - last_checkpoint >= checkpoint_interval
+            ):
+                await _flush_checkpoint(
+                    db_path, book_id, bundle_path, pending_chapters, lock,
+                    source.name,
+                )
+                await asyncio.to_thread(journal.reset)
+                pending_chapters.clear()
+                last_checkpoint = now
+                elapsed = now - start_time
+                rate = stats["saved"] / elapsed if elapsed > 0 else 0
+                log_detail(
+                    f"  CHECKPOINT {book_id}[{ch.index}/{api_chapter_count}]: "
+                    f"+{stats['saved']} chapters ({rate:.1f}/s)"
+                )
+            t_fetch = time.perf_counter()
+
+        # 4. Final flush
+        if pending_chapters:
             await _flush_checkpoint(
-                db_path, book_id, bundle_path, pending_chapters, lock
+                db_path, book_id, bundle_path, pending_chapters, lock,
+                source.name,
             )
             pending_chapters.clear()
-            elapsed = time.time() - start_time
-            rate = stats["saved"] / elapsed if elapsed > 0 else 0
-            log_detail(
-                f"  CHECKPOINT {book_id}[{ch.index}/{api_chapter_count}]: "
-                f"+{stats['saved']} chapters ({rate:.1f}/s)"
-            )
+        await asyncio.to_thread(journal.remove)
+    finally:
+        # On error / cancellation the journal stays on disk for replay
+        journal.close()
 
-    # 4. Final flush
-    if pending_chapters:
-        await _flush_checkpoint(db_path, book_id, bundle_path, pending_chapters, lock)
-        pending_chapters.clear()
-
-    # 5. Update book metadata in DB (final — with cover + chapters_saved)
+    # 5. Update book metadata in DB (final — with chapters_saved; an
+    # existing cover_url is kept, the cover stage fills in new ones)
     total_saved = len(read_bundle_indices(bundle_path))
 
-    # Pull cover
-    cover_url = await source.download_cover(book_id, meta, str(COVERS_DIR))
-    stats["cover"] = cover_url is not None
-
     async with lock:
-        db = open_db(db_path)
-        try:
-            upsert_book_metadata(
-                db,
-                meta,
-                cover_url,
-                total_saved,
-                meta_hash,
-                source=source.name,
-            )
-            db.commit()
-        finally:
-            db.close()
+        with span("db_meta", src, book_id):
+            db = open_db(db_path)
+            try:
+                upsert_book_metadata(
+                    db,
+                    meta,
+                    None,
+                    total_saved,
+                    meta_hash,
+                    source=source.name,
+                )
+                db.commit()
+            finally:
+                db.close()
+
+    if covers is not None:
+        covers.submit(book_id, meta)
 
     elapsed = time.time() - start_time
     rate = stats["saved"] / elapsed if elapsed > 0 else 0
@@ -606,7 +783,6 @@ async def ingest_book(
         f'DONE {book_id} "{book_name}": +{stats["saved"]} chapters '
         f"({total_saved} total), {stats['errors']} errors, "
         f"{elapsed:.0f}s ({rate:.1f}/s)"
-        f"{', cover OK' if stats['cover'] else ''}"
     )
 
     return stats
@@ -618,10 +794,12 @@ async def _flush_checkpoint(
     bundle_path: str,
     pending: dict[int, tuple[bytes, int, str, str, int, int]],
     lock: asyncio.Lock,
+    source_name: str = "",
 ) -> None:
     """Commit pending chapters to DB and merge into v2 bundle.
 
-    DB transaction commits first; bundle flush follows.
+    DB transaction commits first; bundle flush follows.  The bundle is
+    fsync-ed so the caller can drop the chapters from the book's journal.
     """
     # Prepare chapter metadata for DB (title, slug, word_count, chapter_id)
     ch_db_meta: dict[int, tuple[str, str, int, int]] = {}
@@ -639,12 +817,15 @@ async def _flush_checkpoint(
 
     async with lock:
         # DB commit
+        t0 = time.perf_counter()
         db = open_db(db_path)
         try:
             insert_chapters(db, book_id, ch_db_meta)
             db.commit()
         finally:
             db.close()
+        DB_COMMIT.labels(source_name).observe(time.perf_counter() - t0)
+        trace_record("db_commit", source_name, t0, book_id, chapters=len(pending))
 
     # Bundle merge + write (can run outside lock — file is per-book)
     def _merge_and_write():
@@ -652,9 +833,102 @@ async def _flush_checkpoint(
         existing_meta = read_bundle_meta(bundle_path)
         existing_data.update(ch_data)
         existing_meta.update(ch_bundle_meta)
-        write_bundle(bundle_path, existing_data, existing_meta)
+        write_bundle(bundle_path, existing_data, existing_meta, fsync=True)
 
+    t0 = time.perf_counter()
     await asyncio.to_thread(_merge_and_write)
+    BUNDLE_WRITE.labels(source_name).observe(time.perf_counter() - t0)
+    trace_record("bundle_write", source_name, t0, book_id, chapters=len(pending))
+    BYTES_WRITTEN.labels(source_name, "bundle").inc(os.path.getsize(bundle_path))
+    CHAPTERS.labels(source_name, "persisted").inc(len(pending))
+
+
+# ─── Journal Replay ───────────────────────────────────────────────────────────
+
+
+def replay_journal(db_path: str, path: Path) -> int:
+    """Merge one leftover chapter journal into its bundle and DB, then delete it.
+
+    Chapter rows are only inserted when the book row exists; otherwise the
+    next ingest of the book recovers them from bundle metadata (RECOVER).
+    Returns the number of chapters recovered.
+    """
+    try:
+        book_id, entries = read_journal(path)
+    except JournalError as e:
+        # Crashed while writing the header — there is nothing to recover
+        log_detail(f"JOURNAL {path.name}: discarded — {e}")
+        path.unlink(missing_ok=True)
+        return 0
+
+    if entries:
+        bundle_path = str(COMPRESSED_DIR / f"{book_id}.bundle")
+        total = merge_into_bundle(bundle_path, entries)
+        db = open_db(db_path)
+        try:
+            if db.execute("SELECT 1 FROM books WHERE id = ?", (book_id,)).fetchone():
+                insert_chapters(
+                    db,
+                    book_id,
+                    {
+                        idx: (e.title, e.slug, e.word_count, e.chapter_id)
+                        for idx, e in entries.items()
+                    },
+                )
+                update_chapters_saved(db, book_id, total)
+                db.commit()
+        finally:
+            db.close()
+        log_detail(
+            f"JOURNAL {book_id}: replayed {len(entries)} chapters "
+            f"({total} in bundle)"
+        )
+
+    path.unlink(missing_ok=True)
+    return len(entries)
+
+
+def journal_dir(source_name: str) -> Path:
+    """Journal directory of one source (``data/journal/{source}``)."""
+    return JOURNAL_DIR / source_name
+
+
+def fingerprints_path() -> Path:
+    """Chapter-1 fingerprint store for this run's database.
+
+    ``FINGERPRINTS_PATH`` (see :mod:`src.dedup`) unless the run is on a
+    scratch ``DATABASE_PATH`` without that override: its fingerprints
+    then go next to the scratch database, away from the library's.
+    """
+    if "FINGERPRINTS_PATH" in os.environ:
+        return FINGERPRINTS_PATH
+    if DB_PATH.resolve() == LIBRARY_DB_PATH.resolve():
+        return FINGERPRINTS_PATH
+    return DB_PATH.parent / FINGERPRINTS_PATH.name
+
+
+def replay_journals(db_path: str, source_name: str) -> tuple[int, int]:
+    """Replay the journals an interrupted *source_name* run left behind.
+
+    Covers ``data/journal/{source}/`` plus journals of the source's book ID
+    range in ``data/journal/`` itself (written before journals were split
+    by source).  The caller must hold the source's :class:`JournalDirLock`
+    so no live run owns these journals.
+    Returns ``(books, chapters)`` recovered.
+    """
+    lo, hi = _SOURCE_ID_RANGES.get(source_name, (0, 0))
+    legacy = [
+        path
+        for path in list_journals(JOURNAL_DIR)
+        if path.stem.isdigit() and lo <= int(path.stem) < hi
+    ]
+    books = chapters = 0
+    for path in legacy + list_journals(journal_dir(source_name)):
+        n = replay_journal(db_path, path)
+        if n:
+            books += 1
+            chapters += n
+    return books, chapters
 
 
 # ─── Worker Pool ──────────────────────────────────────────────────────────────
@@ -667,32 +941,114 @@ async def run_ingest(
     dry_run: bool,
     source_name: str = "mtc",
     fix_mode: bool = False,
+    checkpoint_interval: float = 0,
+    http2: bool = False,
+    transport: httpx.AsyncBaseTransport | None = None,
+    max_books: int = 64,
+    target_inflight: int | None = None,
+    order: str = "plan",
+    metrics_port: int = 0,
+    metrics_host: str = "127.0.0.1",
+    cover_workers: int = DEFAULT_COVER_WORKERS,
+    cover_per_host: int = DEFAULT_COVER_PER_HOST,
+    thumb_formats: tuple[str, ...] = THUMB_FORMATS,
+    daemon: bool = False,
+    reload_every: float = 300.0,
+    min_chapters: int = 0,
 ) -> None:
-    """Run the ingest pipeline with a worker pool."""
+    """Run the ingest pipeline.
+
+    Books share one source instance and HTTP connection pool.  A
+    :class:`BookScheduler` keeps at least *workers* books in progress and
+    starts more (up to *max_books*) while fewer than *target_inflight*
+    requests are in flight (default: the source's concurrency limit).
+    Books are started in *order* (see :mod:`src.priority`).
+    With *metrics_port* set, Prometheus metrics are served on
+    ``http://<metrics_host>:<metrics_port>/metrics`` while books run.
+    *transport* replaces the network under the shared client (record /
+    replay, see :mod:`src.httpreplay`).
+    Covers are downloaded by a background :class:`CoverStage` with
+    *cover_workers* tasks and *cover_per_host* requests per image host
+    (``cover_workers=0`` skips covers).  Each saved cover gets 150/300 px
+    thumbnails in *thumb_formats* from a :class:`ThumbnailPool` (empty =
+    no thumbnails).
+
+    With *daemon* set the run does not end with the plan: every book is
+    kept in a :class:`~src.daemon.CheckQueue` and re-checked when its
+    next-check time comes due, the plan store is re-read every
+    *reload_every* seconds for added, grown (``chapter_count`` >=
+    *min_chapters*) and removed books, and SIGTERM / SIGINT stop the run
+    once the books in progress have finished.
+    """
     total_books = len(entries)
     db_path = str(DB_PATH)
+    src_cfg = _SOURCE_DEFAULTS.get(source_name, _SOURCE_DEFAULTS["mtc"])
+    max_concurrent = src_cfg["max_concurrent"]
+    if target_inflight is None:
+        target_inflight = max_concurrent
+
+    triggers = []
+    if flush_every > 0:
+        triggers.append(f"{flush_every} chapters")
+    if checkpoint_interval > 0:
+        triggers.append(format_duration(checkpoint_interval))
+    checkpoint_desc = (
+        f"checkpoint every {' / '.join(triggers)}" if triggers else "checkpoint per book"
+    )
 
     console.print(
         f"\n[bold]book-ingest[/bold] ({source_name}) — {format_num(total_books)} books, "
-        f"{workers} workers, flush every {flush_every} chapters"
+        f"{workers}-{max(workers, max_books)} books in flight, {checkpoint_desc}"
         f"{' [yellow](dry run)[/yellow]' if dry_run else ''}"
         f"{' [cyan](fix mode)[/cyan]' if fix_mode else ''}\n"
-        f"  Workers: {workers}\n"
-        f"  Source:  {source_name}\n"
+        f"  Books:   {workers} min, {max(workers, max_books)} max, "
+        f"target {target_inflight}/{max_concurrent} requests in flight\n"
+        f"  Order:   {order}\n"
+        + (
+            f"  Daemon:  per-book next checks, plan reload every "
+            f"{format_duration(reload_every)}\n"
+            if daemon
+            else ""
+        )
+        + f"  Source:  {source_name}\n"
         f"  DB:      {DB_PATH}\n"
         f"  Bundles: {COMPRESSED_DIR}\n"
         f"  Plan: {SCRIPT_DIR / 'data' / (PLAN_PREFIX + source_name + '.json')}  \n"
         f"  Covers:  {COVERS_DIR}\n"
-        f"  Log:     {DETAIL_LOG}\n"
+        f"  Log:     {_detail_log.path}\n"
+        + (
+            f"  Metrics: http://{metrics_host}:{metrics_port}/metrics\n"
+            if metrics_port
+            else ""
+        )
     )
 
     log_detail("=" * 60)
     log_detail(
         f"Ingest started — {total_books} books, workers={workers}"
+        f"{', daemon' if daemon else ''}"
         f"{', dry-run' if dry_run else ''}"
     )
     log_detail("=" * 60)
 
+    # Recover chapters fetched by an interrupted run but never checkpointed.
+    # The journal lock is held until run_ingest returns: a second run of
+    # the same source would replay (and overwrite) this run's journals.
+    journal_lock = JournalDirLock(journal_dir(source_name))
+    if not dry_run:
+        if not journal_lock.acquire():
+            console.print(
+                f"[red]Error:[/red] another {source_name} ingest is running "
+                f"(journal lock {journal_lock.path} is held)"
+            )
+            return
+        jbooks, jchapters = replay_journals(db_path, source_name)
+        if jbooks:
+            console.print(
+                f"  [cyan]Replayed {format_num(jchapters)} journalled chapters "
+                f"into {format_num(jbooks)} bundles[/cyan]\n"
+            )
+
     # Init compressor
     compressor = ChapterCompressor(str(DICT_PATH))
 
@@ -713,13 +1069,13 @@ async def run_ingest(
 
     # ── Fix mode pre-audit: scan bundles for gaps ───────────────────────
     if fix_mode:
-        # Enrich entries from the plan file to get accurate chapter_count.
+        # Enrich entries from the plan to get accurate chapter_count.
         # The DB may have an inflated estimate (e.g. 2500 from detail page
         # pagination) while the plan has the exact listing count (e.g. 2489).
-        plan_path = SCRIPT_DIR / "data" / f"books_plan_{source_name}.json"
-        if plan_path.exists():
-            plan_data = load_plan(str(plan_path))
-            plan_by_id = {e["id"]: e for e in plan_data}
+        # Only the plan rows of the books being fixed are read.
+        with open_plan_store(source_name) as store:
+            plan_by_id = store.get_many(source_name, [e["id"] for e in entries])
+        if plan_by_id:
             enriched_count = 0
             for e in entries:
                 plan_entry = plan_by_id.get(e["id"])
@@ -738,6 +1094,12 @@ async def run_ingest(
                 )
 
         console.print("[bold cyan]Fix mode: auditing bundles for gaps...[/bold cyan]")
+        # Gaps here are counted against 1..chapter_count.  Sources with a
+        # chapter list (TTV/TF) may list fewer (VIP tail) or more chapters,
+        # so for them the audit is only an estimate: no book is dropped by
+        # it and ingest_book() checks each bundle against the real list.
+        estimated = has_chapter_list(source_name)
+        approx = "~" if estimated else ""
         total_gaps = 0
         books_with_gaps = 0
         books_complete = 0
@@ -761,9 +1123,16 @@ async def run_ingest(
                 books_complete += 1
 
         console.print(f"  Books scanned:         {format_num(len(entries))}")
-        console.print(f"  Already complete:      {format_num(books_complete)}")
-        console.print(f"  With gaps:             {format_num(books_with_gaps)}")
-        console.print(f"  Total chapters to fix: [bold]{format_num(total_gaps)}[/bold]")
+        console.print(f"  Already complete:      {approx}{format_num(books_complete)}")
+        console.print(f"  With gaps:             {approx}{format_num(books_with_gaps)}")
+        console.print(
+            f"  Total chapters to fix: [bold]{approx}{format_num(total_gaps)}[/bold]"
+        )
+        if estimated:
+            console.print(
+                "  [dim]Estimated from chapter_count; each book's chapter list "
+                "decides what is fetched[/dim]"
+            )
 
         if audit_rows:
             audit_rows.sort(key=lambda r: -r[4])
@@ -775,38 +1144,53 @@ async def run_ingest(
             if len(audit_rows) > 15:
                 console.print(f"    [dim]... and {len(audit_rows) - 15} more[/dim]")
 
-        if total_gaps == 0:
+        if total_gaps == 0 and not estimated:
             console.print("\n[green]All books are complete. Nothing to fix.[/green]")
             return
 
-        # Filter to only books with gaps; update totals for progress bar
-        gap_book_ids = {r[0] for r in audit_rows}
-        entries = [e for e in entries if e["id"] in gap_book_ids]
-        total_books = len(entries)
+        if not estimated:
+            # Filter to only books with gaps; update totals for progress bar
+            gap_book_ids = {r[0] for r in audit_rows}
+            entries = [e for e in entries if e["id"] in gap_book_ids]
+            total_books = len(entries)
         est_chapters = total_gaps
         console.print(
             f"\n  Proceeding with {format_num(total_books)} books, "
-            f"{format_num(est_chapters)} chapters to download.\n"
+            f"{approx}{format_num(est_chapters)} chapters to download.\n"
         )
 
+    # Priority queue of books — gap-based policies read each bundle header
+    def bundle_count(e: dict) -> int:
+        return read_bundle_count(str(COMPRESSED_DIR / f"{e['id']}.bundle"))
+
+    if daemon:
+        # Books with missing chapters first (in *order*), the rest spread
+        # over their first check interval
+        plan_queue = CheckQueue()
+        backlog = plan_queue.load(entries, order, have=bundle_count)
+        console.print(
+            f"  [cyan]Daemon: {format_num(backlog)} books due now, "
+            f"{format_num(total_books - backlog)} scheduled[/cyan]\n"
+        )
+    else:
+        plan_queue = PlanQueue(entries, order, have=bundle_count)
+
     start_time = time.time()
     lock = asyncio.Lock()  # protects DB access
+    # Synthetic bench books must never become dedup candidates
+    fingerprints = (
+        None
+        if dry_run or source_name == "bench"
+        else FingerprintStore(fingerprints_path())
+    )
 
     # Stats
     total_saved = 0
     total_skipped = 0
     total_errors = 0
-    total_covers = 0
     books_processed = 0
     progress_interval = max(10, total_books // 20)
-
-    # Queue of entries
-    queue: asyncio.Queue[dict | None] = asyncio.Queue()
-    for entry in entries:
-        queue.put_nowait(entry)
-    # Sentinel values for workers
-    for _ in range(workers):
-        queue.put_nowait(None)
+    stopping = False
 
     with Progress(
         SpinnerColumn(),
@@ -818,80 +1202,223 @@ async def run_ingest(
         TimeRemainingColumn(),
         console=console,
     ) as progress:
-        book_task = progress.add_task("[cyan]Books", total=total_books)
+        # A daemon has no end, so its bars count up without a total
+        book_task = progress.add_task(
+            "[cyan]Checks" if daemon else "[cyan]Books",
+            total=None if daemon else total_books,
+        )
         ch_label = "[cyan]Fixing" if fix_mode else "[green]Chapters"
-        chapter_task = progress.add_task(ch_label, total=max(est_chapters, 1))
+        chapter_task = progress.add_task(
+            ch_label, total=None if daemon else max(est_chapters, 1)
+        )
 
-        async def worker():
-            nonlocal total_saved, total_skipped, total_errors, total_covers
+        async def run_book(entry: dict) -> None:
+            nonlocal total_saved, total_skipped, total_errors
             nonlocal books_processed
 
-            src_cfg = _SOURCE_DEFAULTS.get(source_name, _SOURCE_DEFAULTS["mtc"])
-            mc = max(5, src_cfg["max_concurrent"] // workers)
+            stats = None
+            try:
+                with span("book", source_name, entry["id"]):
+                    stats = await ingest_book(
+                        source=source,
+                        entry=entry,
+                        compressor=compressor,
+                        db_path=db_path,
+                        flush_every=flush_every,
+                        dry_run=dry_run,
+                        book_progress=progress,
+                        book_task_id=book_task,
+                        chapter_progress=progress,
+                        chapter_task_id=chapter_task,
+                        lock=lock,
+                        fix_mode=fix_mode,
+                        checkpoint_interval=checkpoint_interval,
+                        covers=covers,
+                        fingerprints=fingerprints,
+                    )
+                total_saved += max(stats["saved"], 0)
+                total_skipped += max(stats["skipped"], 0)
+                total_errors += max(stats["errors"], 0)
+                if stats["errors"] < 0:
+                    outcome = "error"
+                elif stats["saved"] > 0:
+                    outcome = "done"
+                else:
+                    outcome = "skipped"
+                BOOKS.labels(source_name, outcome).inc()
+            except Exception as e:
+                log_detail(f"FAIL {entry['id']}: {e}")
+                total_errors += 1
+                BOOKS.labels(source_name, "error").inc()
+
+            books_processed += 1
+            progress.update(book_task, advance=1)
+
+            if daemon:
+                plan_queue.reschedule(
+                    entry["id"],
+                    saved=max(stats["saved"], 0) if stats else 0,
+                    chapter_count=stats["chapter_count"] if stats else 0,
+                )
+                if books_processed % progress_interval == 0:
+                    log_daemon_status()
+                return
+
+            # Periodic progress log — write to detail log AND console
+            if books_processed % progress_interval == 0:
+                elapsed = time.time() - start_time
+                pct = (books_processed / total_books) * 100
+                books_per_sec = books_processed / elapsed if elapsed > 0 else 0
+                remaining = (
+                    (total_books - books_processed) / books_per_sec
+                    if books_per_sec > 0
+                    else 0
+                )
+                limiter = source.limiter
+                load = (
+                    f", {scheduler.active} books / "
+                    f"{limiter.in_flight} requests in flight"
+                    if limiter is not None
+                    else ""
+                )
+                progress_msg = (
+                    f"PROGRESS: {format_num(books_processed)}/{format_num(total_books)} "
+                    f"books ({pct:.1f}%), +{format_num(total_saved)} chapters, "
+                    f"{format_num(total_errors)} errors, "
+                    f"elapsed {format_duration(elapsed)}, "
+                    f"ETA {format_duration(remaining)}{load}"
+                )
+                log_detail(progress_msg)
+                console.print(f"  [dim]{progress_msg}[/dim]")
+
+        def log_daemon_status() -> None:
+            next_at = plan_queue.next_due()
+            wait = max(next_at - time.time(), 0) if next_at is not None else 0
+            msg = (
+                f"DAEMON: {format_num(books_processed)} checks, "
+                f"+{format_num(total_saved)} chapters, "
+                f"{format_num(total_errors)} errors, "
+                f"{format_num(len(plan_queue))} books scheduled, "
+                f"{scheduler.active} in progress, next check in "
+                f"{format_duration(wait)}, up {format_duration(time.time() - start_time)}"
+            )
+            log_detail(msg)
+            console.print(f"  [dim]{msg}[/dim]")
+
+        async def reload_plan() -> None:
+            """Merge plan store changes into the check queue (daemon)."""
+            since = time.time()
+            while True:
+                await asyncio.sleep(reload_every)
+                started = time.time()
+                try:
+                    changed, ids = await asyncio.to_thread(
+                        read_plan_changes, source_name, since, min_chapters
+                    )
+                except Exception as e:
+                    log_detail(f"DAEMON: plan reload failed — {e}")
+                    continue
+                since = started
+                due = sum(plan_queue.update(e) for e in changed)
+                # An empty plan is a store being rebuilt, not a plan to follow
+                removed = plan_queue.retain(ids) if ids else 0
+                if changed or removed:
+                    log_detail(
+                        f"DAEMON: plan reload — {len(changed)} changed "
+                        f"({due} due now), {removed} removed"
+                    )
+
+        def stop() -> None:
+            nonlocal stopping
+            if not stopping:
+                stopping = True
+                log_detail("DAEMON: stopping after the books in progress")
+                console.print(
+                    "\n[yellow]Stopping — waiting for books in progress...[/yellow]"
+                )
+            plan_queue.close()
+
+        # One source (one limiter, one connection pool) shared by every book
+        # in progress; the scheduler adds books while it has spare capacity.
+        async with create_http_client(
+            source_name, max_concurrent=max_concurrent, http2=http2, transport=transport
+        ) as http_client:
             source = create_source(
                 source_name,
-                max_concurrent=mc,
+                max_concurrent=max_concurrent,
                 request_delay=src_cfg["request_delay"],
+                http_client=http_client,
             )
             async with source:
-                while True:
-                    entry = await queue.get()
-                    if entry is None:
-                        break
-
-                    try:
-                        stats = await ingest_book(
-                            source=source,
-                            entry=entry,
-                            compressor=compressor,
-                            db_path=db_path,
-                            flush_every=flush_every,
-                            dry_run=dry_run,
-                            book_progress=progress,
-                            book_task_id=book_task,
-                            chapter_progress=progress,
-                            chapter_task_id=chapter_task,
-                            lock=lock,
-                            fix_mode=fix_mode,
-                        )
-                        total_saved += max(stats["saved"], 0)
-                        total_skipped += max(stats["skipped"], 0)
-                        total_errors += max(stats["errors"], 0)
-                        if stats.get("cover"):
-                            total_covers += 1
-                    except Exception as e:
-                        log_detail(f"FAIL {entry['id']}: {e}")
-                        total_errors += 1
-
-                    books_processed += 1
-                    progress.update(book_task, advance=1)
-
-                    # Periodic progress log — write to detail log AND console
-                    if books_processed % progress_interval == 0:
-                        elapsed = time.time() - start_time
-                        pct = (books_processed / total_books) * 100
-                        books_per_sec = books_processed / elapsed if elapsed > 0 else 0
-                        remaining = (
-                            (total_books - books_processed) / books_per_sec
-                            if books_per_sec > 0
-                            else 0
-                        )
-                        progress_msg = (
-                            f"PROGRESS: {format_num(books_processed)}/{format_num(total_books)} "
-                            f"books ({pct:.1f}%), +{format_num(total_saved)} chapters, "
-                            f"{format_num(total_errors)} errors, "
-                            f"elapsed {format_duration(elapsed)}, "
-                            f"ETA {format_duration(remaining)}"
-                        )
-                        log_detail(progress_msg)
-                        console.print(f"  [dim]{progress_msg}[/dim]")
-
-        # Launch workers
-        tasks = [asyncio.create_task(worker()) for _ in range(workers)]
-        await asyncio.gather(*tasks)
+                thumbs = (
+                    ThumbnailPool(str(COVERS_DIR), formats=thumb_formats)
+                    if thumb_formats and cover_workers > 0 and not dry_run
+                    else None
+                )
+                covers = (
+                    CoverStage(
+                        source,
+                        str(COVERS_DIR),
+                        db_path,
+                        lock,
+                        workers=cover_workers,
+                        per_host=cover_per_host,
+                        thumbs=thumbs,
+                    )
+                    if cover_workers > 0 and not dry_run
+                    else None
+                )
+                scheduler = BookScheduler(
+                    source,
+                    run_book,
+                    min_books=workers,
+                    max_books=max_books,
+                    target_inflight=target_inflight,
+                )
+                BOOKS_IN_FLIGHT.set_function(lambda: scheduler.active)
+                QUEUE_DEPTH.set_function(lambda: len(plan_queue))
+                if source.limiter is not None:
+                    REQUESTS_IN_FLIGHT.set_function(lambda: source.limiter.in_flight)
+                    REQUESTS_WAITING.set_function(lambda: source.limiter.waiting)
+                if covers is not None:
+                    COVER_QUEUE_DEPTH.set_function(lambda: len(covers))
+                metrics_server = (
+                    await start_metrics_server(metrics_port, metrics_host)
+                    if metrics_port
+                    else None
+                )
+                reloader = None
+                if daemon:
+                    loop = asyncio.get_running_loop()
+                    for sig in (signal.SIGTERM, signal.SIGINT):
+                        loop.add_signal_handler(sig, stop)
+                    reloader = asyncio.create_task(reload_plan())
+                try:
+                    await scheduler.run(plan_queue)
+                    if covers is not None:
+                        if len(covers):
+                            log_detail(f"Waiting for {len(covers)} covers")
+                        await covers.close()
+                finally:
+                    if reloader is not None:
+                        reloader.cancel()
+                        for sig in (signal.SIGTERM, signal.SIGINT):
+                            loop.remove_signal_handler(sig)
+                    if covers is not None:
+                        await covers.close(wait=False)
+                    if thumbs is not None:
+                        await asyncio.to_thread(thumbs.close)
+                    if fingerprints is not None:
+                        fingerprints.close()
+                    if metrics_server is not None:
+                        metrics_server.close()
+                        await metrics_server.wait_closed()
 
     # Summary
     elapsed = time.time() - start_time
+    total_covers = covers.saved if covers is not None else 0
+    if daemon:
+        total_books = books_processed  # checks, counting repeats
 
     log_detail("=" * 60)
     log_detail(
@@ -899,7 +1426,10 @@ async def run_ingest(
         f"{format_num(total_skipped)} skipped, {total_errors} errors, "
         f"{total_covers} covers"
     )
-    log_detail(f"Duration: {format_duration(elapsed)}")
+    log_detail(
+        f"Duration: {format_duration(elapsed)}, "
+        f"peak {scheduler.peak_books} books in progress"
+    )
     log_detail("=" * 60 + "\n")
 
     log_summary(
@@ -942,7 +1472,22 @@ def parse_args() -> argparse.Namespace:
         "--workers",
         type=int,
         default=5,
-        help="Number of parallel workers (default: 5)",
+        help="Minimum number of books in progress (default: 5); more are "
+        "started while the source has spare request capacity",
+    )
+    parser.add_argument(
+        "--max-books",
+        type=int,
+        default=64,
+        help="Maximum number of books in progress at once (default: 64); "
+        "bounds memory, open journals and bundle rewrites",
+    )
+    parser.add_argument(
+        "--target-inflight",
+        type=int,
+        default=None,
+        help="Keep starting books while fewer than N chapter requests are in "
+        "flight (default: the source's concurrency limit)",
     )
     parser.add_argument(
         "--plan",
@@ -953,8 +1498,46 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--flush-every",
         type=int,
-        default=100,
-        help="Checkpoint interval in chapters (default: 100)",
+        default=0,
+        help="Also checkpoint (bundle + DB write) every N chapters "
+        "(default: 0 = only on --checkpoint-interval and at book end). "
+        "Fetched chapters are journalled, so rare checkpoints lose nothing.",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=300,
+        help="Checkpoint a book in progress at least every N seconds "
+        "(default: 300, 0 = only at book end)",
+    )
+    parser.add_argument(
+        "--order",
+        choices=list(ORDER_POLICIES),
+        default="plan",
+        help="Book order: plan (file order, default), gap (most missing "
+        "chapters first), popularity, freshness (newest updates first), "
+        "sjf (fewest missing first) or weighted (gap x popularity x freshness)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run continuously: re-check each plan book when its next-check "
+        "time (from its release cadence and status) comes due, instead of "
+        "one pass over the plan per run.  Stops on SIGTERM/SIGINT.",
+    )
+    parser.add_argument(
+        "--reload-every",
+        type=float,
+        default=300,
+        metavar="SECONDS",
+        help="(--daemon) Re-read the plan store for added, grown and removed "
+        "books every N seconds (default: 300)",
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Use HTTP/2 for the shared upstream connection pool "
+        "(requires the optional 'h2' package)",
     )
     parser.add_argument(
         "--audit-only",
@@ -1006,11 +1589,256 @@ def parse_args() -> argparse.Namespace:
         "Audits each bundle for gaps and fills them. "
         "Works with plan files and explicit book IDs, all sources.",
     )
+    parser.add_argument(
+        "--log-format",
+        choices=list(LOG_FORMATS),
+        default="text",
+        help="Detail log format: text (data/ingest-detail.log, default) or "
+        "json (JSON lines in data/ingest-detail.jsonl)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=0,
+        help="Serve Prometheus metrics on this port at /metrics while "
+        "ingesting (default: 0 = off)",
+    )
+    parser.add_argument(
+        "--metrics-host",
+        default="127.0.0.1",
+        help="Interface for --metrics-port (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--cover-workers",
+        type=int,
+        default=DEFAULT_COVER_WORKERS,
+        metavar="N",
+        help="Concurrent cover downloads in the background cover stage "
+        f"(default: {DEFAULT_COVER_WORKERS}; 0 = skip covers)",
+    )
+    parser.add_argument(
+        "--cover-per-host",
+        type=int,
+        default=DEFAULT_COVER_PER_HOST,
+        metavar="N",
+        help="Concurrent cover requests per image host "
+        f"(default: {DEFAULT_COVER_PER_HOST})",
+    )
+    parser.add_argument(
+        "--thumb-formats",
+        default=",".join(THUMB_FORMATS),
+        metavar="LIST",
+        help="Cover thumbnail formats, comma-separated: "
+        f"{', '.join(SUPPORTED_FORMATS)} or 'none' (default: {','.join(THUMB_FORMATS)}); "
+        "needs Pillow",
+    )
+    parser.add_argument(
+        "--bench-books",
+        type=int,
+        default=1000,
+        metavar="N",
+        help="(--source bench) Synthetic books to generate when no plan or "
+        "IDs are given (default: 1000)",
+    )
+    parser.add_argument(
+        "--bench-chapters",
+        type=int,
+        default=300,
+        metavar="N",
+        help="(--source bench) Mean chapters per book, long-tailed (default: 300)",
+    )
+    parser.add_argument(
+        "--bench-words",
+        type=int,
+        default=2500,
+        metavar="N",
+        help="(--source bench) Mean words per chapter (default: 2500)",
+    )
+    parser.add_argument(
+        "--bench-latency",
+        type=float,
+        default=0.0,
+        metavar="S",
+        help="(--source bench) Simulated fetch time per chapter (default: 0)",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="Record every upstream response into a cassette file (SQLite) "
+        "for later --replay",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="Serve upstream responses from a --record cassette instead of "
+        "the network",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        default=0.0,
+        metavar="S",
+        help="(--replay) Seconds of latency added to every response (default: 0)",
+    )
+    parser.add_argument(
+        "--replay-jitter",
+        type=float,
+        default=0.0,
+        metavar="S",
+        help="(--replay) Extra random latency up to S seconds (default: 0)",
+    )
+    parser.add_argument(
+        "--replay-errors",
+        type=float,
+        default=0.0,
+        metavar="RATE",
+        help="(--replay) Fraction of requests that fail (default: 0)",
+    )
+    parser.add_argument(
+        "--replay-error-kinds",
+        default=",".join(ERROR_KINDS),
+        metavar="KINDS",
+        help=f"(--replay) Comma-separated failures to inject (default: "
+        f"{','.join(ERROR_KINDS)})",
+    )
+    parser.add_argument(
+        "--replay-seed",
+        type=int,
+        default=None,
+        help="(--replay) Random seed for reproducible latency and failures",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="Write per-book phase timings (JSON lines) to PATH and print "
+        "a profile report at the end of the run",
+    )
+    parser.add_argument(
+        "--profile-report",
+        metavar="TRACE",
+        help="Print p50/p95/total per phase and source from a --trace file, "
+        "then exit",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Sample-profile the run: write collapsed stacks (flamegraph input) "
+        "to PATH (default: data/profile/ingest-<time>.collapsed) and a top-N summary to PATH.top.txt",
+    )
     return parser.parse_args()
 
 
 def main():
+    global JOURNAL_DIR
     args = parse_args()
+    set_detail_log_format(args.log_format)
+
+    if args.profile_report:
+        print_profile_report(args.profile_report)
+        return
+    if args.profile is not None:
+        start_profiling(
+            args.profile or default_output(SCRIPT_DIR / "data" / "profile", "ingest")
+        )
+
+    if args.http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            console.print(
+                "[red]Error:[/red] --http2 needs the 'h2' package.\n"
+                "  Install: pip install 'httpx[http2]'"
+            )
+            sys.exit(1)
+
+    if args.record and args.replay:
+        console.print("[red]Error:[/red] --record and --replay are mutually exclusive.")
+        sys.exit(1)
+    if args.replay and not Path(args.replay).exists():
+        console.print(f"[red]Error:[/red] Cassette not found: {args.replay}")
+        sys.exit(1)
+    bad_kinds = set(args.replay_error_kinds.split(",")) - set(ERROR_KINDS) - {""}
+    if bad_kinds:
+        console.print(
+            f"[red]Error:[/red] Unknown --replay-error-kinds {sorted(bad_kinds)}; "
+            f"expected {', '.join(ERROR_KINDS)}"
+        )
+        sys.exit(1)
+
+    if args.daemon:
+        conflicts = [
+            flag
+            for flag, used in (
+                ("book IDs", bool(args.book_ids)),
+                ("--plan", bool(args.plan)),
+                ("--offset/--limit", bool(args.offset or args.limit)),
+                ("--fix", args.fix),
+                ("--force", args.force),
+                ("--audit-only", args.audit_only),
+                ("--update-meta-only", args.update_meta_only),
+                ("--source bench", args.source == "bench"),
+            )
+            if used
+        ]
+        if conflicts:
+            console.print(
+                "[red]Error:[/red] --daemon follows the whole plan store and cannot "
+                f"be combined with {', '.join(conflicts)}."
+            )
+            sys.exit(1)
+        if args.reload_every <= 0:
+            console.print("[red]Error:[/red] --reload-every must be > 0.")
+            sys.exit(1)
+
+    if args.cover_workers < 0 or args.cover_per_host < 1:
+        console.print(
+            "[red]Error:[/red] --cover-workers must be >= 0 and --cover-per-host >= 1."
+        )
+        sys.exit(1)
+
+    thumb_formats = [
+        f.strip().lower()
+        for f in args.thumb_formats.split(",")
+        if f.strip() and f.strip().lower() != "none"
+    ]
+    bad = [f for f in thumb_formats if f not in SUPPORTED_FORMATS]
+    if bad:
+        console.print(
+            f"[red]Error:[/red] unknown --thumb-formats {', '.join(bad)}; "
+            f"expected {', '.join(SUPPORTED_FORMATS)} or none"
+        )
+        sys.exit(1)
+    missing = unsupported_formats(thumb_formats)
+    if missing:
+        console.print(
+            f"[yellow]No {'/'.join(missing)} thumbnails:[/yellow] Pillow is not "
+            "installed or lacks the codec (pip install Pillow)"
+        )
+    args.thumb_formats = tuple(f for f in thumb_formats if f not in missing)
+
+    # Synthetic bench books must never land in the real library
+    if args.source == "bench":
+        live = [
+            name
+            for name, path, library in (
+                ("DATABASE_PATH", DB_PATH, LIBRARY_DB_PATH),
+                ("COMPRESSED_DIR", COMPRESSED_DIR, LIBRARY_COMPRESSED_DIR),
+            )
+            if path.resolve() == library.resolve()
+        ]
+        if live:
+            console.print(
+                "[red]Error:[/red] --source bench writes to the binslib library "
+                f"unless {' and '.join(live)} point at a scratch copy, e.g.\n"
+                "  DATABASE_PATH=/tmp/bench.db COMPRESSED_DIR=/tmp/bench/compressed "
+                "python3 ingest.py --source bench"
+            )
+            sys.exit(1)
+        if "JOURNAL_DIR" not in os.environ:
+            # Keep bench journals with the scratch bundles
+            JOURNAL_DIR = COMPRESSED_DIR.parent / "journal"
 
     # Validate paths
     if not DB_PATH.exists():
@@ -1033,11 +1861,26 @@ def main():
 
     if args.book_ids:
         entries = entries_from_ids(args.book_ids, source_name)
+    elif source_name == "bench" and not args.plan:
+        # Synthetic plan; its long tail of short books is part of the workload
+        from src.sources.bench import make_plan
+
+        args.min_chapters = 0
+        entries = make_plan(
+            args.bench_books,
+            args.bench_chapters,
+            args.bench_words,
+            args.bench_latency,
+        )[args.offset : (args.offset + args.limit) if args.limit else None]
     elif args.plan:
         entries = load_plan(args.plan, args.offset, args.limit)
-    elif default_plan.exists():
-        entries = load_plan(str(default_plan), args.offset, args.limit)
     else:
+        with open_plan_store(source_name) as store:
+            if store.has_plan(source_name):
+                entries = store.query(source_name, offset=args.offset, limit=args.limit)
+            else:
+                entries = None
+    if entries is None:
         console.print(
             "[red]Error:[/red] No book IDs provided and no plan file found.\n"
             f"  Expected: {default_plan}\n"
@@ -1123,6 +1966,8 @@ def main():
             bpath = COMPRESSED_DIR / f"{bid}.bundle"
             if bpath.exists():
                 os.remove(bpath)
+            # A leftover journal would otherwise be replayed into the new bundle
+            journal_path(journal_dir(source_name), bid).unlink(missing_ok=True)
             db.execute("DELETE FROM chapters WHERE book_id = ?", (bid,))
             # Reset chapters_saved so metadata reflects the wipe
             db.execute("UPDATE books SET chapters_saved = 0 WHERE id = ?", (bid,))
@@ -1138,19 +1983,20 @@ def main():
         # _plan_entry_to_meta() — name="?", slug="", chapter_count=0, no
         # author.  Enrich from the plan file so we get full metadata.
         if args.book_ids:
-            plan_path = args.plan or (
-                str(default_plan) if default_plan.exists() else None
-            )
-            if not plan_path:
-                console.print(
-                    "[red]Error:[/red] --update-meta-only with book IDs requires "
-                    "a plan file.\n"
-                    f"  Expected: {default_plan}\n"
-                    "  Run generate_plan.py first, or use --plan path/to/plan.json"
-                )
-                sys.exit(1)
-            plan_entries = load_plan(plan_path)
-            plan_by_id = {e["id"]: e for e in plan_entries}
+            if args.plan:
+                plan_by_id = {e["id"]: e for e in load_plan(args.plan)}
+            else:
+                with open_plan_store(source_name) as store:
+                    if not store.has_plan(source_name):
+                        console.print(
+                            "[red]Error:[/red] --update-meta-only with book IDs "
+                            "requires a plan file.\n"
+                            f"  Expected: {default_plan}\n"
+                            "  Run generate_plan.py first, or use --plan "
+                            "path/to/plan.json"
+                        )
+                        sys.exit(1)
+                    plan_by_id = store.get_many(source_name, args.book_ids)
             enriched: list[dict] = []
             for e in entries:
                 full = plan_by_id.get(e["id"])
@@ -1171,6 +2017,9 @@ def main():
     elif args.audit_only:
         asyncio.run(_run_audit_with_client(entries))
     else:
+        if args.trace:
+            start_trace(args.trace)
+        transport = build_transport(args, source_name)
         asyncio.run(
             run_ingest(
                 entries,
@@ -1179,8 +2028,77 @@ def main():
                 args.dry_run,
                 source_name,
                 fix_mode=fix_mode,
+                checkpoint_interval=args.checkpoint_interval,
+                http2=args.http2,
+                transport=transport,
+                max_books=args.max_books,
+                target_inflight=args.target_inflight,
+                order=args.order,
+                metrics_port=args.metrics_port,
+                metrics_host=args.metrics_host,
+                cover_workers=args.cover_workers,
+                cover_per_host=args.cover_per_host,
+                thumb_formats=args.thumb_formats,
+                daemon=args.daemon,
+                reload_every=args.reload_every,
+                min_chapters=args.min_chapters,
+            )
+        )
+        if isinstance(transport, RecordingTransport):
+            console.print(
+                f"  Recorded {format_num(transport.recorded)} responses → {args.record}"
             )
+        elif isinstance(transport, ReplayTransport):
+            console.print(
+                f"  Replayed {format_num(transport.hits)} responses from {args.replay}, "
+                f"{format_num(transport.misses)} not recorded, "
+                f"{format_num(transport.injected)} injected failures"
+            )
+        if args.trace:
+            stop_trace()
+            print_profile_report(args.trace)
+
+
+def build_transport(args: argparse.Namespace, source_name: str):
+    """Recording / replay transport for ``--record`` / ``--replay``, else ``None``."""
+    if args.record:
+        max_concurrent = _SOURCE_DEFAULTS.get(source_name, _SOURCE_DEFAULTS["mtc"])[
+            "max_concurrent"
+        ]
+        return RecordingTransport(
+            live_transport(max_concurrent, http2=args.http2), Cassette(args.record)
+        )
+    if args.replay:
+        kinds = tuple(k.strip() for k in args.replay_error_kinds.split(",") if k.strip())
+        return ReplayTransport(
+            Cassette(args.replay),
+            latency=args.replay_latency,
+            jitter=args.replay_jitter,
+            error_rate=args.replay_errors,
+            errors=kinds,
+            seed=args.replay_seed,
         )
+    return None
+
+
+def print_profile_report(trace_path: str) -> None:
+    """Print the per-phase timing table for a ``--trace`` file."""
+    if not Path(trace_path).exists():
+        console.print(f"[red]Error:[/red] Trace file not found: {trace_path}")
+        sys.exit(1)
+    records = load_trace(trace_path)
+    if not records:
+        console.print(f"[yellow]No spans in {trace_path}[/yellow]")
+        return
+    console.print(
+        f"\n[bold]Profile report[/bold] — {format_num(len(records))} spans "
+        f"from {trace_path}\n"
+    )
+    console.print(format_report(summarize(records)), markup=False, highlight=False)
+    console.print(
+        "\n  [dim]fetch ≈ network (+ decrypt/parse), compress ≈ CPU, "
+        "db_commit / bundle_write ≈ disk[/dim]\n"
+    )
 
 
 def _plan_entry_to_meta(entry: dict) -> dict:
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""make_thumbnails.py — Backfill responsive cover thumbnails.
+
+Renders ``{book_id}-150.webp`` / ``{book_id}-300.webp`` (and ``.avif`` with
+``--formats webp,avif``) next to every ``{book_id}.jpg`` in the covers
+directory.  New covers get these at download time (ingest.py and
+generate_plan.py); this fills in covers downloaded before that.
+
+Only missing or outdated thumbnails (older than their JPEG) are written,
+so re-running is cheap.  Work is spread over a process pool.
+
+Usage:
+    python3 make_thumbnails.py                       # all covers
+    python3 make_thumbnails.py --formats webp,avif   # also AVIF
+    python3 make_thumbnails.py --ids 100267 100358   # specific books
+    python3 make_thumbnails.py --force -w 8          # re-render everything
+    python3 make_thumbnails.py --dry-run             # count only
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    TextColumn,
+    TimeElapsedColumn,
+    TimeRemainingColumn,
+)
+
+# ─── Setup paths & imports ────────────────────────────────────────────────────
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from src.thumbnails import (
+    DEFAULT_THUMB_WORKERS,
+    SUPPORTED_FORMATS,
+    THUMB_FORMATS,
+    THUMB_WIDTHS,
+    ThumbnailPool,
+    thumb_path,
+    unsupported_formats,
+)
+
+BINSLIB_DIR = SCRIPT_DIR.parent / "binslib"
+COVERS_DIR = Path(os.environ.get("COVERS_DIR", str(BINSLIB_DIR / "public" / "covers")))
+
+console = Console()
+
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def cover_ids(covers_dir: Path) -> list[int]:
+    """Book IDs with a ``{id}.jpg`` cover, sorted."""
+    ids = []
+    for name in os.listdir(covers_dir):
+        stem, ext = os.path.splitext(name)
+        if ext == ".jpg" and stem.isdigit():
+            ids.append(int(stem))
+    return sorted(ids)
+
+
+def needs_render(covers_dir: Path, book_id: int, formats: tuple[str, ...]) -> bool:
+    src_mtime = (covers_dir / f"{book_id}.jpg").stat().st_mtime
+    for width in THUMB_WIDTHS:
+        for fmt in formats:
+            try:
+                if os.path.getmtime(thumb_path(str(covers_dir), book_id, width, fmt)) < src_mtime:
+                    return True
+            except OSError:
+                return True
+    return False
+
+
+async def backfill(
+    book_ids: list[int], formats: tuple[str, ...], workers: int, force: bool
+) -> tuple[int, int]:
+    """Render thumbnails for *book_ids*; returns ``(files written, failures)``."""
+    progress = Progress(
+        TextColumn("[bold blue]{task.description}"),
+        BarColumn(bar_width=30),
+        MofNCompleteColumn(),
+        TextColumn("•"),
+        TimeElapsedColumn(),
+        TextColumn("•"),
+        TimeRemainingColumn(),
+    )
+    with progress, ThumbnailPool(str(COVERS_DIR), formats=formats, workers=workers) as pool:
+        task = progress.add_task("Thumbnails", total=len(book_ids))
+        # Keep a bounded number of renders queued on the pool
+        pending = iter(book_ids)
+
+        async def feed() -> None:
+            for book_id in pending:
+                await pool.render(book_id, force=force)
+                progress.advance(task)
+
+        await asyncio.gather(*(feed() for _ in range(workers * 2)))
+    return pool.written, pool.failed
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Backfill WebP/AVIF cover thumbnails for existing covers"
+    )
+    parser.add_argument(
+        "--ids",
+        type=int,
+        nargs="+",
+        help="Specific book IDs (default: every {id}.jpg in the covers dir)",
+    )
+    parser.add_argument(
+        "--formats",
+        default=",".join(THUMB_FORMATS),
+        help=f"Comma-separated output formats: {', '.join(SUPPORTED_FORMATS)} "
+        f"(default: {','.join(THUMB_FORMATS)})",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=DEFAULT_THUMB_WORKERS,
+        help=f"Worker processes (default: {DEFAULT_THUMB_WORKERS})",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render thumbnails even if they are up to date",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only count covers that need thumbnails",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    formats = tuple(f.strip().lower() for f in args.formats.split(",") if f.strip())
+    bad = [f for f in formats if f not in SUPPORTED_FORMATS]
+    if bad or not formats:
+        console.print(
+            f"[red]Error:[/red] --formats must be a list of {', '.join(SUPPORTED_FORMATS)}"
+        )
+        sys.exit(1)
+    missing = unsupported_formats(formats)
+    if missing:
+        console.print(
+            f"[red]Error:[/red] cannot write {'/'.join(missing)}: Pillow is not "
+            "installed or lacks the codec (pip install Pillow)"
+        )
+        sys.exit(1)
+    if args.workers < 1:
+        console.print("[red]Error:[/red] --workers must be >= 1")
+        sys.exit(1)
+    if not COVERS_DIR.is_dir():
+        console.print(f"[red]Error:[/red] Covers directory not found: {COVERS_DIR}")
+        sys.exit(1)
+
+    if args.ids:
+        book_ids = [b for b in sorted(args.ids) if (COVERS_DIR / f"{b}.jpg").exists()]
+    else:
+        book_ids = cover_ids(COVERS_DIR)
+    if not args.force:
+        book_ids = [b for b in book_ids if needs_render(COVERS_DIR, b, formats)]
+
+    console.print(f"\n[bold]Cover thumbnails[/bold] ({', '.join(formats)})")
+    console.print(f"  Covers:  [dim]{COVERS_DIR}[/dim]")
+    console.print(f"  Widths:  {', '.join(str(w) for w in THUMB_WIDTHS)} px")
+    console.print(f"  To render: [bold]{len(book_ids)}[/bold]\n")
+
+    if not book_ids or args.dry_run:
+        return
+
+    start = time.time()
+    written, failed = asyncio.run(backfill(book_ids, formats, args.workers, args.force))
+    console.print(
+        f"\nDone in {time.time() - start:.1f}s: [green]{written}[/green] files written, "
+        f"[red]{failed}[/red] covers failed"
+    )
+
+
+if __name__ == "__main__":
+    main()
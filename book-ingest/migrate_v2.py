@@ -40,7 +40,6 @@ import sqlite3
 import struct
 import sys
 import time
-from datetime import datetime
 from pathlib import Path
 
 import pyzstd
@@ -71,6 +70,8 @@ from src.bundle import (
     read_bundle_raw,
     write_bundle,
 )
+from src.logsink import LOG_FORMATS, LogSink
+from src.profiling import default_output, start_profiling
 
 BINSLIB_DIR = SCRIPT_DIR.parent / "binslib"
 COMPRESSED_DIR = BINSLIB_DIR / "data" / "compressed"
@@ -85,10 +86,6 @@ console = Console()
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
 
-def timestamp() -> str:
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-
 def format_duration(seconds: float) -> str:
     s = int(seconds)
     if s < 60:
@@ -100,10 +97,12 @@ def format_duration(seconds: float) -> str:
     return f"{h}h {m}m {sec}s"
 
 
+# Written by a background thread; see src/logsink.py
+_detail_log = LogSink(DETAIL_LOG)
+
+
 def log_detail(msg: str) -> None:
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-    with open(DETAIL_LOG, "a") as f:
-        f.write(f"[{timestamp()}] {msg}\n")
+    _detail_log.write(msg)
 
 
 def slugify_index(index_num: int) -> str:
@@ -728,11 +727,33 @@ def parse_args():
         default=False,
         help="Report what would be done without writing",
     )
+    parser.add_argument(
+        "--log-format",
+        choices=list(LOG_FORMATS),
+        default="text",
+        help="Detail log format: text (default) or json (JSON lines in "
+        "data/migrate-v2-detail.jsonl)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Sample-profile the run: write collapsed stacks (flamegraph input) "
+        "to PATH (default: data/profile/migrate-v2-<time>.collapsed) and a top-N summary to PATH.top.txt",
+    )
     return parser.parse_args()
 
 
 def main():
+    global _detail_log
     args = parse_args()
+    if args.log_format == "json":
+        _detail_log = LogSink(DETAIL_LOG.with_suffix(".jsonl"), fmt="json")
+    if args.profile is not None:
+        start_profiling(
+            args.profile or default_output(SCRIPT_DIR / "data" / "profile", "migrate-v2")
+        )
 
     if not DB_PATH.exists():
         console.print(f"[red]Error:[/red] Database not found: {DB_PATH}")
@@ -827,7 +848,7 @@ def main():
     if args.refetch:
         console.print(f"  API calls:      {stats.get('api_calls', 0):,}")
     console.print(f"  Duration:       {format_duration(elapsed)}")
-    console.print(f"  Detail log:     {DETAIL_LOG}")
+    console.print(f"  Detail log:     {_detail_log.path}")
 
     # ── Sample verification ───────────────────────────────────────────────
 
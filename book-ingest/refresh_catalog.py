@@ -11,7 +11,10 @@ The output is sorted by chapter_count descending (same as the original).
 With --scan, also probes every ID in the range 100003–{max_id} to
 discover books missing from the plan (the /api/books listing and search
 endpoints are severely limited — many valid books are invisible to them
-but accessible by direct ID).
+but accessible by direct ID).  Probe results are kept in the scan ledger
+(data/scan_ledger.sqlite, shared with generate_plan.py --scan): IDs that
+returned 404 are re-probed only after --scan-ttl days, so repeat scans
+mostly probe IDs above the last high-water mark.
 
 With --fix-author, books that have no author but have a creator will get
 a synthetic author generated as {id: 999{creator_id}, name: creator_name}.
@@ -23,6 +26,7 @@ Usage:
     python3 refresh_catalog.py --fix-author             # generate missing authors
     python3 refresh_catalog.py --scan --fix-author      # both
     python3 refresh_catalog.py --scan --workers 200     # faster scanning
+    python3 refresh_catalog.py --scan --full-scan       # ignore the scan ledger
     python3 refresh_catalog.py --dry-run                # preview, don't write
     python3 refresh_catalog.py --input path/to/plan.json --output updated.json
 """
@@ -39,6 +43,9 @@ from dataclasses import dataclass, field
 
 import httpx
 
+from src.scanledger import DAY, UPPER_MARGIN, ScanLedger
+from src.scanledger import find_upper_bound as search_upper_bound
+
 # ── API config ────────────────────────────────────────────────────────────────
 
 BASE_URL = "https://android.lonoapp.net"
@@ -56,6 +63,7 @@ HEADERS = {
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_INPUT = os.path.join(SCRIPT_DIR, "data", "books_plan_mtc.json")
 DEFAULT_OUTPUT = DEFAULT_INPUT  # overwrite in place
+SCAN_LEDGER = os.path.join(SCRIPT_DIR, "data", "scan_ledger.sqlite")
 
 # Books with fewer chapters than this are excluded from the output.
 # Keeps the plan focused on substantial books worth downloading.
@@ -262,8 +270,12 @@ async def fetch_book(
     delay: float,
     fix_author: bool = False,
     retries: int = 3,
+    missing: set[int] | None = None,
 ) -> dict | None:
-    """Fetch metadata for a single book.  Returns parsed entry or None."""
+    """Fetch metadata for a single book.  Returns parsed entry or None.
+
+    IDs the API says do not exist are added to *missing*.
+    """
     for attempt in range(retries):
         async with sem:
             await asyncio.sleep(delay)
@@ -279,6 +291,8 @@ async def fetch_book(
                 return None
 
         if r.status_code == 404:
+            if missing is not None:
+                missing.add(book_id)
             return None
 
         if r.status_code == 429:
@@ -296,6 +310,8 @@ async def fetch_book(
 
         data = r.json()
         if not data.get("success"):
+            if missing is not None:
+                missing.add(book_id)
             return None
 
         return parse_book(data.get("data", {}), fix_author=fix_author)
@@ -312,6 +328,8 @@ async def _fetch_batch(
     delay: float,
     label: str,
     fix_author: bool = False,
+    missing: set[int] | None = None,
+    quiet: bool = False,
 ) -> dict[int, dict | None]:
     """Fetch metadata for a batch of book IDs.  Returns {id: entry_or_None}."""
     results: dict[int, dict | None] = {}
@@ -324,13 +342,15 @@ async def _fetch_batch(
     async with httpx.AsyncClient(headers=HEADERS, timeout=30) as client:
 
         async def _do(bid: int) -> None:
-            entry = await fetch_book(client, sem, bid, delay, fix_author=fix_author)
+            entry = await fetch_book(
+                client, sem, bid, delay, fix_author=fix_author, missing=missing
+            )
             async with results_lock:
                 results[bid] = entry
                 progress["done"] += 1
 
             done = progress["done"]
-            if done % 500 == 0 or done == total:
+            if not quiet and (done % 500 == 0 or done == total):
                 elapsed = time.time() - start
                 rate = done / elapsed if elapsed > 0 else 0
                 eta = (total - done) / rate if rate > 0 else 0
@@ -342,17 +362,18 @@ async def _fetch_batch(
     return results
 
 
-async def find_upper_bound(workers: int, delay: float) -> int:
-    """Probe above ID_RANGE_END to find the true upper boundary."""
-    # Quick sweep in steps of 50 to find where 404s become solid
-    probe_ids = list(range(ID_RANGE_END - 500, ID_RANGE_END + 1000, 50))
-    results = await _fetch_batch(probe_ids, workers, delay, "probe")
-    last_valid = ID_RANGE_END
-    for bid in sorted(results):
-        if results[bid] is not None:
-            last_valid = max(last_valid, bid)
-    # Add a small buffer above the last valid ID
-    return last_valid + 100
+async def find_upper_bound(workers: int, delay: float, start: int) -> int:
+    """Search upward from the live ID *start* for the true upper boundary."""
+
+    async def probe(ids: list[int]) -> set[int]:
+        results = await _fetch_batch(ids, workers, delay, "probe", quiet=True)
+        return {bid for bid, entry in results.items() if entry is not None}
+
+    # Exponential + binary search; returns the last live ID plus a buffer
+    # Never below the configured range end, whatever the probes found
+    return await search_upper_bound(
+        probe, max(start, ID_RANGE_START), floor=ID_RANGE_END + UPPER_MARGIN
+    )
 
 
 async def scan_missing(
@@ -361,22 +382,57 @@ async def scan_missing(
     delay: float,
     upper_bound: int,
     fix_author: bool = False,
+    ledger: ScanLedger | None = None,
+    dead_ttl: float = 0,
+    found_ttl: float = 0,
 ) -> list[dict]:
-    """Scan the full ID range and return entries for books not in known_ids."""
-    to_probe = [
-        bid for bid in range(ID_RANGE_START, upper_bound + 1) if bid not in known_ids
-    ]
+    """Scan the ID range and return entries for books not in known_ids.
+
+    With a ledger, IDs probed within the TTLs (seconds) are skipped and
+    every result is recorded.
+    """
+    if ledger is not None:
+        ledger.forget(known_ids)
+        to_probe = ledger.due(
+            ID_RANGE_START, upper_bound, known_ids, dead_ttl=dead_ttl, found_ttl=found_ttl
+        )
+        total = upper_bound - ID_RANGE_START + 1 - len(known_ids)
+        print(
+            f"  Ledger: high-water {ledger.high_water or '-'}, "
+            f"skipping {max(total - len(to_probe), 0):,} recently probed IDs"
+        )
+    else:
+        to_probe = [
+            bid
+            for bid in range(ID_RANGE_START, upper_bound + 1)
+            if bid not in known_ids
+        ]
     if not to_probe:
-        print("  No IDs to scan — plan already covers the full range.")
+        print("  No IDs to scan — plan and ledger cover the full range.")
+        if ledger is not None:
+            ledger.set_high_water(max(upper_bound, ledger.high_water))
         return []
 
     print(
         f"  Scanning {len(to_probe):,} unknown IDs ({ID_RANGE_START}–{upper_bound})..."
     )
+    missing: set[int] = set()
     results = await _fetch_batch(
-        to_probe, workers, delay, "scan", fix_author=fix_author
+        to_probe, workers, delay, "scan", fix_author=fix_author, missing=missing
     )
 
+    if ledger is not None:
+        found = {
+            bid: entry.get("chapter_count", 0)
+            for bid, entry in results.items()
+            if entry is not None
+        }
+        ledger.record(found, missing)
+        ledger.set_high_water(max(upper_bound, ledger.high_water))
+        errors = len(to_probe) - len(found) - len(missing)
+        if errors:
+            print(f"  {errors:,} probes failed; retried next scan")
+
     discovered: list[dict] = []
     for bid, entry in results.items():
         if (
@@ -396,6 +452,9 @@ async def refresh(
     scan: bool,
     min_chapters: int = MIN_CHAPTER_COUNT,
     fix_author: bool = False,
+    ledger: ScanLedger | None = None,
+    dead_ttl: float = 0,
+    found_ttl: float = 0,
 ) -> tuple[list[dict], Stats]:
     """Fetch fresh metadata for all entries.  Returns (updated_list, stats)."""
     stats = Stats(total=len(entries))
@@ -434,11 +493,21 @@ async def refresh(
     if scan:
         print()
         print("Phase 2: scanning for missing books...")
-        upper = await find_upper_bound(workers, delay)
-        print(f"  Detected upper bound: {upper}")
         known = set(old_by_id.keys())
+        start = max(known, default=0)
+        if ledger is not None:
+            start = max(start, ledger.max_found())
+        upper = await find_upper_bound(workers, delay, start)
+        print(f"  Detected upper bound: {upper}")
         discovered = await scan_missing(
-            known, workers, delay, upper, fix_author=fix_author
+            known,
+            workers,
+            delay,
+            upper,
+            fix_author=fix_author,
+            ledger=ledger,
+            dead_ttl=dead_ttl,
+            found_ttl=found_ttl,
         )
         # Apply the same chapter filter to discovered books
         discovered = [
@@ -527,6 +596,25 @@ def parse_args() -> argparse.Namespace:
         "books missing from the plan.  Many valid books are invisible to "
         "the search/listing API but accessible by direct ID.",
     )
+    parser.add_argument(
+        "--scan-ttl",
+        type=float,
+        default=30,
+        metavar="DAYS",
+        help="Re-probe IDs that returned 404 only after DAYS days (default: 30)",
+    )
+    parser.add_argument(
+        "--scan-found-ttl",
+        type=float,
+        default=7,
+        metavar="DAYS",
+        help="Re-probe books too small for the plan after DAYS days (default: 7)",
+    )
+    parser.add_argument(
+        "--full-scan",
+        action="store_true",
+        help="Ignore the scan ledger and probe every unknown ID",
+    )
     parser.add_argument(
         "--fix-author",
         nargs="?",
@@ -568,9 +656,13 @@ def main() -> None:
     print(f"Books : {len(entries):,}")
     print(f"Workers: {args.workers}, delay: {args.delay}s")
     print(f"Min ch: {args.min_chapters}")
-    print(
-        f"Scan  : {'YES — full ID range' if args.scan else 'no (use --scan to discover missing books)'}"
-    )
+    if not args.scan:
+        scan_mode = "no (use --scan to discover missing books)"
+    elif args.full_scan:
+        scan_mode = "YES — full ID range"
+    else:
+        scan_mode = f"YES — ledger, 404s re-probed after {args.scan_ttl:g} days"
+    print(f"Scan  : {scan_mode}")
     print(
         f"Fix author: {'YES' if args.fix_author else 'no (disabled via --no-fix-author / --fix-author 0)'}"
     )
@@ -578,17 +670,26 @@ def main() -> None:
         print("DRY RUN — will not write output")
     print()
 
+    ledger = ScanLedger(SCAN_LEDGER, readonly=args.dry_run) if args.scan else None
+    ttl_scale = 0 if args.full_scan else DAY
     start = time.time()
-    updated, stats = asyncio.run(
-        refresh(
-            entries,
-            args.workers,
-            args.delay,
-            scan=args.scan,
-            min_chapters=args.min_chapters,
-            fix_author=args.fix_author,
+    try:
+        updated, stats = asyncio.run(
+            refresh(
+                entries,
+                args.workers,
+                args.delay,
+                scan=args.scan,
+                min_chapters=args.min_chapters,
+                fix_author=args.fix_author,
+                ledger=ledger,
+                dead_ttl=args.scan_ttl * ttl_scale,
+                found_ttl=args.scan_found_ttl * ttl_scale,
+            )
         )
-    )
+    finally:
+        if ledger is not None:
+            ledger.close()
     elapsed = time.time() - start
 
     # Count author stats
@@ -533,9 +533,9 @@ async def run_repair_ttv(
     # Get TTV URL slugs for all books.
     # The DB stores ASCII-clean slugs for website routing, but we need the
     # original TTV slugs (which may contain diacritics) for fetching chapter
-    # pages.  The book registry maps ttv_slug → book_id; invert it.
-    registry = load_registry()
-    id_to_ttv_slug: dict[int, str] = {v: k for k, v in registry.items()}
+    # pages.  The book registry maps ttv_slug ↔ book_id.
+    with load_registry() as registry:
+        id_to_ttv_slug = registry.slugs_for(bid for bid, _, _ in books)
 
     book_slugs: dict[int, str] = {}
     for bid, _, _ in books:
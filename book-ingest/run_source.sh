@@ -14,6 +14,11 @@ set -euo pipefail
 #   4. Update per-source state file on completion/failure
 #   5. Signal trap cleans up on interruption (SIGTERM/SIGINT/SIGHUP)
 #
+# With --daemon (or INGEST_DAEMON=1), step 3 runs ingest.py --daemon with no
+# interval gate and no timeout: the daemon re-checks each book on its own
+# schedule, and the 15-minute timer only restarts it if it died (the lock
+# makes every other tick a no-op).
+#
 # Per-source state file:  data/cron/state_<source>.json
 # Per-source lock dir:    data/cron/ingest-<source>.lock
 # Wrapper log:            data/cron/cycle.log
@@ -24,11 +29,13 @@ set -euo pipefail
 #   INGEST_EXTRA_ARGS        — additional args forwarded to ingest.py
 #   PYTHON_BIN               — python interpreter (default: python3)
 #   MAX_RUNTIME_SECONDS      — hard timeout for ingest.py (default: 36000 = 10h)
+#   INGEST_DAEMON            — 1 = run ingest.py --daemon (default: 0)
 #
 # Usage:
 #   ./run_source.sh --source mtc                     # normal run
 #   ./run_source.sh --source ttv --workers 5         # override workers
 #   ./run_source.sh --source tf --force-run-now      # bypass interval gate
+#   ./run_source.sh --source mtc --daemon            # continuous ingest
 #   ./run_source.sh --source mtc -- --dry-run        # forward args to ingest.py
 #
 # systemd quick reference:
@@ -45,6 +52,7 @@ PYTHON_BIN="${PYTHON_BIN:-python3}"
 INGEST_INTERVAL_SECONDS="${INGEST_INTERVAL_SECONDS:-18000}"  # 5 hours
 MAX_RUNTIME_SECONDS="${MAX_RUNTIME_SECONDS:-36000}"          # 10 hours
 INGEST_EXTRA_ARGS="${INGEST_EXTRA_ARGS:-}"
+DAEMON="${INGEST_DAEMON:-0}"
 
 # Source name and workers (set via args or env)
 SOURCE=""
@@ -64,6 +72,7 @@ Required:
 Options:
   --workers <n>        Worker count (default: $WORKERS or 5)
   --force-run-now      Bypass the interval gate for this invocation
+  --daemon             Run ingest.py --daemon (no interval gate, no timeout)
   -h, --help           Show this help message
 
 All arguments after -- are forwarded to ingest.py.
@@ -84,6 +93,10 @@ while (($# > 0)); do
       FORCE_RUN_NOW=1
       shift
       ;;
+    --daemon)
+      DAEMON=1
+      shift
+      ;;
     -h|--help)
       print_usage
       exit 0
@@ -386,6 +399,9 @@ check_interval_gate() {
     log "Force run requested; bypassing interval gate."
     return 0
   fi
+  if (( DAEMON )); then
+    return 0  # the daemon schedules its own checks
+  fi
 
   local last_result=""
   last_result="$(json_value "last_result" || true)"
@@ -466,18 +482,26 @@ fi
 
 # Step 4: Run ingest
 update_state start
-log "Config: interval=$(format_duration ${INGEST_INTERVAL_SECONDS}), max_runtime=$(format_duration ${MAX_RUNTIME_SECONDS}), workers=${WORKERS}"
+if (( DAEMON )); then
+  log "Config: daemon, workers=${WORKERS}"
+else
+  log "Config: interval=$(format_duration ${INGEST_INTERVAL_SECONDS}), max_runtime=$(format_duration ${MAX_RUNTIME_SECONDS}), workers=${WORKERS}"
+fi
 if (( ${#FORWARDED_ARGS[@]} > 0 )); then
   log "Extra args: ${FORWARDED_ARGS[*]}"
 fi
 
 cmd=(
-  timeout --signal=TERM --kill-after=60 "${MAX_RUNTIME_SECONDS}"
   "${PYTHON_BIN}"
   "${SCRIPT_DIR}/ingest.py"
   "--source" "${SOURCE}"
   "-w" "${WORKERS}"
 )
+if (( DAEMON )); then
+  cmd+=("--daemon")
+else
+  cmd=(timeout --signal=TERM --kill-after=60 "${MAX_RUNTIME_SECONDS}" "${cmd[@]}")
+fi
 if (( ${#FORWARDED_ARGS[@]} > 0 )); then
   cmd+=("${FORWARDED_ARGS[@]}")
 fi
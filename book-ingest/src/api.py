@@ -14,6 +14,8 @@ from typing import Optional
 import httpx
 
 from .decrypt import DecryptionError, decrypt_content
+from .metrics import count_retry, instrumented_get
+from .ratelimit import TrackedSemaphore
 
 BASE_URL = "https://android.lonoapp.net"
 BEARER_TOKEN = os.environ.get(
@@ -32,6 +34,31 @@ class APIError(Exception):
     pass
 
 
+def create_http_client(
+    max_concurrent: int = 180,
+    timeout: float = 30,
+    http2: bool = False,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """Build an ``httpx.AsyncClient`` configured for the MTC API.
+
+    ``ingest.py`` creates one of these and hands it to every worker's
+    :class:`AsyncBookClient`, so all workers share one connection pool.
+    *http2* requires the optional ``h2`` package.
+    *transport* replaces the network pool (see :mod:`src.httpreplay`).
+    """
+    return httpx.AsyncClient(
+        headers=HEADERS,
+        timeout=timeout,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_concurrent + 10,
+            max_keepalive_connections=max_concurrent,
+        ),
+        transport=transport,
+    )
+
+
 class AsyncBookClient:
     """Async API client with semaphore-based rate limiting.
 
@@ -43,6 +70,9 @@ class AsyncBookClient:
         Minimum seconds between requests (within semaphore).
     timeout : float
         Per-request timeout in seconds.
+    client : httpx.AsyncClient, optional
+        Shared client (see :func:`create_http_client`).  The caller keeps
+        ownership: :meth:`close` leaves it open.
     """
 
     def __init__(
@@ -50,13 +80,16 @@ class AsyncBookClient:
         max_concurrent: int = 180,
         request_delay: float = 0.015,
         timeout: float = 30,
+        client: httpx.AsyncClient | None = None,
     ):
-        self._client = httpx.AsyncClient(headers=HEADERS, timeout=timeout)
-        self._sem = asyncio.Semaphore(max_concurrent)
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(headers=HEADERS, timeout=timeout)
+        self._sem = TrackedSemaphore(max_concurrent)
         self._delay = request_delay
 
     async def close(self):
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
 
     async def __aenter__(self):
         return self
@@ -69,6 +102,11 @@ class AsyncBookClient:
         """Expose the underlying httpx client for cover downloads."""
         return self._client
 
+    @property
+    def limiter(self) -> TrackedSemaphore:
+        """The semaphore capping in-flight requests (for load reporting)."""
+        return self._sem
+
     async def _get(
         self, path: str, params: Optional[dict] = None, retries: int = 3
     ) -> dict:
@@ -76,9 +114,12 @@ class AsyncBookClient:
             async with self._sem:
                 await asyncio.sleep(self._delay)
                 try:
-                    r = await self._client.get(f"{BASE_URL}{path}", params=params)
+                    r = await instrumented_get(
+                        self._client, "mtc", f"{BASE_URL}{path}", params=params
+                    )
                 except httpx.TransportError as e:
                     if attempt < retries - 1:
+                        count_retry("mtc", "error")
                         await asyncio.sleep(2 ** (attempt + 1))
                         continue
                     raise APIError(f"Transport error: {e}")
@@ -86,6 +127,7 @@ class AsyncBookClient:
             if r.status_code == 429:
                 wait = int(r.headers.get("Retry-After", 2 ** (attempt + 2)))
                 if attempt < retries - 1:
+                    count_retry("mtc", r.status_code)
                     await asyncio.sleep(wait)
                     continue
                 raise APIError(f"Rate limited after {retries} attempts")
@@ -95,6 +137,7 @@ class AsyncBookClient:
 
             if r.status_code != 200:
                 if attempt < retries - 1:
+                    count_retry("mtc", r.status_code)
                     await asyncio.sleep(2 ** (attempt + 1))
                     continue
                 raise APIError(f"HTTP {r.status_code}: {path}")
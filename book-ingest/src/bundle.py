@@ -162,6 +162,20 @@ _EMPTY_META_BLOCK = _encode_meta(ChapterMeta())
 # ─── Readers ──────────────────────────────────────────────────────────────────
 
 
+def read_bundle_count(bundle_path: str) -> int:
+    """Read only the header — returns the number of chapters in the bundle.
+
+    Cheap enough to call for every book in a plan (one 16-byte read).
+    Returns 0 if the bundle doesn't exist or is invalid.
+    """
+    try:
+        with open(bundle_path, "rb") as f:
+            parsed = _parse_header(f.read(HEADER_SIZE_V2))
+    except OSError:
+        return 0
+    return parsed[1] if parsed else 0
+
+
 def read_bundle_indices(bundle_path: str) -> set[int]:
     """Read only the index section — returns set of chapter index numbers.
 
@@ -296,6 +310,7 @@ def write_bundle(
     bundle_path: str,
     chapters: dict[int, tuple[bytes, int]],
     meta: dict[int, ChapterMeta] | None = None,
+    fsync: bool = False,
 ) -> None:
     """Write a complete BLIB v2 bundle file atomically (tmp + rename).
 
@@ -306,6 +321,8 @@ def write_bundle(
         bundle_path: Destination path for the .bundle file.
         chapters: dict mapping index_num -> (compressed_bytes, uncompressed_length).
         meta: optional dict mapping index_num -> ChapterMeta.
+        fsync: flush the new file to disk before the rename, so the bundle
+            survives a power loss (used before a chapter journal is dropped).
     """
     if not chapters:
         return
@@ -361,6 +378,9 @@ def write_bundle(
             f.write(index_buf)
             for part in data_parts:
                 f.write(part)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
         os.replace(tmp_path, bundle_path)
     except Exception:
         try:
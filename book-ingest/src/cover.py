@@ -1,55 +1,334 @@
-"""Cover image download with URL fallback and retry."""
+"""Cover image download with URL fallback, and the background cover stage."""
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TYPE_CHECKING
 
 import httpx
 
+from .db import open_db, update_cover_urls
+from .metrics import COVERS, instrumented_get
+from .ratelimit import HostLimiter
+from .trace import span
+
+if TYPE_CHECKING:
+    from .thumbnails import ThumbnailPool
+
+log = logging.getLogger("book-ingest.cover")
+
+DEFAULT_COVER_WORKERS = 8
+DEFAULT_COVER_PER_HOST = 4
+COVER_BATCH_SIZE = 50
+COVER_FLUSH_INTERVAL = 5.0  # seconds
+
+_MIN_IMAGE_BYTES = 100
+
+
+def cover_path(covers_dir: str, book_id: int) -> str:
+    return os.path.join(covers_dir, f"{book_id}.jpg")
+
+
+def write_cover(dest: str, data: bytes) -> None:
+    """Write *data* to *dest* atomically (tmp + rename); blocking."""
+    directory = os.path.dirname(dest) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+async def fetch_image(
+    client: httpx.AsyncClient,
+    url: str,
+    hosts: HostLimiter | None = None,
+    source: str = "cover",
+) -> bytes | None:
+    """GET an image; ``None`` unless it is a 200 with a plausible body."""
+    try:
+        if hosts is not None:
+            async with hosts.slot(url):
+                r = await instrumented_get(
+                    client, source, url, follow_redirects=True, timeout=30
+                )
+        else:
+            r = await instrumented_get(
+                client, source, url, follow_redirects=True, timeout=30
+            )
+    except Exception:
+        return None
+    if r.status_code == 200 and len(r.content) > _MIN_IMAGE_BYTES:
+        return r.content
+    return None
+
 
 async def download_cover(
     client: httpx.AsyncClient,
     book_id: int,
     poster: dict | str | None,
     covers_dir: str,
+    hosts: HostLimiter | None = None,
+    source: str = "cover",
+    overwrite: bool = False,
 ) -> str | None:
     """Download cover image, trying poster URLs in size order.
 
     Returns '/covers/{book_id}.jpg' on success, None on failure.
-    Skips if cover already exists on disk.
+    Skips if cover already exists on disk (unless *overwrite*).  The file
+    is written off the event loop; *hosts* caps concurrent requests per
+    image host.
     """
-    dest = os.path.join(covers_dir, f"{book_id}.jpg")
-    if os.path.exists(dest):
+    dest = cover_path(covers_dir, book_id)
+    if not overwrite and os.path.exists(dest):
         return f"/covers/{book_id}.jpg"
 
     if poster is None:
         return None
 
-    # Handle poster as dict with size keys
+    # Poster as dict with size keys, or a plain string URL
     if isinstance(poster, dict):
-        for key in ["default", "600", "300", "150"]:
-            url = poster.get(key)
-            if not url:
-                continue
+        urls = [poster[key] for key in ("default", "600", "300", "150") if poster.get(key)]
+    elif isinstance(poster, str):
+        urls = [poster]
+    else:
+        urls = []
+
+    for url in urls:
+        data = await fetch_image(client, url, hosts, source)
+        if data is not None:
+            await asyncio.to_thread(write_cover, dest, data)
+            return f"/covers/{book_id}.jpg"
+
+    return None
+
+
+async def pull_covers(
+    client: httpx.AsyncClient,
+    jobs: Iterable[tuple[int, dict | str | None]],
+    covers_dir: str,
+    workers: int = DEFAULT_COVER_WORKERS,
+    hosts: HostLimiter | None = None,
+    resolve: Callable[[int], Awaitable[dict | str | None]] | None = None,
+    overwrite: bool = False,
+    on_done: Callable[[int, bool], None] | None = None,
+    source: str = "cover",
+    thumbs: ThumbnailPool | None = None,
+) -> tuple[int, int]:
+    """Download covers for ``(book_id, poster)`` *jobs* concurrently.
+
+    Used by the standalone cover pullers.  Posters normally come straight
+    from the plan; *resolve* is awaited only for jobs whose poster is
+    ``None`` (e.g. an API lookup).  *workers* downloads run at once and
+    *hosts* caps each host; *on_done* is called with ``(book_id, ok)``
+    after every job.  With *thumbs*, each saved cover is also handed to
+    the thumbnail pool.
+
+    Returns ``(saved, failed)``.
+    """
+    pending = iter(jobs)
+    saved = failed = 0
+
+    async def worker() -> None:
+        nonlocal saved, failed
+        for book_id, poster in pending:
+            url = None
             try:
-                r = await client.get(url, follow_redirects=True, timeout=30)
-                if r.status_code == 200 and len(r.content) > 100:
-                    os.makedirs(os.path.dirname(dest), exist_ok=True)
-                    with open(dest, "wb") as f:
-                        f.write(r.content)
-                    return f"/covers/{book_id}.jpg"
+                if poster is None and resolve is not None:
+                    poster = await resolve(book_id)
+                url = await download_cover(
+                    client, book_id, poster, covers_dir, hosts, source, overwrite
+                )
             except Exception:
+                url = None
+            if url and thumbs is not None:
+                await thumbs.render(book_id)
+            if url:
+                saved += 1
+            else:
+                failed += 1
+            if on_done is not None:
+                on_done(book_id, url is not None)
+
+    await asyncio.gather(*(worker() for _ in range(max(workers, 1))))
+    return saved, failed
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Background cover stage
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+class CoverStage:
+    """Cover downloads decoupled from chapter ingest.
+
+    Books hand their metadata to :meth:`submit` and move on; *workers*
+    tasks call ``source.download_cover`` with a per-host limiter of their
+    own, so a slow image CDN neither extends per-book latency nor holds
+    the source's chapter request slots.  ``cover_url`` updates are
+    written to the DB in batches (every *batch_size* covers or
+    *flush_interval* seconds, and on :meth:`close`); a batch whose write
+    fails (e.g. ``database is locked``) is logged and retried with the
+    next one.
+
+    Parameters
+    ----------
+    source:
+        The :class:`~src.sources.base.BookSource` the books come from.
+    covers_dir:
+        Directory the images are written to.
+    db_path:
+        SQLite database for ``cover_url`` updates (``None`` = no updates).
+    lock:
+        The ingest DB lock, held while a batch is written.
+    workers:
+        Concurrent cover downloads.
+    per_host:
+        Concurrent requests per image host.
+    thumbs:
+        Optional :class:`~src.thumbnails.ThumbnailPool`; saved covers get
+        their WebP/AVIF thumbnails rendered before the next download.
+    """
+
+    def __init__(
+        self,
+        source,
+        covers_dir: str,
+        db_path: str | None,
+        lock: asyncio.Lock,
+        workers: int = DEFAULT_COVER_WORKERS,
+        per_host: int = DEFAULT_COVER_PER_HOST,
+        batch_size: int = COVER_BATCH_SIZE,
+        flush_interval: float = COVER_FLUSH_INTERVAL,
+        thumbs: ThumbnailPool | None = None,
+    ):
+        self.source = source
+        self.covers_dir = covers_dir
+        self.db_path = db_path
+        self.lock = lock
+        self.hosts = HostLimiter(per_host)
+        self.thumbs = thumbs
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[tuple[int, dict]] = asyncio.Queue()
+        self._pending: list[tuple[int, str]] = []
+        self._last_flush = time.monotonic()
+        self._flush_failed = False
+        self._queued: set[int] = set()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(max(workers, 1))]
+        self._closed = False
+        self.saved = 0
+        self.failed = 0
+
+    def __len__(self) -> int:
+        """Covers queued or in progress."""
+        return len(self._queued)
+
+    def submit(self, book_id: int, meta: dict) -> None:
+        """Queue a cover download for *book_id* (never blocks)."""
+        if book_id in self._queued:
+            return
+        self._queued.add(book_id)
+        # Only what download_cover reads; full metadata dicts can be large
+        cover_meta = {k: meta[k] for k in ("poster", "cover_url") if k in meta}
+        self._queue.put_nowait((book_id, cover_meta))
+
+    async def _worker(self) -> None:
+        src = self.source.name
+        while True:
+            try:
+                book_id, meta = await asyncio.wait_for(
+                    self._queue.get(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                await self._maybe_flush()
                 continue
+            try:
+                with span("cover", src, book_id):
+                    url = await self.source.download_cover(
+                        book_id, meta, self.covers_dir, hosts=self.hosts
+                    )
+            except Exception:
+                url = None
+            if url and self.thumbs is not None:
+                with span("thumbnail", src, book_id):
+                    await self.thumbs.render(book_id)
+            self._queued.discard(book_id)
+            if url:
+                self.saved += 1
+                COVERS.labels(src, "saved").inc()
+                self._pending.append((book_id, url))
+            else:
+                self.failed += 1
+                COVERS.labels(src, "missing").inc()
+            try:
+                await self._maybe_flush()
+            finally:
+                self._queue.task_done()
+
+    async def _maybe_flush(self) -> None:
+        if not self._pending:
+            return
+        due = time.monotonic() - self._last_flush >= self.flush_interval
+        # After a failed write, retry on the timer only
+        full = len(self._pending) >= self.batch_size and not self._flush_failed
+        if due or full:
+            self._flush_failed = not await self.flush()
 
-    # Handle poster as plain string URL
-    if isinstance(poster, str):
+    async def flush(self) -> bool:
+        """Write queued ``cover_url`` updates in one transaction.
+
+        Never raises on a DB error: the batch goes back to the pending
+        list for the next flush and False is returned.
+        """
+        batch, self._pending = self._pending, []
+        self._last_flush = time.monotonic()
+        if not batch or self.db_path is None:
+            return True
         try:
-            r = await client.get(poster, follow_redirects=True, timeout=30)
-            if r.status_code == 200 and len(r.content) > 100:
-                os.makedirs(os.path.dirname(dest), exist_ok=True)
-                with open(dest, "wb") as f:
-                    f.write(r.content)
-                return f"/covers/{book_id}.jpg"
-        except Exception:
-            pass
+            await self.lock.acquire()
+        except asyncio.CancelledError:
+            self._pending[:0] = batch  # close() writes it
+            raise
+        try:
+            await asyncio.to_thread(self._write_batch, batch)
+        except Exception as e:
+            log.warning("cover_url update of %d books failed: %s", len(batch), e)
+            self._pending[:0] = batch
+            return False
+        finally:
+            self.lock.release()
+        return True
 
-    return None
+    def _write_batch(self, batch: list[tuple[int, str]]) -> None:
+        db = open_db(self.db_path)
+        try:
+            update_cover_urls(db, batch)
+            db.commit()
+        finally:
+            db.close()
+
+    async def close(self, wait: bool = True) -> None:
+        """Finish queued downloads (unless *wait* is false), then write the
+        last batch.  Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        if wait:
+            await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.flush()
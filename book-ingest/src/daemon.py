@@ -0,0 +1,283 @@
+"""Per-book check scheduling for ``ingest.py --daemon``.
+
+A timer-driven cycle re-checks every plan book once per run (every 5
+hours), so a chapter published just after a cycle waits hours, and each
+cycle hits the source with the whole plan at once.  The daemon instead
+keeps every book in a heap keyed by its *next check time* and starts
+books as they come due, so load is spread evenly and active books are
+looked at often:
+
+* a book's first interval is half its observed **release cadence**
+  (:func:`release_cadence`: time between its first and latest chapter
+  divided by the chapters in between), or ``default_interval`` when the
+  plan has no timestamps; books idle for much longer than their cadence
+  are checked less often;
+* a check that saves new chapters halves the interval; a check that
+  finds nothing stretches it by ``backoff``;
+* completed books are checked every ``completed_interval``;
+* every interval is clamped to ``[min_interval, max_interval]``.
+
+Books whose plan already lists more chapters than their bundle holds
+are due immediately, and so are books that a plan reload adds or whose
+``chapter_count`` it raises.
+
+:class:`CheckQueue` is a live feed for :class:`~src.scheduler.BookScheduler`:
+iterating it yields the next due book, or ``None`` while nothing is due.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import random
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+
+from .priority import PlanQueue, freshness, parse_timestamp
+from .refreshpolicy import is_completed
+
+MINUTE = 60.0
+HOUR = 3600.0
+DAY = 86_400.0
+
+
+def release_cadence(entry: dict) -> float | None:
+    """Mean seconds between chapters of *entry*, or ``None`` if unknown."""
+    latest = freshness(entry)
+    first = parse_timestamp(entry.get("published_at") or entry.get("created_at"))
+    chapters = entry.get("chapter_count") or 0
+    if not latest or first is None or chapters < 2 or latest <= first:
+        return None
+    return (latest - first) / (chapters - 1)
+
+
+@dataclass
+class CheckPolicy:
+    """Next-check intervals, in seconds.
+
+    Parameters
+    ----------
+    min_interval, max_interval:
+        Bounds for every interval.
+    default_interval:
+        First interval of a book with no usable timestamps.
+    completed_interval:
+        Interval of books the source marks as finished.
+    backoff:
+        Factor applied to the interval after a check that found nothing.
+    """
+
+    min_interval: float = 10 * MINUTE
+    max_interval: float = 2 * DAY
+    default_interval: float = 6 * HOUR
+    completed_interval: float = 7 * DAY
+    backoff: float = 1.5
+
+    def clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def base(self, entry: dict, now: float | None = None) -> float:
+        """Interval derived from the plan alone (cadence and idle time)."""
+        cadence = release_cadence(entry)
+        interval = cadence / 2 if cadence else self.default_interval
+        latest = freshness(entry)
+        if latest:
+            idle = (time.time() if now is None else now) - latest
+            if idle > 3 * (cadence or self.default_interval):
+                interval = max(interval, idle / 4)
+        return self.clamp(interval)
+
+    def initial(self, entry: dict, now: float | None = None) -> float:
+        if is_completed(entry):
+            return self.completed_interval
+        return self.base(entry, now)
+
+    def after(
+        self, entry: dict, interval: float, saved: int, now: float | None = None
+    ) -> float:
+        """Interval after a check that saved *saved* chapters."""
+        if is_completed(entry):
+            return self.completed_interval
+        if saved > 0:
+            return self.clamp(min(interval / 2, self.base(entry, now)))
+        return self.clamp(interval * self.backoff)
+
+
+class CheckQueue:
+    """Heap of ``(next check time, book)`` for one source.
+
+    Books handed out by :meth:`pop_due` are *in progress* until
+    :meth:`reschedule` puts them back.  Stale heap items (books removed
+    or rescheduled) are skipped when popped.
+
+    Parameters
+    ----------
+    policy:
+        Interval policy (default :class:`CheckPolicy`).
+    clock:
+        Time source, epoch seconds.
+    """
+
+    def __init__(
+        self,
+        policy: CheckPolicy | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.policy = policy or CheckPolicy()
+        self._clock = clock
+        self._seq = itertools.count()
+        self._heap: list[tuple[float, int, int]] = []
+        self._entries: dict[int, dict] = {}
+        self._next: dict[int, float] = {}
+        self._interval: dict[int, float] = {}
+        self._running: set[int] = set()
+        self._recheck: set[int] = set()
+        self._closed = False
+
+    # ── Loading ─────────────────────────────────────────────────────────
+
+    def load(
+        self,
+        entries: Iterable[dict],
+        order: str = "plan",
+        have: Callable[[dict], int] | None = None,
+    ) -> int:
+        """Add the plan at startup; returns the number of books due now.
+
+        Books with missing chapters (``chapter_count`` above *have*) are
+        due now, in *order* (see :mod:`src.priority`); the others get
+        their first check spread over their initial interval.
+        """
+        now = self._clock()
+        counts: dict[int, int] = {}
+        backlog: list[dict] = []
+        for entry in entries:
+            counts[entry["id"]] = have(entry) if have else 0
+            if (entry.get("chapter_count") or 0) > counts[entry["id"]]:
+                backlog.append(entry)
+            else:
+                interval = self.policy.initial(entry, now)
+                self._add(entry, now + random.uniform(0, interval), interval)
+        queue = PlanQueue(backlog, order, have=lambda e: counts[e["id"]], now=now)
+        start = now - len(backlog) * 1e-6  # all due now, in priority order
+        for i, entry in enumerate(queue):
+            self._add(entry, start + i * 1e-6)
+        return len(backlog)
+
+    def _add(self, entry: dict, at: float, interval: float | None = None) -> None:
+        book_id = entry["id"]
+        self._entries[book_id] = entry
+        if interval is None:
+            interval = self.policy.initial(entry, self._clock())
+        self._interval[book_id] = interval
+        self._schedule(book_id, at)
+
+    def _schedule(self, book_id: int, at: float) -> None:
+        self._next[book_id] = at
+        heapq.heappush(self._heap, (at, next(self._seq), book_id))
+
+    def update(self, entry: dict) -> bool:
+        """Merge a (re)loaded plan entry; returns True if it became due.
+
+        New books and books whose ``chapter_count`` went up are checked
+        now (after the current check, if one is in progress).
+        """
+        book_id = entry["id"]
+        old = self._entries.get(book_id)
+        if old is None:
+            if book_id in self._running:  # removed and re-added mid-check
+                self._entries[book_id] = entry
+                self._recheck.add(book_id)
+            else:
+                self._add(entry, self._clock())
+            return True
+        count = entry.get("chapter_count") or 0
+        known = old.get("chapter_count") or 0
+        self._entries[book_id] = entry
+        if count <= known:
+            # The daemon may already have seen a higher count than the plan
+            entry["chapter_count"] = known
+            return False
+        if book_id in self._running:
+            self._recheck.add(book_id)
+        else:
+            self._schedule(book_id, self._clock())
+        return True
+
+    def retain(self, ids: Iterable[int]) -> int:
+        """Drop books not in *ids* (removed from the plan); returns how many."""
+        keep = set(ids)
+        gone = [book_id for book_id in self._entries if book_id not in keep]
+        for book_id in gone:
+            self.remove(book_id)
+        return len(gone)
+
+    def remove(self, book_id: int) -> None:
+        self._entries.pop(book_id, None)
+        self._next.pop(book_id, None)
+        self._interval.pop(book_id, None)
+        self._recheck.discard(book_id)
+
+    # ── Checks ──────────────────────────────────────────────────────────
+
+    def pop_due(self, now: float | None = None) -> dict | None:
+        """The next book due at *now*, marked in progress; else ``None``."""
+        now = self._clock() if now is None else now
+        while self._heap and self._heap[0][0] <= now:
+            at, _, book_id = heapq.heappop(self._heap)
+            if self._next.get(book_id) != at:
+                continue  # removed or rescheduled since
+            del self._next[book_id]
+            self._running.add(book_id)
+            return self._entries[book_id]
+        return None
+
+    def reschedule(
+        self, book_id: int, saved: int = 0, chapter_count: int = 0
+    ) -> float | None:
+        """Put a checked book back; returns its next check time.
+
+        *saved* is the number of new chapters the check stored and
+        *chapter_count* the count the source reported (0 = unknown).
+        Returns ``None`` for books removed from the plan meanwhile.
+        """
+        self._running.discard(book_id)
+        entry = self._entries.get(book_id)
+        if entry is None:
+            return None
+        if chapter_count > (entry.get("chapter_count") or 0):
+            # A later plan reload with this count is not news
+            entry["chapter_count"] = chapter_count
+        now = self._clock()
+        interval = self.policy.after(
+            entry, self._interval.get(book_id, self.policy.default_interval), saved, now
+        )
+        self._interval[book_id] = interval
+        at = now if book_id in self._recheck else now + interval
+        self._recheck.discard(book_id)
+        self._schedule(book_id, at)
+        return at
+
+    def next_due(self) -> float | None:
+        """Time of the earliest scheduled check, or ``None`` if none."""
+        while self._heap and self._next.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    # ── Feed ────────────────────────────────────────────────────────────
+
+    def close(self) -> None:
+        """End the feed; books in progress still finish."""
+        self._closed = True
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[dict | None]:
+        while not self._closed:
+            yield self.pop_due()
@@ -158,7 +158,8 @@ def upsert_book_metadata(
             bookmark_count=excluded.bookmark_count, vote_count=excluded.vote_count,
             review_score=excluded.review_score, review_count=excluded.review_count,
             chapter_count=excluded.chapter_count, word_count=excluded.word_count,
-            cover_url=excluded.cover_url, author_id=excluded.author_id,
+            cover_url=COALESCE(excluded.cover_url, books.cover_url),
+            author_id=excluded.author_id,
             created_at=excluded.created_at, updated_at=excluded.updated_at,
             published_at=excluded.published_at, new_chap_at=excluded.new_chap_at,
             chapters_saved=excluded.chapters_saved, meta_hash=excluded.meta_hash,
@@ -241,6 +242,14 @@ def update_cover_url(conn: sqlite3.Connection, book_id: int, cover_url: str) ->
     )
 
 
+def update_cover_urls(conn: sqlite3.Connection, covers: list[tuple[int, str]]) -> None:
+    """Set ``cover_url`` for many books at once (``[(book_id, cover_url), ...]``)."""
+    conn.executemany(
+        "UPDATE books SET cover_url = ? WHERE id = ?",
+        [(url, book_id) for book_id, url in covers],
+    )
+
+
 def update_chapters_saved(conn: sqlite3.Connection, book_id: int, count: int) -> None:
     """Update the chapters_saved count for a book."""
     conn.execute(
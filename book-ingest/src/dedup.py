@@ -0,0 +1,233 @@
+"""Cross-source duplicate detection for plan generation.
+
+TTV and TF plan generation skip listing books that binslib already has
+from another source.  :class:`DedupIndex` is built once per run from one
+read of the ``books`` table and answers every lookup with dict hits:
+
+* **slug** — :func:`~src.db.slugify` of the slug (ASCII, lower case);
+* **name + author** — case-folded, whitespace-collapsed title.  A title
+  match counts unless both books have an author and the authors differ;
+* **content fingerprint** (optional) — a hash of the first chapter's
+  normalised text, which catches the same book under different titles.
+
+Fingerprints are recorded by ``ingest.py`` whenever it fetches chapter 1
+(:class:`FingerprintStore`, ``data/fingerprints.sqlite``) and compared by
+``generate_plan.py --fingerprint-dedup``, which fetches chapter 1 of each
+new listing book.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from .db import slugify
+
+# FINGERPRINTS_PATH overrides the store (e.g. next to a scratch database)
+FINGERPRINTS_PATH = Path(
+    os.environ.get(
+        "FINGERPRINTS_PATH",
+        str(Path(__file__).resolve().parent.parent / "data" / "fingerprints.sqlite"),
+    )
+)
+
+# Chapter text shorter than this (after normalisation) is too generic to
+# identify a book (e.g. "Chương 1" placeholders, VIP notices).
+FINGERPRINT_MIN_CHARS = 200
+# Only the start of the chapter is hashed: sources append different
+# footers and ads at the end.
+FINGERPRINT_CHARS = 2000
+
+_WS = re.compile(r"\s+")
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_name(name: str | None) -> str:
+    """``"  Đấu  Phá Thương Khung "`` → ``"đấu phá thương khung"``."""
+    if not name:
+        return ""
+    return _WS.sub(" ", unicodedata.normalize("NFC", name).casefold()).strip()
+
+
+def normalize_slug(slug: str | None) -> str:
+    return slugify(slug) if slug else ""
+
+
+def content_fingerprint(text: str) -> str | None:
+    """Hash of the first :data:`FINGERPRINT_CHARS` letters and digits of
+    *text* (case-folded, punctuation and whitespace removed), or ``None``
+    if the text is too short to tell books apart."""
+    norm = _NON_WORD.sub("", unicodedata.normalize("NFC", text).casefold())
+    if len(norm) < FINGERPRINT_MIN_CHARS:
+        return None
+    return hashlib.blake2b(norm[:FINGERPRINT_CHARS].encode(), digest_size=16).hexdigest()
+
+
+def chapter_fingerprint(
+    parse_chapter: Callable[[str], dict | None], html: str
+) -> str | None:
+    """:func:`content_fingerprint` of the chapter body *parse_chapter* finds
+    in *html*.  Module-level so a process pool can run it."""
+    chapter = parse_chapter(html)
+    return content_fingerprint(chapter["body"]) if chapter else None
+
+
+class DedupIndex:
+    """In-memory index of existing books by slug, title and fingerprint."""
+
+    def __init__(self) -> None:
+        self._by_slug: dict[str, dict] = {}
+        self._by_name: dict[str, list[dict]] = {}
+        self._by_fingerprint: dict[str, dict] = {}
+        self._by_id: dict[int, dict] = {}
+
+    def add(
+        self,
+        book_id: int,
+        slug: str | None,
+        name: str | None,
+        status: int = 1,
+        source: str = "mtc",
+        author: str | None = None,
+    ) -> None:
+        entry = {
+            "id": book_id,
+            "name": name or "",
+            "status": status,
+            "source": source,
+            "author": normalize_name(author),
+        }
+        self._by_id[book_id] = entry
+        key = normalize_slug(slug)
+        if key:
+            self._by_slug[key] = entry
+        name_key = normalize_name(name)
+        if name_key:
+            self._by_name.setdefault(name_key, []).append(entry)
+
+    def add_fingerprint(self, book_id: int, fingerprint: str) -> None:
+        entry = self._by_id.get(book_id)
+        if entry is not None:
+            self._by_fingerprint.setdefault(fingerprint, entry)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def has_fingerprints(self) -> bool:
+        return bool(self._by_fingerprint)
+
+    def by_slug(self, slug: str) -> dict | None:
+        return self._by_slug.get(normalize_slug(slug))
+
+    def by_name(self, name: str, author: str | None = None) -> dict | None:
+        """First book titled *name* whose author does not contradict *author*."""
+        author_key = normalize_name(author)
+        for entry in self._by_name.get(normalize_name(name), ()):
+            if not author_key or not entry["author"] or entry["author"] == author_key:
+                return entry
+        return None
+
+    def by_fingerprint(self, fingerprint: str | None) -> dict | None:
+        return self._by_fingerprint.get(fingerprint) if fingerprint else None
+
+    def find(
+        self,
+        slug: str | None = None,
+        name: str | None = None,
+        author: str | None = None,
+        fingerprint: str | None = None,
+    ) -> dict | None:
+        """The existing book matching any tier, or ``None``."""
+        return (
+            (self.by_slug(slug) if slug else None)
+            or (self.by_name(name, author) if name else None)
+            or self.by_fingerprint(fingerprint)
+        )
+
+    @classmethod
+    def from_db(
+        cls, db_path: str | Path, fingerprints_path: str | Path | None = None
+    ) -> DedupIndex:
+        """Index the binslib ``books`` table (empty if the DB is missing),
+        plus stored fingerprints when *fingerprints_path* exists."""
+        index = cls()
+        if Path(db_path).exists():
+            uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True)
+            try:
+                rows = conn.execute(
+                    "SELECT b.id, b.slug, b.name, b.status, b.source, a.name"
+                    " FROM books b LEFT JOIN authors a ON a.id = b.author_id"
+                ).fetchall()
+            finally:
+                conn.close()
+            for row in rows:
+                index.add(*row)
+        if fingerprints_path is not None and Path(fingerprints_path).exists():
+            with FingerprintStore(fingerprints_path) as store:
+                for book_id, fingerprint in store.items():
+                    index.add_fingerprint(book_id, fingerprint)
+        return index
+
+
+class FingerprintStore:
+    """First-chapter fingerprints of ingested books (SQLite, thread-safe)."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            " book_id INTEGER PRIMARY KEY, source TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_fingerprints_fp ON fingerprints (fingerprint)"
+        )
+        self._db.commit()
+
+    def record(self, book_id: int, source: str, text: str) -> str | None:
+        """Fingerprint chapter 1 *text* of *book_id*; returns the hash."""
+        fingerprint = content_fingerprint(text)
+        if fingerprint is None:
+            return None
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?)",
+                (book_id, source, fingerprint),
+            )
+            self._db.commit()
+        return fingerprint
+
+    def lookup(self, fingerprint: str) -> list[int]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT book_id FROM fingerprints WHERE fingerprint = ?", (fingerprint,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def items(self) -> Iterable[tuple[int, str]]:
+        with self._lock:
+            return self._db.execute(
+                "SELECT book_id, fingerprint FROM fingerprints"
+            ).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> FingerprintStore:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
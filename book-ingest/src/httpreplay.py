@@ -0,0 +1,218 @@
+"""Record / replay HTTP transports for offline ingest runs.
+
+``ingest.py --record PATH`` wraps the real connection pool in a
+:class:`RecordingTransport` that stores every upstream response in a
+:class:`Cassette` — a single SQLite file with zstd-compressed bodies,
+keyed by method + URL (query parameters sorted).  ``--replay PATH`` swaps
+the network for a :class:`ReplayTransport` that serves those responses
+back, optionally with latency, jitter and injected failures::
+
+    python3 ingest.py --source ttv --limit 50 --record data/cassettes/ttv.sqlite
+    python3 ingest.py --source ttv --limit 50 --replay data/cassettes/ttv.sqlite \\
+        --replay-latency 0.08 --replay-jitter 0.05 --replay-errors 0.02
+
+Everything above the transport — clients, retries, walk strategies,
+checkpoints — runs unchanged, so a replayed run exercises the same code
+as a live one and is reproducible (``--replay-seed``).
+
+Only final answers are recorded: 429 and 5xx responses are not stored
+(replay injects those on demand instead).  Redirects are stored as-is and
+followed by the client on replay.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import sqlite3
+import threading
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import httpx
+import pyzstd
+
+ERROR_KINDS = ("429", "503", "timeout")
+
+# Response headers worth keeping; the body is stored decoded, so
+# content-encoding / content-length are dropped.
+_KEEP_HEADERS = ("content-type", "location", "retry-after")
+
+
+def request_key(method: str, url: str | httpx.URL) -> str:
+    """Cassette key: ``"GET https://host/path?a=1&b=2"`` with sorted query."""
+    parts = urlsplit(str(url))
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    base = f"{parts.scheme}://{parts.netloc}{parts.path}"
+    return f"{method.upper()} {base}?{query}" if query else f"{method.upper()} {base}"
+
+
+class Cassette:
+    """On-disk response store (SQLite, zstd-compressed bodies).
+
+    Parameters
+    ----------
+    path:
+        SQLite file; created on first use.
+    commit_every:
+        Commit after this many new responses (and on :meth:`close`).
+    """
+
+    def __init__(self, path: str | Path, commit_every: int = 200):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, status INTEGER NOT NULL,"
+            " headers TEXT NOT NULL, body BLOB NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        self._uncommitted = 0
+        self.commit_every = commit_every
+
+    def get(self, key: str) -> tuple[int, dict[str, str], bytes] | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, headers, body = row
+        return status, json.loads(headers), pyzstd.decompress(body) if body else b""
+
+    def put(self, key: str, status: int, headers: dict[str, str], body: bytes) -> None:
+        blob = pyzstd.compress(body, 6) if body else b""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, status, json.dumps(headers), blob),
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self._db.commit()
+                self._uncommitted = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Forward to *inner* and store every final response in *cassette*."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+        self.recorded = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.inner.handle_async_request(request)
+        body = await response.aread()  # decoded (gzip/br) body
+        await response.aclose()
+        headers = {
+            k: response.headers[k] for k in _KEEP_HEADERS if k in response.headers
+        }
+        if response.status_code != 429 and response.status_code < 500:
+            self.cassette.put(
+                request_key(request.method, request.url),
+                response.status_code,
+                headers,
+                body,
+            )
+            self.recorded += 1
+        return httpx.Response(
+            response.status_code, headers=headers, content=body, request=request
+        )
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+        self.cassette.close()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serve responses from a :class:`Cassette` instead of the network.
+
+    Parameters
+    ----------
+    cassette:
+        Recorded responses.  Unrecorded requests get a 404.
+    latency:
+        Seconds added to every response.
+    jitter:
+        Extra uniform random delay in ``[0, jitter]`` seconds.
+    error_rate:
+        Probability (0–1) that a request fails instead of being served.
+    errors:
+        Failure kinds to pick from: ``"429"`` (with ``Retry-After``),
+        ``"503"`` and ``"timeout"`` (raises ``httpx.ReadTimeout``).
+    retry_after:
+        ``Retry-After`` seconds sent with injected 429s.
+    seed:
+        Random seed for reproducible delays and failures.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        errors: tuple[str, ...] = ERROR_KINDS,
+        retry_after: int = 1,
+        seed: int | None = None,
+    ):
+        unknown = set(errors) - set(ERROR_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown error kinds {sorted(unknown)}; expected {ERROR_KINDS}")
+        self.cassette = cassette
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.errors = tuple(errors)
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self.hits = 0
+        self.misses = 0
+        self.injected = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.errors and self.error_rate > 0 and self._rng.random() < self.error_rate:
+            self.injected += 1
+            kind = self._rng.choice(self.errors)
+            if kind == "timeout":
+                raise httpx.ReadTimeout("injected timeout", request=request)
+            headers = {"retry-after": str(self.retry_after)} if kind == "429" else {}
+            return httpx.Response(int(kind), headers=headers, request=request)
+
+        recorded = self.cassette.get(request_key(request.method, request.url))
+        if recorded is None:
+            self.misses += 1
+            return httpx.Response(404, content=b"not recorded", request=request)
+        self.hits += 1
+        status, headers, body = recorded
+        return httpx.Response(status, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        self.cassette.close()
+
+
+def live_transport(max_concurrent: int, http2: bool = False) -> httpx.AsyncHTTPTransport:
+    """The pooled network transport the source clients would build themselves."""
+    return httpx.AsyncHTTPTransport(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_concurrent + 10,
+            max_keepalive_connections=max_concurrent,
+        ),
+    )
@@ -0,0 +1,311 @@
+"""Per-book append-only chapter journal.
+
+``ingest.py`` appends every fetched chapter (already zstd-compressed) to
+``data/journal/{source}/{book_id}.journal`` before it reaches the bundle
+or the DB.  Bundle/DB checkpoints can then be rare — once per book, or
+every few minutes — without risking fetched content: whatever was
+journalled but not yet checkpointed is replayed into the bundle and DB
+on the next start.
+
+File format (little-endian):
+  [4 bytes]  magic: "BJNL"
+  [4 bytes]  uint32: version (1)
+  [4 bytes]  uint32: book id
+  Records, back to back:
+    [4 bytes]  uint32: CRC-32 of everything after this field
+    [4 bytes]  uint32: chapter index number
+    [4 bytes]  uint32: chapter_id
+    [4 bytes]  uint32: word_count
+    [4 bytes]  uint32: uncompressed length
+    [4 bytes]  uint32: compressed length (C)
+    [2 bytes]  uint16: title length (T)
+    [2 bytes]  uint16: slug length (S)
+    [T bytes]  title UTF-8
+    [S bytes]  slug UTF-8
+    [C bytes]  zstd-compressed chapter data
+
+A crash can leave a partially written last record; readers stop at the
+first record that is short or fails its CRC and ignore the rest.
+
+Records are flushed to the OS on every append (a killed process loses
+nothing) and ``fsync``-ed in batches (a power loss loses at most the last
+batch).
+
+Each source has its own journal directory (``data/journal/{source}/``)
+and an ingest run holds :class:`JournalDirLock` on it for its lifetime:
+journals in a locked directory belong to a live run and must not be
+replayed by anyone else.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+from .bundle import ChapterMeta, read_bundle_meta, read_bundle_raw, write_bundle
+
+# ─── Constants ────────────────────────────────────────────────────────────────
+
+JOURNAL_MAGIC = b"BJNL"
+JOURNAL_VERSION = 1
+JOURNAL_SUFFIX = ".journal"
+
+_HEADER = struct.Struct("<4sII")  # magic, version, book_id
+_RECORD = struct.Struct("<IIIIIIHH")  # crc, index, ch_id, wc, raw, comp, tlen, slen
+_TEXT_MAX = 0xFFFF
+
+
+class JournalError(Exception):
+    """Raised when a journal file has a bad header."""
+
+
+# ─── Data types ───────────────────────────────────────────────────────────────
+
+
+@dataclass
+class JournalEntry:
+    """One chapter recovered from a journal."""
+
+    index: int
+    compressed: bytes
+    raw_len: int
+    title: str
+    slug: str
+    word_count: int
+    chapter_id: int = 0
+
+
+def journal_path(journal_dir: str | Path, book_id: int) -> Path:
+    """Path of the journal for *book_id* inside *journal_dir*."""
+    return Path(journal_dir) / f"{book_id}{JOURNAL_SUFFIX}"
+
+
+def _encode_record(
+    index: int,
+    compressed: bytes,
+    raw_len: int,
+    title: str,
+    slug: str,
+    word_count: int,
+    chapter_id: int,
+) -> bytes:
+    title_b = title.encode("utf-8")[:_TEXT_MAX]
+    slug_b = slug.encode("utf-8")[:_TEXT_MAX]
+    head = _RECORD.pack(
+        0, index, chapter_id, word_count, raw_len,
+        len(compressed), len(title_b), len(slug_b),
+    )[4:]
+    crc = zlib.crc32(compressed, zlib.crc32(slug_b, zlib.crc32(title_b, zlib.crc32(head))))
+    return struct.pack("<I", crc) + head + title_b + slug_b + compressed
+
+
+# ─── Writer ───────────────────────────────────────────────────────────────────
+
+
+class ChapterJournal:
+    """Append-only journal for one book.
+
+    Not thread-safe: one book is ingested by one coroutine, which calls
+    :meth:`append` from ``asyncio.to_thread`` one chapter at a time.
+
+    Parameters
+    ----------
+    path:
+        Journal file.  An existing file is replaced — recover it first
+        (:func:`read_journal` + :func:`merge_into_bundle`) if it may hold
+        chapters that never reached the bundle.
+    book_id:
+        Book the journal belongs to (stored in the header).
+    sync_every:
+        ``fsync`` after this many appended records.
+    sync_interval:
+        … or when this many seconds have passed since the last ``fsync``.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        book_id: int,
+        sync_every: int = 32,
+        sync_interval: float = 2.0,
+    ):
+        self.path = Path(path)
+        self.book_id = book_id
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, "wb")
+        self._f.write(_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, book_id))
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._sync()
+
+    def append(
+        self,
+        index: int,
+        compressed: bytes,
+        raw_len: int,
+        title: str,
+        slug: str,
+        word_count: int,
+        chapter_id: int = 0,
+    ) -> int:
+        """Append one chapter record (flushed now, fsync-ed in batches).
+
+        Returns the number of bytes written.
+        """
+        record = _encode_record(
+            index, compressed, raw_len, title, slug, word_count, chapter_id
+        )
+        self._f.write(record)
+        self._f.flush()
+        self._unsynced += 1
+        if (
+            self._unsynced >= self.sync_every
+            or time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self._sync()
+        return len(record)
+
+    def reset(self) -> None:
+        """Drop all records — call once they are safely in the bundle and DB."""
+        self._f.truncate(_HEADER.size)
+        self._f.seek(_HEADER.size)
+        self._sync()
+
+    def remove(self) -> None:
+        """Close and delete the journal (book finished)."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Sync and close, leaving the file in place for replay."""
+        if self._f.closed:
+            return
+        self._sync()
+        self._f.close()
+
+    def _sync(self) -> None:
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+
+# ─── Reader / replay ──────────────────────────────────────────────────────────
+
+
+def read_journal(path: str | Path) -> tuple[int, dict[int, JournalEntry]]:
+    """Read a journal, stopping at the first torn or corrupt record.
+
+    Returns ``(book_id, entries by chapter index)``; a chapter journalled
+    more than once keeps its last record.  Raises :class:`JournalError`
+    if the header is missing or invalid.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if len(data) < _HEADER.size:
+        raise JournalError(f"{path}: truncated header")
+    magic, version, book_id = _HEADER.unpack_from(data, 0)
+    if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+        raise JournalError(f"{path}: not a v{JOURNAL_VERSION} chapter journal")
+
+    entries: dict[int, JournalEntry] = {}
+    pos = _HEADER.size
+    while pos + _RECORD.size <= len(data):
+        crc, index, ch_id, wc, raw_len, comp_len, tlen, slen = _RECORD.unpack_from(
+            data, pos
+        )
+        end = pos + _RECORD.size + tlen + slen + comp_len
+        if end > len(data):
+            break  # torn tail
+        if zlib.crc32(data[pos + 4 : end]) != crc:
+            break  # corrupt record — nothing after it can be trusted
+        off = pos + _RECORD.size
+        title = data[off : off + tlen].decode("utf-8", errors="replace")
+        off += tlen
+        slug = data[off : off + slen].decode("utf-8", errors="replace")
+        off += slen
+        entries[index] = JournalEntry(
+            index=index,
+            compressed=data[off:end],
+            raw_len=raw_len,
+            title=title,
+            slug=slug,
+            word_count=wc,
+            chapter_id=ch_id,
+        )
+        pos = end
+
+    return book_id, entries
+
+
+def merge_into_bundle(bundle_path: str, entries: dict[int, JournalEntry]) -> int:
+    """Merge journalled chapters into a bundle; returns the bundle's chapter count.
+
+    Journalled chapters replace bundle chapters with the same index — they
+    are newer.  The bundle is fsync-ed before the caller drops the journal.
+    """
+    data = read_bundle_raw(bundle_path)
+    meta = read_bundle_meta(bundle_path)
+    for idx, e in entries.items():
+        data[idx] = (e.compressed, e.raw_len)
+        meta[idx] = ChapterMeta(
+            chapter_id=e.chapter_id, word_count=e.word_count, title=e.title, slug=e.slug
+        )
+    write_bundle(bundle_path, data, meta, fsync=True)
+    return len(data)
+
+
+def list_journals(journal_dir: str | Path) -> list[Path]:
+    """All journal files in *journal_dir*, sorted by name."""
+    d = Path(journal_dir)
+    if not d.is_dir():
+        return []
+    return sorted(d.glob(f"*{JOURNAL_SUFFIX}"))
+
+
+class JournalDirLock:
+    """Exclusive ``flock`` on ``.lock`` inside a journal directory.
+
+    The lock is released when the process exits, however it exits, so a
+    crashed run's journals become replayable again.
+    """
+
+    def __init__(self, journal_dir: str | Path):
+        self.path = Path(journal_dir) / ".lock"
+        self._f = None
+
+    @property
+    def held(self) -> bool:
+        return self._f is not None
+
+    def acquire(self) -> bool:
+        """Take the lock without waiting; False if another process holds it."""
+        if self._f is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        f = open(self.path, "ab")
+        if fcntl is not None:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                f.close()
+                return False
+        self._f = f
+        return True
+
+    def release(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            self._f = None
@@ -0,0 +1,219 @@
+"""Buffered, non-blocking log files for the detail logs.
+
+``log_detail()`` used to open the log, write one line and close it on every
+call — from inside the asyncio event loop.  :class:`LogSink` instead puts
+``(time, message)`` pairs on a queue and lets a daemon thread format and
+write them in batches, so callers only pay for a ``queue.put``.
+
+Text format is unchanged (``[YYYY-mm-dd HH:MM:SS] message``) so existing
+``grep`` tooling keeps working.  The optional JSON-lines format wraps the
+same message text::
+
+    {"ts": "2025-01-01T12:00:00", "event": "DONE", "book_id": 100358, "msg": "DONE 100358 ..."}
+
+Files are rotated by size (``path`` → ``path.1`` → … → ``path.N``).
+The mtc, ttv and tf runs share one detail log, so the size check, the
+rotation and the append happen under an exclusive ``flock`` on
+``path.lock``: only one process rotates, and the others append to the
+new file.  Pending lines are flushed at interpreter exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import re
+import threading
+import time
+import weakref
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+LOG_FORMATS = ("text", "json")
+
+# "DONE 100358 ..." / "FIX 30000003 ..." → event + book id for JSON lines
+_EVENT_RE = re.compile(r"^([A-Z][A-Z_-]+)(?::?\s+(\d+))?")
+
+_STOP = object()
+_sinks: weakref.WeakSet[LogSink] = weakref.WeakSet()
+
+
+class LogSink:
+    """Append-only log file written by a background thread.
+
+    Parameters
+    ----------
+    path:
+        Log file path.  Parent directories are created on first write.
+    fmt:
+        ``"text"`` (default) or ``"json"`` for JSON lines.
+    max_bytes:
+        Rotate when the file would grow past this size; ``0`` disables
+        rotation.
+    backups:
+        Number of rotated files to keep.
+    flush_interval:
+        Maximum seconds a line may sit in the buffer before being written.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        fmt: str = "text",
+        max_bytes: int = 50 * 1024 * 1024,
+        backups: int = 5,
+        flush_interval: float = 0.5,
+    ):
+        if fmt not in LOG_FORMATS:
+            raise ValueError(f"Unknown log format {fmt!r}; expected one of {LOG_FORMATS}")
+        self.path = Path(path)
+        self.fmt = fmt
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        _sinks.add(self)
+
+    # ── Producer side ───────────────────────────────────────────────────
+
+    def write(self, msg: str) -> None:
+        """Queue one message.  Never blocks on disk I/O."""
+        self._put((time.time(), msg))
+
+    def write_record(self, record: dict) -> None:
+        """Queue a pre-built JSON record (written as one JSON line as-is)."""
+        self._put(record)
+
+    def flush(self) -> None:
+        """Block until every message queued so far has been written."""
+        if self._thread is None or self._closed:
+            return  # after close() nothing is queued and no thread would answer
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        """Flush pending messages and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _put(self, item: object) -> None:
+        if self._closed:
+            # Late writes after close() (e.g. from atexit ordering) go
+            # straight to disk rather than being dropped.
+            self._write_batch([item])
+            return
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name=f"logsink:{self.path.name}", daemon=True
+                    )
+                    self._thread.start()
+        self._queue.put(item)
+
+    # ── Writer thread ───────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: list[object] = []
+            waiters: list[threading.Event] = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or waiters:
+                    # Drain whatever is already queued, then write
+                    try:
+                        item = self._queue.get_nowait()
+                        continue
+                    except queue.Empty:
+                        break
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except OSError:
+                    pass  # a full disk must not take the pipeline down
+            for w in waiters:
+                w.set()
+            if stop:
+                return
+
+    def _format(self, item: object) -> str:
+        if isinstance(item, dict):
+            return json.dumps(item, ensure_ascii=False) + "\n"
+        ts, msg = item  # type: ignore[misc]
+        if self.fmt == "text":
+            return f"[{datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')}] {msg}\n"
+        record: dict = {"ts": datetime.fromtimestamp(ts).isoformat(timespec="seconds")}
+        m = _EVENT_RE.match(msg)
+        if m:
+            record["event"] = m.group(1)
+            if m.group(2):
+                record["book_id"] = int(m.group(2))
+        record["msg"] = msg
+        return json.dumps(record, ensure_ascii=False) + "\n"
+
+    def _write_batch(self, batch: list[object]) -> None:
+        data = "".join(self._format(item) for item in batch).encode("utf-8")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.max_bytes <= 0:
+            with open(self.path, "ab") as f:
+                f.write(data)
+            return
+        with open(self.path.with_name(self.path.name + ".lock"), "ab") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            # Sized under the lock: another process may just have rotated
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size > 0 and size + len(data) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "ab") as f:
+                f.write(data)
+
+    def _rotate(self) -> None:
+        if self.backups <= 0:
+            self.path.unlink(missing_ok=True)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.path.exists():
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+
+
+@atexit.register
+def _close_all() -> None:
+    for sink in list(_sinks):
+        sink.close()
@@ -0,0 +1,369 @@
+"""Prometheus-compatible metrics for ingest runs.
+
+A small in-process registry (counters, gauges, histograms with labels)
+rendered in the Prometheus text exposition format, plus an asyncio HTTP
+endpoint for ``ingest.py --metrics-port``.  No ``prometheus_client``
+dependency: recording a sample is a dict lookup and an add under a lock,
+so the metrics below are always recorded and only served when asked.
+
+All metrics live in :data:`REGISTRY` and are defined at the bottom of
+this module so the HTTP clients, sources and ``ingest.py`` share them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+
+_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _format_value(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    if v == int(v):
+        return str(int(v))
+    return repr(float(v))
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def labels(self, *values: object):
+        """Child metric for one label combination (created on first use)."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """A fresh child (value or histogram) for one label combination."""
+
+    def _unlabelled(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use .labels()")
+        return self.labels()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(child._render(self.name, self.labelnames, key))
+        return lines
+
+
+class _Value:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._value = 0.0
+        self._fn: Callable[[], float] | None = None
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Read the value from *fn* at scrape time (gauges only)."""
+        self._fn = fn
+
+    @property
+    def value(self) -> float:
+        if self._fn is not None:
+            try:
+                return float(self._fn())
+            except Exception:
+                return math.nan
+        return self._value
+
+    def _render(self, name: str, labelnames, key) -> list[str]:
+        return [f"{name}{_labels_text(labelnames, key)} {_format_value(self.value)}"]
+
+
+class Counter(_Metric):
+    """Monotonic counter.  ``c.inc()`` or ``c.labels("mtc").inc(5)``."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self._unlabelled().inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def set(self, value: float) -> None:
+        self._unlabelled().set(value)
+
+    def inc(self, amount: float = 1) -> None:
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._unlabelled().dec(amount)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._unlabelled().set_function(fn)
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self._lock = threading.Lock()
+        self._buckets = tuple(buckets)
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+
+    def _render(self, name: str, labelnames, key) -> list[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        lines = []
+        cumulative = 0
+        for bound, n in zip((*self._buckets, math.inf), counts):
+            cumulative += n
+            le = f'le="{_format_value(bound)}"'
+            lines.append(
+                f"{name}_bucket{_labels_text(labelnames, key, le)} {cumulative}"
+            )
+        labels = _labels_text(labelnames, key)
+        lines.append(f"{name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{name}_count{labels} {cumulative}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in fixed buckets (seconds by default)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled().observe(value)
+
+
+class Registry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        """The whole registry in Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# HTTP endpoint
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+async def start_metrics_server(
+    port: int, host: str = "127.0.0.1", registry: Registry | None = None
+) -> asyncio.AbstractServer:
+    """Serve ``GET /metrics`` on *host*:*port* from the running event loop.
+
+    Returns the server; close it with ``server.close()`` when the run ends.
+    """
+    registry = registry or REGISTRY
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=10)
+            # Drain headers; we do not need them
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=10)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+            parts = request.decode("latin-1").split()
+            path = parts[1].split("?", 1)[0] if len(parts) >= 2 else ""
+            if len(parts) >= 2 and parts[0] == "GET" and path in ("/metrics", "/"):
+                status, ctype, body = "200 OK", _CONTENT_TYPE, registry.render().encode()
+            else:
+                status, ctype, body = "404 Not Found", "text/plain", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {ctype}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Ingest metrics
+# ═══════════════════════════════════════════════════════════════════════════
+
+REGISTRY = Registry()
+
+CHAPTERS = REGISTRY.counter(
+    "bookingest_chapters_total",
+    "Chapters by pipeline stage (fetched, compressed, persisted).",
+    ("source", "stage"),
+)
+HTTP_RESPONSES = REGISTRY.counter(
+    "bookingest_http_responses_total",
+    "Upstream HTTP responses by status code ('error' = transport failure).",
+    ("source", "status"),
+)
+HTTP_RETRIES = REGISTRY.counter(
+    "bookingest_http_retries_total",
+    "Upstream request retries by reason.",
+    ("source", "reason"),
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "bookingest_http_request_seconds",
+    "Upstream request latency (one attempt, excluding throttle sleeps).",
+    ("source",),
+)
+BUNDLE_WRITE = REGISTRY.histogram(
+    "bookingest_bundle_write_seconds",
+    "Bundle merge + atomic write time per checkpoint.",
+    ("source",),
+)
+DB_COMMIT = REGISTRY.histogram(
+    "bookingest_db_commit_seconds",
+    "Chapter-row insert + commit time per checkpoint (excluding lock wait).",
+    ("source",),
+)
+BYTES_WRITTEN = REGISTRY.counter(
+    "bookingest_bytes_written_total",
+    "Bytes written to disk by kind (bundle, journal).",
+    ("source", "kind"),
+)
+BOOKS = REGISTRY.counter(
+    "bookingest_books_total",
+    "Books finished by outcome (done, skipped, error).",
+    ("source", "outcome"),
+)
+COVERS = REGISTRY.counter(
+    "bookingest_covers_total",
+    "Cover stage results by outcome (saved, missing).",
+    ("source", "outcome"),
+)
+BOOKS_IN_FLIGHT = REGISTRY.gauge(
+    "bookingest_books_in_flight", "Books currently in progress."
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "bookingest_queue_depth", "Plan entries not yet started."
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "bookingest_requests_in_flight", "Requests holding a limiter slot."
+)
+REQUESTS_WAITING = REGISTRY.gauge(
+    "bookingest_requests_waiting", "Requests queued on the limiter."
+)
+COVER_QUEUE_DEPTH = REGISTRY.gauge(
+    "bookingest_cover_queue_depth", "Covers queued or downloading."
+)
+
+
+async def instrumented_get(client, source: str, url: str, **kwargs):
+    """``await client.get(url, **kwargs)`` recording latency and status.
+
+    Transport failures are counted as status ``"error"`` and re-raised.
+    """
+    start = time.perf_counter()
+    try:
+        r = await client.get(url, **kwargs)
+    except Exception:
+        HTTP_RESPONSES.labels(source, "error").inc()
+        raise
+    finally:
+        HTTP_LATENCY.labels(source).observe(time.perf_counter() - start)
+    HTTP_RESPONSES.labels(source, r.status_code).inc()
+    return r
+
+
+def count_retry(source: str, reason: object) -> None:
+    """Record one retry of an upstream request (*reason*: status code or ``"error"``)."""
+    HTTP_RETRIES.labels(source, reason).inc()
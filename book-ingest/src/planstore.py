@@ -0,0 +1,333 @@
+"""Indexed plan store: download plans for every source in one SQLite file.
+
+The plans used to be whole JSON arrays (``books_plan_{source}.json``),
+rewritten in full on every checkpoint and parsed in full by every
+``ingest.py`` start, even for ``--limit 10`` or a handful of IDs.  The
+store keeps one row per book::
+
+    data/plans.sqlite
+        plans(source, id, position, chapter_count, status, changed_at, data,
+              refreshed_at, grew_at)
+            PRIMARY KEY (source, id)
+            data         the plan entry, as JSON
+            position     order of the book in the plan (ingest order)
+            changed_at   when ``data`` last changed (not when it was last
+                         written with the same content)
+            refreshed_at when ``--refresh`` last fetched the book's metadata
+            grew_at      when a write last raised ``chapter_count``
+
+so checkpoints upsert only the books that were just discovered, and
+ingest reads only the rows it asks for (:meth:`PlanStore.query`).
+
+The JSON files stay the interchange format: plan generation exports them
+once per run (:meth:`PlanStore.export_json`), and a JSON file written by
+another tool (``meta-puller``, ``refresh_catalog.py``, a copy from another
+machine) replaces the stored plan the next time the store is opened —
+the same mtime/size check as :class:`~src.registry.SlugRegistry`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+PLAN_STORE_PATH = Path(__file__).resolve().parent.parent / "data" / "plans.sqlite"
+
+
+def _dumps(entry: dict) -> str:
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+
+class PlanStore:
+    """Per-book plan rows for all sources.
+
+    Parameters
+    ----------
+    path:
+        SQLite file; created on first use.
+    json_paths:
+        ``{source: plan JSON}``.  A file that changed since it was last
+        imported or exported replaces that source's plan on open.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = PLAN_STORE_PATH,
+        json_paths: Mapping[str, str | Path] | None = None,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: every write below manages its own transaction
+        self._db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS plans ("
+            " source TEXT NOT NULL, id INTEGER NOT NULL,"
+            " position INTEGER NOT NULL, chapter_count INTEGER NOT NULL DEFAULT 0,"
+            " status, changed_at REAL NOT NULL, data TEXT NOT NULL,"
+            " refreshed_at REAL, grew_at REAL,"
+            " PRIMARY KEY (source, id))"
+        )
+        # Stores created before refresh tracking
+        columns = {r[1] for r in self._db.execute("PRAGMA table_info(plans)")}
+        for column in ("refreshed_at", "grew_at"):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE plans ADD COLUMN {column} REAL")
+        for column in ("position", "chapter_count", "changed_at"):
+            self._db.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_plans_{column}"
+                f" ON plans (source, {column})"
+            )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self.json_paths = {s: Path(p) for s, p in (json_paths or {}).items()}
+        for source, json_path in self.json_paths.items():
+            if self._json_changed(source, json_path):
+                self.import_json(source, json_path)
+
+    # ── Writes ──────────────────────────────────────────────────────────
+
+    def upsert(self, source: str, entries: Iterable[dict]) -> int:
+        """Insert or update *entries* (keyed by ``id``); other books stay.
+
+        New books go to the end of the plan; existing ones keep their
+        position.  Returns the number of rows whose data changed.
+        """
+        return self._write(source, list(entries), replace=False)
+
+    def replace(self, source: str, entries: Iterable[dict]) -> int:
+        """Make *entries*, in this order, the whole plan for *source*.
+
+        Rows are still written one book at a time: unchanged books keep
+        their ``changed_at``, and books not in *entries* are deleted.
+        Returns the number of rows added, changed or deleted.
+        """
+        return self._write(source, list(entries), replace=True)
+
+    def _write(self, source: str, entries: list[dict], replace: bool) -> int:
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            if replace:
+                base = 0
+            else:
+                row = self._db.execute(
+                    "SELECT MAX(position) FROM plans WHERE source = ?", (source,)
+                ).fetchone()
+                base = (row[0] if row[0] is not None else -1) + 1
+            rows = [
+                (
+                    source,
+                    e["id"],
+                    base + i,
+                    e.get("chapter_count") or 0,
+                    e.get("status"),
+                    now,
+                    _dumps(e),
+                )
+                for i, e in enumerate(entries)
+            ]
+            position = "excluded.position" if replace else "plans.position"
+            # Identical rows are skipped; changed_at only moves with the data
+            self._db.executemany(
+                "INSERT INTO plans"
+                " (source, id, position, chapter_count, status, changed_at, data)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(source, id) DO UPDATE SET"
+                f" position = {position},"
+                " grew_at = CASE WHEN excluded.chapter_count > plans.chapter_count"
+                "   THEN excluded.changed_at ELSE plans.grew_at END,"
+                " chapter_count = excluded.chapter_count,"
+                " status = excluded.status,"
+                " changed_at = CASE WHEN plans.data = excluded.data"
+                "   THEN plans.changed_at ELSE excluded.changed_at END,"
+                " data = excluded.data"
+                f" WHERE plans.data != excluded.data OR plans.position != {position}",
+                rows,
+            )
+            changed = self._db.execute(
+                "SELECT COUNT(*) FROM plans WHERE source = ? AND changed_at = ?",
+                (source, now),
+            ).fetchone()[0]
+            if replace:
+                changed += self._db.execute(
+                    "DELETE FROM plans WHERE source = ? AND id NOT IN"
+                    " (SELECT value FROM json_each(?))",
+                    (source, json.dumps([r[1] for r in rows])),
+                ).rowcount
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return changed
+
+    # ── Queries ─────────────────────────────────────────────────────────
+
+    def query(
+        self,
+        source: str,
+        ids: Iterable[int] | None = None,
+        min_chapters: int = 0,
+        status: object | None = None,
+        changed_since: float | None = None,
+        offset: int = 0,
+        limit: int = 0,
+    ) -> list[dict]:
+        """Plan entries for *source* in plan order, filtered in SQL.
+
+        *ids* restricts to those books (missing ones are skipped);
+        *offset*/*limit* apply after the other filters.
+        """
+        where = ["source = ?"]
+        params: list = [source]
+        if ids is not None:
+            where.append("id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(ids)))
+        if min_chapters > 0:
+            where.append("chapter_count >= ?")
+            params.append(min_chapters)
+        if status is not None:
+            where.append("status = ?")
+            params.append(status)
+        if changed_since is not None:
+            where.append("changed_at >= ?")
+            params.append(changed_since)
+        sql = f"SELECT data FROM plans WHERE {' AND '.join(where)} ORDER BY position"
+        if limit > 0 or offset > 0:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit if limit > 0 else -1, offset]
+        return [json.loads(r[0]) for r in self._db.execute(sql, params)]
+
+    def get(self, source: str, book_id: int) -> dict | None:
+        row = self._db.execute(
+            "SELECT data FROM plans WHERE source = ? AND id = ?", (source, book_id)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, source: str, ids: Iterable[int]) -> dict[int, dict]:
+        """``{id: entry}`` for the IDs that are in the plan."""
+        return {e["id"]: e for e in self.query(source, ids=ids)}
+
+    def count(self, source: str) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM plans WHERE source = ?", (source,)
+        ).fetchone()[0]
+
+    def ids(self, source: str) -> set[int]:
+        """IDs of every book in the plan (no entry data is decoded)."""
+        return {
+            r[0] for r in self._db.execute("SELECT id FROM plans WHERE source = ?", (source,))
+        }
+
+    def has_plan(self, source: str) -> bool:
+        return self._db.execute(
+            "SELECT 1 FROM plans WHERE source = ? LIMIT 1", (source,)
+        ).fetchone() is not None
+
+    # ── Refresh tracking ────────────────────────────────────────────────
+
+    def refresh_state(self, source: str) -> dict[int, tuple[float | None, float | None]]:
+        """``{id: (refreshed_at, grew_at)}`` for every book in the plan."""
+        return {
+            book_id: (refreshed_at, grew_at)
+            for book_id, refreshed_at, grew_at in self._db.execute(
+                "SELECT id, refreshed_at, grew_at FROM plans WHERE source = ?",
+                (source,),
+            )
+        }
+
+    def mark_refreshed(
+        self, source: str, ids: Iterable[int], at: float | None = None
+    ) -> None:
+        """Record that the metadata of *ids* was fetched at *at* (default: now)."""
+        at = time.time() if at is None else at
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.executemany(
+                "UPDATE plans SET refreshed_at = ? WHERE source = ? AND id = ?",
+                ((at, source, book_id) for book_id in ids),
+            )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+    # ── JSON snapshot ───────────────────────────────────────────────────
+
+    def _signature(self, path: Path) -> str:
+        st = path.stat()
+        return f"{st.st_mtime_ns}:{st.st_size}"
+
+    def _set_signature(self, source: str, path: Path) -> None:
+        self._db.execute(
+            "INSERT INTO meta VALUES (?, ?)"
+            " ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (f"json:{source}", self._signature(path)),
+        )
+
+    def _json_changed(self, source: str, path: Path) -> bool:
+        if not path.exists():
+            return False
+        row = self._db.execute(
+            "SELECT value FROM meta WHERE key = ?", (f"json:{source}",)
+        ).fetchone()
+        return row is None or row[0] != self._signature(path)
+
+    def import_json(self, source: str, path: str | Path) -> int:
+        """Replace the plan for *source* with a JSON plan file.
+
+        Accepts flat arrays and structured plans (``need_download`` /
+        ``partial`` lists).  Returns the number of rows changed (0 if the
+        file does not exist).
+        """
+        path = Path(path)
+        if not path.exists():
+            return 0
+        changed = self.replace(source, read_plan_json(path))
+        self._set_signature(source, path)
+        return changed
+
+    def export_json(self, source: str, path: str | Path | None = None) -> int:
+        """Write the plan for *source* as a flat JSON array (once per run).
+
+        Returns the number of entries written.
+        """
+        path = Path(path) if path is not None else self.json_paths[source]
+        entries = self.query(source)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+        self._set_signature(source, path)
+        return len(entries)
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> PlanStore:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_plan_json(path: str | Path) -> list[dict]:
+    """Entries of a plan JSON file: a flat array, or a structured plan
+    with ``need_download`` / ``partial`` / ``have_partial`` / ``books``."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data
+    entries: list[dict] = []
+    if isinstance(data, dict):
+        for key in ("need_download", "partial", "have_partial", "books"):
+            if key in data and isinstance(data[key], list):
+                entries.extend(data[key])
+    return entries
@@ -0,0 +1,173 @@
+"""Priority ordering of plan entries for ``ingest.py --order``.
+
+An ingest cycle may end before it reaches every book, so the order in
+which books are started decides which chapters land first.  Policies:
+
+    plan        plan-file order (default)
+    gap         most missing chapters first
+    popularity  most viewed / bookmarked / voted first
+    freshness   most recently updated first (``new_chap_at``, else ``updated_at``)
+    sjf         shortest job first: fewest missing chapters first
+    weighted    gap × popularity × freshness score, highest first
+
+"Missing" is ``chapter_count`` from the plan minus the chapter count in
+the bundle header (:func:`src.bundle.read_bundle_count`).
+
+:class:`PlanQueue` is a heap-backed priority queue that the scheduler
+consumes as a plain iterator.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+import time
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime, timezone
+
+ORDER_POLICIES = ("plan", "gap", "popularity", "freshness", "sjf", "weighted")
+
+# Policies that need the bundle's chapter count for every entry.
+_GAP_POLICIES = frozenset({"gap", "sjf", "weighted"})
+
+# Freshness half-life for the weighted score: a book updated 30 days ago
+# counts half as much as one updated today.
+FRESHNESS_HALF_LIFE_DAYS = 30.0
+
+
+def parse_timestamp(value: object) -> float | None:
+    """Best-effort epoch seconds from a plan timestamp field.
+
+    Accepts ISO-8601 strings (``2024-05-01T12:00:00.000000Z``,
+    ``2024-05-01 12:00:00``, ``2024-05-01``) and numeric epochs.
+    Returns ``None`` for anything else.
+    """
+    if isinstance(value, (int, float)) and value > 0:
+        return float(value)
+    if not isinstance(value, str) or not value:
+        return None
+    text = value.strip().replace("Z", "+00:00")
+    for candidate in (text, text[:19], text[:10]):
+        try:
+            dt = datetime.fromisoformat(candidate)
+        except ValueError:
+            continue
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    return None
+
+
+def popularity(entry: dict) -> float:
+    """Log-scaled popularity from the plan's reader counters."""
+    views = entry.get("view_count") or 0
+    bookmarks = entry.get("bookmark_count") or 0
+    votes = entry.get("vote_count") or 0
+    return math.log1p(views) + 2 * math.log1p(bookmarks) + math.log1p(votes)
+
+
+def freshness(entry: dict) -> float:
+    """Epoch seconds of the latest update, or 0 if unknown."""
+    for key in ("new_chap_at", "updated_at"):
+        ts = parse_timestamp(entry.get(key))
+        if ts is not None:
+            return ts
+    return 0.0
+
+
+def gap(entry: dict, have: int) -> int:
+    """Chapters listed in the plan but not in the bundle."""
+    return max((entry.get("chapter_count") or 0) - have, 0)
+
+
+def weighted_score(entry: dict, have: int, now: float | None = None) -> float:
+    """Combined value of ingesting *entry* now; higher is more urgent.
+
+    Missing chapters are worth more on popular books and on books that
+    are still being updated.  A complete book scores 0.
+    """
+    now = time.time() if now is None else now
+    g = gap(entry, have)
+    if g == 0:
+        return 0.0
+    updated = freshness(entry)
+    if updated:
+        age_days = max(now - updated, 0) / 86400
+        recency = 0.5 ** (age_days / FRESHNESS_HALF_LIFE_DAYS)
+    else:
+        recency = 0.0
+    return math.log1p(g) * (1 + popularity(entry)) * (0.5 + recency)
+
+
+def priority_key(policy: str, entry: dict, have: int, now: float | None = None) -> float:
+    """Sort key for *entry* under *policy* — smaller is started first."""
+    if policy == "plan":
+        return 0.0
+    if policy == "gap":
+        return -gap(entry, have)
+    if policy == "popularity":
+        return -popularity(entry)
+    if policy == "freshness":
+        return -freshness(entry)
+    if policy == "sjf":
+        return gap(entry, have)
+    if policy == "weighted":
+        return -weighted_score(entry, have, now)
+    raise ValueError(f"Unknown order policy {policy!r}; expected one of {ORDER_POLICIES}")
+
+
+class PlanQueue:
+    """Priority queue of plan entries.
+
+    Iterating pops entries in priority order; ties (and the whole queue
+    under ``"plan"``) keep insertion order.  Entries may be pushed while
+    the queue is being consumed.
+
+    Parameters
+    ----------
+    entries:
+        Initial plan entries.
+    policy:
+        One of :data:`ORDER_POLICIES`.
+    have:
+        ``entry -> chapters already stored``; only called for the gap-based
+        policies (``gap``, ``sjf``, ``weighted``).
+    now:
+        Reference time for freshness (default: construction time).
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[dict] = (),
+        policy: str = "plan",
+        have: Callable[[dict], int] | None = None,
+        now: float | None = None,
+    ):
+        if policy not in ORDER_POLICIES:
+            raise ValueError(
+                f"Unknown order policy {policy!r}; expected one of {ORDER_POLICIES}"
+            )
+        self.policy = policy
+        self._have = have if policy in _GAP_POLICIES else None
+        self._now = time.time() if now is None else now
+        self._seq = itertools.count()
+        self._heap: list[tuple[float, int, dict]] = []
+        for entry in entries:
+            self.push(entry)
+
+    def push(self, entry: dict) -> None:
+        have = self._have(entry) if self._have else 0
+        key = priority_key(self.policy, entry, have, self._now)
+        heapq.heappush(self._heap, (key, next(self._seq), entry))
+
+    def pop(self) -> dict:
+        """Remove and return the highest-priority entry (``IndexError`` if empty)."""
+        return heapq.heappop(self._heap)[2]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __iter__(self) -> Iterator[dict]:
+        while self._heap:
+            yield self.pop()
@@ -0,0 +1,195 @@
+"""Built-in sampling profiler for ``--profile``.
+
+A daemon thread snapshots every thread's Python stack with
+``sys._current_frames()`` at a fixed rate.  Unlike ``cProfile`` this sees
+all threads at once — the event loop, ``asyncio.to_thread`` workers
+(compression, bundle writes) and log sinks — costs the profiled code
+nothing between samples, and keeps whole call stacks, so the output
+loads straight into flamegraph tools::
+
+    python3 ingest.py --profile data/profile/ingest.collapsed
+    flamegraph.pl data/profile/ingest.collapsed > ingest.svg
+    # or drag the file into https://www.speedscope.app
+
+At exit two files are written:
+
+    <path>           collapsed stacks: ``thread;outer (file:line);...;leaf count``
+    <path>.top.txt   top-N functions by self and inclusive samples
+
+Samples of threads parked in the event loop's ``select``, a queue
+``get`` or a lock wait are dropped so the report shows work, not idle
+time.
+
+This file is shared with ``epub-converter/profiling.py``; keep the two
+copies identical.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_INTERVAL = 0.005  # 200 Hz
+DEFAULT_TOP = 30
+
+# (file name, function) of leaf frames that mean "thread is waiting"
+_IDLE_LEAVES = frozenset(
+    {
+        ("selectors.py", "select"),
+        ("threading.py", "wait"),
+        ("threading.py", "_wait_for_tstate_lock"),
+        ("queue.py", "get"),
+        ("thread.py", "_worker"),  # concurrent.futures pool, between jobs
+        ("logsink.py", "_run"),
+    }
+)
+
+
+def default_output(directory: str | Path, name: str) -> Path:
+    """``<directory>/<name>-YYYYmmdd-HHMMSS.collapsed``."""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return Path(directory) / f"{name}-{stamp}.collapsed"
+
+
+class SamplingProfiler:
+    """Sample all Python threads every *interval* seconds.
+
+    Parameters
+    ----------
+    interval:
+        Seconds between samples.
+    include_idle:
+        Keep samples whose leaf frame is a known wait (see module docs).
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.samples = 0
+        self.started_at = 0.0
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._labels: dict[object, str] = {}
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.elapsed = time.perf_counter() - self.started_at
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = (
+                f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                f":{code.co_firstlineno})"
+            )
+            self._labels[code] = label
+        return label
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                code = frame.f_code
+                if (
+                    not self.include_idle
+                    and (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES
+                ):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(f"thread:{names.get(ident, ident)}")
+                stack.reverse()
+                self.stacks[tuple(stack)] += 1
+            self.samples += 1
+
+    # ── Output ──────────────────────────────────────────────────────────
+
+    def collapsed(self) -> list[str]:
+        """Folded-stack lines (``a;b;c 12``), heaviest first."""
+        return [
+            f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()
+        ]
+
+    def top(self, n: int = DEFAULT_TOP) -> tuple[list[tuple[str, int]], list[tuple[str, int]]]:
+        """``(self_samples, inclusive_samples)`` — the *n* heaviest functions each."""
+        self_counts: Counter[str] = Counter()
+        incl_counts: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack[1:]):
+                incl_counts[label] += count
+        return self_counts.most_common(n), incl_counts.most_common(n)
+
+    def format_top(self, n: int = DEFAULT_TOP) -> str:
+        total = sum(self.stacks.values())
+        self_top, incl_top = self.top(n)
+        lines = [
+            f"{self.samples:,} sampling rounds over {self.elapsed:.1f}s "
+            f"({self.interval * 1000:g} ms interval), {total:,} busy thread samples",
+        ]
+        for title, rows in (("Self", self_top), ("Inclusive", incl_top)):
+            lines.append("")
+            lines.append(f"{title:<9}  {'samples':>8}  {'%':>6}  function")
+            for label, count in rows:
+                pct = 100 * count / total if total else 0
+                lines.append(f"{'':<9}  {count:>8,}  {pct:>5.1f}%  {label}")
+        return "\n".join(lines)
+
+    def write(self, path: str | Path, n: int = DEFAULT_TOP) -> tuple[Path, Path]:
+        """Write the collapsed-stack file and the top-N summary next to it."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(self.collapsed()) + "\n", encoding="utf-8")
+        top_path = path.with_name(path.name + ".top.txt")
+        top_path.write_text(self.format_top(n) + "\n", encoding="utf-8")
+        return path, top_path
+
+
+def start_profiling(
+    output: str | Path,
+    interval: float = DEFAULT_INTERVAL,
+    top: int = DEFAULT_TOP,
+) -> SamplingProfiler:
+    """Profile the rest of the process; write *output* (+ ``.top.txt``) at exit.
+
+    The report is written from an ``atexit`` hook, so it also covers runs
+    that end in ``sys.exit()`` or Ctrl-C.  A short summary goes to stderr.
+    """
+    profiler = SamplingProfiler(interval)
+    profiler.start()
+
+    def _finish() -> None:
+        profiler.stop()
+        path, top_path = profiler.write(output, top)
+        print(
+            f"\nProfile: {path} (collapsed stacks), {top_path} (top {top})\n\n"
+            + "\n".join(profiler.format_top(min(top, 15)).splitlines()),
+            file=sys.stderr,
+        )
+
+    atexit.register(_finish)
+    return profiler
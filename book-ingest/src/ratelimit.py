@@ -0,0 +1,84 @@
+"""Concurrency primitives shared by the source HTTP clients."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator
+from urllib.parse import urlsplit
+
+
+class TrackedSemaphore:
+    """``asyncio.Semaphore`` that counts holders and waiters.
+
+    The source clients cap in-flight requests with one of these; the
+    ingest scheduler reads :attr:`in_flight` and :attr:`waiting` to decide
+    whether another book can be started without just queueing behind the
+    limiter.
+
+    Use as ``async with sem: ...``.
+    """
+
+    def __init__(self, value: int):
+        self._sem = asyncio.Semaphore(value)
+        self.limit = value
+        self.in_flight = 0
+        self.waiting = 0
+
+    async def __aenter__(self) -> TrackedSemaphore:
+        self.waiting += 1
+        try:
+            await self._sem.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        self.in_flight -= 1
+        self._sem.release()
+
+
+class HostLimiter:
+    """Per-host concurrency cap with optional spacing between requests.
+
+    One :class:`TrackedSemaphore` per host, created on first use, so a
+    slow image CDN only holds its own slots.  *delay* spaces request
+    starts to the same host by at least that many seconds.
+
+    Use as ``async with hosts.slot(url): ...``.
+    """
+
+    def __init__(self, per_host: int, delay: float = 0.0):
+        self.per_host = per_host
+        self.delay = delay
+        self._sems: dict[str, TrackedSemaphore] = {}
+        self._next_start: dict[str, float] = {}
+
+    def _host(self, url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+    def limiter(self, url: str) -> TrackedSemaphore:
+        """The semaphore for *url*'s host."""
+        host = self._host(url)
+        sem = self._sems.get(host)
+        if sem is None:
+            sem = self._sems[host] = TrackedSemaphore(self.per_host)
+        return sem
+
+    @property
+    def in_flight(self) -> int:
+        return sum(s.in_flight for s in self._sems.values())
+
+    @contextlib.asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        async with self.limiter(url):
+            if self.delay > 0:
+                host = self._host(url)
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, 0.0))
+                self._next_start[host] = start + self.delay
+                if start > now:
+                    await asyncio.sleep(start - now)
+            yield
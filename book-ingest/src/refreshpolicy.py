@@ -0,0 +1,120 @@
+"""Tiered refresh policy for ``generate_plan.py --refresh``.
+
+A full refresh fetches the metadata of every plan book, but most of them
+cannot have changed: completed books rarely get new chapters, and a
+serial that has been idle for months is unlikely to resume this week.
+Each book is put in a tier from its status and its last observed
+activity, and is only re-fetched once its tier's interval has passed
+since its last refresh:
+
+    tier        condition                                     default interval
+    new         never refreshed                               every run
+    hot         active within ``hot_days`` (14)               every run
+    warm        active within ``cold_days`` (90), or unknown  3 days
+    cold        idle for longer than ``cold_days``            14 days
+    completed   status "completed" (2 / Hoàn thành / Full)    30 days
+
+"Activity" is the latest of the plan's ``new_chap_at`` / ``updated_at``
+(:func:`src.priority.freshness`) and ``grew_at``, the last time the plan
+store saw the book's chapter count go up — the only history TF books
+have.  Refresh times come from the plan store (``refreshed_at``).
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from .priority import freshness
+
+DAY = 86_400.0
+
+TIERS = ("new", "hot", "warm", "cold", "completed")
+
+_COMPLETED_NAMES = frozenset({"hoàn thành", "đã hoàn thành", "full", "completed"})
+
+
+def is_completed(entry: dict) -> bool:
+    """True for books the source marks as finished."""
+    for key in ("status", "status_name"):
+        value = entry.get(key)
+        if value == 2:
+            return True
+        if isinstance(value, str) and value.strip().lower() in _COMPLETED_NAMES:
+            return True
+    return False
+
+
+@dataclass
+class RefreshPolicy:
+    """Refresh intervals per tier, in seconds.
+
+    Parameters
+    ----------
+    hot_days:
+        Books active within this many days are refreshed every run.
+    cold_days:
+        Books idle for longer than this are ``cold``.
+    warm_interval, cold_interval, completed_interval:
+        Minimum time between two refreshes of a book in that tier.
+    """
+
+    hot_days: float = 14
+    cold_days: float = 90
+    warm_interval: float = 3 * DAY
+    cold_interval: float = 14 * DAY
+    completed_interval: float = 30 * DAY
+
+    def interval(self, tier: str) -> float:
+        return {
+            "warm": self.warm_interval,
+            "cold": self.cold_interval,
+            "completed": self.completed_interval,
+        }.get(tier, 0.0)
+
+    def tier(
+        self,
+        entry: dict,
+        refreshed_at: float | None,
+        grew_at: float | None = None,
+        now: float | None = None,
+    ) -> str:
+        if refreshed_at is None:
+            return "new"
+        if is_completed(entry):
+            return "completed"
+        active = max(freshness(entry), grew_at or 0.0)
+        if not active:
+            return "warm"
+        idle = (time.time() if now is None else now) - active
+        if idle < self.hot_days * DAY:
+            return "hot"
+        return "warm" if idle < self.cold_days * DAY else "cold"
+
+    def select(
+        self,
+        entries: list[dict],
+        state: Mapping[int, tuple[float | None, float | None]],
+        now: float | None = None,
+    ) -> tuple[list[dict], list[dict], dict[str, tuple[int, int]]]:
+        """Split *entries* into (due, held) for this run.
+
+        *state* maps book ID → ``(refreshed_at, grew_at)``
+        (:meth:`~src.planstore.PlanStore.refresh_state`).  The third
+        result maps each tier to ``(books, due)``.
+        """
+        now = time.time() if now is None else now
+        due: list[dict] = []
+        held: list[dict] = []
+        tiers = {t: [0, 0] for t in TIERS}
+        for entry in entries:
+            refreshed_at, grew_at = state.get(entry["id"], (None, None))
+            tier = self.tier(entry, refreshed_at, grew_at, now)
+            tiers[tier][0] += 1
+            if refreshed_at is None or now - refreshed_at >= self.interval(tier):
+                tiers[tier][1] += 1
+                due.append(entry)
+            else:
+                held.append(entry)
+        return due, held, {t: (n, d) for t, (n, d) in tiers.items()}
@@ -0,0 +1,268 @@
+"""Slug → book ID registry for slug-addressed sources (TTV, TF).
+
+TTV and TF books have no numeric ID we can use, so each source slug gets
+a sequential ID above the source's offset (10M for TTV, 30M for TF) the
+first time it is seen.  The mapping lives in one SQLite file shared by
+both sources::
+
+    data/book_registry.sqlite
+        books(source, slug, id)   PRIMARY KEY (source, slug), UNIQUE (id)
+
+Lookups go both ways through indexes, so ``--ids`` runs and title repair
+resolve a handful of IDs without loading the registry, and assigning an
+ID is one INSERT instead of rewriting a JSON file.  :meth:`allocate`
+assigns a whole listing page in one transaction.
+
+The JSON registries (``books_registry_ttv.json``, ``book_registry_tf.json``)
+are kept in git as snapshots.  A source merges its JSON file whenever the
+file changed since the last import (e.g. after a ``git pull``), and plan
+generation writes it back once per run with :meth:`export_json`.  A
+snapshot entry that contradicts the local mapping (its slug already has
+another ID, or its ID already belongs to another slug) is not imported;
+it is logged and listed in :attr:`SlugRegistry.import_conflicts`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+log = logging.getLogger("book-ingest.registry")
+
+
+class SlugRegistry:
+    """Bidirectional slug ↔ ID mapping for one source.
+
+    Parameters
+    ----------
+    path:
+        SQLite file; created on first use.
+    source:
+        Source name (``"ttv"`` or ``"tf"``); each source has its own slugs
+        and ID range.
+    id_offset:
+        New IDs start at ``id_offset + 1``.
+    json_path:
+        ``{slug: id}`` JSON snapshot, merged in when it changed since the
+        last import.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        source: str,
+        id_offset: int,
+        json_path: str | Path | None = None,
+    ):
+        self.path = Path(path)
+        self.source = source
+        self.id_offset = id_offset
+        self.import_conflicts: list[str] = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: every write below manages its own transaction
+        self._db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS books ("
+            " source TEXT NOT NULL, slug TEXT NOT NULL, id INTEGER NOT NULL UNIQUE,"
+            " PRIMARY KEY (source, slug))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self.json_path = Path(json_path) if json_path is not None else None
+        if self.json_path is not None and self._json_changed():
+            self.import_json(self.json_path)
+
+    # ── Lookups ─────────────────────────────────────────────────────────
+
+    def get(self, slug: str, default: int | None = None) -> int | None:
+        row = self._db.execute(
+            "SELECT id FROM books WHERE source = ? AND slug = ?", (self.source, slug)
+        ).fetchone()
+        return row[0] if row else default
+
+    def __getitem__(self, slug: str) -> int:
+        book_id = self.get(slug)
+        if book_id is None:
+            raise KeyError(slug)
+        return book_id
+
+    def __contains__(self, slug: object) -> bool:
+        return isinstance(slug, str) and self.get(slug) is not None
+
+    def __len__(self) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM books WHERE source = ?", (self.source,)
+        ).fetchone()[0]
+
+    def items(self) -> Iterator[tuple[str, int]]:
+        yield from self._db.execute(
+            "SELECT slug, id FROM books WHERE source = ? ORDER BY id", (self.source,)
+        )
+
+    def slug_for(self, book_id: int) -> str | None:
+        row = self._db.execute(
+            "SELECT slug FROM books WHERE source = ? AND id = ?", (self.source, book_id)
+        ).fetchone()
+        return row[0] if row else None
+
+    def slugs_for(self, book_ids: Iterable[int]) -> dict[int, str]:
+        """``{id: slug}`` for the IDs that are registered (others are omitted)."""
+        out: dict[int, str] = {}
+        for book_id in dict.fromkeys(book_ids):
+            slug = self.slug_for(book_id)
+            if slug is not None:
+                out[book_id] = slug
+        return out
+
+    # ── Allocation ──────────────────────────────────────────────────────
+
+    def get_or_create(self, slug: str) -> int:
+        """Return the ID for *slug*, assigning the next free one if new."""
+        book_id = self.get(slug)
+        if book_id is not None:
+            return book_id
+        return self.allocate([slug])[slug]
+
+    def allocate(self, slugs: Iterable[str]) -> dict[str, int]:
+        """IDs for all *slugs*, assigning new ones in a single transaction.
+
+        ``BEGIN IMMEDIATE`` takes the write lock before reading the current
+        maximum, so concurrent processes (ingest and plan generation) never
+        hand out the same ID.
+        """
+        slugs = list(dict.fromkeys(slugs))
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            out: dict[str, int] = {}
+            new: list[str] = []
+            for slug in slugs:
+                book_id = self.get(slug)
+                if book_id is None:
+                    new.append(slug)
+                else:
+                    out[slug] = book_id
+            if new:
+                next_id = self._next_id()
+                rows = [(self.source, slug, next_id + i) for i, slug in enumerate(new)]
+                self._db.executemany("INSERT INTO books VALUES (?, ?, ?)", rows)
+                out.update((slug, book_id) for _, slug, book_id in rows)
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return out
+
+    def _next_id(self) -> int:
+        row = self._db.execute(
+            "SELECT MAX(id) FROM books WHERE source = ?", (self.source,)
+        ).fetchone()
+        return max(row[0] or 0, self.id_offset) + 1
+
+    # ── JSON snapshot ───────────────────────────────────────────────────
+
+    def _signature(self, path: Path) -> str:
+        st = path.stat()
+        return f"{st.st_mtime_ns}:{st.st_size}"
+
+    def _set_signature(self, path: Path) -> None:
+        self._db.execute(
+            "INSERT INTO meta VALUES (?, ?)"
+            " ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (f"json:{self.source}", self._signature(path)),
+        )
+
+    def _json_changed(self) -> bool:
+        if not self.json_path.exists():
+            return False
+        row = self._db.execute(
+            "SELECT value FROM meta WHERE key = ?", (f"json:{self.source}",)
+        ).fetchone()
+        return row is None or row[0] != self._signature(self.json_path)
+
+    def import_json(self, path: str | Path) -> int:
+        """Merge a ``{slug: id}`` JSON registry, keeping its IDs.
+
+        Slugs already registered keep their ID.  Entries that contradict
+        the registry — the slug has another ID here, or the ID belongs
+        to another slug (of any source) — are skipped, logged and listed
+        in :attr:`import_conflicts`.  Returns the number of rows added
+        (0 if the file does not exist).
+        """
+        path = Path(path)
+        if not path.exists():
+            return 0
+        mapping: dict[str, int] = json.loads(path.read_text(encoding="utf-8"))
+        conflicts: list[str] = []
+        rows: list[tuple[str, str, int]] = []
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            ids = dict(
+                self._db.execute(
+                    "SELECT slug, id FROM books WHERE source = ?", (self.source,)
+                )
+            )
+            owners = {
+                book_id: f"{source}/{slug}"
+                for source, slug, book_id in self._db.execute(
+                    "SELECT source, slug, id FROM books"
+                )
+            }
+            for slug, book_id in mapping.items():
+                book_id = int(book_id)
+                have = ids.get(slug)
+                if have == book_id:
+                    continue
+                if have is not None:
+                    conflicts.append(f"{slug}: snapshot ID {book_id}, registry has {have}")
+                elif book_id in owners:
+                    conflicts.append(
+                        f"{slug}: snapshot ID {book_id} belongs to {owners[book_id]}"
+                    )
+                else:
+                    rows.append((self.source, slug, book_id))
+                    ids[slug] = book_id
+                    owners[book_id] = f"{self.source}/{slug}"
+            self._db.executemany("INSERT INTO books VALUES (?, ?, ?)", rows)
+            self._set_signature(path)
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        if conflicts:
+            log.warning(
+                "%s: %d entries conflict with %s and were not imported: %s",
+                path.name,
+                len(conflicts),
+                self.path.name,
+                "; ".join(conflicts[:5]) + (" …" if len(conflicts) > 5 else ""),
+            )
+        self.import_conflicts.extend(conflicts)
+        return len(rows)
+
+    def export_json(self, path: str | Path | None = None) -> None:
+        """Write the whole mapping to the JSON snapshot (once per run)."""
+        path = Path(path) if path is not None else self.json_path
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(
+            json.dumps(dict(self.items()), indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+        self._set_signature(path)
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> SlugRegistry:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,216 @@
+"""Persistent ledger for MTC ID-range scans (``generate_plan.py --scan``).
+
+Most of the MTC ID range is dead: a full ``--scan`` sends ~50k requests
+and nearly all of them are the same 404s as last time.  The ledger keeps
+the last result of every probed ID in a small SQLite file::
+
+    probes(id, status, chapter_count, probed_at)
+        status = "found"    book exists (not in the plan: too few chapters
+                            or no first chapter yet)
+                 "missing"  404 / unsuccessful response
+
+plus the scan *high-water mark* (the highest ID a completed scan
+covered).  :meth:`ScanLedger.due` then picks only the IDs worth probing:
+
+* IDs above the high-water mark, and IDs never probed (including earlier
+  transport errors, which are not recorded) — every run;
+* ``missing`` IDs whose last probe is older than *dead_ttl*;
+* ``found`` IDs (books too small for the plan) older than *found_ttl*,
+  since they gain chapters over time.
+
+:func:`find_upper_bound` replaces the fixed sweep above ``ID_RANGE_END``
+with an exponential + binary search for the end of the live range.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from pathlib import Path
+
+DAY = 86_400.0
+DEFAULT_DEAD_TTL = 30 * DAY
+DEFAULT_FOUND_TTL = 7 * DAY
+
+# find_upper_bound: IDs are allocated roughly in order but with gaps, so a
+# point counts as "live" if any ID in one of UPPER_PROBES windows of this
+# size, spread over the next UPPER_STEP IDs, exists.
+UPPER_WINDOW = 10
+UPPER_PROBES = 4
+UPPER_STEP = 256
+UPPER_MARGIN = 100
+
+
+class ScanLedger:
+    """Last probe result per MTC book ID (SQLite).
+
+    Parameters
+    ----------
+    path:
+        SQLite file; created on first use.
+    readonly:
+        Read the ledger but never write it (``--dry-run``).
+    """
+
+    def __init__(self, path: str | Path, readonly: bool = False):
+        self.path = Path(path)
+        self.readonly = readonly
+        if readonly and self.path.exists():
+            uri = self.path.resolve().as_uri() + "?mode=ro"
+            self._db = sqlite3.connect(uri, uri=True)
+            return
+        if readonly:
+            # No ledger yet: an empty in-memory one makes every ID due
+            self._db = sqlite3.connect(":memory:")
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path))
+            self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS probes ("
+            " id INTEGER PRIMARY KEY, status TEXT NOT NULL,"
+            " chapter_count INTEGER NOT NULL DEFAULT 0, probed_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    # ── High-water mark ─────────────────────────────────────────────────
+
+    @property
+    def high_water(self) -> int:
+        """Highest ID covered by a completed scan (0 = never scanned)."""
+        row = self._db.execute(
+            "SELECT value FROM meta WHERE key = 'high_water'"
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def set_high_water(self, book_id: int) -> None:
+        if self.readonly:
+            return
+        self._db.execute(
+            "INSERT INTO meta VALUES ('high_water', ?)"
+            " ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (str(book_id),),
+        )
+        self._db.commit()
+
+    def max_found(self) -> int:
+        """Highest ID ever seen alive (0 if none)."""
+        row = self._db.execute(
+            "SELECT MAX(id) FROM probes WHERE status = 'found'"
+        ).fetchone()
+        return row[0] or 0
+
+    # ── Probes ──────────────────────────────────────────────────────────
+
+    def record(
+        self,
+        found: dict[int, int],
+        missing: Iterable[int],
+        at: float | None = None,
+    ) -> None:
+        """Store one batch of results: *found* maps ID → chapter count."""
+        if self.readonly:
+            return
+        at = time.time() if at is None else at
+        rows = [(bid, "found", ch, at) for bid, ch in found.items()]
+        rows += [(bid, "missing", 0, at) for bid in missing]
+        self._db.executemany("INSERT OR REPLACE INTO probes VALUES (?, ?, ?, ?)", rows)
+        self._db.commit()
+
+    def forget(self, ids: Iterable[int]) -> None:
+        """Drop IDs (e.g. books now in the plan) so they are probed fresh later."""
+        if self.readonly:
+            return
+        self._db.executemany("DELETE FROM probes WHERE id = ?", ((i,) for i in ids))
+        self._db.commit()
+
+    def due(
+        self,
+        start: int,
+        end: int,
+        known: set[int],
+        dead_ttl: float = DEFAULT_DEAD_TTL,
+        found_ttl: float = DEFAULT_FOUND_TTL,
+        now: float | None = None,
+    ) -> list[int]:
+        """IDs in ``[start, end]`` not in *known* that need a probe this run."""
+        now = time.time() if now is None else now
+        fresh = {
+            bid
+            for bid, status, probed_at in self._db.execute(
+                "SELECT id, status, probed_at FROM probes WHERE id BETWEEN ? AND ?",
+                (start, end),
+            )
+            if now - probed_at < (dead_ttl if status == "missing" else found_ttl)
+        }
+        return [
+            bid for bid in range(start, end + 1) if bid not in known and bid not in fresh
+        ]
+
+    def counts(self) -> dict[str, int]:
+        return dict(
+            self._db.execute("SELECT status, COUNT(*) FROM probes GROUP BY status")
+        )
+
+    def close(self) -> None:
+        if not self.readonly:
+            self._db.commit()
+        self._db.close()
+
+    def __enter__(self) -> ScanLedger:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+async def find_upper_bound(
+    probe: Callable[[list[int]], Awaitable[set[int]]],
+    start: int,
+    window: int = UPPER_WINDOW,
+    step: int = UPPER_STEP,
+    margin: int = UPPER_MARGIN,
+    probes: int = UPPER_PROBES,
+    floor: int = 0,
+) -> int:
+    """Find where live IDs end, starting from a live ID *start*.
+
+    *probe* takes a batch of IDs and returns the ones that exist.  A point
+    *x* is live if any ID exists in one of *probes* windows of *window*
+    IDs spread over ``[x, x + step)``; a point is only called dead after
+    all of them come back empty, so a sparse stretch above the last
+    known ID does not end the search.  The search doubles its stride
+    from *start* until it hits a dead point, then binary-searches the
+    last live one: about ``2·log2(gap / step)`` points instead of a
+    linear sweep.  Returns the highest live ID seen plus *margin*, and
+    never less than *floor*.
+    """
+    best = start
+    spread = max(step // max(probes, 1), window)
+
+    async def live(x: int) -> bool:
+        nonlocal best
+        for k in range(max(probes, 1)):
+            lo = x + k * spread
+            hits = await probe(list(range(lo, lo + window)))
+            if hits:
+                best = max(best, max(hits))
+                return True
+        return False
+
+    lo, stride = start, step
+    while await live(lo + stride):
+        lo += stride
+        stride *= 2
+    hi = lo + stride  # dead
+    while hi - lo > window:
+        mid = (lo + hi) // 2
+        if await live(mid):
+            lo = mid
+        else:
+            hi = mid
+    return max(best + margin, floor)
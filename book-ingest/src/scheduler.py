@@ -0,0 +1,135 @@
+"""Dynamic book scheduler for ``ingest.py``.
+
+A fixed pool of ``-w`` workers keeps exactly ``-w`` books in progress.
+That under-uses sources whose chapter walk is serial: five MTC books keep
+about five requests in flight while the limiter allows 180.
+
+:class:`BookScheduler` instead starts books while the source's request
+limiter has spare capacity:
+
+* always keep at least ``min_books`` books in progress (the ``-w`` floor);
+* above that, start one more book per tick while fewer than
+  ``target_inflight`` requests are in flight **and** nobody is queued on
+  the limiter (a queue means it is already saturated);
+* never exceed ``max_books`` books in progress.  This caps pending
+  chapters in memory, open journals and bundle rewrites.
+
+The entries may be a *live feed* (``ingest.py --daemon``): an iterator
+that yields ``None`` when no book is due yet.  The scheduler then asks
+again on the next tick instead of treating the feed as exhausted, and
+only returns once the iterator itself stops.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+
+from .sources.base import BookSource
+
+_EXHAUSTED = object()
+
+
+class BookScheduler:
+    """Run ``run_book(entry)`` for every entry with adaptive parallelism.
+
+    Parameters
+    ----------
+    source:
+        The shared source; its :attr:`~BookSource.limiter` is polled for
+        load.  Sources without a limiter get a fixed ``min_books`` pool.
+    run_book:
+        Coroutine function handling one plan entry.  It should handle its
+        own errors; an exception escaping it aborts the run.
+    min_books:
+        Books kept in progress regardless of load.
+    max_books:
+        Hard cap on books in progress.
+    target_inflight:
+        In-flight request count to aim for (default: the limiter's limit).
+    tick:
+        Seconds between admission checks while books are running.
+    idle_tick:
+        Seconds between polls of a live feed while no book is running.
+    """
+
+    def __init__(
+        self,
+        source: BookSource,
+        run_book: Callable[[dict], Awaitable[object]],
+        min_books: int = 5,
+        max_books: int = 64,
+        target_inflight: int | None = None,
+        tick: float = 0.05,
+        idle_tick: float = 1.0,
+    ):
+        self.source = source
+        self.run_book = run_book
+        self.min_books = max(1, min_books)
+        self.max_books = max(self.min_books, max_books)
+        limiter = source.limiter
+        if target_inflight is None:
+            target_inflight = limiter.limit if limiter is not None else 0
+        self.target_inflight = target_inflight
+        self.tick = tick
+        self.idle_tick = idle_tick
+        self.active = 0
+        self.peak_books = 0
+
+    def _can_admit(self) -> bool:
+        if self.active < self.min_books:
+            return True
+        if self.active >= self.max_books:
+            return False
+        limiter = self.source.limiter
+        if limiter is None or self.target_inflight <= 0:
+            return False
+        return limiter.waiting == 0 and limiter.in_flight < self.target_inflight
+
+    async def run(self, entries: Iterable[dict | None]) -> None:
+        """Process every entry; returns once all books have finished.
+
+        A ``None`` entry means "nothing due yet" (live feeds).
+        """
+        it = iter(entries)
+        exhausted = False
+        tasks: set[asyncio.Task] = set()
+        try:
+            while True:
+                # Fill up to the floor at once; above it admit one book per
+                # tick so its requests show up in the limiter before the
+                # next decision.
+                while not exhausted and self._can_admit():
+                    entry = next(it, _EXHAUSTED)
+                    if entry is _EXHAUSTED:
+                        exhausted = True
+                        break
+                    if entry is None:
+                        break  # live feed: nothing due until a later tick
+                    tasks.add(asyncio.create_task(self.run_book(entry)))
+                    self.active = len(tasks)
+                    self.peak_books = max(self.peak_books, self.active)
+                    if self.active > self.min_books:
+                        break
+
+                if not tasks:
+                    if exhausted:
+                        return
+                    await asyncio.sleep(self.idle_tick)  # idle live feed
+                    continue
+
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=None if exhausted else self.tick,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    tasks.discard(task)
+                    task.result()
+                self.active = len(tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            self.active = 0
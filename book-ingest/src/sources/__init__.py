@@ -7,13 +7,21 @@ Usage::
     source = create_source("mtc", max_concurrent=60)
     async with source:
         meta = await source.fetch_book_metadata(entry)
+
+Several sources can share one connection pool::
+
+    async with create_http_client("mtc", max_concurrent=180) as http:
+        sources = [create_source("mtc", http_client=http) for _ in range(5)]
 """
 
 from __future__ import annotations
 
+import importlib
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    import httpx
+
     from .base import BookSource
 
 # Lazy imports to avoid pulling in heavy dependencies (httpx, bs4, …)
@@ -23,39 +31,75 @@ _REGISTRY: dict[str, str] = {
     "mtc": "src.sources.mtc",
     "ttv": "src.sources.ttv",
     "tf": "src.sources.tf",
+    "bench": "src.sources.bench",
 }
 
 _CLASS_NAMES: dict[str, str] = {
     "mtc": "MTCSource",
     "ttv": "TTVSource",
     "tf": "TFSource",
+    "bench": "BenchSource",
 }
 
 VALID_SOURCES = tuple(_REGISTRY.keys())
 
 
+def _import_source_module(name: str):
+    if name not in _REGISTRY:
+        valid = ", ".join(sorted(VALID_SOURCES))
+        raise ValueError(f"Unknown source {name!r}. Valid sources: {valid}")
+    return importlib.import_module(_REGISTRY[name])
+
+
 def create_source(name: str, **kwargs: object) -> BookSource:
     """Instantiate a :class:`BookSource` by short name.
 
     Parameters
     ----------
     name:
-        One of ``"mtc"`` or ``"ttv"``.
+        One of ``"mtc"``, ``"ttv"``, ``"tf"`` or ``"bench"`` (synthetic
+        books for load tests, see :mod:`src.sources.bench`).
     **kwargs:
         Forwarded to the source constructor (e.g. ``max_concurrent``,
-        ``request_delay``).
+        ``request_delay``, ``http_client``).
 
     Raises
     ------
     ValueError
         If *name* is not a registered source.
     """
-    if name not in _REGISTRY:
-        valid = ", ".join(sorted(VALID_SOURCES))
-        raise ValueError(f"Unknown source {name!r}. Valid sources: {valid}")
-
-    import importlib
-
-    module = importlib.import_module(_REGISTRY[name])
+    module = _import_source_module(name)
     cls = getattr(module, _CLASS_NAMES[name])
     return cls(**kwargs)
+
+
+def has_chapter_list(name: str) -> bool:
+    """True if source *name* overrides
+    :meth:`~src.sources.base.BookSource.fetch_chapter_list` (TTV, TF)."""
+    from .base import BookSource
+
+    cls = getattr(_import_source_module(name), _CLASS_NAMES[name])
+    return cls.fetch_chapter_list is not BookSource.fetch_chapter_list
+
+
+def create_http_client(name: str, **kwargs: object) -> httpx.AsyncClient:
+    """Build the pooled ``httpx.AsyncClient`` a source would use.
+
+    Pass the result as ``http_client=`` to any number of
+    :func:`create_source` calls so they share connections, keep-alive
+    and TLS sessions.  The caller owns the client and must close it.
+
+    Parameters
+    ----------
+    name:
+        Source short name (see :func:`create_source`).
+    **kwargs:
+        ``max_concurrent`` (sizes the pool), ``timeout``, ``http2``
+        (needs the optional ``h2`` package).
+
+    Raises
+    ------
+    ValueError
+        If *name* is not a registered source.
+    """
+    return _import_source_module(name).create_http_client(**kwargs)
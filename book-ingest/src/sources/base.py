@@ -13,8 +13,20 @@ its own transport (encrypted API, HTML scraping, etc.).
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from collections.abc import AsyncIterator
-from typing import NamedTuple
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from ..ratelimit import HostLimiter, TrackedSemaphore
+
+
+def lru_put(cache: OrderedDict, key: int, value: object, max_size: int) -> None:
+    """Insert into a bounded LRU dict, evicting the oldest entries."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > max_size:
+        cache.popitem(last=False)
 
 
 class ChapterData(NamedTuple):
@@ -28,12 +40,23 @@ class ChapterData(NamedTuple):
     chapter_id: int = 0
 
 
+class ChapterRef(NamedTuple):
+    """One entry of a book's table of contents."""
+
+    index: int
+    url: str
+    title: str
+
+
 class BookSource(ABC):
     """Abstract base for book data sources.
 
     Subclasses must implement the four abstract methods and expose
     ``name``.  Sources are used as async context managers — the
     ``__aenter__`` / ``__aexit__`` pair handles HTTP client lifecycle.
+    A client passed in as ``http_client`` (see
+    :func:`src.sources.create_http_client`) belongs to the caller and is
+    not closed by the source.
 
     Example::
 
@@ -79,6 +102,20 @@ class BookSource(ABC):
 
     # ── Chapter iteration ───────────────────────────────────────────────
 
+    async def fetch_chapter_list(self, meta: dict) -> list[ChapterRef] | None:
+        """Return the book's freely readable chapters, in index order.
+
+        Sources that can scrape a table-of-contents page override this so
+        that :meth:`fetch_chapters` requests exactly the listed chapters
+        instead of probing ``1..chapter_count``.  The result is also what
+        ``ingest.py --fix`` uses for exact gap accounting.
+
+        Returns ``None`` when the source has no TOC (MTC walks a linked
+        list) or the TOC could not be fetched; callers then fall back to
+        ``meta["chapter_count"]``.
+        """
+        return None
+
     @abstractmethod
     def fetch_chapters(
         self,
@@ -93,8 +130,9 @@ class BookSource(ABC):
         * **MTC** — linked-list traversal via ``chapter_id`` with
           forward / reverse / resume modes.  Reads bundle metadata to
           determine where to resume.
-        * **TTV** — sequential URL iteration (``chuong-1`` …
-          ``chuong-N``), skipping indices in *existing_indices*.
+        * **TTV / TF** — URL iteration over the chapters listed by
+          :meth:`fetch_chapter_list` (or ``chuong-1`` … ``chuong-N`` when
+          no TOC is available), skipping indices in *existing_indices*.
 
         Parameters
         ----------
@@ -123,6 +161,7 @@ class BookSource(ABC):
         book_id: int,
         meta: dict,
         covers_dir: str,
+        hosts: HostLimiter | None = None,
     ) -> str | None:
         """Download the cover image for a book.
 
@@ -135,6 +174,10 @@ class BookSource(ABC):
             from it).
         covers_dir:
             Directory to save the image in (e.g. ``binslib/public/covers``).
+        hosts:
+            Per-host limiter for image requests (see
+            :class:`~src.cover.CoverStage`).  Cover requests do not go
+            through the source's chapter :attr:`limiter`.
 
         Returns
         -------
@@ -144,6 +187,19 @@ class BookSource(ABC):
             already exists on disk.
         """
 
+    # ── Load reporting ──────────────────────────────────────────────────
+
+    @property
+    def limiter(self) -> TrackedSemaphore | None:
+        """The semaphore capping this source's in-flight requests.
+
+        ``ingest.py``'s scheduler reads its ``in_flight`` / ``waiting`` /
+        ``limit`` counters to decide when to start another book.  ``None``
+        means the source does not report load; the scheduler then keeps a
+        fixed number of books in progress.
+        """
+        return None
+
     # ── Lifecycle ───────────────────────────────────────────────────────
 
     async def close(self) -> None:
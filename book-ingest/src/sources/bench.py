@@ -0,0 +1,242 @@
+"""Synthetic "bench" source for load-testing the write path.
+
+``ingest.py --source bench`` runs the full pipeline — scheduler, journal,
+compression, checkpoints, bundle writes, DB commits — against books that
+are generated locally instead of fetched.  Everything is deterministic
+(seeded by book ID and chapter index), so two runs see the same workload
+and storage-layer changes can be compared like for like.
+
+Chapter text is Vietnamese-like: common syllables with diacritics drawn
+with Zipf-like frequencies, built into sentences and paragraphs, so zstd
+ratios with the global dictionary are close to real chapters.
+
+Workload knobs live in the plan entries (see :func:`make_plan`)::
+
+    chapter_count   chapters in the book
+    bench_words     mean words per chapter (log-normal spread)
+    bench_latency   simulated fetch time per chapter, seconds
+
+Bench book IDs start at :data:`BENCH_ID_OFFSET` so they cannot collide
+with MTC, TTV or TF books; still, run benchmarks against a scratch copy
+of the database and bundle directory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import random
+from collections.abc import AsyncIterator
+
+import httpx
+
+from ..ratelimit import HostLimiter, TrackedSemaphore
+from .base import BookSource, ChapterData
+
+BENCH_ID_OFFSET = 90_000_000
+BENCH_AUTHOR_OFFSET = 95_000_000
+BENCH_DEFAULT_MAX_CONCURRENT = 64
+
+DEFAULT_CHAPTERS = 300
+DEFAULT_WORDS = 2500
+
+# Common Vietnamese syllables, roughly by frequency in web-novel prose.
+_VOCAB = (
+    "không có là của và một người này đã được những cho với ta hắn nàng "
+    "lại đến thì cũng mà đi ra trong nói như vào lên khi nhưng còn rồi đó "
+    "các biết muốn nhìn thấy chỉ thể gì làm sao chút tại vẫn đang nữa "
+    "ngươi chúng trên mình thật nhiều tiếng lời sư phụ huynh đệ tỷ muội "
+    "kiếm khí linh lực đan dược tu luyện cảnh giới tông môn trưởng lão "
+    "đệ tử thiên địa vạn năm trước sau bên ngoài trời đất núi sông mây "
+    "gió lửa nước băng hồn phách thân thể tâm ý máu ánh mắt khuôn mặt "
+    "bàn tay thanh âm chậm rãi lạnh lùng mỉm cười gật đầu lắc quay "
+    "bước tới đứng dậy ngồi xuống cảm giác trong lòng đột nhiên lập tức "
+    "hơi thở khẽ nhẹ nặng mạnh yếu cao thấp xa gần sâu lớn nhỏ mới cũ "
+    "đây kia ấy nào ai đâu bao giờ vì nên nếu để từ theo về hay hoặc "
+    "chính là thế nhưng mà bởi vậy cuối cùng ban đầu tất cả mọi chưa "
+    "hề vô cùng quả nhiên dường như phải chăng chẳng lẽ hóa ra thì ra"
+).split()
+
+_CUM_WEIGHTS = list(
+    itertools.accumulate(1 / (rank + 1) ** 0.9 for rank in range(len(_VOCAB)))
+)
+
+
+def _lognormal(rng: random.Random, mean: float, sigma: float) -> float:
+    """Log-normal sample with the given *mean* (not median)."""
+    return rng.lognormvariate(math.log(mean) - sigma * sigma / 2, sigma)
+
+
+def generate_text(rng: random.Random, words: int) -> str:
+    """About *words* words of Vietnamese-like prose, one paragraph per line."""
+    tokens = rng.choices(_VOCAB, cum_weights=_CUM_WEIGHTS, k=max(words, 1))
+    paragraphs: list[str] = []
+    sentences: list[str] = []
+    pos = 0
+    while pos < len(tokens):
+        n = rng.randint(6, 22)
+        sentence = tokens[pos : pos + n]
+        pos += n
+        if len(sentence) > 8 and rng.random() < 0.4:
+            sentence[rng.randint(3, len(sentence) - 3)] += ","
+        text = " ".join(sentence)
+        sentences.append(text[0].upper() + text[1:] + rng.choice("....!?"))
+        if len(sentences) >= rng.randint(2, 6):
+            paragraphs.append(" ".join(sentences))
+            sentences = []
+    if sentences:
+        paragraphs.append(" ".join(sentences))
+    return "\n".join(paragraphs)
+
+
+def generate_chapter(book_id: int, index: int, mean_words: int) -> ChapterData:
+    """Deterministic synthetic chapter *index* of *book_id*."""
+    rng = random.Random(book_id * 1_000_003 + index)
+    words = max(int(_lognormal(rng, mean_words, 0.35)), 50)
+    name = " ".join(rng.choices(_VOCAB, k=rng.randint(2, 6)))
+    title = f"Chương {index}: {name.title()}"
+    body = f"{title}\n{generate_text(rng, words)}"
+    return ChapterData(
+        index=index,
+        title=title,
+        slug=f"chuong-{index}",
+        body=body,
+        word_count=len(body.split()),
+        chapter_id=0,
+    )
+
+
+def make_plan(
+    books: int,
+    chapters: int = DEFAULT_CHAPTERS,
+    words: int = DEFAULT_WORDS,
+    latency: float = 0.0,
+    seed: int = 0,
+) -> list[dict]:
+    """Plan entries for *books* synthetic books.
+
+    Chapter counts are log-normal around *chapters* (long tail, like real
+    catalogs); each book gets its own mean chapter length around *words*.
+    """
+    rng = random.Random(seed)
+    entries = []
+    for n in range(1, books + 1):
+        book_id = BENCH_ID_OFFSET + n
+        entries.append(
+            {
+                "id": book_id,
+                "name": f"Bench {n}",
+                "slug": f"bench-{n}",
+                "chapter_count": max(int(_lognormal(rng, chapters, 0.8)), 1),
+                "bench_words": max(int(_lognormal(rng, words, 0.25)), 100),
+                "bench_latency": latency,
+                "view_count": int(_lognormal(rng, 20_000, 1.5)),
+                "bookmark_count": int(_lognormal(rng, 300, 1.5)),
+                "vote_count": int(_lognormal(rng, 50, 1.5)),
+            }
+        )
+    return entries
+
+
+def create_http_client(
+    max_concurrent: int = BENCH_DEFAULT_MAX_CONCURRENT,
+    timeout: float = 30,
+    http2: bool = False,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """Unused client so ``ingest.py`` can treat bench like any source."""
+    return httpx.AsyncClient(timeout=timeout, transport=transport)
+
+
+class BenchSource(BookSource):
+    """Synthetic book source (no network).
+
+    Parameters
+    ----------
+    max_concurrent:
+        Simulated request slots; chapter "fetches" hold one for
+        ``bench_latency`` seconds, so the scheduler sees realistic load.
+    request_delay:
+        Default per-chapter latency for entries without ``bench_latency``.
+    http_client:
+        Accepted for interface compatibility; never used.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = BENCH_DEFAULT_MAX_CONCURRENT,
+        request_delay: float = 0.0,
+        http_client: httpx.AsyncClient | None = None,
+    ):
+        self._sem = TrackedSemaphore(max_concurrent)
+        self._delay = request_delay
+
+    @property
+    def name(self) -> str:
+        return "bench"
+
+    @property
+    def limiter(self) -> TrackedSemaphore:
+        return self._sem
+
+    async def fetch_book_metadata(self, entry: dict) -> dict | None:
+        book_id = entry["id"]
+        n = book_id - BENCH_ID_OFFSET
+        chapter_count = entry.get("chapter_count") or DEFAULT_CHAPTERS
+        words = entry.get("bench_words") or DEFAULT_WORDS
+        return {
+            "id": book_id,
+            "name": entry.get("name") or f"Bench {n}",
+            "slug": entry.get("slug") or f"bench-{n}",
+            "synopsis": "Synthetic book for ingest benchmarks.",
+            "status": 1,
+            "status_name": "Còn tiếp",
+            "view_count": entry.get("view_count", 0),
+            "comment_count": 0,
+            "bookmark_count": entry.get("bookmark_count", 0),
+            "vote_count": entry.get("vote_count", 0),
+            "review_score": 0,
+            "review_count": 0,
+            "chapter_count": chapter_count,
+            "word_count": chapter_count * words,
+            "author": {
+                "id": BENCH_AUTHOR_OFFSET + n % 1000,
+                "name": f"Bench author {n % 1000}",
+            },
+            "genres": [],
+            "tags": [],
+            "created_at": None,
+            "updated_at": None,
+            "published_at": None,
+            "new_chap_at": None,
+            "bench_words": words,
+            "bench_latency": entry.get("bench_latency", self._delay),
+        }
+
+    async def fetch_chapters(
+        self,
+        meta: dict,
+        existing_indices: set[int],
+        bundle_path: str,
+    ) -> AsyncIterator[ChapterData]:
+        book_id = meta["id"]
+        words = meta["bench_words"]
+        latency = meta["bench_latency"]
+        for index in range(1, meta["chapter_count"] + 1):
+            if index in existing_indices:
+                continue
+            async with self._sem:
+                if latency > 0:
+                    await asyncio.sleep(latency)
+            # Text generation is CPU work, like parsing a real page
+            yield await asyncio.to_thread(generate_chapter, book_id, index, words)
+
+    async def download_cover(
+        self,
+        book_id: int,
+        meta: dict,
+        covers_dir: str,
+        hosts: HostLimiter | None = None,
+    ) -> str | None:
+        return None
@@ -0,0 +1,108 @@
+"""lxml helpers for the chapter-page fast path.
+
+The TTV and TF chapter parsers only need the ``<h2>`` title and the text of
+one content container.  Building a full BeautifulSoup tree for that costs
+several times more CPU than parsing with ``lxml.html`` directly, so both
+sources try these helpers first and fall back to their BeautifulSoup code
+when the markup is not what the fast path expects.
+
+:func:`get_text` reproduces ``Tag.get_text()`` exactly (same strings, same
+joins), which is what lets the two paths be compared byte-for-byte in
+``test_chapter_parsers.py``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Iterator
+
+import lxml.html
+from lxml import etree
+
+# Tags whose strings BeautifulSoup stores as Script/Stylesheet/… rather
+# than NavigableString; ``get_text()`` leaves them out.
+_NON_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+# Whitespace-only strings are kept verbatim inside these, squashed elsewhere.
+_PRESERVE_WS_TAGS = frozenset({"pre", "textarea"})
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+
+def parse_document(html: str) -> lxml.html.HtmlElement | None:
+    """Parse *html* into a document tree, or ``None`` if lxml refuses it."""
+    try:
+        return lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def first(root: lxml.html.HtmlElement, xpath: str) -> lxml.html.HtmlElement | None:
+    """Return the first element matching *xpath* in document order."""
+    found = root.xpath(xpath)
+    return found[0] if found else None
+
+
+def in_non_text(el: lxml.html.HtmlElement) -> bool:
+    """True if *el* sits inside ``<template>`` (or another non-text tag).
+
+    BeautifulSoup handles such content differently from lxml, so callers
+    decline the fast path instead of guessing.
+    """
+    return any(a.tag in _NON_TEXT_TAGS for a in el.iterancestors())
+
+
+def class_xpath(tag: str, cls: str) -> str:
+    """XPath for ``tag.cls`` (``*`` for any tag), matching whole class tokens."""
+    return (
+        f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+    )
+
+
+def iter_strings(
+    el: lxml.html.HtmlElement,
+    skip: Collection[lxml.html.HtmlElement] = (),
+) -> Iterator[str]:
+    """Yield the text strings under *el* in the order BeautifulSoup sees them.
+
+    Elements in *skip* are treated as decomposed: neither their text nor
+    their children's is yielded, but the text following them (their tail)
+    still is.  Comments and processing instructions are skipped the same way.
+    """
+    preserve = any(a.tag in _PRESERVE_WS_TAGS for a in el.iterancestors())
+    return _iter_strings(el, skip, preserve)
+
+
+def _iter_strings(
+    el: lxml.html.HtmlElement,
+    skip: Collection[lxml.html.HtmlElement],
+    preserve: bool,
+) -> Iterator[str]:
+    if el.tag in _NON_TEXT_TAGS:
+        return
+    preserve = preserve or el.tag in _PRESERVE_WS_TAGS
+    if el.text:
+        yield el.text if preserve else _squash_blank(el.text)
+    for child in el:
+        if isinstance(child.tag, str) and child not in skip:
+            yield from _iter_strings(child, skip, preserve)
+        if child.tail:
+            yield child.tail if preserve else _squash_blank(child.tail)
+
+
+def _squash_blank(text: str) -> str:
+    """BeautifulSoup collapses all-ASCII-whitespace strings to one character."""
+    if text.strip(_ASCII_SPACES):
+        return text
+    return "\n" if "\n" in text else " "
+
+
+def get_text(
+    el: lxml.html.HtmlElement,
+    separator: str = "",
+    strip: bool = False,
+    skip: Collection[lxml.html.HtmlElement] = (),
+) -> str:
+    """Equivalent of BeautifulSoup ``Tag.get_text(separator, strip=strip)``."""
+    strings = iter_strings(el, skip)
+    if strip:
+        return separator.join(s for s in (s.strip() for s in strings) if s)
+    return separator.join(strings)
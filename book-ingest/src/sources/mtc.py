@@ -10,10 +10,15 @@ import asyncio
 import logging
 from collections.abc import AsyncIterator
 
+import httpx
+
 from ..api import APIError, AsyncBookClient, decrypt_chapter
+from ..api import create_http_client  # noqa: F401  (used by sources.create_http_client)
 from ..bundle import read_bundle_meta
 from ..cover import download_cover as _download_cover
 from ..decrypt import DecryptionError
+from ..ratelimit import HostLimiter, TrackedSemaphore
+from ..trace import span
 from .base import BookSource, ChapterData
 
 # Author names that are placeholders, not real names.
@@ -64,6 +69,9 @@ class MTCSource(BookSource):
         Minimum seconds between requests inside the semaphore.
     timeout:
         Per-request timeout in seconds.
+    http_client:
+        Shared ``httpx.AsyncClient`` from :func:`create_http_client`;
+        left open by :meth:`close`.  A private client is created if omitted.
     """
 
     def __init__(
@@ -71,11 +79,13 @@ class MTCSource(BookSource):
         max_concurrent: int = 180,
         request_delay: float = 0.015,
         timeout: float = 30,
+        http_client: httpx.AsyncClient | None = None,
     ):
         self._client = AsyncBookClient(
             max_concurrent=max_concurrent,
             request_delay=request_delay,
             timeout=timeout,
+            client=http_client,
         )
 
     # ── Identity ────────────────────────────────────────────────────────
@@ -186,6 +196,7 @@ class MTCSource(BookSource):
         book_id: int,
         meta: dict,
         covers_dir: str,
+        hosts: HostLimiter | None = None,
     ) -> str | None:
         """Download cover via the poster URLs in the MTC metadata."""
         return await _download_cover(
@@ -193,8 +204,16 @@ class MTCSource(BookSource):
             book_id,
             meta.get("poster"),
             covers_dir,
+            hosts,
+            self.name,
         )
 
+    # ── Load reporting ──────────────────────────────────────────────────
+
+    @property
+    def limiter(self) -> TrackedSemaphore:
+        return self._client.limiter
+
     # ── Lifecycle ───────────────────────────────────────────────────────
 
     async def close(self) -> None:
@@ -386,7 +405,8 @@ class MTCSource(BookSource):
             return None
 
         try:
-            title, slug, body, word_count = decrypt_chapter(chapter)
+            with span("decrypt", "mtc", book_id, index=index):
+                title, slug, body, word_count = decrypt_chapter(chapter)
         except DecryptionError as exc:
             log.warning("  DECRYPT FAIL %d[%d]: %s", book_id, index, exc)
             return None
@@ -15,20 +15,26 @@ Only completed ("Full") hot books are discovered via the listing at
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
-import os
 import random
 import re
+from collections import OrderedDict, deque
 from collections.abc import AsyncIterator
 from html import unescape
 from pathlib import Path
+from urllib.parse import urljoin
 
 import httpx
 from bs4 import BeautifulSoup, Tag
 
+from ..cover import download_cover as _download_cover
 from ..db import slugify as _slugify
-from .base import BookSource, ChapterData
+from ..dedup import FINGERPRINTS_PATH, DedupIndex
+from ..metrics import count_retry, instrumented_get
+from ..ratelimit import HostLimiter, TrackedSemaphore
+from ..registry import SlugRegistry
+from . import fastparse
+from .base import BookSource, ChapterData, ChapterRef, lru_put
 
 log = logging.getLogger("book-ingest.tf")
 
@@ -62,7 +68,8 @@ AUTHOR_ID_OFFSET = 40_000_000
 
 _INGEST_DIR = Path(__file__).resolve().parent.parent.parent  # book-ingest/
 DATA_DIR = _INGEST_DIR / "data"
-REGISTRY_PATH = DATA_DIR / "book_registry_tf.json"
+REGISTRY_PATH = DATA_DIR / "book_registry.sqlite"  # shared with ttv
+REGISTRY_JSON_PATH = DATA_DIR / "book_registry_tf.json"  # git-tracked snapshot
 TF_PLAN_FILE = DATA_DIR / "books_plan_tf.json"
 BINSLIB_DB_PATH = _INGEST_DIR.parent / "binslib" / "data" / "binslib.db"
 
@@ -80,8 +87,37 @@ class TFNotFound(TFFetchError):
     """HTTP 404 from TF."""
 
 
+def create_http_client(
+    max_concurrent: int = TF_DEFAULT_MAX_CONCURRENT,
+    timeout: float = 30,
+    http2: bool = False,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """Build an ``httpx.AsyncClient`` configured for truyenfull.vision.
+
+    Used by :class:`_AsyncTFClient` when it owns its client, and by ``ingest.py``
+    to create one pool shared by every worker.  *http2* requires the
+    optional ``h2`` package.
+    *transport* replaces the network pool (see :mod:`src.httpreplay`).
+    """
+    return httpx.AsyncClient(
+        headers=TF_HEADERS,
+        timeout=httpx.Timeout(connect=10, read=timeout, write=10, pool=30),
+        follow_redirects=True,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_concurrent + 10,
+            max_keepalive_connections=max_concurrent,
+        ),
+        transport=transport,
+    )
+
+
 class _AsyncTFClient:
-    """Async HTTP client with semaphore-based throttling and retries."""
+    """Async HTTP client with semaphore-based throttling and retries.
+
+    A shared *client* is used as-is and left open by :meth:`close`.
+    """
 
     def __init__(
         self,
@@ -89,22 +125,27 @@ class _AsyncTFClient:
         max_concurrent: int = TF_DEFAULT_MAX_CONCURRENT,
         timeout: float = 30,
         max_retries: int = 3,
+        client: httpx.AsyncClient | None = None,
     ):
-        self._sem = asyncio.Semaphore(max_concurrent)
+        self._sem = TrackedSemaphore(max_concurrent)
         self._delay = delay
         self._max_retries = max_retries
-        self._client = httpx.AsyncClient(
-            headers=TF_HEADERS,
-            timeout=httpx.Timeout(connect=10, read=timeout, write=10, pool=30),
-            follow_redirects=True,
-            limits=httpx.Limits(
-                max_connections=max_concurrent + 10,
-                max_keepalive_connections=max_concurrent,
-            ),
-        )
+        self._owns_client = client is None
+        self._client = client or create_http_client(max_concurrent, timeout)
 
     async def close(self) -> None:
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
+
+    @property
+    def limiter(self) -> TrackedSemaphore:
+        """The semaphore capping in-flight requests (for load reporting)."""
+        return self._sem
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The underlying connection pool (cover downloads bypass the limiter)."""
+        return self._client
 
     async def get(
         self, url: str, params: dict | None = None, retries: int | None = None
@@ -125,9 +166,10 @@ class _AsyncTFClient:
             await asyncio.sleep(jittered_delay)
             async with self._sem:
                 try:
-                    r = await self._client.get(url, params=params)
+                    r = await instrumented_get(self._client, "tf", url, params=params)
                 except httpx.TransportError as exc:
                     if attempt < retries - 1:
+                        count_retry("tf", "error")
                         await asyncio.sleep(random.uniform(3, 10))
                         continue
                     raise TFFetchError(
@@ -145,6 +187,7 @@ class _AsyncTFClient:
                         retries,
                         wait,
                     )
+                    count_retry("tf", r.status_code)
                     await asyncio.sleep(wait)
                     continue
                 raise TFFetchError(f"Rate limited after {retries} retries")
@@ -165,6 +208,7 @@ class _AsyncTFClient:
                         retries,
                         wait,
                     )
+                    count_retry("tf", r.status_code)
                     await asyncio.sleep(wait)
                     continue
                 raise TFFetchError(f"HTTP 503 after {retries} retries: {url}")
@@ -180,6 +224,7 @@ class _AsyncTFClient:
                         retries,
                         wait,
                     )
+                    count_retry("tf", r.status_code)
                     await asyncio.sleep(wait)
                     continue
                 raise TFFetchError(f"HTTP {r.status_code}: {url}")
@@ -191,9 +236,6 @@ class _AsyncTFClient:
     async def get_html(self, url: str, params: dict | None = None) -> str:
         return (await self.get(url, params=params)).text
 
-    async def get_bytes(self, url: str) -> bytes:
-        return (await self.get(url)).content
-
 
 # ═══════════════════════════════════════════════════════════════════════════
 # HTML parsers
@@ -439,7 +481,55 @@ def parse_chapter(html: str) -> dict | None:
     TF chapter pages have a clean structure:
     - ``<h2>`` = chapter title (e.g. "Chương 1: Sống lại")
     - ``#chapter-c`` = body text (no title duplication, no ``<h5>`` issues)
+
+    The lxml fast path handles normal pages; anything it does not
+    recognise goes through the BeautifulSoup parser, which produces the
+    same output for pages both can read.
     """
+    extracted = _extract_chapter_lxml(html)
+    if extracted is None:
+        extracted = _extract_chapter_bs4(html)
+    if extracted is None:
+        return None
+    title, body = extracted
+    return {"title": unescape(title), "body": body}
+
+
+# Ad containers stripped from the chapter body (CSS for BS4, XPath for lxml)
+_AD_SELECTOR = ".ads-holder, .ads-responsive, script, ins"
+_AD_XPATH = (
+    ".//*[contains(concat(' ', normalize-space(@class), ' '), ' ads-holder ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' ads-responsive ')]"
+    " | .//script | .//ins"
+)
+
+
+def _extract_chapter_lxml(html: str) -> tuple[str, str] | None:
+    """Fast path: ``(title, body)`` via lxml, or ``None`` to fall back."""
+    root = fastparse.parse_document(html)
+    if root is None:
+        return None
+
+    h2 = fastparse.first(root, "//h2")
+    if h2 is None:
+        return None
+    title = fastparse.get_text(h2, strip=True).replace("\xa0", " ")
+
+    chapter_c = fastparse.first(root, "//*[@id='chapter-c']")
+    if chapter_c is None:
+        chapter_c = fastparse.first(root, fastparse.class_xpath("*", "chapter-c"))
+    if chapter_c is None or fastparse.in_non_text(chapter_c):
+        return None
+
+    ads = set(chapter_c.xpath(_AD_XPATH))
+    body = fastparse.get_text(chapter_c, separator="\n", skip=ads).strip()
+    if not body:
+        return None
+    return title, body
+
+
+def _extract_chapter_bs4(html: str) -> tuple[str, str] | None:
+    """Reference parser: ``(title, body)`` via BeautifulSoup, or ``None``."""
     soup = BeautifulSoup(html, "lxml")
 
     # Chapter title from <h2>
@@ -456,14 +546,50 @@ def parse_chapter(html: str) -> dict | None:
         return None
 
     # Remove ad divs inside chapter content
-    for ad in chapter_c.select(".ads-holder, .ads-responsive, script, ins"):
+    for ad in chapter_c.select(_AD_SELECTOR):
         ad.decompose()
 
     body = chapter_c.get_text(separator="\n").strip()
     if not body:
         return None
 
-    return {"title": unescape(title), "body": body}
+    return title, body
+
+
+# ---------------------------------------------------------------------------
+# Chapter list  (/{tf_slug}/ and /{tf_slug}/trang-{N}/)
+# ---------------------------------------------------------------------------
+
+
+def parse_chapter_list(html: str) -> list[ChapterRef]:
+    """Parse one page of a book's chapter list (50 chapters per page).
+
+    Works on both the detail page (page 1) and ``/trang-{N}/`` pages.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    refs: list[ChapterRef] = []
+    for a in soup.select("ul.list-chapter li a"):
+        href = str(a.get("href", ""))
+        idx = _extract_chapter_index(href)
+        if idx <= 0:
+            continue
+        title = a.get_text(strip=True).replace("\xa0", " ")
+        refs.append(ChapterRef(index=idx, url=href, title=unescape(title)))
+    return refs
+
+
+def parse_chapter_list_last_page(html: str) -> int:
+    """Return the number of chapter-list pages (1 when not paginated)."""
+    soup = BeautifulSoup(html, "lxml")
+    last_page = 1
+    total_input = soup.select_one("input#total-page")
+    if total_input:
+        last_page = max(last_page, _parse_int(str(total_input.get("value", ""))))
+    for a in soup.select("#list-chapter ul.pagination li a"):
+        m = re.search(r"trang-(\d+)", str(a.get("href", "")))
+        if m:
+            last_page = max(last_page, int(m.group(1)))
+    return last_page
 
 
 # ---------------------------------------------------------------------------
@@ -499,73 +625,43 @@ def _parse_int(text: str) -> int:
 # ═══════════════════════════════════════════════════════════════════════════
 
 
-def load_registry() -> dict[str, int]:
-    """Load the tf_slug → numeric ID mapping from disk."""
-    if REGISTRY_PATH.exists():
-        return json.loads(REGISTRY_PATH.read_text(encoding="utf-8"))
-    return {}
-
+def load_registry() -> SlugRegistry:
+    """Open the tf_slug → numeric ID registry.
 
-def save_registry(registry: dict[str, int]) -> None:
-    """Persist the tf_slug → numeric ID mapping."""
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    REGISTRY_PATH.write_text(
-        json.dumps(registry, indent=2, ensure_ascii=False), encoding="utf-8"
+    Changes to the JSON snapshot are merged in on open; close the
+    returned registry (or use it as a context manager) when done.
+    """
+    return SlugRegistry(
+        REGISTRY_PATH, "tf", ID_OFFSET, json_path=REGISTRY_JSON_PATH
     )
 
 
-def get_or_create_book_id(tf_slug: str, registry: dict[str, int]) -> int:
+def get_or_create_book_id(tf_slug: str, registry: SlugRegistry) -> int:
     """Return the existing ID for *tf_slug* or assign the next sequential one."""
-    if tf_slug in registry:
-        return registry[tf_slug]
-    next_id = ID_OFFSET + len(registry) + 1
-    registry[tf_slug] = next_id
-    save_registry(registry)
-    return next_id
+    return registry.get_or_create(tf_slug)
 
 
 # ── Dedup (checks existing books across all sources) ────────────────────────
 
 
-def build_existing_index() -> dict[str, dict]:
-    """Index existing binslib books by slug for deduplication.
+def build_existing_index() -> DedupIndex:
+    """Index existing binslib books (all sources) for deduplication.
 
-    Returns ``{slug: {"id": int, "name": str, "status": int, "source": str}}``.
+    One read of the ``books`` table, plus first-chapter fingerprints
+    recorded by ingest; every lookup after that is a dict hit.
     """
-    import sqlite3
-
-    if not BINSLIB_DB_PATH.exists():
-        return {}
-    conn = sqlite3.connect(str(BINSLIB_DB_PATH))
-    try:
-        rows = conn.execute(
-            "SELECT id, name, slug, status, source FROM books WHERE slug IS NOT NULL"
-        ).fetchall()
-    finally:
-        conn.close()
-    return {
-        slug: {"id": book_id, "name": name, "status": status, "source": source}
-        for book_id, name, slug, status, source in rows
-        if slug
-    }
+    return DedupIndex.from_db(BINSLIB_DB_PATH, FINGERPRINTS_PATH)
 
 
-def is_duplicate(slug: str, name: str, existing_index: dict[str, dict]) -> bool:
+def is_duplicate(
+    slug: str, name: str, existing_index: DedupIndex, author: str | None = None
+) -> bool:
     """Return *True* if the book already exists in any source.
 
-    Checks by slug match first, then by exact name match.
+    Matches the normalised slug first, then the normalised title (unless
+    both books have an author and the authors differ).
     """
-    # Check by slug
-    if slug in existing_index:
-        return True
-
-    # Check by exact name match (different slug, same book)
-    name_lower = name.lower().strip()
-    for entry in existing_index.values():
-        if entry.get("name", "").lower().strip() == name_lower:
-            return True
-
-    return False
+    return existing_index.find(slug=slug, name=name, author=author) is not None
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -584,6 +680,9 @@ class TFSource(BookSource):
         Minimum seconds between requests inside the semaphore.
     timeout:
         Per-request read-timeout in seconds.
+    http_client:
+        Shared ``httpx.AsyncClient`` from :func:`create_http_client`;
+        left open by :meth:`close`.  A private client is created if omitted.
     """
 
     def __init__(
@@ -591,12 +690,26 @@ class TFSource(BookSource):
         max_concurrent: int = TF_DEFAULT_MAX_CONCURRENT,
         request_delay: float = TF_DEFAULT_DELAY,
         timeout: float = 30,
+        http_client: httpx.AsyncClient | None = None,
     ):
         self._client = _AsyncTFClient(
             delay=request_delay,
             max_concurrent=max_concurrent,
             timeout=timeout,
+            client=http_client,
+        )
+        # book_id -> first chapter-list page (refs, last_page), captured from
+        # the detail page so fetch_chapter_list() need not fetch it again.
+        self._toc_seeds: OrderedDict[int, tuple[list[ChapterRef], int]] = (
+            OrderedDict()
         )
+        # book_id -> full chapter list, shared by ingest's gap accounting
+        # and fetch_chapters().
+        self._toc_cache: OrderedDict[int, list[ChapterRef]] = OrderedDict()
+
+    # Books whose TOC is kept in memory.  Entries are normally consumed by
+    # fetch_chapters(); the bound only matters for books that are skipped.
+    _TOC_CACHE_SIZE = 64
 
     # ── Identity ────────────────────────────────────────────────────────
 
@@ -631,8 +744,16 @@ class TFSource(BookSource):
         if "id" in entry:
             meta["id"] = entry["id"]
         else:
-            registry = load_registry()
-            meta["id"] = get_or_create_book_id(tf_slug, registry)
+            with load_registry() as registry:
+                meta["id"] = registry.get_or_create(tf_slug)
+
+        # The detail page is also page 1 of the chapter list
+        lru_put(
+            self._toc_seeds,
+            meta["id"],
+            (parse_chapter_list(html), parse_chapter_list_last_page(html)),
+            self._TOC_CACHE_SIZE,
+        )
 
         # Prefer the plan's chapter_count (from the listing page "Chương N"
         # text, which is exact) over the detail page's estimate (which rounds
@@ -646,12 +767,60 @@ class TFSource(BookSource):
 
     # ── Chapter iteration ───────────────────────────────────────────────
 
-    # Batch size for parallel chapter fetching.  Chapters within a batch
-    # are fetched concurrently (bounded by the client semaphore), then
-    # yielded in index order before starting the next batch.
-    # Kept at 10 (not 20) to avoid overwhelming the server — a batch of
-    # 20 simultaneous requests frequently triggers 503 responses.
-    _FETCH_BATCH_SIZE = 10
+    async def fetch_chapter_list(self, meta: dict) -> list[ChapterRef] | None:
+        """Scrape the paginated chapter list (50 per page).
+
+        Page 1 is the detail page (reused from :meth:`fetch_book_metadata`
+        when available); pages 2..N are fetched concurrently, bounded by
+        the client semaphore.  Returns ``None`` if any page fails so the
+        caller falls back to ``chapter_count``.
+        """
+        book_id = meta["id"]
+        if book_id in self._toc_cache:
+            return self._toc_cache[book_id]
+
+        tf_slug = meta.get("tf_slug", meta["slug"])
+        seed = self._toc_seeds.pop(book_id, None)
+        if seed is None:
+            try:
+                html = await self._client.get_html(f"/{tf_slug}/")
+            except TFFetchError as exc:
+                log.warning("  [%d] chapter list: %s", book_id, exc)
+                return None
+            seed = (parse_chapter_list(html), parse_chapter_list_last_page(html))
+
+        refs, last_page = seed
+        refs = list(refs)
+        if last_page > 1:
+            pages = await asyncio.gather(
+                *[
+                    self._client.get_html(f"/{tf_slug}/trang-{page}/")
+                    for page in range(2, last_page + 1)
+                ],
+                return_exceptions=True,
+            )
+            for page, result in enumerate(pages, start=2):
+                if isinstance(result, BaseException):
+                    log.warning(
+                        "  [%d] chapter list page %d: %s", book_id, page, result
+                    )
+                    return None
+                refs.extend(parse_chapter_list(result))
+
+        if not refs:
+            return None
+
+        by_index = {ref.index: ref for ref in refs}
+        toc = [by_index[idx] for idx in sorted(by_index)]
+        lru_put(self._toc_cache, book_id, toc, self._TOC_CACHE_SIZE)
+        return toc
+
+    # Window size for parallel chapter fetching.  At most this many chapter
+    # requests are in flight per book; a slot is refilled as soon as any
+    # fetch finishes, so one slow chapter no longer stalls the other nine.
+    # Kept at 10 (not 20) to avoid overwhelming the server — 20 simultaneous
+    # requests frequently trigger 503 responses.
+    _FETCH_WINDOW_SIZE = 10
 
     async def fetch_chapters(
         self,
@@ -659,84 +828,132 @@ class TFSource(BookSource):
         existing_indices: set[int],
         bundle_path: str,
     ) -> AsyncIterator[ChapterData]:
-        """Fetch missing chapters in parallel batches.
-
-        Unlike the old sequential approach (one request at a time, ~3 ch/s),
-        this fetches ``_FETCH_BATCH_SIZE`` chapters concurrently per batch,
-        achieving ~15-60 ch/s depending on server response time and the
-        client's ``max_concurrent`` setting.
-
-        Results are yielded in ascending index order within each batch.
+        """Fetch missing chapters through a sliding window of requests.
+
+        The set of chapters comes from :meth:`fetch_chapter_list`, so only
+        URLs that actually exist are requested; if the chapter list cannot
+        be scraped, ``chuong-1`` … ``chuong-{chapter_count}`` is used.
+
+        Requests run at most ``_FETCH_WINDOW_SIZE`` chapters ahead of the
+        next chapter to yield (further bounded by the client semaphore), so
+        a slow or retrying head chapter pauses new requests instead of
+        growing the reorder buffer.  Completed chapters are yielded in
+        ascending index order as soon as the next expected index is
+        available; a fetch that raises counts as a failed chapter.
+
+        Backoff is driven by the outcome of the last ``_FETCH_WINDOW_SIZE``
+        completed fetches: when more than half of them failed, every window
+        of new requests is paced over an extra 5 s (max 30 s); a clean
+        window eases that by 2 s.  The pacing is re-evaluated once per
+        window's worth of completions, matching the old per-batch cadence.
         """
         tf_slug = meta.get("tf_slug", meta["slug"])
         chapter_count = meta.get("chapter_count", 0)
         book_id = meta["id"]
+        window = self._FETCH_WINDOW_SIZE
 
-        # Collect all missing indices upfront
-        to_fetch = sorted(
-            idx for idx in range(1, chapter_count + 1) if idx not in existing_indices
-        )
+        toc = await self.fetch_chapter_list(meta)
+        self._toc_cache.pop(book_id, None)
+
+        # (index, url) of every missing chapter, in index order
+        if toc is not None:
+            to_fetch = [
+                (ref.index, ref.url) for ref in toc if ref.index not in existing_indices
+            ]
+        else:
+            to_fetch = [
+                (idx, f"/{tf_slug}/chuong-{idx}/")
+                for idx in range(1, chapter_count + 1)
+                if idx not in existing_indices
+            ]
 
         if not to_fetch:
             return
 
-        # Progressive backoff: when a batch has many errors, pause longer
-        # before the next batch to let the server recover.
-        batch_delay = 0.0  # seconds to wait before starting next batch
-
-        # Process in batches
-        for batch_start in range(0, len(to_fetch), self._FETCH_BATCH_SIZE):
-            # Inter-batch delay — increases when errors are detected
-            if batch_delay > 0:
-                await asyncio.sleep(batch_delay)
-
-            batch = to_fetch[batch_start : batch_start + self._FETCH_BATCH_SIZE]
-
-            # Fetch all chapters in this batch concurrently
-            results: dict[int, ChapterData | None] = {}
-
-            async def _fetch_one(ch_idx: int) -> None:
-                data = await self._fetch_single_chapter(book_id, tf_slug, ch_idx)
-                results[ch_idx] = data
-
-            await asyncio.gather(*[_fetch_one(idx) for idx in batch])
-
-            # Count errors in this batch to adjust pacing
-            batch_errors = sum(1 for v in results.values() if v is None)
-            if batch_errors > len(batch) // 2:
-                # More than half failed — server is struggling, back off
-                batch_delay = min(batch_delay + 5.0, 30.0)
-                log.info(
-                    "  [%d] batch %d/%d: %d/%d failed, backing off %.0fs",
-                    book_id,
-                    batch_start // self._FETCH_BATCH_SIZE + 1,
-                    (len(to_fetch) + self._FETCH_BATCH_SIZE - 1)
-                    // self._FETCH_BATCH_SIZE,
-                    batch_errors,
-                    len(batch),
-                    batch_delay,
-                )
-            elif batch_errors == 0 and batch_delay > 0:
-                # All succeeded — ease off the backoff
-                batch_delay = max(batch_delay - 2.0, 0.0)
+        in_flight: dict[asyncio.Task, int] = {}
+        reorder: dict[int, ChapterData | None] = {}
+        outcomes: deque[bool] = deque(maxlen=window)  # True = failed
+        since_adjust = 0
+        admit_delay = 0.0  # pause before admitting the next request
+        next_submit = 0  # position in to_fetch of the next request to start
+        next_yield = 0  # position in to_fetch of the next chapter to yield
 
-            # Yield successful results in index order
-            for idx in batch:
-                ch = results.get(idx)
-                if ch is not None:
-                    yield ch
+        try:
+            while next_yield < len(to_fetch):
+                # Refill the window — bounded by the head chapter, not by the
+                # requests in flight, so ``reorder`` holds < window chapters
+                while next_submit - next_yield < window and next_submit < len(to_fetch):
+                    if admit_delay > 0:
+                        # Spread the pause over the window so the overall
+                        # rate matches one pause per window of requests.
+                        await asyncio.sleep(admit_delay / window)
+                    ch_idx, url = to_fetch[next_submit]
+                    task = asyncio.create_task(
+                        self._fetch_single_chapter(book_id, tf_slug, ch_idx, url)
+                    )
+                    in_flight[task] = ch_idx
+                    next_submit += 1
+
+                done, _ = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    ch_idx = in_flight.pop(task)
+                    try:
+                        data = task.result()
+                    except Exception as e:
+                        log.warning("  [%d] chapter %d failed: %s", book_id, ch_idx, e)
+                        data = None
+                    reorder[ch_idx] = data
+                    outcomes.append(data is None)
+                    since_adjust += 1
+
+                # Adjust pacing from the rolling error ratio
+                if since_adjust >= window:
+                    since_adjust = 0
+                    errors = sum(outcomes)
+                    if errors > len(outcomes) // 2:
+                        # More than half failed — server is struggling, back off
+                        admit_delay = min(admit_delay + 5.0, 30.0)
+                        log.info(
+                            "  [%d] %d/%d of last fetches failed, backing off %.0fs",
+                            book_id,
+                            errors,
+                            len(outcomes),
+                            admit_delay,
+                        )
+                    elif errors == 0 and admit_delay > 0:
+                        # All succeeded — ease off the backoff
+                        admit_delay = max(admit_delay - 2.0, 0.0)
+
+                # Yield the contiguous run of completed chapters in index order
+                while (
+                    next_yield < len(to_fetch) and to_fetch[next_yield][0] in reorder
+                ):
+                    ch = reorder.pop(to_fetch[next_yield][0])
+                    next_yield += 1
+                    if ch is not None:
+                        yield ch
+        finally:
+            # Consumer stopped early (or an error escaped) — drop stragglers
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
 
     async def _fetch_single_chapter(
         self,
         book_id: int,
         tf_slug: str,
         ch_idx: int,
+        url: str | None = None,
     ) -> ChapterData | None:
         """Fetch and parse a single chapter with retry on parse failure.
 
-        Returns ``ChapterData`` on success, ``None`` on failure.
+        *url* defaults to ``/{tf_slug}/chuong-{ch_idx}/``.  Returns
+        ``ChapterData`` on success, ``None`` on failure.
         """
-        url = f"/{tf_slug}/chuong-{ch_idx}/"
+        url = url or f"/{tf_slug}/chuong-{ch_idx}/"
 
         # Retry up to 3 times when the server returns 200 but the page
         # is not a chapter (ad interstitial, CAPTCHA, throttle page).
@@ -775,28 +992,27 @@ class TFSource(BookSource):
         book_id: int,
         meta: dict,
         covers_dir: str,
+        hosts: HostLimiter | None = None,
     ) -> str | None:
-        """Download cover image from the URL in *meta['cover_url']*."""
-        dest = os.path.join(covers_dir, f"{book_id}.jpg")
-        if os.path.exists(dest):
-            return f"/covers/{book_id}.jpg"
+        """Download cover image from the URL in *meta['cover_url']*.
 
+        Goes straight to the connection pool, not through the chapter
+        request limiter; *hosts* caps requests per image host.
+        """
         cover_url = meta.get("cover_url", "")
         if not cover_url:
-            return None
-
-        try:
-            data = await self._client.get_bytes(cover_url)
-        except TFFetchError:
-            return None
+            cover_url = None
+        else:
+            cover_url = urljoin(f"{TF_BASE_URL}/", cover_url)
+        return await _download_cover(
+            self._client.client, book_id, cover_url, covers_dir, hosts, self.name
+        )
 
-        if len(data) < 100:
-            return None
+    # ── Load reporting ──────────────────────────────────────────────────
 
-        os.makedirs(covers_dir, exist_ok=True)
-        with open(dest, "wb") as f:
-            f.write(data)
-        return f"/covers/{book_id}.jpg"
+    @property
+    def limiter(self) -> TrackedSemaphore:
+        return self._client.limiter
 
     # ── Lifecycle ───────────────────────────────────────────────────────
 
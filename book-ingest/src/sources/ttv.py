@@ -16,17 +16,24 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import os
 import re
+from collections import OrderedDict
 from collections.abc import AsyncIterator
 from html import unescape
 from pathlib import Path
+from urllib.parse import unquote, urljoin, urlsplit
 
 import httpx
 from bs4 import BeautifulSoup, Tag
 
+from ..cover import download_cover as _download_cover
 from ..db import slugify as _slugify
-from .base import BookSource, ChapterData
+from ..dedup import FINGERPRINTS_PATH, DedupIndex
+from ..metrics import count_retry, instrumented_get
+from ..ratelimit import HostLimiter, TrackedSemaphore
+from ..registry import SlugRegistry
+from . import fastparse
+from .base import BookSource, ChapterData, ChapterRef, lru_put
 
 log = logging.getLogger("book-ingest.ttv")
 
@@ -49,6 +56,14 @@ TTV_HEADERS = {
 TTV_DEFAULT_DELAY = 0.3  # seconds between requests
 TTV_DEFAULT_MAX_CONCURRENT = 20
 
+# Chapters per request when scraping the chapter list endpoint
+# (``/doc-truyen/page/{story_id}?page=N&limit=…``).  Large pages keep a
+# full TOC scan to a handful of requests even for 5 000-chapter books.
+TTV_TOC_PAGE_SIZE = 1000
+# Pages fetched past the detail page's chapter count, when the list has
+# grown since; also stops an endpoint that ignores ``page``.
+TTV_TOC_MAX_EXTRA_PAGES = 10
+
 # TTV book IDs start at 10M to avoid collision with MTC IDs (< 1M).
 ID_OFFSET = 10_000_000
 
@@ -60,7 +75,8 @@ AUTHOR_ID_OFFSET = 20_000_000
 
 _INGEST_DIR = Path(__file__).resolve().parent.parent.parent  # book-ingest/
 DATA_DIR = _INGEST_DIR / "data"
-REGISTRY_PATH = DATA_DIR / "books_registry_ttv.json"
+REGISTRY_PATH = DATA_DIR / "book_registry.sqlite"  # shared with tf
+REGISTRY_JSON_PATH = DATA_DIR / "books_registry_ttv.json"  # git-tracked snapshot
 TTV_PLAN_FILE = DATA_DIR / "books_plan_ttv.json"
 BINSLIB_DB_PATH = _INGEST_DIR.parent / "binslib" / "data" / "binslib.db"
 
@@ -82,11 +98,38 @@ class TTVRedirect(TTVFetchError):
     """Request was silently redirected (e.g. VIP chapter → book page)."""
 
 
+def create_http_client(
+    max_concurrent: int = TTV_DEFAULT_MAX_CONCURRENT,
+    timeout: float = 30,
+    http2: bool = False,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """Build an ``httpx.AsyncClient`` configured for truyen.tangthuvien.vn.
+
+    Used by :class:`_AsyncTTVClient` when it owns its client, and by
+    ``ingest.py`` to create one pool shared by every worker.  *http2* requires the
+    optional ``h2`` package.
+    *transport* replaces the network pool (see :mod:`src.httpreplay`).
+    """
+    return httpx.AsyncClient(
+        headers=TTV_HEADERS,
+        timeout=httpx.Timeout(connect=10, read=timeout, write=10, pool=30),
+        follow_redirects=True,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_concurrent + 10,
+            max_keepalive_connections=max_concurrent,
+        ),
+        transport=transport,
+    )
+
+
 class _AsyncTTVClient:
     """Async HTTP client with semaphore-based throttling and retries.
 
     Each request acquires the semaphore, sleeps for *delay* seconds, then
-    fires.  This caps both concurrency **and** rate.
+    fires.  This caps both concurrency **and** rate.  A shared *client*
+    is used as-is and left open by :meth:`close`.
     """
 
     def __init__(
@@ -95,22 +138,27 @@ class _AsyncTTVClient:
         max_concurrent: int = TTV_DEFAULT_MAX_CONCURRENT,
         timeout: float = 30,
         max_retries: int = 3,
+        client: httpx.AsyncClient | None = None,
     ):
-        self._sem = asyncio.Semaphore(max_concurrent)
+        self._sem = TrackedSemaphore(max_concurrent)
         self._delay = delay
         self._max_retries = max_retries
-        self._client = httpx.AsyncClient(
-            headers=TTV_HEADERS,
-            timeout=httpx.Timeout(connect=10, read=timeout, write=10, pool=30),
-            follow_redirects=True,
-            limits=httpx.Limits(
-                max_connections=max_concurrent + 10,
-                max_keepalive_connections=max_concurrent,
-            ),
-        )
+        self._owns_client = client is None
+        self._client = client or create_http_client(max_concurrent, timeout)
 
     async def close(self) -> None:
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
+
+    @property
+    def limiter(self) -> TrackedSemaphore:
+        """The semaphore capping in-flight requests (for load reporting)."""
+        return self._sem
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The underlying connection pool (cover downloads bypass the limiter)."""
+        return self._client
 
     async def get(
         self, url: str, params: dict | None = None, retries: int | None = None
@@ -124,9 +172,10 @@ class _AsyncTTVClient:
             for attempt in range(retries):
                 await asyncio.sleep(self._delay)
                 try:
-                    r = await self._client.get(url, params=params)
+                    r = await instrumented_get(self._client, "ttv", url, params=params)
                 except httpx.TransportError as exc:
                     if attempt < retries - 1:
+                        count_retry("ttv", "error")
                         await asyncio.sleep(2 ** (attempt + 1))
                         continue
                     raise TTVFetchError(
@@ -136,6 +185,7 @@ class _AsyncTTVClient:
                 if r.status_code == 429:
                     wait = int(r.headers.get("Retry-After", 2 ** (attempt + 2)))
                     if attempt < retries - 1:
+                        count_retry("ttv", r.status_code)
                         await asyncio.sleep(wait)
                         continue
                     raise TTVFetchError(f"Rate limited after {retries} retries")
@@ -145,6 +195,7 @@ class _AsyncTTVClient:
 
                 if r.status_code != 200:
                     if attempt < retries - 1:
+                        count_retry("ttv", r.status_code)
                         await asyncio.sleep(2 ** (attempt + 1))
                         continue
                     raise TTVFetchError(f"HTTP {r.status_code}: {url}")
@@ -170,9 +221,6 @@ class _AsyncTTVClient:
             raise TTVRedirect(f"Redirected: {url} → {r.url}")
         return r.text
 
-    async def get_bytes(self, url: str) -> bytes:
-        return (await self.get(url)).content
-
 
 # ═══════════════════════════════════════════════════════════════════════════
 # HTML parsers  (ported from crawler-tangthuvien/src/parser.py)
@@ -422,32 +470,17 @@ def parse_chapter(html: str) -> dict | None:
     2. If the first non-empty line of the body matches the title, it is
        stripped to avoid duplication in the reader UI — same fix applied
        to MTC chapters in ``decrypt_chapter()``.
-    """
-    soup = BeautifulSoup(html, "lxml")
-
-    h2 = soup.select_one("h2")
-    if not h2:
-        return None
-    title = h2.get_text(strip=True).replace("\xa0", " ")
-
-    box_chaps = soup.select("div.box-chap")
-    if not box_chaps:
-        return None
-
-    # Remove embedded <h5> headings that duplicate the chapter title
-    for box in box_chaps:
-        for h5 in box.find_all("h5"):
-            h5.decompose()
-
-    paragraphs: list[str] = []
-    for box in box_chaps:
-        text = box.get_text(separator="\n").strip()
-        if text:
-            paragraphs.append(text)
 
-    body = "\n\n".join(paragraphs)
-    if not body:
+    Extraction tries the lxml fast path first and falls back to the
+    BeautifulSoup parser on markup it does not recognise; both yield the
+    same ``(title, body)`` for pages they can both read.
+    """
+    extracted = _extract_chapter_lxml(html)
+    if extracted is None:
+        extracted = _extract_chapter_bs4(html)
+    if extracted is None:
         return None
+    title, body = extracted
 
     # Strip leading text that matches the chapter title (same dedup as MTC).
     # TTV pages embed the title in the body in two ways:
@@ -495,6 +528,106 @@ def parse_chapter(html: str) -> dict | None:
     return {"title": title_clean, "body": body}
 
 
+def _extract_chapter_lxml(html: str) -> tuple[str, str] | None:
+    """Fast path: ``(title, body)`` via lxml, or ``None`` to fall back."""
+    root = fastparse.parse_document(html)
+    if root is None:
+        return None
+
+    h2 = fastparse.first(root, "//h2")
+    if h2 is None:
+        return None
+    title = fastparse.get_text(h2, strip=True).replace("\xa0", " ")
+
+    box_chaps = root.xpath(fastparse.class_xpath("div", "box-chap"))
+    if not box_chaps:
+        return None
+
+    # Embedded <h5> headings duplicate the chapter title
+    h5s = {h5 for box in box_chaps for h5 in box.iter("h5")}
+
+    # Nested containers (a box inside another box, inside an <h5> that gets
+    # removed, or inside <template>) are left to BeautifulSoup.
+    boxes = set(box_chaps)
+    for box in box_chaps:
+        if fastparse.in_non_text(box) or any(
+            a in boxes or a.tag == "h5" for a in box.iterancestors()
+        ):
+            return None
+    paragraphs = [
+        text
+        for box in box_chaps
+        if (text := fastparse.get_text(box, separator="\n", skip=h5s).strip())
+    ]
+
+    body = "\n\n".join(paragraphs)
+    if not body:
+        return None
+    return title, body
+
+
+def _extract_chapter_bs4(html: str) -> tuple[str, str] | None:
+    """Reference parser: ``(title, body)`` via BeautifulSoup, or ``None``."""
+    soup = BeautifulSoup(html, "lxml")
+
+    h2 = soup.select_one("h2")
+    if not h2:
+        return None
+    title = h2.get_text(strip=True).replace("\xa0", " ")
+
+    box_chaps = soup.select("div.box-chap")
+    if not box_chaps:
+        return None
+
+    # Remove embedded <h5> headings that duplicate the chapter title
+    for box in box_chaps:
+        for h5 in box.find_all("h5"):
+            h5.decompose()
+
+    paragraphs: list[str] = []
+    for box in box_chaps:
+        text = box.get_text(separator="\n").strip()
+        if text:
+            paragraphs.append(text)
+
+    body = "\n\n".join(paragraphs)
+    if not body:
+        return None
+    return title, body
+
+
+# ---------------------------------------------------------------------------
+# Chapter list  (/doc-truyen/page/{story_id}?page=N&limit=M&web=1)
+# ---------------------------------------------------------------------------
+
+
+def parse_chapter_list(html: str) -> list[ChapterRef]:
+    """Parse one page of the chapter list endpoint.
+
+    Only freely readable chapters are returned: entries marked VIP (a
+    ``vip`` class or a lock icon) are skipped, as are links that are not
+    ``chuong-N`` URLs.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    refs: list[ChapterRef] = []
+    for li in soup.select("li"):
+        a = li.select_one("a[href*='chuong-']")
+        if not a:
+            continue
+        classes = " ".join(li.get("class", []) + a.get("class", [])).lower()
+        if "vip" in classes or li.select_one(".vip, .fa-lock, .icon-lock"):
+            continue
+        # Keep the decoded path so redirect detection in get_chapter_html()
+        # compares like with like.
+        href = unquote(urlsplit(str(a.get("href", ""))).path)
+        idx = _extract_chapter_index(href)
+        if idx <= 0:
+            continue
+        title = (a.get("title") or a.get_text(strip=True)).replace("\xa0", " ")
+        refs.append(ChapterRef(index=idx, url=href, title=unescape(title.strip())))
+    return refs
+
+
 # ---------------------------------------------------------------------------
 # Parser helpers
 # ---------------------------------------------------------------------------
@@ -549,60 +682,34 @@ def _map_status(text: str) -> int:
 # ═══════════════════════════════════════════════════════════════════════════
 
 
-def load_registry() -> dict[str, int]:
-    """Load the slug → numeric ID mapping from disk."""
-    if REGISTRY_PATH.exists():
-        return json.loads(REGISTRY_PATH.read_text(encoding="utf-8"))
-    return {}
+def load_registry() -> SlugRegistry:
+    """Open the slug → numeric ID registry.
 
-
-def save_registry(registry: dict[str, int]) -> None:
-    """Persist the slug → numeric ID mapping."""
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    REGISTRY_PATH.write_text(
-        json.dumps(registry, indent=2, ensure_ascii=False), encoding="utf-8"
+    Changes to the JSON snapshot are merged in on open; close the
+    returned registry (or use it as a context manager) when done.
+    """
+    return SlugRegistry(
+        REGISTRY_PATH, "ttv", ID_OFFSET, json_path=REGISTRY_JSON_PATH
     )
 
 
-def get_or_create_book_id(slug: str, registry: dict[str, int]) -> int:
+def get_or_create_book_id(slug: str, registry: SlugRegistry) -> int:
     """Return the existing ID for *slug* or assign the next sequential one."""
-    if slug in registry:
-        return registry[slug]
-    next_id = ID_OFFSET + len(registry) + 1
-    registry[slug] = next_id
-    save_registry(registry)
-    return next_id
+    return registry.get_or_create(slug)
 
 
 # ── MTC deduplication (for plan generation) ─────────────────────────────────
 
 
-def build_mtc_index() -> dict[str, dict]:
-    """Index existing binslib books by slug for deduplication.
-
-    Returns ``{slug: {"id": int, "name": str, "status": int}}``.
-    """
-    import sqlite3
-
-    if not BINSLIB_DB_PATH.exists():
-        return {}
-    conn = sqlite3.connect(str(BINSLIB_DB_PATH))
-    try:
-        rows = conn.execute(
-            "SELECT id, name, slug, status FROM books WHERE slug IS NOT NULL"
-        ).fetchall()
-    finally:
-        conn.close()
-    return {
-        slug: {"id": book_id, "name": name, "status": status}
-        for book_id, name, slug, status in rows
-        if slug
-    }
+def build_mtc_index() -> DedupIndex:
+    """Index existing binslib books for deduplication (one DB read, plus
+    first-chapter fingerprints recorded by ingest)."""
+    return DedupIndex.from_db(BINSLIB_DB_PATH, FINGERPRINTS_PATH)
 
 
-def is_mtc_duplicate(slug: str, mtc_index: dict[str, dict]) -> bool:
+def is_mtc_duplicate(slug: str, mtc_index: DedupIndex) -> bool:
     """Return *True* if the slug matches a completed (status=2) MTC book."""
-    entry = mtc_index.get(slug)
+    entry = mtc_index.by_slug(slug)
     return entry is not None and entry.get("status") == 2
 
 
@@ -622,6 +729,9 @@ class TTVSource(BookSource):
         Minimum seconds between requests inside the semaphore.
     timeout:
         Per-request read-timeout in seconds.
+    http_client:
+        Shared ``httpx.AsyncClient`` from :func:`create_http_client`;
+        left open by :meth:`close`.  A private client is created if omitted.
     """
 
     def __init__(
@@ -629,12 +739,21 @@ class TTVSource(BookSource):
         max_concurrent: int = TTV_DEFAULT_MAX_CONCURRENT,
         request_delay: float = TTV_DEFAULT_DELAY,
         timeout: float = 30,
+        http_client: httpx.AsyncClient | None = None,
     ):
         self._client = _AsyncTTVClient(
             delay=request_delay,
             max_concurrent=max_concurrent,
             timeout=timeout,
+            client=http_client,
         )
+        # book_id -> chapter list, shared by ingest's gap accounting and
+        # fetch_chapters().
+        self._toc_cache: OrderedDict[int, list[ChapterRef]] = OrderedDict()
+
+    # Books whose TOC is kept in memory.  Entries are normally consumed by
+    # fetch_chapters(); the bound only matters for books that are skipped.
+    _TOC_CACHE_SIZE = 64
 
     # ── Identity ────────────────────────────────────────────────────────
 
@@ -672,13 +791,66 @@ class TTVSource(BookSource):
         if "id" in entry:
             meta["id"] = entry["id"]
         else:
-            registry = load_registry()
-            meta["id"] = get_or_create_book_id(slug, registry)
+            with load_registry() as registry:
+                meta["id"] = registry.get_or_create(ttv_slug)
 
         return meta
 
     # ── Chapter iteration ───────────────────────────────────────────────
 
+    async def fetch_chapter_list(self, meta: dict) -> list[ChapterRef] | None:
+        """Scrape the chapter list endpoint for the free chapters.
+
+        Needs ``ttv_story_id`` from the detail page.  All pages implied by
+        ``chapter_count`` are fetched concurrently (bounded by the client
+        semaphore); if the last one is full, following pages are fetched
+        until a short page, a page that lists no new chapter, or
+        ``TTV_TOC_MAX_EXTRA_PAGES`` extra pages.  Returns ``None`` if any
+        page fails or nothing is listed, so the caller falls back to
+        probing.
+        """
+        book_id = meta["id"]
+        if book_id in self._toc_cache:
+            return self._toc_cache[book_id]
+
+        story_id = meta.get("ttv_story_id")
+        if not story_id:
+            return None
+
+        size = TTV_TOC_PAGE_SIZE
+        url = f"/doc-truyen/page/{story_id}"
+
+        async def _page(page: int) -> list[ChapterRef]:
+            html = await self._client.get_html(
+                url, params={"page": page, "limit": size, "web": 1}
+            )
+            return parse_chapter_list(html)
+
+        n_pages = max(1, -(-meta.get("chapter_count", 0) // size))
+        try:
+            pages = await asyncio.gather(*[_page(p) for p in range(n_pages)])
+            by_index = {ref.index: ref for refs in pages for ref in refs}
+            # The detail page count may lag behind the list
+            last = pages[-1]
+            for extra in range(TTV_TOC_MAX_EXTRA_PAGES):
+                if len(last) < size:
+                    break
+                last = await _page(n_pages + extra)
+                new = [ref for ref in last if ref.index not in by_index]
+                if not new:
+                    break  # same page again: ``page`` ignored or off by one
+                by_index.update((ref.index, ref) for ref in new)
+        except TTVFetchError as exc:
+            log.warning("  [%d] chapter list: %s", book_id, exc)
+            return None
+
+        if not by_index:
+            return None
+
+        toc = [by_index[idx] for idx in sorted(by_index)]
+        lru_put(self._toc_cache, book_id, toc, self._TOC_CACHE_SIZE)
+        return toc
+
     # Maximum consecutive fetch failures (redirect / parse error) before
     # we assume remaining chapters are VIP-only and stop the walk.
     MAX_CONSECUTIVE_FAILURES = 10
@@ -689,13 +861,14 @@ class TTVSource(BookSource):
         existing_indices: set[int],
         bundle_path: str,
     ) -> AsyncIterator[ChapterData]:
-        """Iterate ``chuong-1`` … ``chuong-N``, skipping existing indices.
+        """Fetch the missing free chapters sequentially.
 
-        TTV serves chapters at predictable URLs, so the walk is a simple
-        sequential loop — no linked-list traversal or resume logic needed.
+        The chapter URLs come from :meth:`fetch_chapter_list`, so VIP and
+        missing chapters are never requested.  When the chapter list is
+        unavailable the walk falls back to ``chuong-1`` … ``chuong-N``.
 
-        Two early-exit mechanisms avoid wasting time on VIP/premium chapters
-        that TTV does not serve publicly:
+        Two early-exit mechanisms guard the fallback walk (and any
+        unexpected failures on listed chapters):
 
         1. **Redirect detection** — TTV silently redirects missing or VIP
            chapter URLs back to the book listing page (HTTP 200, no 404).
@@ -711,19 +884,28 @@ class TTVSource(BookSource):
         book_id = meta["id"]
         consecutive_failures = 0
 
-        for ch_idx in range(1, chapter_count + 1):
-            if ch_idx in existing_indices:
-                # Don't reset counter — existing chapters don't tell us
-                # whether the *next* chapter will be available.
-                continue
+        toc = await self.fetch_chapter_list(meta)
+        self._toc_cache.pop(book_id, None)
 
-            url = f"/doc-truyen/{ttv_slug}/chuong-{ch_idx}"
+        # (index, url) of every missing chapter, in index order
+        if toc is not None:
+            targets = [
+                (ref.index, ref.url) for ref in toc if ref.index not in existing_indices
+            ]
+        else:
+            targets = [
+                (idx, f"/doc-truyen/{ttv_slug}/chuong-{idx}")
+                for idx in range(1, chapter_count + 1)
+                if idx not in existing_indices
+            ]
+
+        for pos, (ch_idx, url) in enumerate(targets):
             try:
                 html = await self._client.get_chapter_html(url)
             except TTVRedirect:
                 consecutive_failures += 1
                 if consecutive_failures >= self.MAX_CONSECUTIVE_FAILURES:
-                    skipped = chapter_count - ch_idx
+                    skipped = len(targets) - pos - 1
                     log.info(
                         "  [%d] stopping at chuong-%d: %d consecutive "
                         "redirects (likely VIP), skipping ~%d chapters",
@@ -785,28 +967,27 @@ class TTVSource(BookSource):
         book_id: int,
         meta: dict,
         covers_dir: str,
+        hosts: HostLimiter | None = None,
     ) -> str | None:
-        """Download cover image from the URL in *meta['cover_url']*."""
-        dest = os.path.join(covers_dir, f"{book_id}.jpg")
-        if os.path.exists(dest):
-            return f"/covers/{book_id}.jpg"
+        """Download cover image from the URL in *meta['cover_url']*.
 
+        Goes straight to the connection pool, not through the chapter
+        request limiter; *hosts* caps requests per image host.
+        """
         cover_url = meta.get("cover_url", "")
         if not cover_url or "default-book" in cover_url:
-            return None
-
-        try:
-            data = await self._client.get_bytes(cover_url)
-        except TTVFetchError:
-            return None
+            cover_url = None
+        else:
+            cover_url = urljoin(f"{TTV_BASE_URL}/", cover_url)
+        return await _download_cover(
+            self._client.client, book_id, cover_url, covers_dir, hosts, self.name
+        )
 
-        if len(data) < 100:
-            return None
+    # ── Load reporting ──────────────────────────────────────────────────
 
-        os.makedirs(covers_dir, exist_ok=True)
-        with open(dest, "wb") as f:
-            f.write(data)
-        return f"/covers/{book_id}.jpg"
+    @property
+    def limiter(self) -> TrackedSemaphore:
+        return self._client.limiter
 
     # ── Lifecycle ───────────────────────────────────────────────────────
 
@@ -0,0 +1,167 @@
+"""Responsive cover thumbnails (WebP / AVIF) rendered in a process pool.
+
+Next to each ``covers/{book_id}.jpg`` we keep pre-sized derivatives::
+
+    covers/{book_id}-150.webp
+    covers/{book_id}-300.webp
+    covers/{book_id}-300.avif      (only with --thumb-formats webp,avif)
+
+binslib's listing grids load the 150/300 px WebP and fall back to the
+full JPEG, so a page of 40 covers no longer ships 40 upstream posters.
+
+Decoding and resizing are CPU-bound, so :class:`ThumbnailPool` runs
+:func:`render_thumbnails` in worker processes; the event loop only waits
+on the future.  Pillow is optional: without it (or without a codec for a
+requested format) :func:`unsupported_formats` says so and callers skip
+thumbnails.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import multiprocessing
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+from .cover import cover_path, write_cover
+
+THUMB_WIDTHS = (150, 300)
+THUMB_FORMATS = ("webp",)
+SUPPORTED_FORMATS = ("webp", "avif")
+DEFAULT_THUMB_WORKERS = min(4, os.cpu_count() or 1)
+
+_QUALITY = {"webp": 80, "avif": 55}
+
+
+def thumb_path(covers_dir: str, book_id: int, width: int, fmt: str) -> str:
+    return os.path.join(covers_dir, f"{book_id}-{width}.{fmt}")
+
+
+def unsupported_formats(formats: Sequence[str]) -> list[str]:
+    """Formats in *formats* this Pillow build cannot write (all of them
+    when Pillow is not installed)."""
+    try:
+        from PIL import features
+    except ImportError:
+        return list(formats)
+    return [f for f in formats if f not in SUPPORTED_FORMATS or not features.check(f)]
+
+
+def _is_stale(path: str, src_mtime: float) -> bool:
+    try:
+        return os.path.getmtime(path) < src_mtime
+    except OSError:
+        return True
+
+
+def render_thumbnails(
+    covers_dir: str,
+    book_id: int,
+    widths: Sequence[int] = THUMB_WIDTHS,
+    formats: Sequence[str] = THUMB_FORMATS,
+    force: bool = False,
+) -> int:
+    """Write the thumbnails of one cover; blocking (runs in a worker process).
+
+    Only missing thumbnails, or ones older than the JPEG, are rendered
+    unless *force*.  Covers narrower than a width are re-encoded, not
+    upscaled.  Returns the number of files written (0 if there is no
+    cover).
+    """
+    from PIL import Image
+
+    src = cover_path(covers_dir, book_id)
+    try:
+        src_mtime = os.path.getmtime(src)
+    except OSError:
+        return 0
+    targets = [
+        (w, fmt, thumb_path(covers_dir, book_id, w, fmt))
+        for w in sorted(widths, reverse=True)
+        for fmt in formats
+    ]
+    targets = [t for t in targets if force or _is_stale(t[2], src_mtime)]
+    if not targets:
+        return 0
+
+    with Image.open(src) as im:
+        # Let the JPEG decoder downscale by 1/2, 1/4 or 1/8 where it can
+        im.draft("RGB", (max(widths), max(widths) * 4))
+        has_alpha = im.mode in ("RGBA", "LA", "PA") or "transparency" in im.info
+        img = im.convert("RGBA" if has_alpha else "RGB")
+
+    written = 0
+    for width, fmt, path in targets:
+        if img.width > width:
+            height = max(round(img.height * width / img.width), 1)
+            thumb = img.resize((width, height), Image.LANCZOS)
+        else:
+            thumb = img
+        buf = io.BytesIO()
+        thumb.save(buf, format=fmt.upper(), quality=_QUALITY[fmt])
+        write_cover(path, buf.getvalue())
+        written += 1
+    return written
+
+
+class ThumbnailPool:
+    """Process pool rendering cover thumbnails off the event loop.
+
+    Parameters
+    ----------
+    covers_dir:
+        Directory holding ``{book_id}.jpg``; thumbnails go next to them.
+    widths, formats:
+        Thumbnail widths in pixels and output formats.
+    workers:
+        Worker processes.
+    """
+
+    def __init__(
+        self,
+        covers_dir: str,
+        widths: Sequence[int] = THUMB_WIDTHS,
+        formats: Sequence[str] = THUMB_FORMATS,
+        workers: int = DEFAULT_THUMB_WORKERS,
+    ):
+        self.covers_dir = covers_dir
+        self.widths = tuple(widths)
+        self.formats = tuple(formats)
+        # spawn: forking a process that runs an event loop and thread
+        # pools can copy held locks into the child
+        self._pool = ProcessPoolExecutor(
+            max_workers=max(workers, 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self.written = 0
+        self.failed = 0
+
+    async def render(self, book_id: int, force: bool = False) -> int:
+        """Render *book_id*'s thumbnails; returns files written (0 on error)."""
+        loop = asyncio.get_running_loop()
+        try:
+            n = await loop.run_in_executor(
+                self._pool,
+                render_thumbnails,
+                self.covers_dir,
+                book_id,
+                self.widths,
+                self.formats,
+                force,
+            )
+        except Exception:
+            self.failed += 1
+            return 0
+        self.written += n
+        return n
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> ThumbnailPool:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,194 @@
+"""Per-book phase tracing for ``ingest.py --trace``.
+
+Each timed phase of :func:`ingest.ingest_book` becomes one JSON line in
+the trace file, written through a :class:`~src.logsink.LogSink` so the
+event loop never waits on disk::
+
+    {"ts": 1735732800.12, "phase": "fetch", "source": "mtc", "book_id": 100358,
+     "dur": 0.412, "index": 17}
+
+Phases:
+
+    book          whole ingest_book call
+    metadata      source.fetch_book_metadata
+    bundle_index  bundle header / index read
+    toc           table-of-contents fetch and walk planning (TTV/TF)
+    db_lookup     chapter-index and book-row queries (inside the DB lock)
+    fetch         one chapter from the source walk (network + parse/decrypt)
+    decrypt       MTC chapter decryption (nested in ``fetch``)
+    compress      zstd compression + journal append of one chapter
+    db_commit     checkpoint chapter-row insert + commit
+    bundle_write  checkpoint bundle merge + atomic write
+    cover         cover download (background cover stage, outside ``book``)
+    thumbnail     WebP/AVIF thumbnail render of a saved cover (process pool)
+    db_meta       final book-row update
+
+Tracing is off until :func:`start_trace` is called; :func:`span` is then a
+shared no-op context manager.  :func:`summarize` and :func:`format_report`
+turn a trace file into the ``--profile-report`` table (count, p50, p95,
+total per phase and source).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import math
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .logsink import LogSink
+
+_NULL_SPAN = contextlib.nullcontext()
+
+_sink: LogSink | None = None
+
+
+def start_trace(path: str | Path) -> None:
+    """Start writing spans to *path* (appended; never rotated)."""
+    global _sink
+    stop_trace()
+    _sink = LogSink(path, fmt="json", max_bytes=0)
+
+
+def stop_trace() -> None:
+    """Flush and close the trace file, if any."""
+    global _sink
+    if _sink is not None:
+        _sink.close()
+        _sink = None
+
+
+def record(
+    phase: str,
+    source: str,
+    start: float,
+    book_id: int | None = None,
+    **fields: object,
+) -> None:
+    """Write one span that began at ``time.perf_counter()`` value *start*."""
+    if _sink is None:
+        return
+    dur = time.perf_counter() - start
+    rec: dict = {
+        "ts": round(time.time() - dur, 3),
+        "phase": phase,
+        "source": source,
+        "book_id": book_id,
+        "dur": round(dur, 6),
+    }
+    rec.update(fields)
+    _sink.write_record(rec)
+
+
+class _Span:
+    __slots__ = ("phase", "source", "book_id", "fields", "start")
+
+    def __init__(self, phase: str, source: str, book_id: int | None, fields: dict):
+        self.phase = phase
+        self.source = source
+        self.book_id = book_id
+        self.fields = fields
+
+    def __enter__(self) -> _Span:
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.fields["error"] = exc_type.__name__
+        record(self.phase, self.source, self.start, self.book_id, **self.fields)
+
+
+def span(phase: str, source: str, book_id: int | None = None, **fields: object):
+    """``with span("metadata", "mtc", book_id): ...`` — time the block.
+
+    Works around ``await`` too: the span measures wall time, including
+    time the task spends suspended.  A block that raises is recorded with
+    ``"error": "<ExceptionType>"``.
+    """
+    if _sink is None:
+        return _NULL_SPAN
+    return _Span(phase, source, book_id, fields)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Report
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+@dataclass
+class PhaseStats:
+    source: str
+    phase: str
+    count: int
+    total: float
+    p50: float
+    p95: float
+    max: float
+
+
+def load_trace(path: str | Path) -> list[dict]:
+    """Read span records from a trace file, skipping malformed lines."""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line of an interrupted run
+            if isinstance(rec, dict) and "phase" in rec and "dur" in rec:
+                records.append(rec)
+    return records
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list (0 for an empty list)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct * len(sorted_values) / 100), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(records: list[dict]) -> list[PhaseStats]:
+    """Aggregate spans per (source, phase); per source ``book`` first, then by total."""
+    groups: dict[tuple[str, str], list[float]] = {}
+    for rec in records:
+        key = (str(rec.get("source") or "?"), str(rec["phase"]))
+        groups.setdefault(key, []).append(float(rec["dur"]))
+    rows = []
+    for (source, phase), durs in groups.items():
+        durs.sort()
+        rows.append(
+            PhaseStats(
+                source=source,
+                phase=phase,
+                count=len(durs),
+                total=sum(durs),
+                p50=percentile(durs, 50),
+                p95=percentile(durs, 95),
+                max=durs[-1],
+            )
+        )
+    rows.sort(key=lambda r: (r.source, r.phase != "book", -r.total))
+    return rows
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:,.1f}"
+
+
+def format_report(rows: list[PhaseStats]) -> str:
+    """Plain-text table of :func:`summarize` output (times in ms, totals in s)."""
+    header = (
+        f"{'source':<7} {'phase':<13} {'count':>9} {'p50 ms':>10} "
+        f"{'p95 ms':>10} {'max ms':>11} {'total s':>11}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        lines.append(
+            f"{r.source:<7} {r.phase:<13} {r.count:>9,} {_ms(r.p50):>10} "
+            f"{_ms(r.p95):>10} {_ms(r.max):>11} {r.total:>11,.1f}"
+        )
+    return "\n".join(lines)
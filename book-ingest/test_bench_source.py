@@ -0,0 +1,83 @@
+"""
+Tests for the synthetic bench source (src/sources/bench.py).
+
+Run:
+    cd book-ingest
+    python -m pytest test_bench_source.py -v
+  or:
+    python test_bench_source.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import unittest
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.sources import VALID_SOURCES, create_source
+from src.sources.bench import BENCH_ID_OFFSET, generate_chapter, make_plan
+
+
+class TestGenerators(unittest.TestCase):
+    def test_chapters_are_deterministic(self):
+        a = generate_chapter(BENCH_ID_OFFSET + 1, 7, 1500)
+        b = generate_chapter(BENCH_ID_OFFSET + 1, 7, 1500)
+        c = generate_chapter(BENCH_ID_OFFSET + 1, 8, 1500)
+        self.assertEqual(a, b)
+        self.assertNotEqual(a.body, c.body)
+        self.assertTrue(a.title.startswith("Chương 7: "))
+        self.assertEqual(a.slug, "chuong-7")
+        self.assertTrue(a.body.startswith(a.title + "\n"))
+
+    def test_chapter_size_follows_mean(self):
+        counts = [
+            generate_chapter(BENCH_ID_OFFSET + 2, i, 2000).word_count
+            for i in range(1, 101)
+        ]
+        self.assertAlmostEqual(statistics.mean(counts), 2000, delta=250)
+        self.assertGreater(max(counts) - min(counts), 500)  # not all the same
+
+    def test_plan(self):
+        plan = make_plan(500, chapters=200, words=1000)
+        self.assertEqual(plan, make_plan(500, chapters=200, words=1000))
+        self.assertEqual(plan[0]["id"], BENCH_ID_OFFSET + 1)
+        self.assertEqual(len({e["id"] for e in plan}), 500)
+        chapters = [e["chapter_count"] for e in plan]
+        self.assertAlmostEqual(statistics.mean(chapters), 200, delta=40)
+        self.assertGreater(max(chapters), 3 * statistics.median(chapters))
+
+
+class TestBenchSource(unittest.TestCase):
+    def test_fetch_skips_existing(self):
+        self.assertIn("bench", VALID_SOURCES)
+        entry = make_plan(1, chapters=5, words=300)[0]
+        entry["chapter_count"] = 6
+
+        async def run():
+            async with create_source("bench", max_concurrent=2) as source:
+                meta = await source.fetch_book_metadata(entry)
+                self.assertIsNone(await source.fetch_chapter_list(meta))
+                chapters = [
+                    ch async for ch in source.fetch_chapters(meta, {2, 5}, "unused")
+                ]
+                self.assertIsNone(await source.download_cover(meta["id"], meta, "x"))
+                return meta, chapters, source.limiter.in_flight
+
+        meta, chapters, in_flight = asyncio.run(run())
+        self.assertEqual(meta["id"], entry["id"])
+        self.assertEqual([ch.index for ch in chapters], [1, 3, 4, 6])
+        self.assertEqual(chapters[0], generate_chapter(entry["id"], 1, entry["bench_words"]))
+        self.assertEqual(in_flight, 0)
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
@@ -0,0 +1,135 @@
+"""
+Tests for the dynamic book scheduler (src/scheduler.py).
+
+Run:
+    cd book-ingest
+    python -m pytest test_book_scheduler.py -v
+  or:
+    python test_book_scheduler.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import unittest
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.ratelimit import TrackedSemaphore
+from src.scheduler import BookScheduler
+
+
+class _FakeSource:
+    """Just enough of a BookSource for the scheduler: a request limiter."""
+
+    def __init__(self, limit: int | None):
+        self.limiter = TrackedSemaphore(limit) if limit else None
+
+
+def _serial_book(source: _FakeSource, requests: int, latency: float, log: list):
+    """A book that issues *requests* strictly one after another (MTC walk)."""
+
+    async def run_book(entry: dict) -> None:
+        for _ in range(requests):
+            async with source.limiter:
+                await asyncio.sleep(latency)
+        log.append(entry["id"])
+
+    return run_book
+
+
+class TestBookScheduler(unittest.TestCase):
+    def test_grows_past_floor_for_serial_books(self):
+        source = _FakeSource(limit=20)
+        done: list[int] = []
+        sched = BookScheduler(
+            source, _serial_book(source, 5, 0.01, done),
+            min_books=2, max_books=50, tick=0.001,
+        )
+        asyncio.run(sched.run([{"id": i} for i in range(60)]))
+        self.assertEqual(sorted(done), list(range(60)))
+        self.assertGreater(sched.peak_books, 2)
+        self.assertLessEqual(sched.peak_books, 21)  # stops once saturated
+
+    def test_max_books_is_a_hard_cap(self):
+        source = _FakeSource(limit=100)
+        done: list[int] = []
+        sched = BookScheduler(
+            source, _serial_book(source, 3, 0.01, done),
+            min_books=1, max_books=4, tick=0.001,
+        )
+        asyncio.run(sched.run([{"id": i} for i in range(20)]))
+        self.assertEqual(len(done), 20)
+        self.assertLessEqual(sched.peak_books, 4)
+
+    def test_no_limiter_means_fixed_pool(self):
+        source = _FakeSource(limit=None)
+        running = 0
+        peak = 0
+
+        async def run_book(entry: dict) -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.005)
+            running -= 1
+
+        sched = BookScheduler(source, run_book, min_books=3, max_books=10, tick=0.001)
+        asyncio.run(sched.run([{"id": i} for i in range(12)]))
+        self.assertEqual(peak, 3)
+
+    def test_empty_plan(self):
+        source = _FakeSource(limit=5)
+        sched = BookScheduler(source, _serial_book(source, 1, 0, []), min_books=2)
+        asyncio.run(sched.run([]))
+        self.assertEqual(sched.peak_books, 0)
+
+    def test_error_cancels_running_books(self):
+        source = _FakeSource(limit=5)
+        cancelled = []
+
+        async def run_book(entry: dict) -> None:
+            if entry["id"] == 0:
+                await asyncio.sleep(0.01)
+                raise RuntimeError("boom")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(entry["id"])
+                raise
+
+        sched = BookScheduler(source, run_book, min_books=3, tick=0.001)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(sched.run([{"id": i} for i in range(3)]))
+        self.assertEqual(sorted(cancelled), [1, 2])
+
+
+class TestTrackedSemaphore(unittest.TestCase):
+    def test_counts(self):
+        async def scenario():
+            sem = TrackedSemaphore(2)
+            gate = asyncio.Event()
+
+            async def hold():
+                async with sem:
+                    await gate.wait()
+
+            tasks = [asyncio.create_task(hold()) for _ in range(3)]
+            await asyncio.sleep(0)
+            counts = (sem.in_flight, sem.waiting)
+            gate.set()
+            await asyncio.gather(*tasks)
+            return counts, (sem.in_flight, sem.waiting)
+
+        self.assertEqual(asyncio.run(scenario()), ((2, 1), (0, 0)))
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
@@ -0,0 +1,143 @@
+"""
+Tests for the concurrent MTC catalog fetch (generate_plan.fetch_catalog_async).
+
+Run:
+    cd book-ingest
+    python -m pytest test_catalog_fetch.py -v
+  or:
+    python test_catalog_fetch.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import unittest
+
+import httpx
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from generate_plan import fetch_catalog_async
+
+
+class FakeCatalog:
+    """``/api/books`` with *books* entries, *limit* per page."""
+
+    def __init__(self, books: int, limit: int = 10):
+        self.ids = list(range(1000, 1000 + books))
+        self.limit = limit
+        self.fail: dict[int, list[int]] = {}  # page -> statuses to return first
+        self.calls: list[int] = []
+        self.active = 0
+        self.peak = 0
+
+    def page_count(self) -> int:
+        return max((len(self.ids) + self.limit - 1) // self.limit, 1)
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        self.calls.append(page)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(random.uniform(0, 0.01))  # finish out of order
+            statuses = self.fail.get(page)
+            if statuses:
+                status = statuses.pop(0)
+                return httpx.Response(status, headers={"Retry-After": "0"})
+            last = self.page_count()
+            chunk = self.ids[(page - 1) * self.limit : page * self.limit]
+            data = [
+                {"id": i, "name": f"Book {i}", "latest_index": 5, "first_chapter": 1}
+                for i in chunk
+            ]
+            return httpx.Response(
+                200,
+                json={
+                    "success": True,
+                    "data": data,
+                    "pagination": {
+                        "total": len(self.ids),
+                        "last": last,
+                        "next": page + 1 if page < last else None,
+                    },
+                },
+            )
+        finally:
+            self.active -= 1
+
+
+def _fetch(catalog: FakeCatalog, workers: int = 4) -> list[dict]:
+    return asyncio.run(
+        fetch_catalog_async(
+            limit=catalog.limit,
+            workers=workers,
+            delay=0,
+            log=lambda *a: None,
+            transport=httpx.MockTransport(catalog.handler),
+        )
+    )
+
+
+# ---------------------------------------------------------------------------
+# fetch_catalog_async
+# ---------------------------------------------------------------------------
+
+
+class TestFetchCatalog(unittest.TestCase):
+    def test_pages_reassembled_in_order(self):
+        catalog = FakeCatalog(books=95)
+        books = _fetch(catalog, workers=4)
+        self.assertEqual([b["id"] for b in books], catalog.ids)
+        self.assertEqual(sorted(catalog.calls), list(range(1, 11)))
+        self.assertEqual(catalog.calls[0], 1)  # page 1 first, for the total
+        self.assertLessEqual(catalog.peak, 4)
+        self.assertGreater(catalog.peak, 1)
+
+    def test_transient_errors_are_retried(self):
+        catalog = FakeCatalog(books=50)
+        catalog.fail = {3: [503, 429]}  # Retry-After: 0
+        books = _fetch(catalog)
+        self.assertEqual(len(books), 50)
+        self.assertEqual(catalog.calls.count(3), 3)
+
+    def test_failed_page_is_skipped(self):
+        catalog = FakeCatalog(books=50)
+        catalog.fail = {2: [404]}
+        books = _fetch(catalog)
+        self.assertEqual(len(books), 40)
+        self.assertNotIn(1010, {b["id"] for b in books})
+
+    def test_duplicates_from_shifting_pages_are_dropped(self):
+        catalog = FakeCatalog(books=30)
+        catalog.ids[15] = catalog.ids[5]  # a book shows up on two pages
+        books = _fetch(catalog)
+        self.assertEqual(len(books), 29)
+        self.assertEqual(len({b["id"] for b in books}), 29)
+
+    def test_catalog_growth_is_followed(self):
+        catalog = FakeCatalog(books=30)
+        real_handler = catalog.handler
+
+        async def growing(request: httpx.Request) -> httpx.Response:
+            # New books appear after page 1 has reported last=3
+            if int(request.url.params["page"]) != 1 and len(catalog.ids) == 30:
+                catalog.ids.extend(range(2000, 2015))
+            return await real_handler(request)
+
+        catalog.handler = growing
+        books = _fetch(catalog)
+        self.assertEqual(len(books), 45)
+        self.assertEqual(max(catalog.calls), 5)
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
@@ -0,0 +1,260 @@
+"""
+Tests for the per-book chapter journal (src/journal.py) and its replay
+into bundles + DB rows (ingest.replay_journal), one source at a time.
+
+Run:
+    cd book-ingest
+    python -m pytest test_chapter_journal.py -v
+  or:
+    python test_chapter_journal.py
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+import ingest
+from src.bundle import ChapterMeta, read_bundle_meta, read_bundle_raw, write_bundle
+from src.journal import (
+    ChapterJournal,
+    JournalDirLock,
+    JournalError,
+    journal_path,
+    list_journals,
+    read_journal,
+)
+
+BOOK_ID = 30000042
+
+
+def _append(journal: ChapterJournal, idx: int) -> None:
+    journal.append(
+        idx, f"zstd-{idx}".encode() * 3, 100 + idx, f"Chương {idx}: Thử",
+        f"chuong-{idx}", 10 * idx, 9000 + idx,
+    )
+
+
+class _TmpDirMixin:
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+
+# ---------------------------------------------------------------------------
+# Journal file format
+# ---------------------------------------------------------------------------
+
+
+class TestJournalFile(_TmpDirMixin, unittest.TestCase):
+    def test_roundtrip(self):
+        path = journal_path(self.tmp, BOOK_ID)
+        j = ChapterJournal(path, BOOK_ID, sync_every=2)
+        for i in (1, 2, 3):
+            _append(j, i)
+        j.close()
+
+        book_id, entries = read_journal(path)
+        self.assertEqual(book_id, BOOK_ID)
+        self.assertEqual(sorted(entries), [1, 2, 3])
+        e = entries[2]
+        self.assertEqual(e.compressed, b"zstd-2" * 3)
+        self.assertEqual(e.raw_len, 102)
+        self.assertEqual(e.title, "Chương 2: Thử")
+        self.assertEqual(e.slug, "chuong-2")
+        self.assertEqual((e.word_count, e.chapter_id), (20, 9002))
+
+    def test_torn_tail_is_ignored(self):
+        path = journal_path(self.tmp, BOOK_ID)
+        j = ChapterJournal(path, BOOK_ID)
+        for i in (1, 2):
+            _append(j, i)
+        j.close()
+        data = path.read_bytes()
+        for cut in range(1, 20):
+            path.write_bytes(data[:-cut])
+            with self.subTest(cut=cut):
+                _, entries = read_journal(path)
+                self.assertEqual(sorted(entries), [1])
+
+    def test_corrupt_record_stops_reading(self):
+        path = journal_path(self.tmp, BOOK_ID)
+        j = ChapterJournal(path, BOOK_ID)
+        _append(j, 1)
+        size_after_first = path.stat().st_size
+        _append(j, 2)
+        _append(j, 3)
+        j.close()
+        data = bytearray(path.read_bytes())
+        data[size_after_first + 40] ^= 0xFF  # flip a byte inside record 2
+        path.write_bytes(bytes(data))
+        _, entries = read_journal(path)
+        self.assertEqual(sorted(entries), [1])
+
+    def test_reset_and_remove(self):
+        path = journal_path(self.tmp, BOOK_ID)
+        j = ChapterJournal(path, BOOK_ID)
+        _append(j, 1)
+        j.reset()
+        _append(j, 2)
+        self.assertEqual(sorted(read_journal(path)[1]), [2])
+        j.remove()
+        self.assertFalse(path.exists())
+        self.assertEqual(list_journals(self.tmp), [])
+
+    def test_bad_header(self):
+        path = self.tmp / "1.journal"
+        path.write_bytes(b"BJ")
+        with self.assertRaises(JournalError):
+            read_journal(path)
+        path.write_bytes(b"XXXX" + bytes(8))
+        with self.assertRaises(JournalError):
+            read_journal(path)
+
+
+# ---------------------------------------------------------------------------
+# Replay into bundle + DB
+# ---------------------------------------------------------------------------
+
+
+class TestJournalReplay(_TmpDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.db_path = str(self.tmp / "test.db")
+        db = sqlite3.connect(self.db_path)
+        db.executescript(
+            """
+            CREATE TABLE books (id INTEGER PRIMARY KEY, chapters_saved INTEGER);
+            CREATE TABLE chapters (
+                book_id INTEGER REFERENCES books(id) ON DELETE CASCADE,
+                index_num INTEGER, title TEXT, slug TEXT,
+                word_count INTEGER, chapter_id INTEGER,
+                PRIMARY KEY (book_id, index_num)
+            );
+            """
+        )
+        db.execute("INSERT INTO books VALUES (?, 0)", (BOOK_ID,))
+        db.commit()
+        db.close()
+        self.bundles = self.tmp / "compressed"
+        self.journals = self.tmp / "journal"
+        patcher = mock.patch.multiple(
+            ingest,
+            COMPRESSED_DIR=self.bundles,
+            JOURNAL_DIR=self.journals,
+            log_detail=lambda msg: None,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _bundle_path(self) -> str:
+        return str(self.bundles / f"{BOOK_ID}.bundle")
+
+    def test_replay_merges_into_existing_bundle(self):
+        write_bundle(
+            self._bundle_path(),
+            {1: (b"old-1", 50), 2: (b"old-2", 60)},
+            {1: ChapterMeta(1, 5, "Cũ 1", "chuong-1"), 2: ChapterMeta(2, 6, "Cũ 2", "chuong-2")},
+        )
+        j = ChapterJournal(journal_path(ingest.journal_dir("tf"), BOOK_ID), BOOK_ID)
+        for i in (2, 3):
+            _append(j, i)
+        j.close()  # process "dies" before the checkpoint
+
+        books, chapters = ingest.replay_journals(self.db_path, "tf")
+        self.assertEqual((books, chapters), (1, 2))
+        self.assertEqual(list_journals(ingest.journal_dir("tf")), [])
+
+        raw = read_bundle_raw(self._bundle_path())
+        self.assertEqual(sorted(raw), [1, 2, 3])
+        self.assertEqual(raw[1], (b"old-1", 50))
+        self.assertEqual(raw[2], (b"zstd-2" * 3, 102))
+        self.assertEqual(read_bundle_meta(self._bundle_path())[3].title, "Chương 3: Thử")
+
+        db = sqlite3.connect(self.db_path)
+        rows = db.execute(
+            "SELECT index_num, slug, chapter_id FROM chapters ORDER BY index_num"
+        ).fetchall()
+        saved = db.execute("SELECT chapters_saved FROM books").fetchone()[0]
+        db.close()
+        self.assertEqual(rows, [(2, "chuong-2", 9002), (3, "chuong-3", 9003)])
+        self.assertEqual(saved, 3)
+
+    def test_replay_without_book_row_writes_bundle_only(self):
+        other = BOOK_ID + 1
+        j = ChapterJournal(journal_path(ingest.journal_dir("tf"), other), other)
+        _append(j, 7)
+        j.close()
+        self.assertEqual(ingest.replay_journals(self.db_path, "tf"), (1, 1))
+        self.assertEqual(
+            sorted(read_bundle_raw(str(self.bundles / f"{other}.bundle"))), [7]
+        )
+
+    def test_empty_and_broken_journals_are_discarded(self):
+        tf_dir = ingest.journal_dir("tf")
+        tf_dir.mkdir(parents=True)
+        (tf_dir / "1.journal").write_bytes(b"")
+        ChapterJournal(journal_path(tf_dir, BOOK_ID), BOOK_ID).close()
+        self.assertEqual(ingest.replay_journals(self.db_path, "tf"), (0, 0))
+        self.assertEqual(list_journals(tf_dir), [])
+        self.assertFalse(Path(self._bundle_path()).exists())
+
+    def test_replays_only_its_own_source(self):
+        # A live TTV run's journal, and pre-split journals of two sources
+        ttv_book, mtc_book, tf_legacy = 10000005, 100358, BOOK_ID + 2
+        for jdir, book_id in (
+            (ingest.journal_dir("ttv"), ttv_book),
+            (self.journals, mtc_book),
+            (self.journals, tf_legacy),
+        ):
+            j = ChapterJournal(journal_path(jdir, book_id), book_id)
+            _append(j, 1)
+            j.close()
+
+        self.assertEqual(ingest.replay_journals(self.db_path, "tf"), (1, 1))
+        self.assertTrue((self.bundles / f"{tf_legacy}.bundle").exists())
+        self.assertEqual(
+            [p.stem for p in list_journals(self.journals)], [str(mtc_book)]
+        )
+        self.assertEqual(
+            [p.stem for p in list_journals(ingest.journal_dir("ttv"))], [str(ttv_book)]
+        )
+        self.assertFalse((self.bundles / f"{ttv_book}.bundle").exists())
+        self.assertFalse((self.bundles / f"{mtc_book}.bundle").exists())
+
+        self.assertEqual(ingest.replay_journals(self.db_path, "mtc"), (1, 1))
+        self.assertEqual(list_journals(self.journals), [])
+
+    def test_journal_dir_lock_is_exclusive(self):
+        first = JournalDirLock(ingest.journal_dir("ttv"))
+        second = JournalDirLock(ingest.journal_dir("ttv"))
+        other = JournalDirLock(ingest.journal_dir("tf"))
+        self.assertTrue(first.acquire())
+        self.assertFalse(second.acquire())
+        self.assertTrue(other.acquire())
+        first.release()
+        self.assertTrue(second.acquire())
+        self.assertTrue(second.held)
+        # The lock file is not mistaken for a journal
+        self.assertEqual(list_journals(ingest.journal_dir("ttv")), [])
+        second.release()
+        other.release()
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
@@ -0,0 +1,240 @@
+"""
+Differential tests for the TTV / TF chapter parsers.
+
+``parse_chapter`` in both sources has an lxml fast path and a BeautifulSoup
+reference path.  For every page in the corpus below — hand-written pages
+modelled on real markup plus randomly generated ones — the two paths must
+produce identical ``(title, body)`` output (or the fast path must decline
+with ``None`` and leave the page to BeautifulSoup).
+
+Run:
+    cd book-ingest
+    python -m pytest test_chapter_parsers.py -v
+  or:
+    python test_chapter_parsers.py
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import unittest
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.sources import tf, ttv
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+TF_PAGE = """<!DOCTYPE html>
+<html lang="vi"><head><meta charset="utf-8"><title>Chương 1</title>
+<style>.chapter-c { font-size: 20px }</style></head>
+<body>
+<div id="wrap"><div class="container chapter">
+  <a class="truyen-title" href="/than-dao-dan-ton/">Thần Đạo Đan Tôn</a>
+  <h2><a class="chapter-title" href="/than-dao-dan-ton/chuong-1/">Chương 1:&nbsp;Sống lại</a></h2>
+  <div id="chapter-c" class="chapter-c">
+    Lăng Hàn tỉnh lại.<br><br>
+    &ldquo;Đây là đâu?&rdquo; hắn hỏi.<br/>
+    <div class="ads-responsive incontent-ad" id="ads-chapter-pc-top">
+      <ins class="adsbygoogle">QC-INS</ins><script>(adsbygoogle = []).push({});</script>
+    </div>
+    <p>Đoạn <i>hai</i> &amp; <b>ba</b>.</p><!-- comment -->sau bình luận
+    <div class="ads-holder">ad text</div>tail sau quảng cáo
+    <script>var x = "<b>not text</b>";</script>
+  </div>
+</div></div>
+</body></html>"""
+
+TF_CLASS_ONLY = """<html><body><h2>Chương 7: Lớp</h2>
+<div class="box chapter-c\tother">Dòng một<br>Dòng hai</div></body></html>"""
+
+TF_THROTTLE = """<html><body><h1>Bạn đọc quá nhanh</h1>
+<div class="captcha">Vui lòng thử lại</div></body></html>"""
+
+TF_EMPTY_BODY = """<html><body><h2>Chương 3</h2><div id="chapter-c">
+  <div class="ads-holder">only ads</div>   </div></body></html>"""
+
+TF_STRANGE = """<html><body><h2>Chương <span>9</span> <!-- x -->: Lạ</h2>
+<div id="chapter-c">Một<template><p>ẩn</p>hidden</template>Hai
+<ruby>漢<rp>(</rp><rt>hán</rt><rp>)</rp></ruby> Ba
+<style>p { color: red }</style>Bốn<noscript>Năm</noscript></div>
+<div id="chapter-c">thứ hai</div></body></html>"""
+
+TF_NO_H2 = """<html><body><div id="chapter-c">body without title</div></body></html>"""
+
+TTV_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"></head><body>
+<div class="chapter">
+  <h2>Chương 1 : Kim Biên hoa</h2>
+  <div class="box-chap box-chap-123456">
+    <h5>Chương 1 : Kim Biên hoa</h5>
+    Chương 1: Kim Biên hoa
+
+Đoạn đầu tiên của chương.
+    Đoạn thứ hai&hellip;
+  </div>
+  <div class="box-chap box-chap-123457 hidden">
+    <h5 class="title">Lặp lại</h5>Phần sau.<script>track();</script>Kết.
+  </div>
+</div>
+</body></html>"""
+
+TTV_PREFIX = """<html><body><h2>Chương 12: Mở đầu</h2>
+<div class="box-chap">Chương 12 :Mở đầu  Nội dung ngay sau tiêu đề
+dòng tiếp</div></body></html>"""
+
+TTV_NESTED = """<html><body><h2>Chương 5</h2>
+<div class="box-chap">ngoài<div class="box-chap">trong<h5>h</h5>đuôi</div>hết</div>
+</body></html>"""
+
+TTV_NO_BOX = """<html><body><h2>Chương 5</h2><div class="content">x</div></body></html>"""
+
+TTV_EMPTY = """<html><body><h2>Chương 5</h2><div class="box-chap"><h5>x</h5>  </div></body></html>"""
+
+TTV_NOT_HTML = ""
+
+TTV_XML_DECL = """<?xml version="1.0" encoding="utf-8"?>
+<html><body><h2>Chương 2</h2><div class="box-chap">xml declared</div></body></html>"""
+
+TF_CORPUS = {
+    "full_page": TF_PAGE,
+    "class_only": TF_CLASS_ONLY,
+    "throttle": TF_THROTTLE,
+    "empty_body": TF_EMPTY_BODY,
+    "strange_markup": TF_STRANGE,
+    "no_h2": TF_NO_H2,
+    "empty": TTV_NOT_HTML,
+    "xml_decl": TTV_XML_DECL.replace("box-chap", "chapter-c"),
+}
+
+TTV_CORPUS = {
+    "full_page": TTV_PAGE,
+    "title_prefix": TTV_PREFIX,
+    "nested_boxes": TTV_NESTED,
+    "no_box": TTV_NO_BOX,
+    "empty_box": TTV_EMPTY,
+    "empty": TTV_NOT_HTML,
+    "xml_decl": TTV_XML_DECL,
+    "strange_markup": TF_STRANGE.replace('id="chapter-c"', 'class="box-chap"'),
+}
+
+# Pages a real site serves in normal operation; the fast path must take them.
+FAST_PATH_EXPECTED = {
+    "tf": ["full_page", "class_only", "strange_markup"],
+    "ttv": ["full_page", "title_prefix", "strange_markup"],
+}
+
+
+_TAGS = ["p", "div", "span", "b", "i", "br", "h5", "ins", "script", "style",
+         "template", "rt", "em", "a", "ul", "li", "pre"]
+_CLASSES = ["", "ads-holder", "ads-responsive", "box-chap", "chapter-c", "x"]
+_WORDS = ["Chương", "một", "hai", "&nbsp;", "&amp;", "\n", "  ", "Lăng", "Hàn",
+          "<!-- c -->", "\t", "ba."]
+
+
+def _random_fragment(rng: random.Random, depth: int) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 4)):
+        if depth > 0 and rng.random() < 0.5:
+            tag = rng.choice(_TAGS)
+            cls = rng.choice(_CLASSES)
+            attr = f' class="{cls}"' if cls else ""
+            if tag == "br":
+                parts.append("<br>")
+            else:
+                inner = _random_fragment(rng, depth - 1)
+                parts.append(f"<{tag}{attr}>{inner}</{tag}>")
+        else:
+            parts.append(" ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 4))))
+    return "".join(parts)
+
+
+def _random_page(rng: random.Random, container: str) -> str:
+    title = _random_fragment(rng, 1)
+    blocks = "".join(
+        f"<div {container}>{_random_fragment(rng, 3)}</div>"
+        + _random_fragment(rng, 1)
+        for _ in range(rng.randint(1, 3))
+    )
+    return f"<html><body><h2>{title}</h2>{blocks}</body></html>"
+
+
+def _random_corpus(container: str, n: int = 300) -> dict[str, str]:
+    rng = random.Random(20240601)
+    return {f"random_{i}": _random_page(rng, container) for i in range(n)}
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+class _DifferentialMixin:
+    module = None
+    corpus: dict[str, str] = {}
+    source = ""
+
+    def _check(self, name: str, html: str) -> None:
+        fast = self.module._extract_chapter_lxml(html)
+        ref = self.module._extract_chapter_bs4(html)
+        if fast is not None:
+            self.assertEqual(fast, ref, f"{self.source}/{name}: fast != bs4")
+        # Whatever path is taken, parse_chapter must match a pure-BS4 run
+        self.assertEqual(
+            self.module.parse_chapter(html) is None, ref is None, f"{name}"
+        )
+
+    def test_corpus_matches_reference(self):
+        for name, html in self.corpus.items():
+            with self.subTest(page=name):
+                self._check(name, html)
+
+    def test_fast_path_taken_for_normal_pages(self):
+        for name in FAST_PATH_EXPECTED[self.source]:
+            with self.subTest(page=name):
+                self.assertIsNotNone(
+                    self.module._extract_chapter_lxml(self.corpus[name])
+                )
+
+
+class TestTFParserDifferential(_DifferentialMixin, unittest.TestCase):
+    module = tf
+    source = "tf"
+    corpus = {**TF_CORPUS, **_random_corpus('id="chapter-c"')}
+
+    def test_ads_and_scripts_removed(self):
+        parsed = tf.parse_chapter(TF_PAGE)
+        self.assertEqual(parsed["title"], "Chương 1: Sống lại")
+        self.assertNotIn("QC-INS", parsed["body"])
+        self.assertNotIn("ad text", parsed["body"])
+        self.assertNotIn("adsbygoogle", parsed["body"])
+        self.assertIn("tail sau quảng cáo", parsed["body"])
+        self.assertIn("sau bình luận", parsed["body"])
+
+
+class TestTTVParserDifferential(_DifferentialMixin, unittest.TestCase):
+    module = ttv
+    source = "ttv"
+    corpus = {**TTV_CORPUS, **_random_corpus('class="box-chap"')}
+
+    def test_title_dedup_after_fast_path(self):
+        parsed = ttv.parse_chapter(TTV_PAGE)
+        self.assertEqual(parsed["title"], "Chương 1 : Kim Biên hoa")
+        self.assertTrue(parsed["body"].startswith("Đoạn đầu tiên"))
+        self.assertNotIn("Lặp lại", parsed["body"])
+
+        parsed = ttv.parse_chapter(TTV_PREFIX)
+        self.assertTrue(parsed["body"].startswith("Nội dung ngay sau tiêu đề"))
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
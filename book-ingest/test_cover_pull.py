@@ -0,0 +1,178 @@
+"""
+Tests for the standalone cover puller (src/cover.py pull_covers and the
+generate_plan.py poster helpers).
+
+Run:
+    cd book-ingest
+    python -m pytest test_cover_pull.py -v
+  or:
+    python test_cover_pull.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from generate_plan import fetch_poster_async, load_plan_posters
+from src.cover import pull_covers
+from src.ratelimit import HostLimiter
+
+IMAGE = b"\xff\xd8\xff" + b"x" * 500
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+# ---------------------------------------------------------------------------
+# pull_covers
+# ---------------------------------------------------------------------------
+
+
+class TestPullCovers(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.covers_dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_plan_posters_skip_resolve(self):
+        resolved: list[int] = []
+        done: list[tuple[int, bool]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if "missing" in request.url.path:
+                return httpx.Response(404)
+            return httpx.Response(200, content=IMAGE)
+
+        async def resolve(book_id: int):
+            resolved.append(book_id)
+            return f"https://img.example/api-{book_id}.jpg"
+
+        jobs = [
+            (1, {"default": "https://img.example/1.jpg"}),
+            (2, "https://img.example/2.jpg"),
+            (3, None),  # no poster in the plan
+            (4, "https://img.example/missing.jpg"),
+        ]
+
+        async def run():
+            async with _client(handler) as client:
+                return await pull_covers(
+                    client, jobs, self.covers_dir, workers=3,
+                    resolve=resolve, on_done=lambda b, ok: done.append((b, ok)),
+                )
+
+        self.assertEqual(asyncio.run(run()), (3, 1))
+        self.assertEqual(resolved, [3])
+        self.assertEqual(sorted(done), [(1, True), (2, True), (3, True), (4, False)])
+        self.assertEqual(sorted(os.listdir(self.covers_dir)), ["1.jpg", "2.jpg", "3.jpg"])
+
+    def test_concurrency_is_bounded(self):
+        active = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200, content=IMAGE)
+
+        jobs = [(i, f"https://img{i % 2}.example/{i}.jpg") for i in range(1, 21)]
+
+        async def run(workers, hosts):
+            async with _client(handler) as client:
+                return await pull_covers(
+                    client, jobs, self.covers_dir, workers=workers,
+                    hosts=hosts, overwrite=True,
+                )
+
+        self.assertEqual(asyncio.run(run(5, None)), (20, 0))
+        self.assertEqual(peak, 5)
+        peak = 0
+        self.assertEqual(asyncio.run(run(8, HostLimiter(1))), (20, 0))
+        self.assertEqual(peak, 2)  # one per host, two hosts
+
+    def test_existing_covers_kept_unless_overwrite(self):
+        with open(os.path.join(self.covers_dir, "1.jpg"), "wb") as f:
+            f.write(b"old")
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request.url.path)
+            return httpx.Response(200, content=IMAGE)
+
+        async def run(overwrite):
+            async with _client(handler) as client:
+                return await pull_covers(
+                    client, [(1, "https://img.example/1.jpg")], self.covers_dir,
+                    overwrite=overwrite,
+                )
+
+        self.assertEqual(asyncio.run(run(False)), (1, 0))
+        self.assertEqual(requests, [])
+        self.assertEqual(asyncio.run(run(True)), (1, 0))
+        with open(os.path.join(self.covers_dir, "1.jpg"), "rb") as f:
+            self.assertEqual(f.read(), IMAGE)
+
+
+# ---------------------------------------------------------------------------
+# generate_plan helpers
+# ---------------------------------------------------------------------------
+
+
+class TestPosterHelpers(unittest.TestCase):
+    def test_load_plan_posters(self):
+        entries = [
+            {"id": 1, "poster": {"default": "https://img.example/1.jpg"}},
+            {"id": 2, "poster": None},
+            {"id": 3},
+        ]
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "plan.json"
+            path.write_text(json.dumps(entries), encoding="utf-8")
+            self.assertEqual(
+                load_plan_posters(path), {1: {"default": "https://img.example/1.jpg"}}
+            )
+            self.assertEqual(load_plan_posters(Path(d) / "none.json"), {})
+
+    def test_fetch_poster_async(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/7"):
+                book = {"book": {"id": 7, "poster": {"default": "https://img.example/7.jpg"}}}
+                return httpx.Response(200, json={"success": True, "data": book})
+            return httpx.Response(404)
+
+        async def run():
+            async with _client(handler) as client:
+                return [
+                    await fetch_poster_async(client, 7),
+                    await fetch_poster_async(client, 8),
+                ]
+
+        poster, missing = asyncio.run(run())
+        self.assertEqual(poster["default"], "https://img.example/7.jpg")
+        self.assertIsNone(missing)
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
@@ -0,0 +1,246 @@
+"""
+Tests for the background cover stage and per-host limiter
+(src/cover.py, src/ratelimit.py).
+
+Run:
+    cd book-ingest
+    python -m pytest test_cover_stage.py -v
+  or:
+    python test_cover_stage.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+import httpx
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.cover import CoverStage, download_cover
+from src.ratelimit import HostLimiter
+
+IMAGE = b"\xff\xd8\xff" + b"x" * 500
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class _FakeSource:
+    name = "test"
+
+    def __init__(self, client: httpx.AsyncClient, delay: float = 0.0):
+        self.client = client
+        self.delay = delay
+        self.hosts_seen: list[HostLimiter | None] = []
+
+    async def download_cover(self, book_id, meta, covers_dir, hosts=None):
+        self.hosts_seen.append(hosts)
+        await asyncio.sleep(self.delay)
+        return await download_cover(
+            self.client, book_id, meta.get("cover_url"), covers_dir, hosts
+        )
+
+
+# ---------------------------------------------------------------------------
+# HostLimiter
+# ---------------------------------------------------------------------------
+
+
+class TestHostLimiter(unittest.TestCase):
+    def test_caps_each_host_separately(self):
+        hosts = HostLimiter(2)
+        peak: dict[str, int] = {}
+        active: dict[str, int] = {}
+
+        async def hit(url: str, host: str) -> None:
+            async with hosts.slot(url):
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+                await asyncio.sleep(0.01)
+                active[host] -= 1
+
+        async def run():
+            await asyncio.gather(
+                *(hit(f"https://a.example/{i}.jpg", "a") for i in range(6)),
+                *(hit(f"https://B.example/{i}.jpg", "b") for i in range(6)),
+            )
+
+        asyncio.run(run())
+        self.assertEqual(peak, {"a": 2, "b": 2})
+        self.assertIs(hosts.limiter("https://b.example/x"), hosts.limiter("http://B.EXAMPLE/y"))
+
+
+# ---------------------------------------------------------------------------
+# download_cover
+# ---------------------------------------------------------------------------
+
+
+class TestDownloadCover(unittest.TestCase):
+    def test_falls_back_through_poster_sizes(self):
+        requested = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.path)
+            if request.url.path == "/600.jpg":
+                return httpx.Response(200, content=IMAGE)
+            return httpx.Response(404)
+
+        poster = {"default": "https://img.example/default.jpg", "600": "https://img.example/600.jpg"}
+
+        async def run(covers_dir):
+            async with _client(handler) as client:
+                return await download_cover(client, 7, poster, covers_dir, HostLimiter(1))
+
+        with tempfile.TemporaryDirectory() as d:
+            self.assertEqual(asyncio.run(run(d)), "/covers/7.jpg")
+            self.assertEqual(requested, ["/default.jpg", "/600.jpg"])
+            with open(os.path.join(d, "7.jpg"), "rb") as f:
+                self.assertEqual(f.read(), IMAGE)
+            self.assertEqual(os.listdir(d), ["7.jpg"])  # no temp files left
+
+    def test_tiny_or_failed_responses_are_rejected(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/tiny.jpg":
+                return httpx.Response(200, content=b"x")
+            raise httpx.ConnectError("down", request=request)
+
+        async def run(covers_dir):
+            async with _client(handler) as client:
+                return [
+                    await download_cover(client, 1, "https://img.example/tiny.jpg", covers_dir),
+                    await download_cover(client, 2, "https://img.example/down.jpg", covers_dir),
+                ]
+
+        with tempfile.TemporaryDirectory() as d:
+            self.assertEqual(asyncio.run(run(d)), [None, None])
+            self.assertEqual(os.listdir(d), [])
+
+
+# ---------------------------------------------------------------------------
+# CoverStage
+# ---------------------------------------------------------------------------
+
+
+class TestCoverStage(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.covers_dir = os.path.join(self._tmp.name, "covers")
+        self.db_path = os.path.join(self._tmp.name, "books.db")
+        db = sqlite3.connect(self.db_path)
+        db.execute("CREATE TABLE books (id INTEGER PRIMARY KEY, cover_url TEXT)")
+        db.executemany("INSERT INTO books (id) VALUES (?)", [(i,) for i in range(1, 21)])
+        db.commit()
+        db.close()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _cover_urls(self) -> dict[int, str | None]:
+        db = sqlite3.connect(self.db_path)
+        try:
+            return dict(db.execute("SELECT id, cover_url FROM books"))
+        finally:
+            db.close()
+
+    def test_downloads_in_background_and_batches_db_updates(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if "missing" in request.url.path:
+                return httpx.Response(404)
+            return httpx.Response(200, content=IMAGE)
+
+        async def run():
+            async with _client(handler) as client:
+                source = _FakeSource(client, delay=0.01)
+                stage = CoverStage(
+                    source, self.covers_dir, self.db_path, asyncio.Lock(),
+                    workers=4, per_host=2, batch_size=100,
+                )
+                for book_id in range(1, 21):
+                    name = "missing" if book_id % 5 == 0 else str(book_id)
+                    stage.submit(book_id, {"cover_url": f"https://img.example/{name}.jpg"})
+                stage.submit(1, {"cover_url": "https://img.example/1.jpg"})  # dup
+                queued = len(stage)
+                await stage.close()
+                return stage, source, queued
+
+        stage, source, queued = asyncio.run(run())
+        self.assertEqual(queued, 20)
+        self.assertEqual((stage.saved, stage.failed), (16, 4))
+        self.assertEqual(len(source.hosts_seen), 20)
+        self.assertTrue(all(h is stage.hosts for h in source.hosts_seen))
+        urls = self._cover_urls()
+        self.assertEqual(urls[1], "/covers/1.jpg")
+        self.assertIsNone(urls[5])
+        self.assertEqual(sum(u is not None for u in urls.values()), 16)
+        self.assertEqual(len(os.listdir(self.covers_dir)), 16)
+
+    def test_close_without_wait_keeps_finished_covers(self):
+        async def run():
+            gate = asyncio.Event()
+
+            async def handler(request: httpx.Request) -> httpx.Response:
+                if request.url.path != "/1.jpg":
+                    await gate.wait()  # never set: these stay in flight
+                return httpx.Response(200, content=IMAGE)
+
+            async with _client(handler) as client:
+                stage = CoverStage(
+                    _FakeSource(client), self.covers_dir, self.db_path,
+                    asyncio.Lock(), workers=3, batch_size=100,
+                )
+                for book_id in (1, 2, 3):
+                    stage.submit(book_id, {"cover_url": f"https://img.example/{book_id}.jpg"})
+                while stage.saved < 1:
+                    await asyncio.sleep(0.005)
+                await stage.close(wait=False)
+                await stage.close()  # second close is a no-op
+
+        asyncio.run(run())
+        urls = self._cover_urls()
+        self.assertEqual(urls[1], "/covers/1.jpg")
+        self.assertIsNone(urls[2])
+
+    def test_failed_db_write_keeps_workers_and_batch(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=IMAGE)
+
+        async def run():
+            async with _client(handler) as client:
+                # A directory cannot be opened as a database
+                stage = CoverStage(
+                    _FakeSource(client), self.covers_dir, self._tmp.name,
+                    asyncio.Lock(), workers=2, batch_size=1, flush_interval=0.01,
+                )
+                for book_id in range(1, 6):
+                    stage.submit(book_id, {"cover_url": f"https://img.example/{book_id}.jpg"})
+                with self.assertLogs("book-ingest.cover", "WARNING"):
+                    await asyncio.wait_for(stage.close(), timeout=10)
+                pending = sorted(book_id for book_id, _ in stage._pending)
+                # The DB is back: the retained batch is written
+                stage.db_path = self.db_path
+                self.assertTrue(await stage.flush())
+                return stage, pending
+
+        stage, pending = asyncio.run(run())
+        self.assertEqual(stage.saved, 5)
+        self.assertEqual(pending, [1, 2, 3, 4, 5])
+        urls = self._cover_urls()
+        for book_id in range(1, 6):
+            self.assertEqual(urls[book_id], f"/covers/{book_id}.jpg")
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
@@ -0,0 +1,179 @@
+"""
+Tests for cross-source duplicate detection (src/dedup.py) and the
+generate_plan.py fingerprint pass.
+
+Run:
+    cd book-ingest
+    python -m pytest test_dedup.py -v
+  or:
+    python test_dedup.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import httpx
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+import ingest
+from generate_plan import fingerprint_duplicates
+from src.dedup import DedupIndex, FingerprintStore, content_fingerprint
+
+CHAPTER = "Chương 1: Khởi đầu.\n\n" + "Lâm Động ngẩng đầu nhìn trời, gió lạnh thổi qua. " * 20
+
+
+def _parse_chapter(html: str) -> dict:
+    # Module-level so the fingerprint process pool can pickle it
+    return {"title": "", "body": html}
+
+
+def _binslib_db(path: Path) -> None:
+    conn = sqlite3.connect(str(path))
+    conn.executescript(
+        """
+        CREATE TABLE authors (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+        CREATE TABLE books (
+            id INTEGER PRIMARY KEY, name TEXT NOT NULL, slug TEXT NOT NULL,
+            status INTEGER NOT NULL DEFAULT 1, source TEXT NOT NULL DEFAULT 'mtc',
+            author_id INTEGER);
+        INSERT INTO authors VALUES (1, 'Thiên Tằm Thổ Đậu');
+        INSERT INTO books VALUES (100, 'Vũ Động Càn Khôn', 'vu-dong-can-khon', 2, 'mtc', 1);
+        INSERT INTO books VALUES (101, 'Đấu Phá  Thương Khung', 'dau-pha', 1, 'mtc', NULL);
+        INSERT INTO books VALUES (10000001, 'Tiên Nghịch', 'tien-nghich', 2, 'ttv', NULL);
+        """
+    )
+    conn.commit()
+    conn.close()
+
+
+# ---------------------------------------------------------------------------
+# DedupIndex
+# ---------------------------------------------------------------------------
+
+
+class TestDedupIndex(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        _binslib_db(self.dir / "binslib.db")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_slug_and_name_tiers(self):
+        index = DedupIndex.from_db(self.dir / "binslib.db")
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.by_slug("Vu-Dong-Can-Khon")["id"], 100)
+        # Title: case and whitespace insensitive
+        self.assertEqual(index.find(name="đấu phá thương khung")["id"], 101)
+        # Same title, same or unknown author → duplicate
+        self.assertEqual(
+            index.find(name="VŨ ĐỘNG CÀN KHÔN", author="thiên tằm thổ đậu")["id"], 100
+        )
+        self.assertEqual(index.find(name="Vũ Động Càn Khôn")["id"], 100)
+        # Same title, different author → a different book
+        self.assertIsNone(index.find(name="Vũ Động Càn Khôn", author="Ai Đó"))
+        self.assertIsNone(index.find(slug="khac", name="Khác"))
+
+    def test_missing_db(self):
+        self.assertEqual(len(DedupIndex.from_db(self.dir / "none.db")), 0)
+
+    def test_fingerprints(self):
+        self.assertIsNone(content_fingerprint("Chương 1"))
+        # Punctuation, case and whitespace do not change the fingerprint
+        variant = CHAPTER.upper().replace(",", " ").replace("\n", " ")
+        self.assertEqual(content_fingerprint(CHAPTER), content_fingerprint(variant))
+
+        with FingerprintStore(self.dir / "fp.sqlite") as store:
+            fp = store.record(10000001, "ttv", CHAPTER)
+            self.assertIsNone(store.record(100, "mtc", "ngắn"))
+            self.assertEqual(store.lookup(fp), [10000001])
+
+        index = DedupIndex.from_db(self.dir / "binslib.db", self.dir / "fp.sqlite")
+        self.assertTrue(index.has_fingerprints)
+        self.assertEqual(index.find(name="Tên Khác", fingerprint=fp)["id"], 10000001)
+
+
+# ---------------------------------------------------------------------------
+# generate_plan fingerprint pass
+# ---------------------------------------------------------------------------
+
+
+class TestFingerprintDuplicates(unittest.TestCase):
+    def test_matches_by_first_chapter(self):
+        index = DedupIndex()
+        index.add(100, "a", "A", status=2)
+        index.add(30000001, "b", "B", source="tf")
+        index.add_fingerprint(100, content_fingerprint(CHAPTER))
+        index.add_fingerprint(30000001, content_fingerprint(CHAPTER + " khác"))
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            slug = request.url.path.split("/")[1]
+            if slug == "broken":
+                return httpx.Response(404)
+            body = CHAPTER + " khác" if slug == "own" else CHAPTER
+            return httpx.Response(200, text=body)
+
+        books = [
+            {"id": 30000005, "slug": "renamed"},  # same text as book 100
+            {"id": 30000001, "slug": "own"},  # its own fingerprint
+            {"id": 30000006, "slug": "broken"},
+        ]
+        for parse_workers in (0, 1):  # inline, then in the process pool
+            with self.subTest(parse_workers=parse_workers):
+                matches = asyncio.run(
+                    fingerprint_duplicates(
+                        books,
+                        lambda b: f"https://tf.example/{b['slug']}/chuong-1/",
+                        _parse_chapter,
+                        index,
+                        {},
+                        workers=2,
+                        delay=0,
+                        parse_workers=parse_workers,
+                        transport=httpx.MockTransport(handler),
+                    )
+                )
+                self.assertEqual(
+                    {k: v["id"] for k, v in matches.items()}, {30000005: 100}
+                )
+
+
+# ---------------------------------------------------------------------------
+# ingest.py fingerprint store location
+# ---------------------------------------------------------------------------
+
+
+class TestFingerprintsPath(unittest.TestCase):
+    def test_scratch_database_keeps_its_own_store(self):
+        env = {k: v for k, v in os.environ.items() if k != "FINGERPRINTS_PATH"}
+        with mock.patch.dict(os.environ, env, clear=True):
+            with mock.patch.object(ingest, "DB_PATH", ingest.LIBRARY_DB_PATH):
+                self.assertEqual(ingest.fingerprints_path(), ingest.FINGERPRINTS_PATH)
+            with mock.patch.object(ingest, "DB_PATH", Path("/tmp/bench/bench.db")):
+                self.assertEqual(
+                    ingest.fingerprints_path(), Path("/tmp/bench/fingerprints.sqlite")
+                )
+        # An explicit override wins
+        with mock.patch.dict(os.environ, {"FINGERPRINTS_PATH": "/x/fp.sqlite"}):
+            with mock.patch.object(ingest, "DB_PATH", Path("/tmp/bench/bench.db")):
+                self.assertEqual(ingest.fingerprints_path(), ingest.FINGERPRINTS_PATH)
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
@@ -0,0 +1,151 @@
+"""
+Tests for the record / replay HTTP transports (src/httpreplay.py).
+
+Run:
+    cd book-ingest
+    python -m pytest test_httpreplay.py -v
+  or:
+    python test_httpreplay.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.httpreplay import (
+    Cassette,
+    RecordingTransport,
+    ReplayTransport,
+    request_key,
+)
+from src.sources import create_http_client
+
+
+def _upstream(request: httpx.Request) -> httpx.Response:
+    """Stand-in for the live site."""
+    if request.url.path == "/busy":
+        return httpx.Response(503)
+    if request.url.path == "/old":
+        return httpx.Response(301, headers={"location": "https://example.test/new"})
+    body = f"<h1>{request.url.path} {request.url.query.decode()}</h1>".encode()
+    return httpx.Response(
+        200,
+        headers={"content-type": "text/html", "content-encoding": "gzip"},
+        content=gzip.compress(body),
+    )
+
+
+class _TmpMixin:
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "cassettes" / "tf.sqlite"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _record(self, *urls: str) -> None:
+        async def run():
+            transport = RecordingTransport(
+                httpx.MockTransport(_upstream), Cassette(self.path)
+            )
+            async with create_http_client("tf", transport=transport) as client:
+                for url in urls:
+                    await client.get(url)
+
+        asyncio.run(run())
+
+
+class TestRequestKey(unittest.TestCase):
+    def test_query_order_is_ignored(self):
+        self.assertEqual(
+            request_key("get", "https://h/p?b=2&a=1"),
+            request_key("GET", httpx.URL("https://h/p", params={"a": 1, "b": 2})),
+        )
+        self.assertEqual(request_key("GET", "https://h/p"), "GET https://h/p")
+
+
+class TestRecordReplay(_TmpMixin, unittest.TestCase):
+    def test_replay_serves_recorded_responses(self):
+        self._record(
+            "https://example.test/book?page=2&x=1",
+            "https://example.test/old",
+            "https://example.test/busy",
+        )
+        cassette = Cassette(self.path)
+        self.assertEqual(len(cassette), 3)  # book, 301, followed /new; not 503
+        cassette.close()
+
+        async def run():
+            transport = ReplayTransport(Cassette(self.path))
+            async with create_http_client("tf", transport=transport) as client:
+                r1 = await client.get("https://example.test/book?x=1&page=2")
+                r2 = await client.get("https://example.test/old")
+                r3 = await client.get("https://example.test/busy")
+            return transport, r1, r2, r3
+
+        transport, r1, r2, r3 = asyncio.run(run())
+        self.assertEqual(r1.status_code, 200)
+        self.assertEqual(r1.text, "<h1>/book page=2&x=1</h1>")
+        self.assertEqual(r1.headers["content-type"], "text/html")
+        self.assertEqual(str(r2.url), "https://example.test/new")
+        self.assertEqual(r3.status_code, 404)
+        self.assertEqual((transport.hits, transport.misses), (3, 1))
+
+    def test_error_injection_is_seeded(self):
+        self._record("https://example.test/a")
+
+        async def run(seed):
+            transport = ReplayTransport(
+                Cassette(self.path), error_rate=0.5, seed=seed, retry_after=3
+            )
+            outcomes = []
+            async with create_http_client("tf", transport=transport) as client:
+                for _ in range(40):
+                    try:
+                        r = await client.get("https://example.test/a")
+                        outcomes.append(r.status_code)
+                        if r.status_code == 429:
+                            self.assertEqual(r.headers["retry-after"], "3")
+                    except httpx.ReadTimeout:
+                        outcomes.append("timeout")
+            return transport, outcomes
+
+        t1, first = asyncio.run(run(7))
+        _, second = asyncio.run(run(7))
+        self.assertEqual(first, second)
+        self.assertEqual(set(first), {200, 429, 503, "timeout"})
+        self.assertEqual(t1.injected, sum(1 for o in first if o != 200))
+
+    def test_latency_is_applied(self):
+        self._record("https://example.test/a")
+
+        async def run():
+            transport = ReplayTransport(Cassette(self.path), latency=0.05)
+            loop = asyncio.get_running_loop()
+            async with create_http_client("tf", transport=transport) as client:
+                start = loop.time()
+                await asyncio.gather(*(client.get("https://example.test/a") for _ in range(5)))
+                return loop.time() - start
+
+        elapsed = asyncio.run(run())
+        self.assertGreaterEqual(elapsed, 0.05)
+        self.assertLess(elapsed, 0.25)  # concurrent, not serialised
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
@@ -0,0 +1,180 @@
+"""
+Tests for the ingest daemon's per-book check scheduling (src/daemon.py)
+and the scheduler's live-feed mode.
+
+Run:
+    cd book-ingest
+    python -m pytest test_ingest_daemon.py -v
+  or:
+    python test_ingest_daemon.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import unittest
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.daemon import DAY, HOUR, CheckPolicy, CheckQueue, release_cadence
+from src.ratelimit import TrackedSemaphore
+from src.scheduler import BookScheduler
+
+NOW = 1_750_000_000.0
+
+
+class _Clock:
+    def __init__(self, now: float = NOW):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# ---------------------------------------------------------------------------
+# CheckPolicy
+# ---------------------------------------------------------------------------
+
+
+class TestCheckPolicy(unittest.TestCase):
+    def test_intervals_follow_cadence_and_status(self):
+        policy = CheckPolicy()
+        # 101 chapters over 100 days, latest today → one chapter a day
+        # (timestamps may be epoch seconds, see parse_timestamp)
+        daily = {
+            "id": 1,
+            "chapter_count": 101,
+            "published_at": NOW - 100 * DAY,
+            "new_chap_at": NOW,
+        }
+        self.assertAlmostEqual(release_cadence(daily), DAY)
+        self.assertAlmostEqual(policy.initial(daily, NOW), DAY / 2)
+        # Same cadence but idle for 40 days → checked far less often
+        idle = dict(daily, new_chap_at=NOW - 40 * DAY)
+        self.assertEqual(policy.initial(idle, NOW), policy.max_interval)
+        # No timestamps → default; completed → completed interval
+        self.assertIsNone(release_cadence({"id": 2, "chapter_count": 50}))
+        self.assertEqual(policy.initial({"id": 2}, NOW), policy.default_interval)
+        done = dict(daily, status=2)
+        self.assertEqual(policy.initial(done, NOW), policy.completed_interval)
+
+        # New chapters halve the interval, an empty check backs off
+        self.assertAlmostEqual(policy.after(daily, 8 * HOUR, saved=3, now=NOW), 4 * HOUR)
+        self.assertAlmostEqual(policy.after(daily, 8 * HOUR, saved=0, now=NOW), 12 * HOUR)
+        self.assertEqual(policy.after(daily, 15 * 60, saved=5, now=NOW), policy.min_interval)
+
+
+# ---------------------------------------------------------------------------
+# CheckQueue
+# ---------------------------------------------------------------------------
+
+
+class TestCheckQueue(unittest.TestCase):
+    def test_backlog_first_then_next_checks(self):
+        clock = _Clock()
+        queue = CheckQueue(CheckPolicy(default_interval=HOUR), clock=clock)
+        entries = [
+            {"id": 1, "chapter_count": 10},  # complete
+            {"id": 2, "chapter_count": 50},  # 40 missing
+            {"id": 3, "chapter_count": 30},  # 25 missing
+        ]
+        have = {1: 10, 2: 10, 3: 5}
+        self.assertEqual(queue.load(entries, "sjf", have=lambda e: have[e["id"]]), 2)
+        # Backlog in --order (sjf: fewest missing first); book 1 is not due yet
+        self.assertEqual(queue.pop_due()["id"], 3)
+        self.assertEqual(queue.pop_due()["id"], 2)
+        self.assertIsNone(queue.pop_due())
+
+        # Book 3 found new chapters (and a higher count), book 2 nothing
+        at3 = queue.reschedule(3, saved=25, chapter_count=31)
+        at2 = queue.reschedule(2, saved=0)
+        self.assertAlmostEqual(at3 - NOW, HOUR / 2)
+        self.assertAlmostEqual(at2 - NOW, 1.5 * HOUR)
+        clock.now += 2 * HOUR
+        due = {queue.pop_due()["id"] for _ in range(3)}
+        self.assertEqual(due, {1, 2, 3})
+        for book_id in due:
+            queue.reschedule(book_id)
+
+    def test_reload_updates_and_removals(self):
+        clock = _Clock()
+        queue = CheckQueue(CheckPolicy(default_interval=HOUR), clock=clock)
+        queue.load([{"id": 1, "chapter_count": 10}, {"id": 2, "chapter_count": 10}],
+                   have=lambda e: 10)
+        while queue.pop_due() is not None:  # jittered, almost surely not due
+            pass
+        self.assertIsNone(queue.pop_due())
+
+        # Unchanged count → nothing; grown count and new books → due now
+        self.assertFalse(queue.update({"id": 1, "chapter_count": 10, "name": "x"}))
+        self.assertTrue(queue.update({"id": 2, "chapter_count": 12}))
+        self.assertTrue(queue.update({"id": 9, "chapter_count": 100}))
+        self.assertEqual({queue.pop_due()["id"], queue.pop_due()["id"]}, {2, 9})
+        # Growth seen while a check is in progress → re-checked right after
+        self.assertTrue(queue.update({"id": 9, "chapter_count": 120}))
+        self.assertEqual(queue.reschedule(9, saved=100), clock.now)
+        # A count the daemon already fetched is not news to a later reload
+        queue.reschedule(2, chapter_count=15)
+        self.assertFalse(queue.update({"id": 2, "chapter_count": 15}))
+
+        self.assertEqual(queue.retain([1, 9]), 1)
+        self.assertEqual(len(queue), 2)
+        self.assertIsNone(queue.reschedule(2))
+        self.assertEqual(queue.pop_due()["id"], 9)
+
+
+# ---------------------------------------------------------------------------
+# Scheduler with a live feed
+# ---------------------------------------------------------------------------
+
+
+class _FakeSource:
+    def __init__(self, limit: int):
+        self.limiter = TrackedSemaphore(limit)
+
+
+class TestLiveFeed(unittest.TestCase):
+    def test_scheduler_waits_for_due_books_until_closed(self):
+        clock = _Clock()
+        queue = CheckQueue(CheckPolicy(min_interval=0.05, default_interval=0.05),
+                           clock=clock)
+        queue.load([{"id": i, "chapter_count": 5} for i in range(3)], have=lambda e: 0)
+        checks: list[int] = []
+        source = _FakeSource(limit=4)
+
+        async def run_book(entry: dict) -> None:
+            async with source.limiter:
+                await asyncio.sleep(0.001)
+            checks.append(entry["id"])
+            queue.reschedule(entry["id"], saved=0)
+            if len(checks) >= 9:
+                queue.close()
+
+        async def tick_clock() -> None:
+            while True:
+                await asyncio.sleep(0.005)
+                clock.now += 0.02
+
+        async def main() -> None:
+            ticker = asyncio.create_task(tick_clock())
+            sched = BookScheduler(source, run_book, min_books=2, max_books=4,
+                                  tick=0.001, idle_tick=0.001)
+            await asyncio.wait_for(sched.run(queue), timeout=10)
+            ticker.cancel()
+
+        asyncio.run(main())
+        # Every book came back for repeated checks; none ran twice at once
+        self.assertGreaterEqual(len(checks), 9)
+        self.assertEqual(set(checks), {0, 1, 2})
+        self.assertEqual(queue.running, 0)
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
@@ -0,0 +1,152 @@
+"""
+Tests for concurrent TTV / TF listing discovery (generate_plan.scrape_listing).
+
+Run:
+    cd book-ingest
+    python -m pytest test_listing_scrape.py -v
+  or:
+    python test_listing_scrape.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import sys
+import unittest
+
+import httpx
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+import generate_plan
+from generate_plan import scrape_listing
+
+# Listing "HTML" is JSON here; the parsers below are module-level so the
+# process pool can pickle them.
+
+
+def parse_page(html: str) -> list[dict]:
+    return json.loads(html)["books"]
+
+
+def parse_last_page(html: str) -> int:
+    return json.loads(html)["last"]
+
+
+class FakeListing:
+    def __init__(self, pages: int, per_page: int = 3, last: int | None = None):
+        self.pages = pages
+        self.per_page = per_page
+        self.last = last if last is not None else pages
+        self.fail: dict[int, list[int]] = {}
+        self.slow: dict[int, float] = {}
+        self.calls_during_slow: list[int] = []
+        self.calls: list[int] = []
+        self.active = 0
+        self.peak = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        page = int(request.url.path.rstrip("/").rsplit("-", 1)[1])
+        self.calls.append(page)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(random.uniform(0, 0.01))  # finish out of order
+            if page in self.slow:
+                await asyncio.sleep(self.slow[page])
+                self.calls_during_slow = list(self.calls)
+            statuses = self.fail.get(page)
+            if statuses:
+                return httpx.Response(statuses.pop(0))
+            books = (
+                [{"slug": f"p{page}-{i}"} for i in range(self.per_page)]
+                if page <= self.pages
+                else []
+            )
+            return httpx.Response(200, text=json.dumps({"books": books, "last": self.last}))
+        finally:
+            self.active -= 1
+
+
+def _scrape(listing: FakeListing, **kwargs) -> list[tuple[int, int, list[str]]]:
+    seen: list[tuple[int, int, list[str]]] = []
+
+    def on_page(page, page_limit, books):
+        seen.append((page, page_limit, [b["slug"] for b in books]))
+
+    kwargs.setdefault("parse_workers", 0)
+    asyncio.run(
+        scrape_listing(
+            lambda page: f"https://list.example/trang-{page}/",
+            parse_page,
+            parse_last_page,
+            on_page,
+            {},
+            delay=0,
+            transport=httpx.MockTransport(listing.handler),
+            **kwargs,
+        )
+    )
+    return seen
+
+
+# ---------------------------------------------------------------------------
+# scrape_listing
+# ---------------------------------------------------------------------------
+
+
+class TestScrapeListing(unittest.TestCase):
+    def test_pages_delivered_in_order(self):
+        listing = FakeListing(pages=20)
+        seen = _scrape(listing, workers=5)
+        self.assertEqual([p for p, _, _ in seen], list(range(1, 21)))
+        self.assertEqual(seen[3][2], ["p4-0", "p4-1", "p4-2"])
+        self.assertTrue(all(limit == 20 for _, limit, _ in seen))
+        self.assertEqual(listing.calls[0], 1)
+        self.assertLessEqual(listing.peak, 5)
+        self.assertGreater(listing.peak, 1)
+
+    def test_parsing_in_process_pool(self):
+        listing = FakeListing(pages=6)
+        seen = _scrape(listing, workers=3, parse_workers=2)
+        self.assertEqual([p for p, _, _ in seen], list(range(1, 7)))
+
+    def test_max_pages_caps_the_crawl(self):
+        listing = FakeListing(pages=20)
+        seen = _scrape(listing, workers=4, max_pages=5)
+        self.assertEqual([p for p, _, _ in seen], [1, 2, 3, 4, 5])
+        self.assertEqual(max(listing.calls), 5)
+
+    def test_empty_page_ends_listing(self):
+        listing = FakeListing(pages=7, last=12)  # pagination overstates
+        seen = _scrape(listing, workers=3)
+        self.assertEqual([p for p, _, _ in seen], list(range(1, 8)))
+
+    def test_failed_page_is_retried_then_skipped(self):
+        listing = FakeListing(pages=6)
+        listing.fail = {3: [503], 4: [404]}
+        seen = _scrape(listing, workers=2)
+        self.assertEqual([p for p, _, _ in seen], [1, 2, 3, 5, 6])
+        self.assertEqual(listing.calls.count(3), 2)
+        self.assertEqual(listing.calls.count(4), 1)
+
+    def test_slow_page_bounds_read_ahead(self):
+        listing = FakeListing(pages=60)
+        listing.slow = {2: 0.3}
+        seen = _scrape(listing, workers=2)
+        self.assertEqual([p for p, _, _ in seen], list(range(1, 61)))
+        # While page 2 hangs, workers run at most lookahead pages past it
+        lookahead = generate_plan.LISTING_LOOKAHEAD * 2
+        self.assertEqual(max(listing.calls_during_slow), 2 + lookahead - 1)
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
@@ -0,0 +1,134 @@
+"""
+Tests for the background detail-log writer (src/logsink.py).
+
+Run:
+    cd book-ingest
+    python -m pytest test_logsink.py -v
+  or:
+    python test_logsink.py
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.logsink import LogSink
+
+
+def _lines(path: Path) -> list[str]:
+    return path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+
+
+class _TmpDir(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+
+# ---------------------------------------------------------------------------
+# Formats
+# ---------------------------------------------------------------------------
+
+
+class TestFormats(_TmpDir):
+    def test_text_lines(self):
+        sink = LogSink(self.dir / "log" / "detail.log")
+        sink.write("DONE 100358 \"Book\": +5 chapters")
+        sink.write("Ingest started")
+        sink.close()
+        lines = _lines(self.dir / "log" / "detail.log")
+        self.assertEqual(len(lines), 2)
+        self.assertRegex(lines[0], r"^\[\d{4}-\d\d-\d\d \d\d:\d\d:\d\d\] DONE 100358 ")
+
+    def test_json_lines(self):
+        sink = LogSink(self.dir / "detail.jsonl", fmt="json")
+        sink.write("FIX 30000003: 4 gaps")
+        sink.write("waiting for covers")
+        sink.write_record({"phase": "fetch", "ms": 12})
+        sink.close()
+        records = [json.loads(line) for line in _lines(self.dir / "detail.jsonl")]
+        self.assertEqual(records[0]["event"], "FIX")
+        self.assertEqual(records[0]["book_id"], 30000003)
+        self.assertEqual(records[0]["msg"], "FIX 30000003: 4 gaps")
+        self.assertNotIn("event", records[1])
+        self.assertEqual(records[2], {"phase": "fetch", "ms": 12})
+        with self.assertRaises(ValueError):
+            LogSink(self.dir / "x.log", fmt="xml")
+
+    def test_flush_and_close(self):
+        path = self.dir / "detail.log"
+        sink = LogSink(path, flush_interval=10)
+        sink.write("one")
+        sink.flush()
+        self.assertEqual(len(_lines(path)), 1)
+        sink.close()
+        sink.flush()  # must not block once the writer thread is gone
+        sink.write("late")  # written synchronously after close
+        self.assertEqual(len(_lines(path)), 2)
+
+
+# ---------------------------------------------------------------------------
+# Rotation
+# ---------------------------------------------------------------------------
+
+
+class TestRotation(_TmpDir):
+    def test_rotates_and_keeps_backups(self):
+        path = self.dir / "detail.log"
+        sink = LogSink(path, max_bytes=200, backups=2)
+        for i in range(40):
+            sink.write(f"line {i:03d} " + "x" * 20)
+            sink.flush()  # one batch per line
+        sink.close()
+        for p in (path, path.with_name("detail.log.1"), path.with_name("detail.log.2")):
+            self.assertTrue(p.exists())
+            self.assertLessEqual(p.stat().st_size, 200)
+        self.assertFalse(path.with_name("detail.log.3").exists())
+        # The newest lines are in the live file
+        self.assertIn("line 039", _lines(path)[-1])
+
+    def test_concurrent_writers_lose_nothing(self):
+        # Two processes' sinks on one file (here: two sinks, two threads)
+        path = self.dir / "detail.log"
+        sinks = [LogSink(path, max_bytes=2000, backups=50) for _ in range(2)]
+
+        def writer(n: int) -> None:
+            for i in range(200):
+                sinks[n].write(f"w{n} {i:03d} " + "y" * 30)
+                if i % 5 == 0:
+                    sinks[n].flush()
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for sink in sinks:
+            sink.close()
+
+        files = [path] + sorted(self.dir.glob("detail.log.[0-9]*"))
+        lines = [line for p in files for line in _lines(p)]
+        got = sorted(re.search(r"w\d \d{3}", line).group() for line in lines)
+        want = sorted(f"w{n} {i:03d}" for n in range(2) for i in range(200))
+        self.assertEqual(got, want)
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
@@ -0,0 +1,155 @@
+"""
+Tests for the Prometheus metrics registry and HTTP endpoint (src/metrics.py).
+
+Run:
+    cd book-ingest
+    python -m pytest test_metrics.py -v
+  or:
+    python test_metrics.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import unittest
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.metrics import _Metric, Registry, instrumented_get, start_metrics_server
+
+
+class _Response:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+
+class _FakeClient:
+    def __init__(self, result):
+        self.result = result
+
+    async def get(self, url, **kwargs):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+
+class TestRegistry(unittest.TestCase):
+    def test_counter_with_labels(self):
+        reg = Registry()
+        c = reg.counter("x_total", "Things.", ("source", "stage"))
+        c.labels("mtc", "fetched").inc()
+        c.labels("mtc", "fetched").inc(2)
+        c.labels("tf", 'we"ird').inc()
+        text = reg.render()
+        self.assertIn("# HELP x_total Things.\n# TYPE x_total counter\n", text)
+        self.assertIn('x_total{source="mtc",stage="fetched"} 3\n', text)
+        self.assertIn('x_total{source="tf",stage="we\\"ird"} 1\n', text)
+
+    def test_label_arity_is_checked(self):
+        c = Registry().counter("y_total", "Y.", ("source",))
+        with self.assertRaises(ValueError):
+            c.labels("a", "b")
+        with self.assertRaises(ValueError):
+            c.inc()
+
+    def test_gauge_function(self):
+        reg = Registry()
+        g = reg.gauge("depth", "Depth.")
+        items = [1, 2, 3]
+        g.set_function(lambda: len(items))
+        self.assertIn("depth 3\n", reg.render())
+        items.pop()
+        self.assertIn("depth 2\n", reg.render())
+
+    def test_histogram_buckets_are_cumulative(self):
+        reg = Registry()
+        h = reg.histogram("lat_seconds", "Latency.", ("source",), buckets=(0.1, 1))
+        for v in (0.05, 0.1, 0.5, 3):
+            h.labels("mtc").observe(v)
+        text = reg.render()
+        self.assertIn('lat_seconds_bucket{source="mtc",le="0.1"} 2\n', text)
+        self.assertIn('lat_seconds_bucket{source="mtc",le="1"} 3\n', text)
+        self.assertIn('lat_seconds_bucket{source="mtc",le="+Inf"} 4\n', text)
+        self.assertIn('lat_seconds_count{source="mtc"} 4\n', text)
+        self.assertIn('lat_seconds_sum{source="mtc"} 3.65\n', text)
+
+    def test_duplicate_name_rejected(self):
+        reg = Registry()
+        reg.counter("dup", "A.")
+        with self.assertRaises(ValueError):
+            reg.gauge("dup", "B.")
+
+    def test_metric_base_is_abstract(self):
+        with self.assertRaises(TypeError):
+            _Metric("base", "No child type.")
+
+
+# ---------------------------------------------------------------------------
+# HTTP client instrumentation
+# ---------------------------------------------------------------------------
+
+
+class TestInstrumentedGet(unittest.TestCase):
+    def _count(self, status: str) -> float:
+        from src.metrics import HTTP_RESPONSES
+
+        return HTTP_RESPONSES.labels("test", status).value
+
+    def test_counts_status_and_errors(self):
+        before_ok, before_err = self._count("200"), self._count("error")
+        r = asyncio.run(instrumented_get(_FakeClient(_Response(200)), "test", "u"))
+        self.assertEqual(r.status_code, 200)
+        with self.assertRaises(ConnectionError):
+            asyncio.run(instrumented_get(_FakeClient(ConnectionError()), "test", "u"))
+        self.assertEqual(self._count("200"), before_ok + 1)
+        self.assertEqual(self._count("error"), before_err + 1)
+
+
+# ---------------------------------------------------------------------------
+# Endpoint
+# ---------------------------------------------------------------------------
+
+
+class TestMetricsServer(unittest.TestCase):
+    async def _get(self, port: int, path: str) -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        return data
+
+    def test_serves_metrics_and_404(self):
+        reg = Registry()
+        reg.counter("served_total", "Served.").inc(7)
+
+        async def run():
+            server = await start_metrics_server(0, registry=reg)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                return await self._get(port, "/metrics"), await self._get(port, "/nope")
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        ok, missing = asyncio.run(run())
+        self.assertTrue(ok.startswith(b"HTTP/1.1 200 OK\r\n"))
+        self.assertIn(b"text/plain; version=0.0.4", ok)
+        self.assertTrue(ok.endswith(b"served_total 7\n"))
+        self.assertTrue(missing.startswith(b"HTTP/1.1 404"))
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
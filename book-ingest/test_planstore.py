@@ -0,0 +1,120 @@
+"""
+Tests for the indexed plan store (src/planstore.py).
+
+Run:
+    cd book-ingest
+    python -m pytest test_planstore.py -v
+  or:
+    python test_planstore.py
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.planstore import PlanStore
+
+
+def _book(book_id: int, chapters: int, status: object = 1, **extra) -> dict:
+    return {
+        "id": book_id,
+        "name": f"Book {book_id}",
+        "chapter_count": chapters,
+        "status": status,
+        **extra,
+    }
+
+
+# ---------------------------------------------------------------------------
+# PlanStore
+# ---------------------------------------------------------------------------
+
+
+class TestPlanStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.path = self.dir / "plans.sqlite"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_replace_and_upsert(self):
+        with PlanStore(self.path) as store:
+            self.assertFalse(store.has_plan("mtc"))
+            self.assertEqual(store.replace("mtc", [_book(1, 100), _book(2, 50)]), 2)
+            # Checkpoint upsert: new books go last, existing keep their place
+            self.assertEqual(store.upsert("mtc", [_book(3, 10), _book(1, 120)]), 2)
+            self.assertEqual([e["id"] for e in store.query("mtc")], [1, 2, 3])
+            self.assertEqual(store.get("mtc", 1)["chapter_count"], 120)
+
+            # Same data again: nothing changes
+            self.assertEqual(store.upsert("mtc", [_book(3, 10)]), 0)
+            # Replace reorders, drops book 2, and only counts real changes
+            self.assertEqual(store.replace("mtc", [_book(3, 10), _book(1, 120)]), 1)
+            self.assertEqual([e["id"] for e in store.query("mtc")], [3, 1])
+            self.assertIsNone(store.get("mtc", 2))
+            # Sources are independent
+            store.replace("tf", [_book(30000001, 5, 2)])
+            self.assertEqual(store.count("mtc"), 2)
+            self.assertEqual(store.count("tf"), 1)
+
+    def test_query_filters(self):
+        with PlanStore(self.path) as store:
+            store.replace(
+                "mtc",
+                [
+                    _book(i, i * 10, "Hoàn thành" if i % 2 else "Còn tiếp")
+                    for i in range(1, 11)
+                ],
+            )
+            mark = time.time()
+            store.upsert("mtc", [_book(4, 999, "Còn tiếp")])
+
+            def ids(**kw) -> list[int]:
+                return [e["id"] for e in store.query("mtc", **kw)]
+
+            self.assertEqual(ids(offset=2, limit=3), [3, 4, 5])
+            self.assertEqual(ids(ids=[9, 2, 42]), [2, 9])
+            self.assertEqual(ids(min_chapters=80), [4, 8, 9, 10])
+            self.assertEqual(ids(status="Hoàn thành", limit=2), [1, 3])
+            self.assertEqual(ids(changed_since=mark), [4])
+            self.assertEqual(set(store.get_many("mtc", [1, 42])), {1})
+
+    def test_json_sync(self):
+        json_path = self.dir / "books_plan_mtc.json"
+        json_path.write_text(
+            json.dumps({"need_download": [_book(1, 10)], "partial": [_book(2, 20)]}),
+            encoding="utf-8",
+        )
+        with PlanStore(self.path, {"mtc": json_path}) as store:
+            self.assertEqual([e["id"] for e in store.query("mtc")], [1, 2])
+            store.upsert("mtc", [_book(3, 30, poster={"default": "ảnh.jpg"})])
+            self.assertEqual(store.export_json("mtc"), 3)
+
+        exported = json.loads(json_path.read_text(encoding="utf-8"))
+        self.assertEqual(exported[2]["poster"], {"default": "ảnh.jpg"})
+        # Our own export is not re-imported; an external rewrite is
+        with PlanStore(self.path, {"mtc": json_path}) as store:
+            store.upsert("mtc", [_book(4, 40)])
+            self.assertEqual(store.count("mtc"), 4)
+        json_path.write_text(json.dumps([_book(9, 90)]), encoding="utf-8")
+        with PlanStore(self.path, {"mtc": json_path}) as store:
+            self.assertEqual([e["id"] for e in store.query("mtc")], [9])
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
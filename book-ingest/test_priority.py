@@ -0,0 +1,113 @@
+"""
+Tests for ``ingest.py --order`` policies and the plan priority queue
+(src/priority.py) plus the header-only bundle count it relies on.
+
+Run:
+    cd book-ingest
+    python -m pytest test_priority.py -v
+  or:
+    python test_priority.py
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.bundle import read_bundle_count, write_bundle
+from src.priority import (
+    ORDER_POLICIES,
+    PlanQueue,
+    parse_timestamp,
+    weighted_score,
+)
+
+NOW = parse_timestamp("2025-06-01T00:00:00Z")
+
+ENTRIES = [
+    # id, chapter_count, views, bookmarks, new_chap_at
+    {"id": 1, "chapter_count": 100, "view_count": 10, "bookmark_count": 0,
+     "new_chap_at": "2025-05-31T10:00:00.000000Z"},
+    {"id": 2, "chapter_count": 2000, "view_count": 500_000, "bookmark_count": 9000,
+     "new_chap_at": "2025-01-01T00:00:00.000000Z"},
+    {"id": 3, "chapter_count": 500, "view_count": 1000, "bookmark_count": 50,
+     "updated_at": "2025-05-20 08:00:00"},
+    {"id": 4, "chapter_count": 300, "view_count": 0, "bookmark_count": 0},
+]
+HAVE = {1: 40, 2: 1990, 3: 0, 4: 300}  # gaps: 60, 10, 500, 0
+
+
+def _order(policy: str) -> list[int]:
+    q = PlanQueue(ENTRIES, policy, have=lambda e: HAVE[e["id"]], now=NOW)
+    return [e["id"] for e in q]
+
+
+class TestOrderPolicies(unittest.TestCase):
+    def test_plan_keeps_file_order(self):
+        self.assertEqual(_order("plan"), [1, 2, 3, 4])
+
+    def test_gap_and_sjf(self):
+        self.assertEqual(_order("gap"), [3, 1, 2, 4])
+        self.assertEqual(_order("sjf"), [4, 2, 1, 3])
+
+    def test_popularity(self):
+        self.assertEqual(_order("popularity"), [2, 3, 1, 4])
+
+    def test_freshness_falls_back_to_updated_at(self):
+        self.assertEqual(_order("freshness"), [1, 3, 2, 4])
+
+    def test_weighted_puts_complete_books_last(self):
+        order = _order("weighted")
+        self.assertEqual(order[-1], 4)
+        self.assertEqual(weighted_score(ENTRIES[3], HAVE[4], NOW), 0.0)
+        # Big gap on a moderately popular, fresh book beats a tiny gap on a
+        # very popular stale one.
+        self.assertLess(order.index(3), order.index(2))
+
+    def test_have_only_called_for_gap_policies(self):
+        calls = []
+        for policy in ORDER_POLICIES:
+            PlanQueue(ENTRIES, policy, have=lambda e: calls.append(policy) or 0)
+        self.assertEqual(sorted(set(calls)), ["gap", "sjf", "weighted"])
+
+    def test_push_while_consuming(self):
+        q = PlanQueue([{"id": 1, "chapter_count": 5}], "gap", have=lambda e: 0)
+        it = iter(q)
+        self.assertEqual(next(it)["id"], 1)
+        q.push({"id": 2, "chapter_count": 9})
+        self.assertEqual([e["id"] for e in it], [2])
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            PlanQueue(ENTRIES, "random")
+
+    def test_parse_timestamp(self):
+        self.assertEqual(parse_timestamp("2025-06-01"), NOW)
+        self.assertIsNotNone(parse_timestamp("2025-05-20 08:00"))
+        self.assertIsNone(parse_timestamp("3 ngày trước"))
+        self.assertIsNone(parse_timestamp(None))
+
+
+class TestReadBundleCount(unittest.TestCase):
+    def test_header_count(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "1.bundle")
+            self.assertEqual(read_bundle_count(path), 0)
+            write_bundle(path, {i: (b"x", 1) for i in (1, 2, 5)})
+            self.assertEqual(read_bundle_count(path), 3)
+            Path(path).write_bytes(b"nope")
+            self.assertEqual(read_bundle_count(path), 0)
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
@@ -0,0 +1,106 @@
+"""
+Tests for the --profile sampling profiler (src/profiling.py).
+
+Run:
+    cd book-ingest
+    python -m pytest test_profiling.py -v
+  or:
+    python test_profiling.py
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.profiling import SamplingProfiler, default_output
+
+
+def _busy_leaf(deadline: float) -> int:
+    n = 0
+    while time.perf_counter() < deadline:
+        n += 1
+    return n
+
+
+def _busy_outer(seconds: float) -> int:
+    return _busy_leaf(time.perf_counter() + seconds)
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    def _profile(self, fn, include_idle=False) -> SamplingProfiler:
+        prof = SamplingProfiler(interval=0.001, include_idle=include_idle)
+        prof.start()
+        try:
+            fn()
+        finally:
+            prof.stop()
+        return prof
+
+    def test_samples_worker_thread_stack(self):
+        def run():
+            t = threading.Thread(target=_busy_outer, args=(0.2,), name="busy")
+            t.start()
+            t.join()
+
+        prof = self._profile(run)
+        self.assertGreater(prof.samples, 10)
+        busy = [s for s in prof.stacks if s[0] == "thread:busy"]
+        self.assertTrue(busy)
+        leaf_stack = max(busy, key=prof.stacks.__getitem__)
+        self.assertTrue(leaf_stack[-1].startswith("_busy_leaf (test_profiling.py:"))
+        self.assertTrue(any(f.startswith("_busy_outer ") for f in leaf_stack))
+
+        self_top, incl_top = prof.top(5)
+        self.assertTrue(self_top[0][0].startswith("_busy_leaf "))
+        self.assertIn("_busy_outer", " ".join(label for label, _ in incl_top))
+
+    def test_idle_threads_are_dropped(self):
+        ev = threading.Event()
+
+        def run():
+            t = threading.Thread(target=ev.wait, name="idle")
+            t.start()
+            time.sleep(0.05)
+            ev.set()
+            t.join()
+
+        prof = self._profile(run)
+        self.assertFalse([s for s in prof.stacks if s[0] == "thread:idle"])
+        ev.clear()
+        prof = self._profile(run, include_idle=True)
+        self.assertTrue([s for s in prof.stacks if s[0] == "thread:idle"])
+
+    def test_write_outputs(self):
+        prof = self._profile(lambda: _busy_outer(0.05))
+        with tempfile.TemporaryDirectory() as tmp:
+            path, top_path = prof.write(Path(tmp) / "sub" / "run.collapsed", n=5)
+            lines = path.read_text().splitlines()
+            self.assertTrue(lines)
+            for line in lines:
+                stack, count = line.rsplit(" ", 1)
+                self.assertTrue(stack.startswith("thread:"))
+                self.assertGreater(int(count), 0)
+            self.assertEqual(top_path.name, "run.collapsed.top.txt")
+            self.assertIn("Inclusive", top_path.read_text())
+
+    def test_default_output(self):
+        path = default_output("data/profile", "ingest")
+        self.assertEqual(path.parent, Path("data/profile"))
+        self.assertRegex(path.name, r"^ingest-\d{8}-\d{6}\.collapsed$")
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
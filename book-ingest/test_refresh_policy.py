@@ -0,0 +1,120 @@
+"""
+Tests for the tiered --refresh policy (src/refreshpolicy.py) and the
+refresh tracking columns of the plan store.
+
+Run:
+    cd book-ingest
+    python -m pytest test_refresh_policy.py -v
+  or:
+    python test_refresh_policy.py
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from generate_plan import merge_held
+from src.planstore import PlanStore
+from src.refreshpolicy import DAY, RefreshPolicy, is_completed
+
+NOW = 1_700_000_000.0
+
+
+def _iso(days_ago: float) -> str:
+    return datetime.fromtimestamp(NOW - days_ago * DAY, timezone.utc).isoformat()
+
+
+# ---------------------------------------------------------------------------
+# RefreshPolicy
+# ---------------------------------------------------------------------------
+
+
+class TestRefreshPolicy(unittest.TestCase):
+    def test_tiers(self):
+        policy = RefreshPolicy()
+
+        def tier(entry: dict, grew_at: float | None = None) -> str:
+            # Last refreshed yesterday
+            return policy.tier(entry, NOW - DAY, grew_at, NOW)
+
+        self.assertEqual(policy.tier({}, None, now=NOW), "new")
+        self.assertEqual(
+            tier({"status": "Hoàn thành", "new_chap_at": _iso(1)}), "completed"
+        )
+        self.assertEqual(tier({"status": 2}), "completed")
+        self.assertEqual(tier({"status": "Còn tiếp", "new_chap_at": _iso(3)}), "hot")
+        self.assertEqual(tier({"status": 1, "updated_at": _iso(30)}), "warm")
+        self.assertEqual(tier({"status": 1, "new_chap_at": _iso(200)}), "cold")
+        # No dates: warm, unless the store saw the chapter count grow
+        self.assertEqual(tier({"status": 1}), "warm")
+        self.assertEqual(tier({"status": 1}, grew_at=NOW - 2 * DAY), "hot")
+        self.assertTrue(is_completed({"status_name": "Full"}))
+        self.assertFalse(is_completed({"status": "Còn tiếp"}))
+
+    def test_select(self):
+        entries = [
+            {"id": 1, "status": 1, "new_chap_at": _iso(2)},  # hot
+            {"id": 2, "status": 1, "new_chap_at": _iso(200)},  # cold, 5 days ago
+            {"id": 3, "status": 1, "new_chap_at": _iso(200)},  # cold, 20 days ago
+            {"id": 4, "status": 2},  # completed, 5 days ago
+            {"id": 5, "status": 1},  # never refreshed
+        ]
+        state = {
+            1: (NOW - 3600, None),
+            2: (NOW - 5 * DAY, None),
+            3: (NOW - 20 * DAY, None),
+            4: (NOW - 5 * DAY, None),
+        }
+        due, held, tiers = RefreshPolicy().select(entries, state, now=NOW)
+        self.assertEqual([e["id"] for e in due], [1, 3, 5])
+        self.assertEqual([e["id"] for e in held], [2, 4])
+        self.assertEqual(tiers["cold"], (2, 1))
+        self.assertEqual(tiers["completed"], (1, 0))
+
+        # Held books are written back, still subject to --min-chapters
+        merged = merge_held(
+            [{"id": 1, "chapter_count": 50}],
+            [{"id": 2, "chapter_count": 80}, {"id": 4, "chapter_count": 5}],
+            min_chapters=10,
+        )
+        self.assertEqual([e["id"] for e in merged], [2, 1])
+
+
+# ---------------------------------------------------------------------------
+# Plan store refresh tracking
+# ---------------------------------------------------------------------------
+
+
+class TestRefreshState(unittest.TestCase):
+    def test_refreshed_and_grew(self):
+        with tempfile.TemporaryDirectory() as d:
+            with PlanStore(Path(d) / "plans.sqlite") as store:
+                store.replace("mtc", [{"id": 1, "chapter_count": 10}, {"id": 2}])
+                self.assertEqual(
+                    store.refresh_state("mtc"), {1: (None, None), 2: (None, None)}
+                )
+                store.mark_refreshed("mtc", [1], at=NOW)
+                store.replace(
+                    "mtc",
+                    [{"id": 1, "chapter_count": 12}, {"id": 2, "name": "x"}],
+                )
+                state = store.refresh_state("mtc")
+                self.assertEqual(state[1][0], NOW)
+                self.assertIsNotNone(state[1][1])  # chapter count went up
+                self.assertEqual(state[2], (None, None))
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
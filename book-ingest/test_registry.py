@@ -0,0 +1,125 @@
+"""
+Tests for the TTV/TF slug → ID registry (src/registry.py).
+
+Run:
+    cd book-ingest
+    python -m pytest test_registry.py -v
+  or:
+    python test_registry.py
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.registry import SlugRegistry
+
+OFFSET = 10_000_000
+
+
+class TestSlugRegistry(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.db = self.dir / "registry.sqlite"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_allocates_sequential_ids(self):
+        with SlugRegistry(self.db, "ttv", OFFSET) as reg:
+            self.assertEqual(reg.get_or_create("a"), OFFSET + 1)
+            self.assertEqual(reg.get_or_create("a"), OFFSET + 1)
+            ids = reg.allocate(["b", "a", "c", "b"])
+            self.assertEqual(ids, {"a": OFFSET + 1, "b": OFFSET + 2, "c": OFFSET + 3})
+            self.assertEqual(len(reg), 3)
+            self.assertIn("c", reg)
+            self.assertNotIn("d", reg)
+
+        # Persisted; lookups go both ways
+        with SlugRegistry(self.db, "ttv", OFFSET) as reg:
+            self.assertEqual(reg["b"], OFFSET + 2)
+            self.assertEqual(reg.slug_for(OFFSET + 3), "c")
+            self.assertEqual(reg.slugs_for([OFFSET + 1, 5, OFFSET + 1]), {OFFSET + 1: "a"})
+            with self.assertRaises(KeyError):
+                reg["missing"]
+
+    def test_sources_are_separate(self):
+        with SlugRegistry(self.db, "ttv", OFFSET) as ttv, SlugRegistry(
+            self.db, "tf", 3 * OFFSET
+        ) as tf:
+            self.assertEqual(ttv.get_or_create("same-slug"), OFFSET + 1)
+            self.assertEqual(tf.get_or_create("same-slug"), 3 * OFFSET + 1)
+            self.assertEqual(len(ttv), 1)
+            self.assertIsNone(tf.slug_for(OFFSET + 1))
+
+    def test_json_snapshot_import_and_export(self):
+        snapshot = self.dir / "books_registry_ttv.json"
+        snapshot.write_text(json.dumps({"x": OFFSET + 1, "y": OFFSET + 7}))
+
+        with SlugRegistry(self.db, "ttv", OFFSET, json_path=snapshot) as reg:
+            self.assertEqual(reg["y"], OFFSET + 7)
+            # New IDs continue after the highest imported one
+            self.assertEqual(reg.get_or_create("z"), OFFSET + 8)
+            reg.export_json()
+        self.assertEqual(
+            json.loads(snapshot.read_text()),
+            {"x": OFFSET + 1, "y": OFFSET + 7, "z": OFFSET + 8},
+        )
+
+        # A changed snapshot (e.g. after git pull) is merged on open
+        snapshot.write_text(json.dumps({"x": OFFSET + 1, "w": OFFSET + 20}))
+        os.utime(snapshot, ns=(1, 1))
+        with SlugRegistry(self.db, "ttv", OFFSET, json_path=snapshot) as reg:
+            self.assertEqual(dict(reg.items())["w"], OFFSET + 20)
+            self.assertEqual(len(reg), 4)
+            self.assertEqual(reg.import_conflicts, [])
+
+    def test_conflicting_snapshot_entries_are_reported(self):
+        with SlugRegistry(self.db, "ttv", OFFSET) as reg, SlugRegistry(
+            self.db, "tf", 3 * OFFSET
+        ) as tf:
+            reg.allocate(["a", "b"])  # a → +1, b → +2
+            tf.get_or_create("tf-book")  # 3 * OFFSET + 1
+
+        snapshot = self.dir / "books_registry_ttv.json"
+        snapshot.write_text(
+            json.dumps(
+                {
+                    "a": OFFSET + 1,  # agrees
+                    "b": OFFSET + 9,  # b already has another ID
+                    "c": OFFSET + 1,  # ID already taken by a
+                    "d": 3 * OFFSET + 1,  # ID taken by a TF book
+                    "e": OFFSET + 5,  # new
+                    "f": OFFSET + 5,  # same ID twice in the snapshot
+                }
+            )
+        )
+        with self.assertLogs("book-ingest.registry", "WARNING"):
+            with SlugRegistry(self.db, "ttv", OFFSET, json_path=snapshot) as reg:
+                self.assertEqual(
+                    dict(reg.items()), {"a": OFFSET + 1, "b": OFFSET + 2, "e": OFFSET + 5}
+                )
+                conflicts = reg.import_conflicts
+        self.assertEqual(len(conflicts), 4)
+        self.assertIn(f"b: snapshot ID {OFFSET + 9}, registry has {OFFSET + 2}", conflicts)
+        self.assertIn(f"c: snapshot ID {OFFSET + 1} belongs to ttv/a", conflicts)
+        self.assertIn(f"d: snapshot ID {3 * OFFSET + 1} belongs to tf/tf-book", conflicts)
+        self.assertIn(f"f: snapshot ID {OFFSET + 5} belongs to ttv/e", conflicts)
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
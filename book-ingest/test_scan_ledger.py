@@ -0,0 +1,130 @@
+"""
+Tests for the --scan ledger and upper-bound search (src/scanledger.py).
+
+Run:
+    cd book-ingest
+    python -m pytest test_scan_ledger.py -v
+  or:
+    python test_scan_ledger.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.scanledger import DAY, ScanLedger, find_upper_bound
+
+NOW = 1_700_000_000.0
+
+
+# ---------------------------------------------------------------------------
+# ScanLedger
+# ---------------------------------------------------------------------------
+
+
+class TestScanLedger(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "ledger.sqlite"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_due_respects_ttls(self):
+        with ScanLedger(self.path) as ledger:
+            ledger.record({3: 20}, [1, 2], at=NOW - 10 * DAY)
+            ledger.record({}, [4], at=NOW - 40 * DAY)
+            due = ledger.due(1, 6, known={5}, dead_ttl=30 * DAY, found_ttl=7 * DAY, now=NOW)
+            # 1, 2: recent 404s; 3: small book past found_ttl; 4: stale 404;
+            # 5: in the plan; 6: never probed
+            self.assertEqual(due, [3, 4, 6])
+            self.assertEqual(
+                ledger.due(1, 6, known=set(), dead_ttl=0, found_ttl=0, now=NOW),
+                [1, 2, 3, 4, 5, 6],
+            )
+
+    def test_persists_and_forgets(self):
+        with ScanLedger(self.path) as ledger:
+            self.assertEqual(ledger.high_water, 0)
+            ledger.record({7: 50, 9: 3}, [8])
+            ledger.set_high_water(9)
+        with ScanLedger(self.path) as ledger:
+            self.assertEqual(ledger.high_water, 9)
+            self.assertEqual(ledger.max_found(), 9)
+            self.assertEqual(ledger.counts(), {"found": 2, "missing": 1})
+            ledger.forget([9])
+            self.assertEqual(ledger.max_found(), 7)
+            self.assertEqual(ledger.due(7, 9, known=set()), [9])
+
+    def test_readonly_never_writes(self):
+        with ScanLedger(self.path, readonly=True) as ledger:
+            ledger.record({1: 1}, [2])
+            self.assertEqual(ledger.due(1, 3, known=set()), [1, 2, 3])
+        self.assertFalse(self.path.exists())
+
+        with ScanLedger(self.path) as ledger:
+            ledger.record({}, [2])
+        with ScanLedger(self.path, readonly=True) as ledger:
+            ledger.forget([2])
+            ledger.set_high_water(5)
+            self.assertEqual(ledger.due(1, 3, known=set()), [1, 3])
+            self.assertEqual(ledger.high_water, 0)
+
+
+# ---------------------------------------------------------------------------
+# find_upper_bound
+# ---------------------------------------------------------------------------
+
+
+class TestFindUpperBound(unittest.TestCase):
+    def _search(self, live: set[int], start: int, **kwargs) -> tuple[int, int]:
+        requests = 0
+
+        async def probe(ids: list[int]) -> set[int]:
+            nonlocal requests
+            requests += len(ids)
+            return live & set(ids)
+
+        bound = asyncio.run(find_upper_bound(probe, start, margin=100, **kwargs))
+        return bound, requests
+
+    def test_finds_end_of_sparse_range(self):
+        # Every third ID exists, with a few dead stretches shorter than a
+        # window, up to 153_211
+        live = {i for i in range(100_003, 153_212, 3) if i % 1000 >= 5}
+        bound, requests = self._search(live, 100_003)
+        self.assertEqual(bound, max(live) + 100)
+        self.assertLess(requests, 500)  # vs. ~50k for a linear sweep
+
+    def test_sparse_ids_above_start(self):
+        # One ID every 25 past a 300-ID gap: a single window at start + 256
+        # finds nothing, the spread probes do
+        start = 150_000
+        live = {start} | {start + 300 + 25 * k for k in range(400)}
+        bound, requests = self._search(live, start)
+        self.assertGreaterEqual(bound, max(live))
+        self.assertLess(requests, 1000)
+
+    def test_start_at_end(self):
+        bound, _ = self._search({500}, 500)
+        self.assertEqual(bound, 600)
+
+    def test_floor(self):
+        bound, _ = self._search({500}, 500, floor=153_600)
+        self.assertEqual(bound, 153_600)
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
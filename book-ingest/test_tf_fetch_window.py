@@ -0,0 +1,180 @@
+"""
+Tests for TFSource.fetch_chapters() — the sliding-window chapter fetcher —
+and the chapter-list (table of contents) parsers that feed it.
+
+Chapters complete out of order (each fake fetch sleeps a different amount)
+but must be yielded in ascending index order, failed chapters must be
+skipped, and requests may run at most ``_FETCH_WINDOW_SIZE`` chapters ahead
+of the next chapter to yield.
+When a chapter list is available, only the listed chapters are requested.
+
+Run:
+    cd book-ingest
+    python -m pytest test_tf_fetch_window.py -v
+  or:
+    python test_tf_fetch_window.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import unittest
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.sources.base import ChapterData, ChapterRef
+from src.sources.tf import (
+    TFSource,
+    parse_chapter_list,
+    parse_chapter_list_last_page,
+)
+
+
+class _FakeTFSource(TFSource):
+    """TFSource whose single-chapter fetch is simulated in memory."""
+
+    def __init__(
+        self,
+        delays: dict[int, float],
+        failing: set[int] = frozenset(),
+        toc: list[ChapterRef] | None = None,
+    ):
+        super().__init__()
+        self.delays = delays
+        self.failing = set(failing)
+        self.toc = toc
+        self.in_flight = 0
+        self.peak = 0
+        self.started: list[int] = []
+        self.finished: list[int] = []
+
+    async def fetch_chapter_list(self, meta):
+        return self.toc
+
+    async def _fetch_single_chapter(self, book_id, tf_slug, ch_idx, url=None):
+        self.started.append(ch_idx)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(ch_idx, 0.001))
+        finally:
+            self.in_flight -= 1
+        self.finished.append(ch_idx)
+        if ch_idx in self.failing:
+            return None
+        return ChapterData(ch_idx, f"Chương {ch_idx}", f"chuong-{ch_idx}", "x", 1)
+
+
+def _meta(count: int) -> dict:
+    return {"id": 30000001, "slug": "test-book", "chapter_count": count}
+
+
+async def _collect(source: TFSource, meta: dict, existing: set[int]) -> list[int]:
+    out = []
+    async for ch in source.fetch_chapters(meta, existing, ""):
+        out.append(ch.index)
+    await source.close()
+    return out
+
+
+class TestSlidingWindow(unittest.TestCase):
+    def test_yields_in_index_order(self):
+        # Later chapters finish first
+        delays = {i: 0.03 - i * 0.001 for i in range(1, 26)}
+        source = _FakeTFSource(delays)
+        got = asyncio.run(_collect(source, _meta(25), set()))
+        self.assertEqual(got, list(range(1, 26)))
+
+    def test_skips_existing_and_failed(self):
+        source = _FakeTFSource({}, failing={4, 7})
+        got = asyncio.run(_collect(source, _meta(10), {1, 2}))
+        self.assertEqual(got, [3, 5, 6, 8, 9, 10])
+
+    def test_peak_concurrency_bounded_by_window(self):
+        source = _FakeTFSource({i: 0.005 for i in range(1, 51)})
+        asyncio.run(_collect(source, _meta(50), set()))
+        self.assertLessEqual(source.peak, TFSource._FETCH_WINDOW_SIZE)
+
+    def test_slow_head_chapter_bounds_read_ahead(self):
+        # Chapter 1 is slow: the rest of its window completes meanwhile, but
+        # nothing further than a window ahead of it is requested
+        window = TFSource._FETCH_WINDOW_SIZE
+        source = _FakeTFSource({1: 0.2})
+        got = asyncio.run(_collect(source, _meta(30), set()))
+        self.assertEqual(got, list(range(1, 31)))
+        head = source.finished.index(1)
+        self.assertEqual(sorted(source.finished[:head]), list(range(2, window + 1)))
+        self.assertEqual(source.started.index(window + 1), window)
+
+    def test_fetch_exception_counts_as_failure(self):
+        class _Raising(_FakeTFSource):
+            async def _fetch_single_chapter(self, book_id, tf_slug, ch_idx, url=None):
+                if ch_idx == 3:
+                    raise RuntimeError("parser blew up")
+                return await super()._fetch_single_chapter(book_id, tf_slug, ch_idx, url)
+
+        got = asyncio.run(_collect(_Raising({}), _meta(6), set()))
+        self.assertEqual(got, [1, 2, 4, 5, 6])
+
+    def test_early_close_cancels_in_flight(self):
+        source = _FakeTFSource({i: 0.05 for i in range(2, 21)})
+
+        async def run() -> list[int]:
+            out = []
+            gen = source.fetch_chapters(_meta(20), set(), "")
+            async for ch in gen:
+                out.append(ch.index)
+                break
+            await gen.aclose()
+            await source.close()
+            return out
+
+        self.assertEqual(asyncio.run(run()), [1])
+        self.assertEqual(source.in_flight, 0)
+
+    def test_only_listed_chapters_are_fetched(self):
+        toc = [ChapterRef(i, f"/test-book/chuong-{i}/", "") for i in (1, 2, 3, 5, 8)]
+        source = _FakeTFSource({}, toc=toc)
+        got = asyncio.run(_collect(source, _meta(10), {2}))
+        self.assertEqual(got, [1, 3, 5, 8])
+        self.assertEqual(sorted(source.started), [1, 3, 5, 8])
+
+
+TOC_PAGE = """
+<div id="list-chapter">
+  <ul class="list-chapter">
+    <li><a href="https://truyenfull.vision/test-book/chuong-1/"
+           title="Test - Chương 1: Mở đầu">Chương 1: Mở đầu</a></li>
+    <li><a href="https://truyenfull.vision/test-book/chuong-2/">Chương 2:&nbsp;Hai</a></li>
+    <li><a href="https://truyenfull.vision/test-book/">Giới thiệu</a></li>
+  </ul>
+  <ul class="pagination">
+    <li><a href="https://truyenfull.vision/test-book/trang-2/#list-chapter">2</a></li>
+    <li><a href="https://truyenfull.vision/test-book/trang-7/#list-chapter">Cuối</a></li>
+  </ul>
+</div>
+"""
+
+
+class TestChapterListParser(unittest.TestCase):
+    def test_parses_chapter_links(self):
+        refs = parse_chapter_list(TOC_PAGE)
+        self.assertEqual([r.index for r in refs], [1, 2])
+        self.assertEqual(refs[0].title, "Chương 1: Mở đầu")
+        self.assertEqual(refs[1].title, "Chương 2: Hai")
+        self.assertEqual(refs[0].url, "https://truyenfull.vision/test-book/chuong-1/")
+
+    def test_last_page(self):
+        self.assertEqual(parse_chapter_list_last_page(TOC_PAGE), 7)
+        self.assertEqual(parse_chapter_list_last_page("<html></html>"), 1)
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
@@ -0,0 +1,154 @@
+"""
+Tests for cover thumbnails (src/thumbnails.py) and their use by the
+cover stage.  Skipped when Pillow is not installed.
+
+Run:
+    cd book-ingest
+    python -m pytest test_thumbnails.py -v
+  or:
+    python test_thumbnails.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+import httpx
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.cover import CoverStage, download_cover
+from src.thumbnails import (
+    ThumbnailPool,
+    render_thumbnails,
+    thumb_path,
+    unsupported_formats,
+)
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+needs_pillow = unittest.skipIf(
+    unsupported_formats(["webp"]), "Pillow with WebP support not installed"
+)
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 80, 40)).save(buf, "JPEG")
+    return buf.getvalue()
+
+
+def _size(path: str) -> tuple[int, int]:
+    with Image.open(path) as im:
+        return im.size
+
+
+# ---------------------------------------------------------------------------
+# render_thumbnails
+# ---------------------------------------------------------------------------
+
+
+@needs_pillow
+class TestRenderThumbnails(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _cover(self, book_id: int, width: int, height: int) -> None:
+        with open(os.path.join(self.dir, f"{book_id}.jpg"), "wb") as f:
+            f.write(_jpeg(width, height))
+
+    def test_resizes_keeping_aspect_ratio(self):
+        self._cover(1, 600, 800)
+        self.assertEqual(render_thumbnails(self.dir, 1), 2)
+        self.assertEqual(_size(thumb_path(self.dir, 1, 150, "webp")), (150, 200))
+        self.assertEqual(_size(thumb_path(self.dir, 1, 300, "webp")), (300, 400))
+        self.assertEqual(
+            sorted(os.listdir(self.dir)), ["1-150.webp", "1-300.webp", "1.jpg"]
+        )
+
+    def test_small_cover_is_not_upscaled(self):
+        self._cover(2, 200, 280)
+        render_thumbnails(self.dir, 2)
+        self.assertEqual(_size(thumb_path(self.dir, 2, 300, "webp")), (200, 280))
+
+    def test_up_to_date_thumbnails_are_skipped(self):
+        self._cover(3, 600, 800)
+        self.assertEqual(render_thumbnails(self.dir, 3), 2)
+        self.assertEqual(render_thumbnails(self.dir, 3), 0)
+        self.assertEqual(render_thumbnails(self.dir, 3, force=True), 2)
+        # A re-downloaded (newer) cover makes the thumbnails stale
+        src = os.path.join(self.dir, "3.jpg")
+        thumb = thumb_path(self.dir, 3, 150, "webp")
+        os.utime(src, (os.path.getmtime(thumb) + 10,) * 2)
+        self.assertEqual(render_thumbnails(self.dir, 3), 2)
+
+    def test_missing_cover(self):
+        self.assertEqual(render_thumbnails(self.dir, 4), 0)
+
+
+# ---------------------------------------------------------------------------
+# ThumbnailPool + CoverStage
+# ---------------------------------------------------------------------------
+
+
+@needs_pillow
+class TestCoverStageThumbnails(unittest.TestCase):
+    def test_saved_covers_get_thumbnails(self):
+        image = _jpeg(600, 800)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if "missing" in request.url.path:
+                return httpx.Response(404)
+            return httpx.Response(200, content=image)
+
+        class Source:
+            name = "test"
+
+            def __init__(self, client):
+                self.client = client
+
+            async def download_cover(self, book_id, meta, covers_dir, hosts=None):
+                return await download_cover(
+                    self.client, book_id, meta.get("cover_url"), covers_dir, hosts
+                )
+
+        async def run(covers_dir):
+            with ThumbnailPool(covers_dir, workers=2) as thumbs:
+                transport = httpx.MockTransport(handler)
+                async with httpx.AsyncClient(transport=transport) as client:
+                    stage = CoverStage(
+                        Source(client), covers_dir, None, asyncio.Lock(),
+                        workers=2, thumbs=thumbs,
+                    )
+                    stage.submit(1, {"cover_url": "https://img.example/1.jpg"})
+                    stage.submit(2, {"cover_url": "https://img.example/missing.jpg"})
+                    await stage.close()
+                return thumbs.written, thumbs.failed
+
+        with tempfile.TemporaryDirectory() as d:
+            self.assertEqual(asyncio.run(run(d)), (2, 0))
+            self.assertEqual(
+                sorted(os.listdir(d)), ["1-150.webp", "1-300.webp", "1.jpg"]
+            )
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
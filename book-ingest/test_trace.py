@@ -0,0 +1,120 @@
+"""
+Tests for the --trace phase spans and --profile-report aggregation
+(src/trace.py).
+
+Run:
+    cd book-ingest
+    python -m pytest test_trace.py -v
+  or:
+    python test_trace.py
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src import trace
+from src.trace import (
+    format_report,
+    load_trace,
+    percentile,
+    record,
+    span,
+    start_trace,
+    stop_trace,
+    summarize,
+)
+
+
+class TestSpans(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "trace.jsonl"
+
+    def tearDown(self):
+        stop_trace()
+        self._tmp.cleanup()
+
+    def test_disabled_span_writes_nothing(self):
+        with span("metadata", "mtc", 1):
+            pass
+        record("fetch", "mtc", time.perf_counter(), 1)
+        self.assertIsNone(trace._sink)
+        self.assertFalse(self.path.exists())
+
+    def test_spans_are_written_as_json_lines(self):
+        start_trace(self.path)
+        with span("metadata", "mtc", 100358):
+            time.sleep(0.01)
+        t0 = time.perf_counter()
+        record("fetch", "tf", t0, 7, index=3)
+        with self.assertRaises(KeyError):
+            with span("cover", "mtc", 100358):
+                raise KeyError("x")
+        stop_trace()
+
+        lines = [json.loads(l) for l in self.path.read_text().splitlines()]
+        self.assertEqual([r["phase"] for r in lines], ["metadata", "fetch", "cover"])
+        meta, fetch, cover = lines
+        self.assertEqual((meta["source"], meta["book_id"]), ("mtc", 100358))
+        self.assertGreaterEqual(meta["dur"], 0.009)
+        self.assertEqual(fetch["index"], 3)
+        self.assertEqual(cover["error"], "KeyError")
+        self.assertNotIn("error", meta)
+
+
+class TestReport(unittest.TestCase):
+    def test_percentile_nearest_rank(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 95), 95.0)
+        self.assertEqual(percentile([4.0], 95), 4.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_summarize_groups_by_source_and_phase(self):
+        records = [
+            {"phase": "fetch", "source": "mtc", "dur": d} for d in (0.1, 0.2, 0.3, 0.4)
+        ] + [
+            {"phase": "compress", "source": "mtc", "dur": 0.01},
+            {"phase": "book", "source": "mtc", "dur": 2.0},
+            {"phase": "fetch", "source": "tf", "dur": 1.0},
+        ]
+        rows = summarize(records)
+        self.assertEqual(
+            [(r.source, r.phase) for r in rows],
+            [("mtc", "book"), ("mtc", "fetch"), ("mtc", "compress"), ("tf", "fetch")],
+        )
+        fetch = rows[1]
+        self.assertEqual(fetch.count, 4)
+        self.assertAlmostEqual(fetch.total, 1.0)
+        self.assertEqual((fetch.p50, fetch.p95, fetch.max), (0.2, 0.4, 0.4))
+        text = format_report(rows)
+        self.assertIn("p95 ms", text.splitlines()[0])
+        self.assertIn("fetch", text)
+
+    def test_load_trace_skips_torn_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "t.jsonl"
+            path.write_text(
+                '{"phase": "fetch", "source": "mtc", "dur": 0.5}\n'
+                '{"ts": 1, "msg": "not a span"}\n'
+                '{"phase": "compress", "sou'
+            )
+            self.assertEqual(len(load_trace(path)), 1)
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
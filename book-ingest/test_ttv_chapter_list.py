@@ -0,0 +1,169 @@
+"""
+Tests for TTVSource.fetch_chapter_list() — the paginated chapter list
+(table of contents) — and the parser behind it.
+
+Pages implied by the detail page's chapter count are fetched up front;
+further pages are fetched only while the last page is full, stop on a
+page that lists nothing new (an endpoint ignoring ``page``), and are
+capped at ``TTV_TOC_MAX_EXTRA_PAGES``.
+
+Run:
+    cd book-ingest
+    python -m pytest test_ttv_chapter_list.py -v
+  or:
+    python test_ttv_chapter_list.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import unittest
+
+# Ensure the package is importable
+sys.path.insert(0, ".")
+
+from src.sources import has_chapter_list, ttv
+from src.sources.ttv import TTVFetchError, TTVSource, parse_chapter_list
+
+
+def _page_html(indices) -> str:
+    items = "".join(
+        f'<li><a href="https://truyen.tangthuvien.vn/doc-truyen/test/chuong-{i}"'
+        f' title="Chương {i}">Chương {i}</a></li>'
+        for i in indices
+    )
+    return f"<ul>{items}</ul>"
+
+
+class _FakeClient:
+    """Serves chapter list pages from ``pages(page) -> indices``."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested: list[int] = []
+
+    async def get_html(self, url, params=None):
+        page = params["page"]
+        self.requested.append(page)
+        indices = self.pages(page)
+        if indices is None:
+            raise TTVFetchError(f"page {page} failed")
+        return _page_html(indices)
+
+
+def _source(pages) -> TTVSource:
+    source = TTVSource()
+    source._client = _FakeClient(pages)
+    return source
+
+
+def _toc(source: TTVSource, chapter_count: int, book_id: int = 10000001):
+    meta = {"id": book_id, "ttv_story_id": 42, "chapter_count": chapter_count}
+    return asyncio.run(source.fetch_chapter_list(meta))
+
+
+class _SmallPages(unittest.TestCase):
+    """Runs with 10 chapters per list page."""
+
+    def setUp(self):
+        self._size = ttv.TTV_TOC_PAGE_SIZE
+        ttv.TTV_TOC_PAGE_SIZE = 10
+
+    def tearDown(self):
+        ttv.TTV_TOC_PAGE_SIZE = self._size
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+
+class TestChapterListParser(unittest.TestCase):
+    def test_parses_free_chapters(self):
+        html = """
+        <ul>
+          <li><a href="https://truyen.tangthuvien.vn/doc-truyen/t%C3%AAn/chuong-1"
+                 title="Chương 1 :&nbsp;Mở đầu">Chương 1</a></li>
+          <li class="vip"><a href="/doc-truyen/ten/chuong-2">Chương 2</a></li>
+          <li><a href="/doc-truyen/ten/chuong-3">Chương 3 <i class="fa-lock"></i></a></li>
+          <li><a href="/doc-truyen/ten/chuong-4">Chương 4: Bốn</a></li>
+          <li><a href="/doc-truyen/ten">Giới thiệu</a></li>
+        </ul>
+        """
+        refs = parse_chapter_list(html)
+        self.assertEqual([r.index for r in refs], [1, 4])
+        # Paths are decoded, titles unescaped
+        self.assertEqual(refs[0].url, "/doc-truyen/tên/chuong-1")
+        self.assertEqual(refs[0].title, "Chương 1 : Mở đầu")
+        self.assertEqual(refs[1].title, "Chương 4: Bốn")
+
+
+# ---------------------------------------------------------------------------
+# Pagination
+# ---------------------------------------------------------------------------
+
+
+class TestChapterListPagination(_SmallPages):
+    def test_fetches_pages_from_chapter_count(self):
+        source = _source(lambda p: range(p * 10 + 1, min(p * 10 + 10, 25) + 1))
+        toc = _toc(source, 25)
+        self.assertEqual([r.index for r in toc], list(range(1, 26)))
+        self.assertEqual(sorted(source._client.requested), [0, 1, 2])
+
+    def test_follows_a_list_longer_than_the_count(self):
+        # Detail page says 20, the list has 34
+        source = _source(lambda p: range(p * 10 + 1, min(p * 10 + 10, 34) + 1))
+        toc = _toc(source, 20)
+        self.assertEqual(len(toc), 34)
+        self.assertEqual(sorted(source._client.requested), [0, 1, 2, 3])
+
+    def test_page_parameter_ignored(self):
+        # Every page is the same full page: one extra request, then stop
+        source = _source(lambda p: range(1, 11))
+        toc = _toc(source, 10)
+        self.assertEqual(len(toc), 10)
+        self.assertEqual(sorted(source._client.requested), [0, 1])
+
+    def test_pages_numbered_from_one(self):
+        # page=0 and page=1 both return the first page
+        source = _source(lambda p: range(max(p - 1, 0) * 10 + 1, max(p - 1, 0) * 10 + 11))
+        toc = _toc(source, 10)
+        self.assertEqual([r.index for r in toc], list(range(1, 11)))
+        self.assertEqual(sorted(source._client.requested), [0, 1])
+
+    def test_extra_pages_are_capped(self):
+        # A list that never ends
+        source = _source(lambda p: range(p * 10 + 1, p * 10 + 11))
+        toc = _toc(source, 10)
+        extra = ttv.TTV_TOC_MAX_EXTRA_PAGES
+        self.assertEqual(len(source._client.requested), 1 + extra)
+        self.assertEqual(len(toc), 10 * (1 + extra))
+
+    def test_failed_page_falls_back(self):
+        source = _source(lambda p: None if p == 1 else range(p * 10 + 1, p * 10 + 11))
+        self.assertIsNone(_toc(source, 25))
+        self.assertIsNone(_toc(_source(lambda p: []), 5))
+
+    def test_sources_with_a_chapter_list(self):
+        # --fix only trusts its count-based pre-audit for sources without one
+        self.assertEqual(
+            {name: has_chapter_list(name) for name in ("mtc", "ttv", "tf", "bench")},
+            {"mtc": False, "ttv": True, "tf": True, "bench": False},
+        )
+
+    def test_cache_is_bounded(self):
+        source = _source(lambda p: range(1, 4))
+        for book_id in range(TTVSource._TOC_CACHE_SIZE + 5):
+            _toc(source, 3, book_id=book_id)
+        self.assertEqual(len(source._toc_cache), TTVSource._TOC_CACHE_SIZE)
+        self.assertNotIn(0, source._toc_cache)
+
+
+# ---------------------------------------------------------------------------
+# CLI runner
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    result = unittest.main(exit=False, verbosity=2)
+    sys.exit(0 if result.result.wasSuccessful() else 1)
@@ -34,6 +34,7 @@ from epub_builder import (
     load_metadata_from_db,
     validate_cover,
 )
+from profiling import default_output, start_profiling
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import (
@@ -371,8 +372,21 @@ def main():
         choices=STATUS_NAMES,
         help="Only convert books with this status (ongoing, completed, paused)",
     )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Sample-profile the run: write collapsed stacks (flamegraph input) "
+        "to PATH (default: <epub cache>/profile/convert-<time>.collapsed) and a top-N summary to PATH.top.txt",
+    )
     args = parser.parse_args()
 
+    if args.profile is not None:
+        start_profiling(
+            args.profile or default_output(EPUB_CACHE_DIR / "profile", "convert")
+        )
+
     console.print(
         Panel("[bold]MTC EPUB Converter[/bold]", border_style="blue", expand=False)
     )
@@ -23,9 +23,11 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import os
 import struct
+import tempfile
 import time
 from pathlib import Path
 
@@ -56,6 +58,9 @@ HEADERS = {
     "content-type": "application/json",
 }
 REQUEST_DELAY = 0.3
+CATALOG_DELAY = 0.08
+COVER_WORKERS = 8
+CATALOG_WORKERS = 8
 
 # ── Paths ───────────────────────────────────────────────────────────────────
 
@@ -133,6 +138,25 @@ def bundle_path_for(book_id: int) -> Path:
 # ── API helpers ─────────────────────────────────────────────────────────────
 
 
+class RequestPacer:
+    """Spaces request starts *delay* seconds apart across all workers, so
+    ``--delay`` bounds the request rate however many workers run."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if self.delay <= 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+            self._next = max(now, self._next) + self.delay
+
+
 def fetch_book_metadata(client: httpx.Client, book_id: int) -> dict | None:
     """Fetch full book metadata from API by ID.
 
@@ -156,86 +180,145 @@ def fetch_book_metadata(client: httpx.Client, book_id: int) -> dict | None:
     return None
 
 
-def fetch_all_books(
-    client: httpx.Client, limit: int = 50, log=console.print
-) -> list[dict]:
-    """Paginate through /api/books to get every book on the platform."""
-    all_books: list[dict] = []
-    page = 1
-    total = None
-    last_page = "?"
+def _parse_catalog_item(item: dict) -> dict:
+    return {
+        "id": item["id"],
+        "name": item.get("name", "?"),
+        "slug": item.get("slug", ""),
+        "chapter_count": item.get("latest_index", 0),
+        "first_chapter": item.get("first_chapter"),
+        "status": item.get("status_name", "?"),
+        "kind": item.get("kind"),
+        "sex": item.get("sex"),
+        "word_count": item.get("word_count", 0),
+    }
 
-    while True:
-        r = client.get(f"{BASE_URL}/api/books", params={"limit": limit, "page": page})
-        data = r.json()
-        if not data.get("success"):
-            log(f"  Page {page}: API error — {data.get('message', '?')}")
-            break
-
-        items = data.get("data", [])
-        if not items:
-            break
-
-        pag = data.get("pagination", {})
-        if total is None:
-            total = pag.get("total", "?")
-            last_page = pag.get("last", "?")
-            log(f"  Total books: {total}, pages: {last_page}")
-
-        for item in items:
-            all_books.append(
-                {
-                    "id": item["id"],
-                    "name": item.get("name", "?"),
-                    "slug": item.get("slug", ""),
-                    "chapter_count": item.get("latest_index", 0),
-                    "first_chapter": item.get("first_chapter"),
-                    "status": item.get("status_name", "?"),
-                    "kind": item.get("kind"),
-                    "sex": item.get("sex"),
-                    "word_count": item.get("word_count", 0),
-                }
+
+async def fetch_catalog_page(
+    client: httpx.AsyncClient, page: int, limit: int, retries: int = 4
+) -> dict | None:
+    """GET one /api/books page, retrying transport errors, 429 and 5xx."""
+    for attempt in range(retries):
+        try:
+            r = await client.get(
+                f"{BASE_URL}/api/books", params={"limit": limit, "page": page}
             )
+        except httpx.TransportError:
+            r = None
+        if r is not None and r.status_code == 200:
+            data = r.json()
+            return data if data.get("success") else None
+        if r is not None and r.status_code < 500 and r.status_code != 429:
+            return None
+        if attempt < retries - 1:
+            await asyncio.sleep(2 ** (attempt + 1))
+    return None
 
-        if page % 50 == 0 or page == 1:
-            log(f"  Page {page}/{last_page}: {len(all_books)} books collected")
 
-        if not pag.get("next"):
-            break
-        page += 1
-        time.sleep(0.08)
+async def fetch_all_books(
+    limit: int = 50,
+    workers: int = CATALOG_WORKERS,
+    delay: float = CATALOG_DELAY,
+    log=console.print,
+) -> list[dict]:
+    """Fetch every book on the platform via /api/books.
+
+    Page 1 gives the page count; the rest are fetched by *workers*
+    concurrent requests, started at least *delay* seconds apart, and
+    reassembled in page order.
+    """
+    pacer = RequestPacer(delay)
+    async with httpx.AsyncClient(headers=HEADERS, timeout=30) as client:
+        first = await fetch_catalog_page(client, 1, limit)
+        if first is None:
+            log("  Page 1: API error — catalog not fetched")
+            return []
+        pag = first.get("pagination") or {}
+        last_page = int(pag.get("last") or 1)
+        log(f"  Total books: {pag.get('total', '?')}, pages: {last_page}")
+
+        pages: dict[int, list[dict]] = {1: first.get("data") or []}
+        failed: list[int] = []
+        todo = iter(range(2, last_page + 1))
+
+        async def worker() -> None:
+            for page in todo:
+                await pacer.wait()
+                data = await fetch_catalog_page(client, page, limit)
+                if data is None:
+                    failed.append(page)
+                else:
+                    pages[page] = data.get("data") or []
+                    if len(pages) % 50 == 0:
+                        log(f"  Page {len(pages)}/{last_page}")
+
+        await asyncio.gather(*(worker() for _ in range(max(workers, 1))))
 
+    all_books: list[dict] = []
+    seen: set[int] = set()
+    for page in sorted(pages):
+        for item in pages[page]:
+            if item["id"] not in seen:
+                seen.add(item["id"])
+                all_books.append(_parse_catalog_item(item))
+
+    if failed:
+        log(f"  [yellow]{len(failed)} pages failed after retries[/yellow]")
     log(f"  Done: {len(all_books)} books fetched")
     return all_books
 
 
-def download_cover(client: httpx.Client, poster: dict, dest_path: str) -> bool:
+def write_cover(dest_path: str, data: bytes) -> None:
+    """Write cover bytes atomically (tmp file + rename)."""
+    directory = os.path.dirname(dest_path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+async def download_cover(
+    client: httpx.AsyncClient, poster: dict | str, dest_path: str
+) -> bool:
     """Download the best available cover image.
 
-    poster dict has keys like 'default', '600', '300', '150' with URLs.
+    poster dict has keys like 'default', '600', '300', '150' with URLs;
+    a plain string is a single URL.
     """
-    for key in ["default", "600", "300", "150"]:
-        url = poster.get(key)
-        if not url:
-            continue
+    if isinstance(poster, str):
+        urls = [poster]
+    else:
+        urls = [poster[k] for k in ("default", "600", "300", "150") if poster.get(k)]
+    for url in urls:
         try:
-            r = client.get(url, follow_redirects=True, timeout=30)
+            r = await client.get(url, follow_redirects=True, timeout=30)
             if r.status_code == 200 and len(r.content) > 100:
-                with open(dest_path, "wb") as f:
-                    f.write(r.content)
+                await asyncio.to_thread(write_cover, dest_path, r.content)
                 return True
         except Exception as e:
-            console.print(f"    [dim]Cover download ({key}): {e}[/dim]")
+            console.print(f"    [dim]Cover download ({url}): {e}[/dim]")
     return False
 
 
 # ── Meta-only: catalog → plan file ─────────────────────────────────────────
 
 
-def generate_plan(client: httpx.Client, dry_run: bool = False) -> dict:
+def generate_plan(
+    dry_run: bool = False,
+    workers: int = CATALOG_WORKERS,
+    delay: float = CATALOG_DELAY,
+) -> dict:
     """Fetch full catalog, cross-reference with local bundles, write plan."""
     console.print("\n[bold blue]Fetching API catalog...[/bold blue]")
-    catalog = fetch_all_books(client)
+    catalog = asyncio.run(fetch_all_books(workers=workers, delay=delay))
 
     # Build local chapter counts from bundles
     console.print("[bold blue]Scanning local bundles...[/bold blue]")
@@ -373,46 +456,69 @@ def generate_plan(client: httpx.Client, dry_run: bool = False) -> dict:
 # ── Cover-only: download covers ────────────────────────────────────────────
 
 
-def pull_cover_for_book(client: httpx.Client, book_id: int, log=console.print) -> bool:
+async def fetch_poster(client: httpx.AsyncClient, book_id: int) -> dict | str | None:
+    """Fetch a book's poster from the API (for books not in the plan)."""
+    try:
+        r = await client.get(
+            f"{BASE_URL}/api/books/{book_id}", params={"include": "author"}
+        )
+        if r.status_code != 200:
+            return None
+        data = r.json()
+    except Exception as e:
+        console.print(f"    [dim]/api/books/{book_id}: {e}[/dim]")
+        return None
+    book = data.get("data") if data.get("success") else None
+    if isinstance(book, dict) and isinstance(book.get("book"), dict):
+        book = book["book"]
+    return book.get("poster") if isinstance(book, dict) else None
+
+
+def load_plan_posters() -> dict[int, dict | str]:
+    """Map book ID → poster from the plan file (``--refresh`` plans have them)."""
+    if not PLAN_FILE.exists():
+        return {}
+    with open(PLAN_FILE, encoding="utf-8") as f:
+        entries = json.load(f)
+    return {e["id"]: e["poster"] for e in entries if e.get("poster")}
+
+
+async def pull_cover_for_book(
+    client: httpx.AsyncClient,
+    book_id: int,
+    poster: dict | str | None,
+    log=console.print,
+) -> bool:
     """Download cover directly to binslib/public/covers/{book_id}.jpg.
 
-    Fetches poster URL from the API.
+    Uses *poster* from the plan; fetches it from the API only when missing.
     """
     dest_path = str(COVERS_DIR / f"{book_id}.jpg")
 
-    book = fetch_book_metadata(client, book_id)
-    if not book:
-        log(f"  [red]FAILED[/red] {book_id}: no API data")
-        return False
-
-    poster = book.get("poster")
+    if not poster:
+        poster = await fetch_poster(client, book_id)
     if not poster:
         log(f"  [yellow]WARNING[/yellow] {book_id}: no poster info")
         return False
 
-    if isinstance(poster, dict):
-        if download_cover(client, poster, dest_path):
-            return True
-        log(f"  [yellow]WARNING[/yellow] {book_id}: cover download failed")
-        return False
-
-    if isinstance(poster, str):
-        try:
-            r = client.get(poster, follow_redirects=True, timeout=30)
-            if r.status_code == 200 and len(r.content) > 100:
-                with open(dest_path, "wb") as f:
-                    f.write(r.content)
-                return True
-        except Exception as e:
-            log(f"  [yellow]WARNING[/yellow] {book_id}: cover failed: {e}")
-
+    if await download_cover(client, poster, dest_path):
+        return True
+    log(f"  [yellow]WARNING[/yellow] {book_id}: cover download failed")
     return False
 
 
 def run_cover_pull(
-    target_ids: list[int], force: bool, dry_run: bool, delay: float
+    target_ids: list[int],
+    force: bool,
+    dry_run: bool,
+    delay: float,
+    workers: int = COVER_WORKERS,
 ) -> None:
-    """Download missing covers for the given book IDs."""
+    """Download missing covers for the given book IDs.
+
+    *workers* books are fetched at once; books are started at least
+    *delay* seconds apart across all workers.
+    """
     COVERS_DIR.mkdir(parents=True, exist_ok=True)
 
     if force:
@@ -421,9 +527,13 @@ def run_cover_pull(
         pending = [
             bid for bid in target_ids if not (COVERS_DIR / f"{bid}.jpg").exists()
         ]
+    posters = load_plan_posters() if pending else {}
 
     console.print(f"  Targeted:       [bold]{len(target_ids)}[/bold]")
     console.print(f"  Missing covers: [bold]{len(pending)}[/bold]")
+    console.print(
+        f"  API lookups:    [bold]{sum(1 for b in pending if b not in posters)}[/bold]"
+    )
     console.print(f"  Destination:    [dim]{COVERS_DIR}[/dim]")
     console.print()
 
@@ -439,9 +549,6 @@ def run_cover_pull(
             console.print(f"  [dim]... and {len(pending) - 30} more[/dim]")
         return
 
-    succeeded = 0
-    failed = 0
-
     progress = Progress(
         TextColumn("[bold blue]{task.description}"),
         BarColumn(bar_width=30),
@@ -452,25 +559,32 @@ def run_cover_pull(
         TimeRemainingColumn(),
     )
 
-    with progress, httpx.Client(headers=HEADERS, timeout=30) as client:
+    async def run(task) -> int:
+        queue = iter(pending)
+        succeeded = 0
+        pacer = RequestPacer(delay)
+
+        async def worker(client: httpx.AsyncClient) -> None:
+            nonlocal succeeded
+            for bid in queue:
+                await pacer.wait()
+                if await pull_cover_for_book(
+                    client, bid, posters.get(bid), log=progress.console.print
+                ):
+                    succeeded += 1
+                progress.advance(task)
+
+        async with httpx.AsyncClient(headers=HEADERS, timeout=30) as client:
+            await asyncio.gather(*(worker(client) for _ in range(max(workers, 1))))
+        return succeeded
+
+    with progress:
         task = progress.add_task("Pulling covers", total=len(pending))
-
-        for i, bid in enumerate(pending, 1):
-            progress.update(task, description=f"Cover {bid}")
-
-            if pull_cover_for_book(client, bid, log=progress.console.print):
-                succeeded += 1
-            else:
-                failed += 1
-
-            progress.advance(task)
-
-            if i < len(pending):
-                time.sleep(delay)
+        succeeded = asyncio.run(run(task))
 
     console.print(
         f"\nDone: [green]{succeeded}[/green] succeeded, "
-        f"[red]{failed}[/red] failed out of {len(pending)}"
+        f"[red]{len(pending) - succeeded}[/red] failed out of {len(pending)}"
     )
 
 
@@ -515,7 +629,15 @@ def main():
         "--delay",
         type=float,
         default=REQUEST_DELAY,
-        help=f"Seconds between API requests (default: {REQUEST_DELAY})",
+        help="Seconds between cover pull starts, across all workers "
+        f"(default: {REQUEST_DELAY}; catalog pages use {CATALOG_DELAY})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=COVER_WORKERS,
+        help=f"Concurrent cover downloads and catalog page requests "
+        f"(default: {COVER_WORKERS})",
     )
     args = parser.parse_args()
 
@@ -538,8 +660,7 @@ def main():
 
     # ── Meta-only / meta phase ──────────────────────────────────────────
     if do_meta:
-        with httpx.Client(headers=HEADERS, timeout=30) as client:
-            generate_plan(client, dry_run=args.dry_run)
+        generate_plan(dry_run=args.dry_run, workers=args.workers)
 
     # ── Cover-only / cover phase ────────────────────────────────────────
     if do_covers:
@@ -555,7 +676,7 @@ def main():
         console.print(f"\n[bold blue]Cover Pull[/bold blue]")
         console.print(f"  Source:         [dim]bundles in {COMPRESSED_DIR}[/dim]")
         console.print(f"  Books found:    [bold]{len(target_ids)}[/bold]")
-        run_cover_pull(target_ids, args.force, args.dry_run, args.delay)
+        run_cover_pull(target_ids, args.force, args.dry_run, args.delay, args.workers)
 
 
 if __name__ == "__main__":